@@ -0,0 +1,498 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Vektorizált fogadási stratégia backtest
+Az OddsScraper mérkőzés adatain (odds_data.json, MatchTable vagy a teljes
+Football-Data tábla) értékeli a tét stratégiákat, és paraméter rácsokat
+futtat végig folyamat-poolban.
+
+Stratégiák:
+- favourite: mindig az esélyesre, fix téttel
+- value:     ahol az odds a fair (referencia) odds fölött van
+- kelly:     töredék Kelly tét a bankroll arányában (kamatos)
+  (a value és a kelly csak független referencia árral futtatható: a
+  fogadott odds-ból számolt fair valószínűséggel az előny sosem pozitív)
+- draw:      csak döntetlen, odds sávban
+- band:      az esélyesre, ha az odds a megadott sávban van
+"""
+
+import argparse
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from margin_engine import as_odds_array, fair_probabilities, match_columns
+from results_index import date_ordinal
+
+OUTCOME_CODES = {'H': 0, 'D': 1, 'A': 2}
+
+# Referencia (fair) árak a Football-Data táblából, elsőbbségi sorrendben:
+# Pinnacle záró, Pinnacle, piaci átlag záró, piaci átlag
+REFERENCE_PREFIXES = ('PSC', 'PS', 'AvgC', 'Avg')
+
+# Referencia árak JSON bemenetnél: ugyanannak a mérkőzésnek egy másik
+# sora ezektől a bookmakerektől, különben a többi bookmaker átlaga
+REFERENCE_BOOKMAKERS = ('Pinnacle', 'Max')
+MIN_AVERAGE_BOOKMAKERS = 2
+
+# Fair (referencia) valószínűséget igénylő stratégiák
+NEEDS_REFERENCE = {'value', 'kelly'}
+
+
+class BacktestData:
+    """
+    A backtesthez előkészített, időrendbe rendezett tömbök
+
+    Attributes:
+        odds: (n, 3) fogadható odds (H, D, A)
+        fair: (n, 3) fair valószínűségek (a referencia árakból; NaN, ha
+              a mérkőzéshez nincs referencia ár)
+        outcome: (n,) a tényleges kimenet indexe (0=H, 1=D, 2=A)
+        leagues: (n,) bajnokság nevek
+    """
+
+    def __init__(self, odds, fair, outcome, leagues=None, dates=None):
+        odds = as_odds_array(odds)
+        outcome = np.asarray(outcome, dtype=np.int64)
+
+        # Csak a teljes árazású, ismert kimenetelű mérkőzések
+        valid = np.isfinite(odds).all(axis=1) & (outcome >= 0)
+        if dates is not None:
+            # Stabil rendezés dátum szerint (ismeretlen dátumú sorok elöl,
+            # egymás közt az eredeti sorrendben)
+            dates = np.asarray(dates, dtype=np.float64)
+            order = np.argsort(np.where(np.isnan(dates), -np.inf, dates), kind='stable')
+            order = order[valid[order]]
+        else:
+            order = np.flatnonzero(valid)
+
+        self.odds = odds[order]
+        self.fair = np.asarray(fair, dtype=np.float64)[order]
+        self.outcome = outcome[order]
+        self.leagues = np.asarray(leagues if leagues is not None else [''] * len(valid), dtype=object)[order]
+        self.wins = np.zeros(self.odds.shape, dtype=bool)
+        self.wins[np.arange(len(self.outcome)), self.outcome] = True
+
+    def __len__(self):
+        return len(self.outcome)
+
+    def has_reference(self):
+        """(n,) maszk: van-e a sorhoz fair (referencia) valószínűség"""
+        return np.isfinite(self.fair).all(axis=1)
+
+    def subset(self, mask):
+        """Részhalmaz (pl. egy bajnokság) új BacktestData-ként"""
+        data = BacktestData.__new__(BacktestData)
+        for name in ('odds', 'fair', 'outcome', 'leagues', 'wins'):
+            setattr(data, name, getattr(self, name)[mask])
+        return data
+
+
+def _outcome_of(match):
+    result = match.get('result')
+    if result in OUTCOME_CODES:
+        return OUTCOME_CODES[result]
+    home, away = match.get('home_goals'), match.get('away_goals')
+    if home is None or away is None:
+        return -1
+    return 0 if home > away else (1 if home == away else 2)
+
+
+def reference_odds(matches, bookmakers=REFERENCE_BOOKMAKERS, min_average=MIN_AVERAGE_BOOKMAKERS):
+    """
+    Független referencia odds mérkőzés soronként
+
+    Ugyanannak a mérkőzésnek (nap, hazai, vendég) egy MÁSIK sora adja: az
+    első elérhető bookmakers-beli ár, különben legalább min_average másik
+    bookmaker átlaga. A sor saját ára sosem referencia.
+
+    Returns:
+        np.ndarray: (n, 3) odds, NaN ahol nincs referencia
+    """
+    odds = match_columns(matches)
+    groups = {}
+    for row, match in enumerate(matches):
+        key = (date_ordinal(match.get('date')), match.get('home_team'), match.get('away_team'))
+        groups.setdefault(key, []).append(row)
+
+    reference = np.full(odds.shape, np.nan)
+    priced = np.isfinite(odds).all(axis=1)
+    for rows in groups.values():
+        if len(rows) < 2:
+            continue
+        for row in rows:
+            others = [other for other in rows if other != row and priced[other]]
+            preferred = [other for name in bookmakers for other in others
+                         if matches[other].get('bookmaker') == name]
+            if preferred:
+                reference[row] = odds[preferred[0]]
+            elif len(others) >= min_average:
+                reference[row] = odds[others].mean(axis=0)
+    return reference
+
+
+def load_matches(matches, reference=None, method='shin'):
+    """
+    Backtest adatok OddsScraper mérkőzésekből
+
+    Args:
+        matches: Mérkőzés dict-ek vagy MatchTable
+        reference: (n, 3) referencia odds a fair valószínűségekhez (NaN
+                   sorok: nincs referencia; None: egyik sorhoz sincs, a
+                   value / kelly stratégia nem futtatható)
+        method: A margin eltávolítás módszere (lásd margin_engine)
+
+    Returns:
+        BacktestData
+    """
+    odds = match_columns(matches)
+    fair = np.full(odds.shape, np.nan)
+    if reference is not None:
+        reference = np.asarray(reference, dtype=np.float64).reshape(-1, 3)
+        priced = np.isfinite(reference).all(axis=1)
+        fair[priced] = fair_probabilities(reference[priced], method)
+    outcome = [_outcome_of(m) for m in matches]
+    dates = [date_ordinal(m.get('date')) for m in matches]
+    leagues = [m.get('league') or '' for m in matches]
+    return BacktestData(odds, fair, outcome, leagues,
+                        [np.nan if d is None else d for d in dates])
+
+
+def load_json(filename='data/odds_data.json', method='shin'):
+    """Backtest adatok az OddsScraper JSON kimenetéből (referencia: reference_odds)"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        matches = json.load(f)
+    return load_matches(matches, reference_odds(matches), method=method)
+
+
+def from_football_data(table, bookmaker='B365', reference=REFERENCE_PREFIXES, method='shin'):
+    """
+    Backtest adatok a teljes Football-Data táblából (lásd football_data.py)
+
+    A fogadható odds a megadott bookmakeré, a fair valószínűség az első
+    elérhető referencia árból (alapért.: Pinnacle záró) számolódik;
+    referencia nélküli sorra a value / kelly nem fogad.
+
+    Args:
+        table: FootballDataTable
+        bookmaker: Oszlop előtag a fogadható odds-hoz (pl. 'B365', 'WH', 'Max')
+        reference: Referencia oszlop előtag(ok) elsőbbségi sorrendben
+        method: A margin eltávolítás módszere
+    """
+    def prices(prefix):
+        names = [prefix + suffix for suffix in ('H', 'D', 'A')]
+        if not all(name in table for name in names):
+            return None
+        return np.column_stack([np.frombuffer(table.column(name), dtype=np.float64) for name in names])
+
+    odds = prices(bookmaker)
+    if odds is None:
+        raise ValueError(f"Nincsenek {bookmaker} odds oszlopok a táblában")
+
+    if isinstance(reference, str):
+        reference = (reference,)
+    fair = np.full(odds.shape, np.nan)
+    for prefix in reference:
+        ref = prices(prefix)
+        if ref is None:
+            continue
+        # Soronként az első teljes referencia ár
+        missing = ~np.isfinite(fair).all(axis=1)
+        fair[missing] = fair_probabilities(ref[missing], method)
+
+    results = table.values('FTR') if 'FTR' in table else [None] * len(table)
+    outcome = [OUTCOME_CODES.get(r, -1) for r in results]
+    dates = [date_ordinal(d) for d in table.values('Date')] if 'Date' in table else None
+    leagues = table.values('League') if 'League' in table else None
+    return BacktestData(odds, fair, outcome, leagues,
+                        None if dates is None else [np.nan if d is None else d for d in dates])
+
+
+# --- Stratégiák: (kiválasztott kimenet, tét) tömbök ---
+# A kiválasztás -1, ha nincs fogadás; a tét egység (vagy a kamatos
+# stratégiáknál a bankroll hányada)
+
+def favourite(data, stake=1.0, max_odds=np.inf):
+    """Mindig az esélyesre (legkisebb odds), ha az odds legfeljebb max_odds"""
+    selection = np.argmin(data.odds, axis=1)
+    price = data.odds[np.arange(len(data)), selection]
+    return np.where(price <= max_odds, selection, -1), np.full(len(data), stake)
+
+
+def _expected_value(data):
+    """odds * fair_p - 1; referencia nélküli sorban -inf (nincs fogadás)"""
+    expected = data.odds * data.fair - 1.0
+    return np.where(data.has_reference()[:, None], expected, -np.inf)
+
+
+def value(data, edge=0.05, stake=1.0, min_odds=1.0, max_odds=np.inf):
+    """A legnagyobb várható értékű kimenetre, ha odds * fair_p - 1 > edge"""
+    expected = _expected_value(data)
+    expected = np.where((data.odds >= min_odds) & (data.odds <= max_odds), expected, -np.inf)
+    selection = np.argmax(expected, axis=1)
+    best = expected[np.arange(len(data)), selection]
+    return np.where(best > edge, selection, -1), np.full(len(data), stake)
+
+
+def kelly(data, fraction=0.25, edge=0.0, cap=0.1):
+    """
+    Töredék Kelly: a bankroll fraction * (p*o - 1) / (o - 1) hányada
+    a legnagyobb várható értékű kimenetre (legfeljebb cap)
+    """
+    expected = _expected_value(data)
+    selection = np.argmax(expected, axis=1)
+    rows = np.arange(len(data))
+    best = expected[rows, selection]
+    stake = np.minimum(cap, fraction * best / (data.odds[rows, selection] - 1.0))
+    return np.where(best > edge, selection, -1), np.clip(stake, 0.0, None)
+
+
+def draw(data, min_odds=1.0, max_odds=np.inf, stake=1.0):
+    """Csak döntetlenre, ha a döntetlen odds a [min_odds, max_odds] sávban van"""
+    price = data.odds[:, 1]
+    selection = np.where((price >= min_odds) & (price <= max_odds), 1, -1)
+    return selection, np.full(len(data), stake)
+
+
+def band(data, low=1.5, high=2.5, outcome=None, stake=1.0):
+    """
+    Odds sáv: az esélyesre (vagy a megadott kimenetre: 'H', 'D', 'A'),
+    ha az odds a [low, high] sávban van
+    """
+    if outcome is None:
+        selection = np.argmin(data.odds, axis=1)
+    else:
+        selection = np.full(len(data), OUTCOME_CODES[outcome])
+    price = data.odds[np.arange(len(data)), selection]
+    return np.where((price >= low) & (price <= high), selection, -1), np.full(len(data), stake)
+
+
+STRATEGIES = {
+    'favourite': favourite,
+    'value': value,
+    'kelly': kelly,
+    'draw': draw,
+    'band': band,
+}
+
+# Bankroll arányos (kamatos) tétezésű stratégiák
+COMPOUNDING = {'kelly'}
+
+
+def evaluate(data, selection, stake, compounding=False):
+    """
+    Egy stratégia kiértékelése
+
+    Args:
+        data: BacktestData
+        selection: (n,) kiválasztott kimenet (-1 = nincs fogadás)
+        stake: (n,) tét egységben, vagy kamatos esetben a bankroll hányada
+        compounding: Bankroll arányos tétezés (1.0 kezdő bankroll)
+
+    Returns:
+        dict: bets, staked, profit, roi, hit_rate, max_drawdown (és kamatos
+              esetben final_bankroll)
+    """
+    placed = selection >= 0
+    rows = np.flatnonzero(placed)
+    chosen = selection[rows]
+    price = data.odds[rows, chosen]
+    won = data.wins[rows, chosen]
+    stake = np.asarray(stake, dtype=np.float64)[rows]
+    bets = len(rows)
+
+    if bets == 0:
+        return {'bets': 0, 'staked': 0.0, 'profit': 0.0, 'roi': 0.0,
+                'hit_rate': 0.0, 'max_drawdown': 0.0}
+
+    if compounding:
+        # Bankroll a fogadások után: kumulatív szorzat (a tét a pillanatnyi bankroll hányada)
+        returns = np.where(won, stake * (price - 1.0), -stake)
+        bankroll = np.cumprod(1.0 + returns)
+        before = np.concatenate(([1.0], bankroll[:-1]))
+        staked = float((stake * before).sum())
+        profit = float(bankroll[-1] - 1.0)
+        peak = np.maximum.accumulate(np.concatenate(([1.0], bankroll)))
+        drawdown = float(((peak[1:] - bankroll) / peak[1:]).max())
+        result = {'final_bankroll': round(float(bankroll[-1]), 4)}
+    else:
+        returns = np.where(won, stake * (price - 1.0), -stake)
+        cumulative = np.cumsum(returns)
+        staked = float(stake.sum())
+        profit = float(cumulative[-1])
+        peak = np.maximum.accumulate(np.concatenate(([0.0], cumulative)))
+        drawdown = float((peak[1:] - cumulative).max())
+        result = {}
+
+    result.update({
+        'bets': bets,
+        'staked': round(staked, 4),
+        'profit': round(profit, 4),
+        'roi': round(profit / staked, 4) if staked else 0.0,
+        'hit_rate': round(float(won.mean()), 4),
+        'max_drawdown': round(drawdown, 4),
+    })
+    return result
+
+
+def run_strategy(data, name, **params):
+    """Egy stratégia futtatása a megadott paraméterekkel"""
+    if name not in STRATEGIES:
+        raise ValueError(f"Ismeretlen stratégia: {name} (választható: {', '.join(STRATEGIES)})")
+    if name in NEEDS_REFERENCE and not data.has_reference().any():
+        raise ValueError(f"A(z) {name} stratégiához független referencia ár kell "
+                         f"(pl. Pinnacle sor ugyanarra a mérkőzésre)")
+    selection, stake = STRATEGIES[name](data, **params)
+    return evaluate(data, selection, stake, compounding=name in COMPOUNDING)
+
+
+# (alsó, felső) határ paraméter párok
+GRID_BOUNDS = (('min_odds', 'max_odds'), ('low', 'high'))
+
+
+def param_grid(**axes):
+    """
+    Paraméter rács: minden érték kombináció egy dict
+
+    A lehetetlen kombinációk (alsó határ > felső határ, lásd GRID_BOUNDS)
+    kimaradnak.
+
+    Példa: param_grid(low=[1.5, 1.8], high=[2.5, 3.0]) -> 4 kombináció
+    """
+    names = list(axes)
+    grid = [dict(zip(names, values)) for values in itertools.product(*(axes[n] for n in names))]
+    return [params for params in grid
+            if not any(lower in params and upper in params and params[lower] > params[upper]
+                       for lower, upper in GRID_BOUNDS)]
+
+
+# --- Párhuzamos rács futtatás ---
+# A worker folyamatok egyszer kapják meg az adatokat (initializer),
+# utána csak a paraméter csomagok utaznak
+
+_worker_data = None
+
+
+def _init_worker(data):
+    global _worker_data
+    _worker_data = data
+
+
+def _run_chunk(name, chunk):
+    return [run_strategy(_worker_data, name, **params) for params in chunk]
+
+
+def sweep(data, name, grid, workers=None, chunk_size=None):
+    """
+    Paraméter rács kiértékelése folyamat-poolban
+
+    Args:
+        data: BacktestData
+        name: Stratégia neve
+        grid: Paraméter dict-ek listája (lásd param_grid)
+        workers: Folyamatok száma (alapért.: CPU magok száma; 1 = soros)
+        chunk_size: Kombinációk száma csomagonként
+
+    Returns:
+        list: (paraméterek, eredmény) párok ROI szerint csökkenő sorrendben
+    """
+    grid = list(grid)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(grid)))
+    chunk_size = chunk_size or max(1, -(-len(grid) // (workers * 4)))
+    chunks = [grid[i:i + chunk_size] for i in range(0, len(grid), chunk_size)]
+
+    if workers == 1:
+        results = [run_strategy(data, name, **params) for params in grid]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(data,)) as executor:
+            results = [result
+                       for chunk_results in executor.map(_run_chunk, [name] * len(chunks), chunks)
+                       for result in chunk_results]
+
+    ranked = list(zip(grid, results))
+    ranked.sort(key=lambda item: (item[1]['roi'], item[1]['bets']), reverse=True)
+    return ranked
+
+
+# Alapértelmezett rácsok a parancssori futtatáshoz
+DEFAULT_GRIDS = {
+    'favourite': {'max_odds': [1.2, 1.4, 1.6, 1.8, 2.0, 2.5, 3.0, np.inf]},
+    'value': {'edge': [0.0, 0.02, 0.05, 0.1, 0.15], 'min_odds': [1.0, 1.5, 2.0],
+              'max_odds': [3.0, 5.0, 10.0, np.inf]},
+    'kelly': {'fraction': [0.1, 0.25, 0.5, 1.0], 'edge': [0.0, 0.02, 0.05], 'cap': [0.02, 0.05, 0.1]},
+    'draw': {'min_odds': [2.5, 2.8, 3.0, 3.2, 3.5], 'max_odds': [3.2, 3.5, 4.0, 5.0, np.inf]},
+    'band': {'low': [1.2, 1.4, 1.6, 1.8, 2.0], 'high': [1.6, 2.0, 2.5, 3.0, 4.0],
+             'outcome': [None, 'H', 'A']},
+}
+
+
+def print_results(name, ranked, top=10):
+    """A legjobb kombinációk kiírása"""
+    print(f"\n🏆 {name}: legjobb {min(top, len(ranked))} / {len(ranked)} kombináció")
+    print("-" * 78)
+    for params, result in ranked[:top]:
+        shown = ', '.join(f"{k}={v}" for k, v in params.items())
+        print(f"  ROI {result['roi']:>+7.1%} | {result['bets']:>6} fogadás | "
+              f"találat {result['hit_rate']:>5.1%} | {shown}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Vektorizált fogadási stratégia backtest")
+    parser.add_argument('--input', default='data/odds_data.json',
+                        help="OddsScraper JSON vagy Football-Data oszlopos fájl (.fdc)")
+    parser.add_argument('--strategy', choices=list(STRATEGIES), action='append',
+                        help="futtatandó stratégia (ismételhető; alapért.: mind)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="folyamatok száma a rács futtatáshoz")
+    parser.add_argument('--method', default='shin',
+                        help="margin eltávolítás módszere a fair valószínűségekhez")
+    parser.add_argument('--output', default='data/backtest_results.json',
+                        help="eredmények mentése")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    print("💰 STRATÉGIA BACKTEST")
+    print("=" * 78)
+
+    if args.input.endswith('.fdc'):
+        from football_data import FootballDataTable
+        columns = ['Date', 'League', 'FTR'] + [p + s for p in ('B365',) + REFERENCE_PREFIXES
+                                                 for s in ('H', 'D', 'A')]
+        data = from_football_data(FootballDataTable.read(args.input, columns=columns), method=args.method)
+    else:
+        data = load_json(args.input, method=args.method)
+    print(f"📊 {len(data)} mérkőzés: {args.input}")
+
+    referenced = int(data.has_reference().sum())
+    print(f"⚖️  Referencia árral: {referenced} mérkőzés")
+
+    output = {}
+    for name in args.strategy or list(STRATEGIES):
+        if name in NEEDS_REFERENCE and not referenced:
+            print(f"\n⚠️  {name}: kihagyva, nincs független referencia ár "
+                  f"(ugyanarra a mérkőzésre {'/'.join(REFERENCE_BOOKMAKERS)} vagy több bookmaker sora)")
+            continue
+        grid = param_grid(**DEFAULT_GRIDS[name])
+        ranked = sweep(data, name, grid, workers=args.workers)
+        print_results(name, ranked)
+        output[name] = [
+            {'params': {k: (None if isinstance(v, float) and np.isinf(v) else v) for k, v in params.items()},
+             'result': result}
+            for params, result in ranked
+        ]
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(output, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 Eredmények: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Kimeneti formátumok összehasonlítása: fájlméret és betöltési idő
+Használat: python benchmarks/bench_formats.py [mérkőzések száma]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from odds_formats import (brotli, read_columnar, read_columnar_columns,
+                          read_json_compressed, write_columnar, write_json_compressed)
+from odds_scraper import OddsScraper
+
+
+def timed(func, repeat=3):
+    """A leggyorsabb futási idő másodpercben"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    num_matches = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    scraper = OddsScraper(cache_dir=None)
+    scraper.generate_sample_data(num_matches)
+    rows = scraper.data
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {
+            'json (indent=2)': os.path.join(tmp, 'odds.json'),
+            'json.gz': os.path.join(tmp, 'odds.json.gz'),
+            'columnar (.odc)': os.path.join(tmp, 'odds.odc'),
+        }
+        with open(paths['json (indent=2)'], 'w', encoding='utf-8') as f:
+            json.dump(rows, f, indent=2, ensure_ascii=False)
+        write_json_compressed(rows, paths['json.gz'], codec='gzip')
+        write_columnar(rows, paths['columnar (.odc)'])
+
+        def load_json():
+            with open(paths['json (indent=2)'], 'r', encoding='utf-8') as f:
+                return json.load(f)
+
+        loaders = {
+            'json (indent=2)': load_json,
+            'json.gz': lambda: read_json_compressed(paths['json.gz']),
+            'columnar (.odc)': lambda: read_columnar(paths['columnar (.odc)']),
+        }
+
+        if brotli is not None:
+            paths['json.br'] = os.path.join(tmp, 'odds.json.br')
+            write_json_compressed(rows, paths['json.br'], codec='brotli')
+            loaders['json.br'] = lambda: read_json_compressed(paths['json.br'])
+
+        # Csak az oszlopok (dict-ek építése nélkül)
+        paths['columnar, oszloponként'] = paths['columnar (.odc)']
+        loaders['columnar, oszloponként'] = lambda: read_columnar_columns(paths['columnar (.odc)'])
+
+        baseline_size = os.path.getsize(paths['json (indent=2)'])
+        baseline_time = None
+
+        print(f"\n📏 {num_matches} mérkőzés")
+        print("=" * 72)
+        print(f"{'Formátum':<26} {'Méret':>12} {'Arány':>8} {'Betöltés':>12} {'Gyorsulás':>10}")
+        print("-" * 72)
+        for name, loader in loaders.items():
+            size = os.path.getsize(paths[name])
+            elapsed = timed(loader)
+            if baseline_time is None:
+                baseline_time = elapsed
+            print(f"{name:<26} {size / 1024:>10.0f}KB {size / baseline_size:>7.1%} "
+                  f"{elapsed * 1000:>10.1f}ms {baseline_time / elapsed:>9.1f}x")
+        print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teljesítmény mérés a fő feldolgozási útvonalakra, tárolt alapértékkel
+- team_stats:     scraper.analyze_team_stats (adatokfoci.csv formátum)
+- team_stats_np:  ugyanez a numpy motorral
+- football_data:  OddsScraper.scrape_football_data egy helyi HTTP szerverről
+- live_margins:   fetch_live_matches feldolgozás + vektorizált margin
+- save_csv:       OddsScraper.save_to_csv
+- save_json:      OddsScraper.save_to_json (csak a monolitikus fájl)
+- save_shards:    shards.write_shards (bajnokság × szezon shardok, első írás)
+
+Minden eset külön folyamatban fut (szintetikus, seedelt bemenettel); a mért
+érték a futási idő és a tracemalloc csúcs memória. Az alapértékhez
+(benchmarks/baseline.json) képest lassabb / több memóriát használó eset
+regressziónak számít, és a program 1-es kóddal lép ki.
+
+Használat:
+    python benchmarks/bench_hot_paths.py                          # 10k, 100k
+    python benchmarks/bench_hot_paths.py --sizes 10k,100k,1M,10M --case save_json
+    python benchmarks/bench_hot_paths.py --update-baseline
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from fetch_live_matches import parse_live_match
+from margin_engine import annotate_live_matches
+from odds_scraper import OddsScraper
+from scraper import analyze_team_stats
+from shards import write_shards
+from synthetic import MatchGenerator, chunk_rows
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_SIZES = '10k,100k'
+SEED = 42
+CHUNK_SIZE = 100000
+
+# Megengedett eltérés az alapértékhez képest (arány + abszolút tűrés a zajhoz)
+TIME_TOLERANCE = 0.30
+TIME_SLACK = 0.05
+MEMORY_TOLERANCE = 0.20
+MEMORY_SLACK_MB = 1.0
+
+FOOTBALL_DATA_COLUMNS = ('Div', 'Date', 'Time', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG', 'FTR',
+                         'B365H', 'B365D', 'B365A', 'PSH', 'PSD', 'PSA',
+                         'MaxH', 'MaxD', 'MaxA', 'AvgH', 'AvgD', 'AvgA')
+LIVE_BOOKMAKERS = ('Pinnacle', 'Bet365', 'William Hill', 'Unibet', 'Betfair', 'Marathon Bet')
+
+
+def parse_size(value):
+    """'10k' / '1M' / '2500' -> sorok száma"""
+    value = value.strip().lower()
+    multiplier = {'k': 1000, 'm': 1000000}.get(value[-1:], 1)
+    return int(float(value.rstrip('km')) * multiplier)
+
+
+def format_size(rows):
+    if rows >= 1000000 and rows % 1000000 == 0:
+        return f"{rows // 1000000}M"
+    if rows >= 1000 and rows % 1000 == 0:
+        return f"{rows // 1000}k"
+    return str(rows)
+
+
+def chunks(rows):
+    return MatchGenerator(SEED).chunks(rows, CHUNK_SIZE)
+
+
+# --- Bemenetek ---
+
+def write_international_csv(rows, filename):
+    """adatokfoci.csv formátumú szintetikus fájl"""
+    with open(filename, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Datum', 'Hazai csapat', 'Vendeg csapat',
+                         'Haza csapat eredmeny', 'Vendeg csapat eredmeny', 'Bajnoksag'])
+        for chunk in chunks(rows):
+            writer.writerows(zip(chunk['date'].tolist(), chunk['home_team'].tolist(),
+                                 chunk['away_team'].tolist(), chunk['home_goals'].tolist(),
+                                 chunk['away_goals'].tolist(), chunk['league'].tolist()))
+
+
+def write_football_data_csv(rows, filename):
+    """Football-Data formátumú szintetikus fájl (több bookmaker oszloppal)"""
+    with open(filename, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(FOOTBALL_DATA_COLUMNS)
+        for chunk in chunks(rows):
+            odds = [chunk['odds_home'].tolist(), chunk['odds_draw'].tolist(), chunk['odds_away'].tolist()]
+            n = len(chunk['date'])
+            writer.writerows(zip(
+                ['E0'] * n, chunk['date'].tolist(), ['15:00'] * n,
+                chunk['home_team'].tolist(), chunk['away_team'].tolist(),
+                chunk['home_goals'].tolist(), chunk['away_goals'].tolist(), chunk['result'].tolist(),
+                *odds, *odds, *odds, *odds))
+
+
+def live_api_matches(rows):
+    """The Odds API formátumú mérkőzések (bookmakerenként kissé eltérő árakkal)"""
+    commence = (datetime.now(timezone.utc) + timedelta(hours=3)).strftime('%Y-%m-%dT%H:%M:%SZ')
+    matches = []
+    for chunk in chunks(rows):
+        for row in chunk_rows(chunk):
+            home, away = row['home_team'], row['away_team']
+            matches.append({
+                'home_team': home,
+                'away_team': away,
+                'commence_time': commence,
+                'bookmakers': [{
+                    'title': title,
+                    'markets': [{'key': 'h2h', 'outcomes': [
+                        {'name': home, 'price': round(row['odds_home'] * (1 + 0.01 * i), 2)},
+                        {'name': 'Draw', 'price': row['odds_draw']},
+                        {'name': away, 'price': round(row['odds_away'] * (1 - 0.005 * i), 2)},
+                    ]}],
+                } for i, title in enumerate(LIVE_BOOKMAKERS)],
+            })
+    return matches
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@contextlib.contextmanager
+def local_server(directory):
+    """Helyi HTTP szerver a Football-Data URL szerkezettel (/szezon/liga.csv)"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), partial(QuietHandler, directory=directory))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+# --- Esetek: előkészítés (nem mért), majd a mért függvényt adó setup ---
+
+def case_team_stats(rows, tmp, engine='python'):
+    filename = os.path.join(tmp, 'adatokfoci.csv')
+    write_international_csv(rows, filename)
+    return lambda: partial(analyze_team_stats, filename, engine=engine)
+
+
+def case_football_data(rows, tmp):
+    os.makedirs(os.path.join(tmp, '2324'))
+    write_football_data_csv(rows, os.path.join(tmp, '2324', 'E0.csv'))
+    stack = contextlib.ExitStack()
+    base_url = stack.enter_context(local_server(tmp))
+
+    def setup():
+        scraper = OddsScraper(cache_dir=None, aliases_path=None, rate_limit=1000.0)
+        scraper.football_data_url = base_url
+        return partial(scraper.scrape_football_data, leagues={'E0': 'Premier League'}, seasons=['2324'])
+    setup.cleanup = stack.close
+    return setup
+
+
+def case_live_margins(rows, tmp):
+    api_matches = live_api_matches(rows)
+
+    def run():
+        parsed = [parse_live_match(match, 'Premier League', annotate=False) for match in api_matches]
+        annotate_live_matches([match for match in parsed if match is not None])
+    return lambda: run
+
+
+def case_save(rows, tmp, method):
+    data = [row for chunk in chunks(rows) for row in chunk_rows(chunk)]
+
+    def setup():
+        scraper = OddsScraper(cache_dir=None, aliases_path=None)
+        scraper.data = data
+        if method == 'csv':
+            return partial(scraper.save_to_csv, os.path.join(tmp, 'out', 'odds.csv'))
+        if method == 'shards':
+            # Minden futás üres mappába ír (a változatlan shardok kihagyása nélkül)
+            directory = tempfile.mkdtemp(dir=tmp)
+            return partial(write_shards, data, os.path.join(directory, 'odds.json'))
+        return partial(scraper.save_to_json, os.path.join(tmp, 'out', 'odds.json'), shards=False)
+    return setup
+
+
+CASES = {
+    'team_stats': case_team_stats,
+    'team_stats_np': partial(case_team_stats, engine='numpy'),
+    'football_data': case_football_data,
+    'live_margins': case_live_margins,
+    'save_csv': partial(case_save, method='csv'),
+    'save_json': partial(case_save, method='json'),
+    'save_shards': partial(case_save, method='shards'),
+}
+
+
+def measure(case, rows):
+    """
+    Egy eset mérése az aktuális folyamatban
+
+    Returns:
+        dict: {'seconds', 'peak_mb'}
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        setup = CASES[case](rows, tmp)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                func = setup()
+                start = time.perf_counter()
+                func()
+                seconds = time.perf_counter() - start
+
+                # Memória külön futásban (a tracemalloc lassítja a mért kódot)
+                func = setup()
+                tracemalloc.start()
+                func()
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+        finally:
+            getattr(setup, 'cleanup', lambda: None)()
+    return {'seconds': round(seconds, 4), 'peak_mb': round(peak / (1024 * 1024), 2)}
+
+
+def run_child(case, rows):
+    """Mérés külön folyamatban (tiszta memória állapot)"""
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', case, str(rows)],
+        capture_output=True, text=True, cwd=ROOT)
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr else 'ismeretlen hiba')
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+# --- Alapérték ---
+
+def load_baseline(path=BASELINE_PATH):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    """Az alapérték frissítése (a meglévő, most nem mért esetek megmaradnak)"""
+    baseline = load_baseline(path) or {'results': {}}
+    for case, sizes in results.items():
+        baseline['results'].setdefault(case, {}).update(sizes)
+    baseline['machine'] = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+    baseline['updated'] = datetime.now().isoformat(timespec='seconds')
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def compare(current, reference, time_tolerance=TIME_TOLERANCE, memory_tolerance=MEMORY_TOLERANCE):
+    """
+    Összehasonlítás az alapértékkel
+
+    Returns:
+        list: A regressziók leírásai (üres, ha nincs)
+    """
+    problems = []
+    if current['seconds'] > reference['seconds'] * (1 + time_tolerance) + TIME_SLACK:
+        problems.append(f"idő {reference['seconds']:.3f}s -> {current['seconds']:.3f}s")
+    if current['peak_mb'] > reference['peak_mb'] * (1 + memory_tolerance) + MEMORY_SLACK_MB:
+        problems.append(f"memória {reference['peak_mb']:.1f}MB -> {current['peak_mb']:.1f}MB")
+    return problems
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Teljesítmény mérés a fő útvonalakra")
+    parser.add_argument('--case', action='append', choices=sorted(CASES),
+                        help="csak a megadott eset(ek) (alapért.: mind)")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                        help="sorok száma vesszővel (10k..10M), alapért.: " + DEFAULT_SIZES)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="a mért értékek mentése alapértékként (nincs összehasonlítás)")
+    parser.add_argument('--time-tolerance', type=float, default=TIME_TOLERANCE)
+    parser.add_argument('--memory-tolerance', type=float, default=MEMORY_TOLERANCE)
+    parser.add_argument('--output', help="a mért értékek mentése JSON-ba")
+    parser.add_argument('--child', nargs=2, metavar=('ESET', 'SOROK'), help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.child:
+        print(json.dumps(measure(args.child[0], int(args.child[1]))))
+        return 0
+
+    cases = args.case or list(CASES)
+    sizes = [parse_size(value) for value in args.sizes.split(',') if value.strip()]
+    baseline = None if args.update_baseline else load_baseline(args.baseline)
+    reference = (baseline or {}).get('results', {})
+
+    print("⏱️  TELJESÍTMÉNY MÉRÉS")
+    print("=" * 84)
+    if baseline is None and not args.update_baseline:
+        print(f"⚠️  Nincs alapérték ({args.baseline}) - csak mérés; mentés: --update-baseline")
+    print(f"{'Eset':<16} {'Sorok':>7} {'Idő':>10} {'Csúcs mem.':>12} {'Alap idő':>10} {'Alap mem.':>11}  Állapot")
+    print("-" * 84)
+
+    results = {}
+    regressions = []
+    for case in cases:
+        for rows in sizes:
+            label = format_size(rows)
+            try:
+                current = run_child(case, rows)
+            except RuntimeError as e:
+                print(f"{case:<16} {label:>7} ❌ hiba: {e}")
+                regressions.append(f"{case} {label}: hiba ({e})")
+                continue
+            results.setdefault(case, {})[label] = current
+
+            expected = reference.get(case, {}).get(label)
+            status = '—'
+            base_time = base_memory = ''
+            if expected:
+                base_time = f"{expected['seconds']:.3f}s"
+                base_memory = f"{expected['peak_mb']:.1f}MB"
+                problems = compare(current, expected, args.time_tolerance, args.memory_tolerance)
+                status = '✅' if not problems else '❌ ' + ', '.join(problems)
+                if problems:
+                    regressions.append(f"{case} {label}: {', '.join(problems)}")
+            print(f"{case:<16} {label:>7} {current['seconds']:>9.3f}s {current['peak_mb']:>10.1f}MB "
+                  f"{base_time:>10} {base_memory:>11}  {status}")
+    print("=" * 84)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.update_baseline:
+        save_baseline(results, args.baseline)
+        print(f"💾 Alapérték mentve: {args.baseline}")
+        return 0
+
+    if regressions:
+        print(f"\n❌ REGRESSZIÓ ({len(regressions)}):")
+        for regression in regressions:
+            print(f"   {regression}")
+        return 1
+    print("\n✅ Nincs regresszió")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Odds kalibráció előszámítás (batch)
+Csapatonként, bajnokságonként és bookmakerenként számolja az implikált
+valószínűségek pontosságát:
+- kalibrációs vödrök (implikált vs. tényleges gyakoriság)
+- Brier pontszám és log-loss
+- esélyes találati arány
+Az eredmény egy kicsi összesítő JSON (data/calibration_summary.json).
+A generált minta sorok ('Simulated') kimaradnak.
+
+Inkrementális: az additív részösszegek egy állapot fájlban maradnak a
+bemenet feldolgozott sorainak számával és azok hash-ével (állandó méret);
+ha a bemenet eleje változatlan, csak az új sorok és az általuk érintett
+csoportok számolódnak újra, különben teljes újraszámolás.
+
+Csapat mérlegek (team_records): az odds-accuracy és home-advantage oldalak
+statisztikája ugyanabból a forrásból (data/adatokfoci.csv) és ugyanazzal a
+semleges pálya szűréssel, előszámítva (data/team_records.json).
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+
+import numpy as np
+
+from margin_engine import fair_probabilities, match_columns
+from results_index import is_api_row
+
+STATE_PATH = 'data/calibration_state.json'
+SUMMARY_PATH = 'data/calibration_summary.json'
+STATE_VERSION = 2
+
+RECORDS_SOURCE = 'data/adatokfoci.csv'
+RECORDS_PATH = 'data/team_records.json'
+
+# Kalibrációs vödrök száma (0-10%, 10-20%, ...)
+BUCKETS = 10
+
+# Additív részösszegek csoportonként (a vödrök ezek után: darab, p összeg, találat)
+MEASURES = ('matches', 'brier', 'log_loss', 'favourite_hits',
+            'wins', 'draws', 'losses', 'goals_for', 'goals_against')
+BUCKET_OFFSET = len(MEASURES)
+STATE_WIDTH = BUCKET_OFFSET + 3 * BUCKETS
+
+RESULT_CODES = {'H': 0, 'D': 1, 'A': 2}
+
+
+def prefix_digest(matches, count):
+    """Az első count mérkőzés tartalmának közös hash-e (a bemenet eleje változatlan-e)"""
+    hasher = hashlib.blake2b(digest_size=16)
+    for match in matches[:count]:
+        hasher.update(json.dumps(match, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+        hasher.update(b'\n')
+    return hasher.hexdigest()
+
+
+def _atomic_dump(path, data, **options):
+    """JSON írás ideiglenes fájlon és os.replace-en keresztül"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, **options)
+    os.replace(tmp_path, path)
+
+
+def _outcome(match):
+    result = match.get('result')
+    if result in RESULT_CODES:
+        return RESULT_CODES[result]
+    return -1
+
+
+def match_metrics(matches, method='proportional'):
+    """
+    Mérkőzésenkénti mérőszámok vektorizáltan
+
+    Returns:
+        dict: 'valid' maszk és (n,) / (n, 3) tömbök: probabilities, outcome,
+              brier, log_loss, favourite_hit, home_goals, away_goals
+    """
+    odds = match_columns(matches)
+    probabilities = fair_probabilities(odds, method)
+    outcome = np.array([_outcome(m) for m in matches], dtype=np.int64)
+    home_goals = np.array([m.get('home_goals') or 0 for m in matches], dtype=np.float64)
+    away_goals = np.array([m.get('away_goals') or 0 for m in matches], dtype=np.float64)
+
+    valid = np.isfinite(probabilities).all(axis=1) & (outcome >= 0)
+    probabilities = probabilities[valid]
+    outcome = outcome[valid]
+    rows = np.arange(len(outcome))
+
+    actual = np.zeros(probabilities.shape)
+    actual[rows, outcome] = 1.0
+    return {
+        'valid': valid,
+        'probabilities': probabilities,
+        'actual': actual,
+        'outcome': outcome,
+        'brier': ((probabilities - actual) ** 2).sum(axis=1),
+        'log_loss': -np.log(np.clip(probabilities[rows, outcome], 1e-15, 1.0)),
+        'favourite_hit': (np.argmax(probabilities, axis=1) == outcome).astype(np.float64),
+        'home_goals': home_goals[valid],
+        'away_goals': away_goals[valid],
+    }
+
+
+def _group_sums(labels, metrics, perspective=None):
+    """
+    Részösszegek csoportonként (np.bincount)
+
+    Args:
+        labels: (n,) csoport címkék
+        metrics: match_metrics kimenete (a címkékhez igazítva)
+        perspective: 'home' / 'away' csapat nézőpont a győzelem/gól mezőkhöz
+
+    Returns:
+        dict: címke -> STATE_WIDTH hosszú lista
+    """
+    if len(labels) == 0:
+        return {}
+    groups, inverse = np.unique(np.asarray(labels, dtype=str), return_inverse=True)
+    inverse = inverse.reshape(-1)
+    size = len(groups)
+    sums = np.zeros((size, STATE_WIDTH))
+
+    def add(column, weights):
+        sums[:, column] += np.bincount(inverse, weights=weights, minlength=size)
+
+    outcome = metrics['outcome']
+    add(0, None)
+    add(1, metrics['brier'])
+    add(2, metrics['log_loss'])
+    add(3, metrics['favourite_hit'])
+
+    if perspective == 'away':
+        won, lost = outcome == 2, outcome == 0
+        scored, conceded = metrics['away_goals'], metrics['home_goals']
+    else:
+        won, lost = outcome == 0, outcome == 2
+        scored, conceded = metrics['home_goals'], metrics['away_goals']
+    add(4, won.astype(np.float64))
+    add(5, (outcome == 1).astype(np.float64))
+    add(6, lost.astype(np.float64))
+    add(7, scored)
+    add(8, conceded)
+
+    # Kalibrációs vödrök: mindhárom kimenet valószínűsége külön megfigyelés
+    probabilities = metrics['probabilities']
+    bucket = np.minimum((probabilities * BUCKETS).astype(np.int64), BUCKETS - 1)
+    flat = (inverse[:, None] * BUCKETS + bucket).reshape(-1)
+    length = size * BUCKETS
+    counts = np.bincount(flat, minlength=length).reshape(size, BUCKETS)
+    prob_sums = np.bincount(flat, weights=probabilities.reshape(-1), minlength=length).reshape(size, BUCKETS)
+    hits = np.bincount(flat, weights=metrics['actual'].reshape(-1), minlength=length).reshape(size, BUCKETS)
+    sums[:, BUCKET_OFFSET::3] = counts
+    sums[:, BUCKET_OFFSET + 1::3] = prob_sums
+    sums[:, BUCKET_OFFSET + 2::3] = hits
+
+    return {label: row for label, row in zip(groups.tolist(), sums.tolist())}
+
+
+def _record(sums):
+    """Győzelem / döntetlen / vereség és gólok egy csapat nézőpontjából"""
+    return {
+        'matches': int(sums[0]), 'wins': int(sums[4]), 'draws': int(sums[5]), 'losses': int(sums[6]),
+        'goals_for': int(sums[7]), 'goals_against': int(sums[8]),
+    }
+
+
+def summarize(sums, home=None, away=None):
+    """
+    Egy csoport összesítője a részösszegekből
+
+    Args:
+        sums: A csoport részösszegei
+        home, away: Csapat csoportnál a hazai / vendég részösszegek
+    """
+    n = sums[0]
+    summary = {
+        'matches': int(n),
+        'brier': round(sums[1] / n, 4) if n else None,
+        'log_loss': round(sums[2] / n, 4) if n else None,
+        'favourite_hit_rate': round(sums[3] / n, 4) if n else None,
+    }
+    if home is not None or away is not None:
+        summary.update(_record(sums))
+        summary['home'] = _record(home or [0.0] * STATE_WIDTH)
+        summary['away'] = _record(away or [0.0] * STATE_WIDTH)
+    else:
+        summary.update({'home_wins': int(sums[4]), 'draws': int(sums[5]), 'away_wins': int(sums[6])})
+
+    # [vödör alsó határa, átlagos implikált p, tényleges gyakoriság, darab]
+    summary['calibration'] = [
+        [round(b / BUCKETS, 2),
+         round(sums[BUCKET_OFFSET + 3 * b + 1] / count, 4),
+         round(sums[BUCKET_OFFSET + 3 * b + 2] / count, 4),
+         int(count)]
+        for b in range(BUCKETS)
+        for count in (sums[BUCKET_OFFSET + 3 * b],)
+        if count
+    ]
+    return summary
+
+
+class CalibrationStore:
+    """
+    Inkrementális kalibráció: részösszegek + a bemenet feldolgozott eleje
+
+    Összesítő kulcsok: 'all', 'team:<név>', 'league:<név>', 'bookmaker:<név>'
+    A csapatok részösszegei hazai / vendég bontásban vannak az állapotban
+    ('home:<név>', 'away:<név>'), az összesítőben egyesítve.
+
+    A bemenet (pl. odds_data.json) új sorai a végére kerülnek; az állapot a
+    feldolgozott sorok számát és hash-ét tárolja (nem soronkénti azonosítót),
+    így mérete a bemenettel nem nő.
+    """
+
+    def __init__(self, state_path=STATE_PATH, summary_path=SUMMARY_PATH, method='proportional'):
+        self.state_path = state_path
+        self.summary_path = summary_path
+        self.method = method
+        self.groups = {}
+        self.processed = {'rows': 0, 'digest': prefix_digest([], 0)}
+        self.summary = {}
+        self.changed = False
+
+    def load(self):
+        """Állapot és korábbi összesítő betöltése (hiányzó / hibás: üres)"""
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('version') == STATE_VERSION and state.get('method') == self.method:
+                self.groups = state['groups']
+                self.processed = state['processed']
+        except (OSError, ValueError, KeyError):
+            self.groups = {}
+
+        if self.groups:
+            try:
+                with open(self.summary_path, 'r', encoding='utf-8') as f:
+                    self.summary = json.load(f).get('groups', {})
+            except (OSError, ValueError):
+                self.summary = {}
+        return self
+
+    def _reset(self):
+        self.groups, self.summary = {}, {}
+        self.processed = {'rows': 0, 'digest': prefix_digest([], 0)}
+        self.changed = True
+
+    def update(self, matches):
+        """
+        A bemenet még fel nem dolgozott (eredménnyel rendelkező) sorainak hozzáadása
+
+        Ha a korábban feldolgozott eleje megváltozott (átírt vagy rövidebb
+        bemenet), teljes újraszámolás. Az első függőben lévő sornál megáll:
+        az utána következők egy későbbi futásban kerülnek sorra.
+
+        Returns:
+            set: Az újraszámolt összesítő kulcsok
+        """
+        matches = [match for match in matches if is_api_row(match)]
+        start = self.processed['rows']
+        if start > len(matches) or prefix_digest(matches, start) != self.processed['digest']:
+            self._reset()
+            start = 0
+
+        end = start
+        while end < len(matches) and _outcome(matches[end]) >= 0:
+            end += 1
+        if end == start:
+            return set()
+
+        new = matches[start:end]
+        self.processed = {'rows': end, 'digest': prefix_digest(matches, end)}
+        self.changed = True
+
+        metrics = match_metrics(new, self.method)
+        valid = metrics['valid']
+        rows = [m for m, ok in zip(new, valid) if ok]
+
+        def field(name):
+            return [m.get(name) or 'Unknown' for m in rows]
+
+        partials = [
+            ('all', _group_sums(['all'] * len(rows), metrics)),
+            ('league', _group_sums(field('league'), metrics)),
+            ('bookmaker', _group_sums(field('bookmaker'), metrics)),
+            ('home', _group_sums(field('home_team'), metrics, 'home')),
+            ('away', _group_sums(field('away_team'), metrics, 'away')),
+        ]
+
+        touched = set()
+        for prefix, sums_by_label in partials:
+            for label, sums in sums_by_label.items():
+                key = 'all' if prefix == 'all' else f'{prefix}:{label}'
+                current = self.groups.get(key)
+                self.groups[key] = sums if current is None else [a + b for a, b in zip(current, sums)]
+                touched.add(key)
+
+        # Csak az érintett csoportok összesítője számolódik újra
+        summaries = set()
+        for key in touched:
+            prefix, _, label = key.partition(':')
+            if prefix in ('home', 'away'):
+                home = self.groups.get(f'home:{label}')
+                away = self.groups.get(f'away:{label}')
+                total = [a + b for a, b in zip(home or [0.0] * STATE_WIDTH, away or [0.0] * STATE_WIDTH)]
+                key = f'team:{label}'
+                self.summary[key] = summarize(total, home, away)
+            else:
+                self.summary[key] = summarize(self.groups[key])
+            summaries.add(key)
+        return summaries
+
+    def save(self):
+        """Állapot és összesítő mentése (tömör JSON, atomikus cserével)"""
+        _atomic_dump(self.state_path, {'version': STATE_VERSION, 'method': self.method,
+                                       'processed': self.processed, 'groups': self.groups},
+                     separators=(',', ':'))
+        _atomic_dump(self.summary_path, {'method': self.method, 'buckets': BUCKETS, 'groups': self.summary},
+                     ensure_ascii=False, separators=(',', ':'))
+        self.changed = False
+
+
+# --- Csapat mérlegek az oldalaknak (adatokfoci.csv) ---
+
+_LEADING_INT = re.compile(r'\s*([+-]?\d+)')
+
+
+def _parse_int(text):
+    """A JavaScript parseInt megfelelője: a vezető egész rész, különben None"""
+    found = _LEADING_INT.match(text or '')
+    return int(found.group(1)) if found else None
+
+
+def _empty_record():
+    return {'matches': 0, 'wins': 0, 'draws': 0, 'losses': 0, 'goals_for': 0, 'goals_against': 0}
+
+
+def _add_result(record, scored, conceded):
+    record['matches'] += 1
+    record['goals_for'] += scored
+    record['goals_against'] += conceded
+    record['wins' if scored > conceded else 'draws' if scored == conceded else 'losses'] += 1
+
+
+def team_records(csv_file=RECORDS_SOURCE):
+    """
+    Csapatonkénti győzelem / döntetlen / vereség és gólok a válogatott CSV-ből
+
+    Ugyanaz a feldolgozás, mint az oldalak calculateTeamStats függvényeiben
+    (vesszővel tagolt sorok, parseInt): 'teams' minden mérkőzésből
+    (odds-accuracy.html), 'home_away' a semleges pályás mérkőzések nélkül,
+    hazai / vendég bontásban (home-advantage.html).
+
+    Returns:
+        dict: 'source', 'matches', 'non_neutral_matches', 'teams', 'home_away'
+    """
+    with open(csv_file, 'r', encoding='utf-8', errors='replace') as f:
+        lines = f.read().strip().split('\n')[1:]
+
+    teams = {}
+    home_away = {}
+    matches = non_neutral = 0
+    for line in lines:
+        parts = [part.strip() for part in line.split(',')]
+        if len(parts) < 5:
+            continue
+        home, away = parts[1], parts[2]
+        home_score, away_score = _parse_int(parts[3]), _parse_int(parts[4])
+        if not home or not away or home_score is None or away_score is None:
+            continue
+        matches += 1
+        _add_result(teams.setdefault(home, _empty_record()), home_score, away_score)
+        _add_result(teams.setdefault(away, _empty_record()), away_score, home_score)
+
+        # Semleges pályán nincs hazai előny
+        if len(parts) > 6 and parts[6] == 'TRUE':
+            continue
+        non_neutral += 1
+        for team in (home, away):
+            home_away.setdefault(team, {'home': _empty_record(), 'away': _empty_record()})
+        _add_result(home_away[home]['home'], home_score, away_score)
+        _add_result(home_away[away]['away'], away_score, home_score)
+
+    return {
+        'source': csv_file,
+        'matches': matches,
+        'non_neutral_matches': non_neutral,
+        'teams': dict(sorted(teams.items())),
+        'home_away': dict(sorted(home_away.items())),
+    }
+
+
+def write_team_records(csv_file=RECORDS_SOURCE, path=RECORDS_PATH):
+    """A csapat mérlegek mentése (tömör JSON, atomikus cserével)"""
+    records = team_records(csv_file)
+    _atomic_dump(path, records, ensure_ascii=False, separators=(',', ':'))
+    return records
+
+
+def update_calibration(matches, full=False, method='proportional',
+                       state_path=STATE_PATH, summary_path=SUMMARY_PATH):
+    """
+    Kalibrációs összesítő frissítése
+
+    Args:
+        matches: Mérkőzés dict-ek (OddsScraper séma)
+        full: Teljes újraszámolás a korábbi állapot figyelmen kívül hagyásával
+        method: A margin eltávolítás módszere (lásd margin_engine)
+
+    Returns:
+        set: Az újraszámolt csoportok
+    """
+    store = CalibrationStore(state_path, summary_path, method)
+    if not full:
+        store.load()
+    touched = store.update(matches)
+    if touched or full or store.changed:
+        store.save()
+    return touched
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Odds kalibráció előszámítás")
+    parser.add_argument('--input', default='data/odds_data.json', help="OddsScraper JSON kimenet")
+    parser.add_argument('--full', action='store_true', help="teljes újraszámolás")
+    parser.add_argument('--method', default='proportional', help="margin eltávolítás módszere")
+    parser.add_argument('--records-source', default=RECORDS_SOURCE,
+                        help="a csapat mérlegek forrása (odds-accuracy / home-advantage oldalak)")
+    args = parser.parse_args()
+
+    print("🎯 KALIBRÁCIÓ ELŐSZÁMÍTÁS")
+    print("=" * 60)
+
+    if os.path.exists(args.records_source):
+        records = write_team_records(args.records_source, RECORDS_PATH)
+        print(f"🏠 Csapat mérlegek: {len(records['teams'])} csapat, {records['matches']} mérkőzés "
+              f"({records['non_neutral_matches']} nem semleges) -> {RECORDS_PATH}")
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        matches = json.load(f)
+
+    touched = update_calibration(matches, full=args.full, method=args.method)
+    if not touched:
+        print("✅ Nincs új lejátszott mérkőzés, az összesítő naprakész")
+        return
+
+    with open(SUMMARY_PATH, 'r', encoding='utf-8') as f:
+        summary = json.load(f)['groups']
+    overall = summary.get('all', {})
+    print(f"📊 Újraszámolt csoportok: {len(touched)} / {len(summary)}")
+    print(f"   Mérkőzések: {overall.get('matches')}")
+    print(f"   Brier: {overall.get('brier')} | Log-loss: {overall.get('log_loss')} | "
+          f"Esélyes találat: {overall.get('favourite_hit_rate')}")
+    print(f"💾 {SUMMARY_PATH} ({os.path.getsize(SUMMARY_PATH) / 1024:.1f} KB)")
+
+
+if __name__ == "__main__":
+    main()
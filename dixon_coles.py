@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dixon-Coles mérkőzés modell (támadás / védekezés Poisson, időbeli lecsengéssel)
+- Vektorizált log-likelihood az összes mérkőzésre egyszerre (numpy)
+- Fisher scoring illesztés (teljes információs mátrix) és Newton lépés
+  rho-ra; a paraméterek cache-ben maradnak, így a napi újraillesztés a
+  korábbi megoldásból indul és néhány iterációban konvergál
+- Teljes eredmény rács (0-0 ... N-N) egy egész fixture listára egy menetben
+"""
+
+import argparse
+import json
+import os
+from datetime import date
+
+import numpy as np
+
+from rolling_form import international_matches, scraper_matches
+from synthetic import poisson_pmf
+
+MODEL_PATH = 'data/dixon_coles.json'
+MODEL_VERSION = 1
+
+# Időbeli lecsengés napi rátája (Dixon-Coles 1997: 0.0065 / fél hét)
+DEFAULT_XI = 0.0019
+MAX_GOALS = 10
+# Gyenge zsugorítás a támadás / védekezés paraméterekre (kevés meccses csapatok)
+DEFAULT_RIDGE = 0.5
+
+
+def decay_weights(ordinals, reference, xi=DEFAULT_XI):
+    """Exponenciális időbeli súlyok: exp(-xi * eltelt napok)"""
+    return np.exp(-xi * np.maximum(reference - np.asarray(ordinals, dtype=np.float64), 0.0))
+
+
+def tau(home_goals, away_goals, home_rates, away_rates, rho):
+    """
+    Dixon-Coles korrekció az alacsony eredményekre (0-0, 0-1, 1-0, 1-1)
+
+    Returns:
+        tuple: (tau, d log tau / d log lambda, d log tau / d log mu, d log tau / d rho)
+    """
+    lam_mu = home_rates * away_rates
+    x0, x1 = home_goals == 0, home_goals == 1
+    y0, y1 = away_goals == 0, away_goals == 1
+    c00, c01, c10, c11 = x0 & y0, x0 & y1, x1 & y0, x1 & y1
+
+    value = np.ones_like(home_rates)
+    d_rho = np.zeros_like(home_rates)
+    d_lam = np.zeros_like(home_rates)
+    d_mu = np.zeros_like(home_rates)
+
+    value[c00] = 1.0 - lam_mu[c00] * rho
+    d_rho[c00] = -lam_mu[c00]
+    d_lam[c00] = -lam_mu[c00] * rho
+    d_mu[c00] = -lam_mu[c00] * rho
+    value[c01] = 1.0 + home_rates[c01] * rho
+    d_rho[c01] = home_rates[c01]
+    d_lam[c01] = home_rates[c01] * rho
+    value[c10] = 1.0 + away_rates[c10] * rho
+    d_rho[c10] = away_rates[c10]
+    d_mu[c10] = away_rates[c10] * rho
+    value[c11] = 1.0 - rho
+    d_rho[c11] = -1.0
+
+    return value, d_lam / value, d_mu / value, d_rho / value
+
+
+def rho_bounds(home_rates, away_rates):
+    """A rho tartomány, amelyben minden tau pozitív"""
+    low = max(-1.0 / home_rates.max(), -1.0 / away_rates.max())
+    high = min(1.0 / (home_rates * away_rates).max(), 1.0)
+    return 0.99 * low, 0.99 * high
+
+
+class DixonColesModel:
+    """
+    Dixon-Coles modell
+
+    log lambda (hazai gól várható értéke) = szint + támadás[hazai] + védekezés[vendég] + hazai előny
+    log mu (vendég gól várható értéke)    = szint + támadás[vendég] + védekezés[hazai]
+
+    Használat:
+        model = DixonColesModel.load()
+        model.fit(international_matches())
+        model.save()
+        model.score_grids([('Hungary', 'Germany')])
+    """
+
+    def __init__(self, xi=DEFAULT_XI, ridge=DEFAULT_RIDGE, max_goals=MAX_GOALS):
+        """
+        Args:
+            xi: Időbeli lecsengés napi rátája (0 = nincs lecsengés)
+            ridge: Zsugorítás erőssége a támadás / védekezés paraméterekre
+            max_goals: Az eredmény rács mérete (0..max_goals)
+        """
+        self.xi = xi
+        self.ridge = ridge
+        self.max_goals = max_goals
+        self.teams = []
+        self.attack = np.zeros(0)
+        self.defence = np.zeros(0)
+        self.level = 0.0
+        self.home = 0.0
+        self.rho = 0.0
+        self.reference = None
+        self.iterations = 0
+        self.log_likelihood_value = None
+
+    def _team_ids(self, names, extend=False):
+        """Csapat nevek -> indexek (extend=True: új csapatok felvétele 0 paraméterrel)"""
+        index = {team: i for i, team in enumerate(self.teams)}
+        ids = np.empty(len(names), dtype=np.int64)
+        for position, name in enumerate(names):
+            team_id = index.get(name)
+            if team_id is None:
+                if not extend:
+                    raise KeyError(f"Ismeretlen csapat: {name}")
+                team_id = index[name] = len(self.teams)
+                self.teams.append(name)
+            ids[position] = team_id
+        if extend and len(self.teams) > len(self.attack):
+            missing = len(self.teams) - len(self.attack)
+            self.attack = np.concatenate([self.attack, np.zeros(missing)])
+            self.defence = np.concatenate([self.defence, np.zeros(missing)])
+        return ids
+
+    def rates(self, home_ids, away_ids):
+        """Várható gólok (lambda, mu) index tömbökre"""
+        home_rates = np.exp(self.level + self.attack[home_ids] + self.defence[away_ids] + self.home)
+        away_rates = np.exp(self.level + self.attack[away_ids] + self.defence[home_ids])
+        return home_rates, away_rates
+
+    def log_likelihood(self, home_ids, away_ids, home_goals, away_goals, weights):
+        """Súlyozott log-likelihood (a faktoriális konstans nélkül), vektorizáltan"""
+        home_rates, away_rates = self.rates(home_ids, away_ids)
+        value = tau(home_goals, away_goals, home_rates, away_rates, self.rho)[0]
+        terms = (np.log(value) + home_goals * np.log(home_rates) - home_rates
+                 + away_goals * np.log(away_rates) - away_rates)
+        penalty = 0.5 * self.ridge * (self.attack @ self.attack + self.defence @ self.defence)
+        return float(weights @ terms - penalty)
+
+    def fit(self, matches, reference=None, tol=1e-6, max_iter=100, warm=True):
+        """
+        Illesztés maximum likelihood alapján
+
+        Args:
+            matches: (nap, hazai, vendég, hazai gól, vendég gól, ...) sorok
+                     (lásd rolling_form.international_matches / scraper_matches)
+            reference: A lecsengés referencia napja (alapért.: utolsó mérkőzés)
+            tol: Konvergencia küszöb a paraméter lépésekre
+            max_iter: Maximális iteráció szám
+            warm: A meglévő paraméterekből indul (False: nulláról)
+
+        Returns:
+            int: Az iterációk száma
+        """
+        if not matches:
+            raise ValueError("Nincs illeszthető mérkőzés")
+        if not warm:
+            self.teams, self.attack, self.defence = [], np.zeros(0), np.zeros(0)
+            self.level = self.home = self.rho = 0.0
+
+        ordinals = np.array([m[0] for m in matches], dtype=np.float64)
+        home_ids = self._team_ids([m[1] for m in matches], extend=True)
+        away_ids = self._team_ids([m[2] for m in matches], extend=True)
+        home_goals = np.array([m[3] for m in matches], dtype=np.float64)
+        away_goals = np.array([m[4] for m in matches], dtype=np.float64)
+        self.reference = int(reference if reference is not None else ordinals.max())
+        weights = decay_weights(ordinals, self.reference, self.xi)
+        n_teams = len(self.teams)
+
+        # Paraméter vektor: támadás (n), védekezés (n), szint, hazai előny
+        size = 2 * n_teams + 2
+        lam_columns = np.column_stack([home_ids, n_teams + away_ids,
+                                       np.full_like(home_ids, 2 * n_teams),
+                                       np.full_like(home_ids, 2 * n_teams + 1)])
+        mu_columns = np.column_stack([away_ids, n_teams + home_ids,
+                                      np.full_like(home_ids, 2 * n_teams)])
+        diagonal = np.arange(2 * n_teams)
+
+        def objective():
+            return self.log_likelihood(home_ids, away_ids, home_goals, away_goals, weights)
+
+        def set_params(theta):
+            self.attack = theta[:n_teams].copy()
+            self.defence = theta[n_teams:2 * n_teams].copy()
+            self.level, self.home = float(theta[-2]), float(theta[-1])
+
+        current = objective()
+        for iteration in range(1, max_iter + 1):
+            # Fisher scoring: a Poisson rész log linkkel, így az információs
+            # mátrix a (tau nélküli) Hesse-mátrix; ~600 paraméternél olcsó
+            home_rates, away_rates = self.rates(home_ids, away_ids)
+            _, d_lam, d_mu, d_rho = tau(home_goals, away_goals, home_rates, away_rates, self.rho)
+            g_lam = weights * (home_goals - home_rates + d_lam)
+            g_mu = weights * (away_goals - away_rates + d_mu)
+            i_lam = weights * home_rates
+            i_mu = weights * away_rates
+
+            gradient = np.zeros(size)
+            fisher = np.zeros(size * size)
+            for columns, g, info in ((lam_columns, g_lam, i_lam), (mu_columns, g_mu, i_mu)):
+                for j in range(columns.shape[1]):
+                    gradient += np.bincount(columns[:, j], weights=g, minlength=size)
+                    for k in range(columns.shape[1]):
+                        fisher += np.bincount(columns[:, j] * size + columns[:, k],
+                                              weights=info, minlength=size * size)
+            fisher = fisher.reshape(size, size)
+            theta = np.concatenate([self.attack, self.defence, [self.level, self.home]])
+            gradient[diagonal] -= self.ridge * theta[diagonal]
+            fisher[diagonal, diagonal] += self.ridge
+            step = np.linalg.solve(fisher, gradient)
+
+            # Lépés felezés, ha a tau tagok miatt a likelihood nem nőne
+            scale = 1.0
+            while True:
+                set_params(theta + scale * step)
+                candidate = objective()
+                if candidate >= current - 1e-9 or scale < 1e-3:
+                    break
+                scale *= 0.5
+            current = candidate
+            largest = scale * np.abs(step).max()
+
+            # rho: a log tau rho-ban pontosan ismert görbületű (Newton)
+            home_rates, away_rates = self.rates(home_ids, away_ids)
+            d_rho = tau(home_goals, away_goals, home_rates, away_rates, self.rho)[3]
+            curvature = weights @ (d_rho * d_rho)
+            if curvature > 0:
+                low, high = rho_bounds(home_rates, away_rates)
+                new_rho = min(max(self.rho + (weights @ d_rho) / curvature, low), high)
+                largest = max(largest, abs(new_rho - self.rho))
+                self.rho = new_rho
+                current = objective()
+
+            if largest < tol:
+                break
+
+        self.iterations = iteration
+        self.log_likelihood_value = current
+        return iteration
+
+    def fixture_rates(self, fixtures):
+        """
+        Várható gólok egy fixture listára
+
+        Args:
+            fixtures: (hazai, vendég) párok; ismeretlen csapat átlagos erősségű
+
+        Returns:
+            tuple: (lambda, mu) tömbök
+        """
+        index = {team: i for i, team in enumerate(self.teams)}
+        attack = np.append(self.attack, 0.0)
+        defence = np.append(self.defence, 0.0)
+        unknown = len(self.teams)
+        home_ids = np.array([index.get(home, unknown) for home, _ in fixtures], dtype=np.int64)
+        away_ids = np.array([index.get(away, unknown) for _, away in fixtures], dtype=np.int64)
+        home_rates = np.exp(self.level + attack[home_ids] + defence[away_ids] + self.home)
+        away_rates = np.exp(self.level + attack[away_ids] + defence[home_ids])
+        return home_rates, away_rates
+
+    def score_grids(self, fixtures, max_goals=None):
+        """
+        Eredmény valószínűség rácsok egy teljes fixture listára egyszerre
+
+        Returns:
+            np.ndarray: (fixture, hazai gól, vendég gól) alakú tömb
+        """
+        max_goals = max_goals or self.max_goals
+        home_rates, away_rates = self.fixture_rates(fixtures)
+        grids = poisson_pmf(home_rates, max_goals)[:, :, None] * poisson_pmf(away_rates, max_goals)[:, None, :]
+
+        # Dixon-Coles korrekció a négy alacsony eredményre
+        rho = self.rho
+        grids[:, 0, 0] *= 1.0 - home_rates * away_rates * rho
+        grids[:, 0, 1] *= 1.0 + home_rates * rho
+        grids[:, 1, 0] *= 1.0 + away_rates * rho
+        grids[:, 1, 1] *= 1.0 - rho
+        return grids / grids.sum(axis=(1, 2), keepdims=True)
+
+    def outcome_probabilities(self, fixtures):
+        """
+        Hazai győzelem / döntetlen / vendég győzelem valószínűségek
+
+        Returns:
+            np.ndarray: (fixture, 3) tömb
+        """
+        grids = self.score_grids(fixtures)
+        return np.column_stack([
+            np.tril(grids, -1).sum(axis=(1, 2)),
+            np.trace(grids, axis1=1, axis2=2),
+            np.triu(grids, 1).sum(axis=(1, 2)),
+        ])
+
+    def ratings(self):
+        """Csapatonkénti (támadás, védekezés) paraméterek"""
+        return {team: (float(a), float(d)) for team, a, d in zip(self.teams, self.attack, self.defence)}
+
+    # --- Fájl ---
+
+    def to_dict(self):
+        return {
+            'version': MODEL_VERSION,
+            'xi': self.xi,
+            'ridge': self.ridge,
+            'max_goals': self.max_goals,
+            'level': self.level,
+            'home': self.home,
+            'rho': self.rho,
+            'reference': self.reference,
+            'iterations': self.iterations,
+            'teams': {team: [float(a), float(d)] for team, a, d in zip(self.teams, self.attack, self.defence)},
+        }
+
+    def save(self, path=MODEL_PATH):
+        """Paraméterek mentése (ideiglenes fájlon keresztül, atomikusan)"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=MODEL_PATH, **options):
+        """
+        Cache-elt paraméterek betöltése (hiányzó / hibás fájl vagy eltérő
+        xi / ridge esetén üres modell)
+        """
+        model = cls(**options)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return model
+        if (data.get('version') != MODEL_VERSION or data.get('xi') != model.xi
+                or data.get('ridge') != model.ridge):
+            return model
+
+        model.teams = list(data['teams'])
+        params = np.array(list(data['teams'].values()), dtype=np.float64).reshape(-1, 2)
+        model.attack, model.defence = params[:, 0].copy(), params[:, 1].copy()
+        model.level, model.home, model.rho = data['level'], data['home'], data['rho']
+        model.reference, model.iterations = data['reference'], data['iterations']
+        return model
+
+
+def fit_model(matches, path=MODEL_PATH, full=False, **options):
+    """
+    Modell illesztése a cache-elt paraméterekből indulva, majd mentés
+
+    Returns:
+        DixonColesModel
+    """
+    model = DixonColesModel(**options) if full else DixonColesModel.load(path, **options)
+    model.fit(matches, warm=not full)
+    model.save(path)
+    return model
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Dixon-Coles mérkőzés modell")
+    parser.add_argument('--input', default='data/adatokfoci.csv',
+                        help="adatokfoci.csv vagy OddsScraper JSON (.json)")
+    parser.add_argument('--xi', type=float, default=DEFAULT_XI, help="időbeli lecsengés (1/nap)")
+    parser.add_argument('--full', action='store_true', help="illesztés nulláról (cache nélkül)")
+    parser.add_argument('--fixture', action='append', default=[], metavar='HAZAI:VENDÉG',
+                        help="előrejelzés egy párosításra (többször is megadható)")
+    parser.add_argument('--model', default=MODEL_PATH)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    print("🎲 DIXON-COLES MODELL")
+    print("=" * 60)
+    if args.input.endswith('.json'):
+        with open(args.input, 'r', encoding='utf-8') as f:
+            matches = scraper_matches(json.load(f))
+    else:
+        matches = international_matches(args.input)
+    if not matches:
+        print("❌ Nincs feldolgozható adat!")
+        return
+
+    model = fit_model(matches, args.model, full=args.full, xi=args.xi)
+    print(f"📊 Mérkőzések: {len(matches)} | Csapatok: {len(model.teams)} | "
+          f"Iterációk: {model.iterations}")
+    print(f"   Referencia nap: {date.fromordinal(model.reference).isoformat()}")
+    print(f"   Hazai előny: {np.exp(model.home):.3f}x | rho: {model.rho:.4f} | "
+          f"log-likelihood: {model.log_likelihood_value:.1f}")
+
+    strength = sorted(model.ratings().items(), key=lambda item: item[1][0] - item[1][1], reverse=True)
+    print(f"\n🏆 Legerősebb csapatok (támadás - védekezés):")
+    for team, (attack, defence) in strength[:10]:
+        print(f"   {team:<25} támadás {attack:+.3f}  védekezés {defence:+.3f}")
+
+    fixtures = [tuple(part.strip() for part in value.split(':', 1)) for value in args.fixture if ':' in value]
+    if fixtures:
+        probabilities = model.outcome_probabilities(fixtures)
+        grids = model.score_grids(fixtures)
+        print(f"\n🔮 Előrejelzések:")
+        for (home, away), (p_home, p_draw, p_away), grid in zip(fixtures, probabilities, grids):
+            best = np.unravel_index(np.argmax(grid), grid.shape)
+            print(f"   {home} - {away}: H {p_home:.1%} | D {p_draw:.1%} | V {p_away:.1%} "
+                  f"(legvalószínűbb: {best[0]}-{best[1]}, {grid[best]:.1%})")
+
+    print(f"\n💾 Paraméterek: {args.model}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Inkrementális Elo értékelés a válogatott mérkőzésekre (adatokfoci.csv)
+- Egyetlen menet dátum sorrendben, a K szorzó a Bajnoksag oszlop szerint
+  (világbajnokság > kontinens torna > selejtező > egyéb torna > barátságos)
+- Csapatonként rendezett értékelés történet: "X értékelése D napon"
+  bináris kereséssel (bisect)
+- Checkpoint: új sorok hozzáfűzésekor csak azok dolgozódnak fel, a teljes
+  történet újrajátszása nélkül; az értékelés történet külön JSON Lines
+  fájlba kerül, amelyhez frissítéskor csak az új sorok fűződnek hozzá
+"""
+
+import argparse
+import json
+import os
+from array import array
+from bisect import bisect_right
+from datetime import date, datetime
+
+from rolling_form import parse_international_date
+from scraper import (detect_encoding, iter_csv_rows, last_line_end, prefix_fingerprint,
+                     prefix_matches, save_checkpoint)
+
+ELO_PATH = 'data/elo_ratings.json'
+ELO_VERSION = 2
+
+INITIAL_RATING = 1500.0
+HOME_ADVANTAGE = 100.0
+
+# Bajnokság -> K szorzó (eloratings.net alapján); az első illeszkedő
+# szabály érvényes, a 'qualification' a torna neve előtt dönt
+COMPETITION_WEIGHTS = (
+    ('qualification', 40),
+    ('FIFA World Cup', 60),
+    ('UEFA Euro', 50),
+    ('Copa América', 50),
+    ('African Cup of Nations', 50),
+    ('AFC Asian Cup', 50),
+    ('Gold Cup', 50),
+    ('Oceania Nations Cup', 50),
+    ('Confederations Cup', 50),
+    ('Nations League', 40),
+    ('Friendly', 20),
+)
+DEFAULT_WEIGHT = 30
+
+_weights = {}
+
+
+def competition_weight(competition):
+    """K szorzó egy bajnokság névhez (cache-elve)"""
+    weight = _weights.get(competition)
+    if weight is None:
+        lowered = competition.lower()
+        weight = next((k for pattern, k in COMPETITION_WEIGHTS if pattern.lower() in lowered),
+                      DEFAULT_WEIGHT)
+        _weights[competition] = weight
+    return weight
+
+
+def goal_multiplier(goal_difference):
+    """Gólkülönbség szorzó: 1 gól: 1, 2 gól: 1.5, 3+ gól: (11 + N) / 8"""
+    goal_difference = abs(goal_difference)
+    if goal_difference <= 1:
+        return 1.0
+    if goal_difference == 2:
+        return 1.5
+    return (11.0 + goal_difference) / 8.0
+
+
+def expected_score(rating_difference):
+    """A hazai csapat várható pontszáma (0-1) a (hazai - vendég) különbségből"""
+    return 1.0 / (10.0 ** (-rating_difference / 400.0) + 1.0)
+
+
+class EloEngine:
+    """
+    Elo értékelések dátum szerint rendezett mérkőzés folyamon
+
+    Használat:
+        engine = EloEngine()
+        engine.add(ordinal, 'Hungary', 'Germany', 1, 0, 'UEFA Nations League')
+        engine.rating('Hungary', date(2024, 1, 1))
+    """
+
+    def __init__(self, initial=INITIAL_RATING, home_advantage=HOME_ADVANTAGE):
+        self.initial = initial
+        self.home_advantage = home_advantage
+        self.ratings = {}
+        # csapat -> (napok, értékelések) párhuzamos tömbök, nap szerint rendezve
+        self.history = {}
+        self.last_ordinal = None
+        self.matches = 0
+
+    def _record(self, team, ordinal, rating):
+        entry = self.history.get(team)
+        if entry is None:
+            entry = self.history[team] = (array('l'), array('d'))
+        days, ratings = entry
+        days.append(ordinal)
+        ratings.append(rating)
+
+    def add(self, ordinal, home, away, home_goals, away_goals, competition='', neutral=False):
+        """
+        Egy mérkőzés feldolgozása
+
+        Args:
+            ordinal: A mérkőzés napja (date.toordinal); nem lehet korábbi
+                     az eddig feldolgozottaknál
+            competition: Bajnokság név (a K szorzóhoz)
+            neutral: Semleges pálya (nincs hazai előny)
+
+        Returns:
+            float: A hazai csapat értékelésének változása
+        """
+        if self.last_ordinal is not None and ordinal < self.last_ordinal:
+            raise ValueError(f"A mérkőzések nincsenek dátum szerint rendezve: "
+                             f"{date.fromordinal(ordinal)} < {date.fromordinal(self.last_ordinal)}")
+        self.last_ordinal = ordinal
+        self.matches += 1
+
+        home_rating = self.ratings.get(home, self.initial)
+        away_rating = self.ratings.get(away, self.initial)
+        advantage = 0.0 if neutral else self.home_advantage
+        expected = expected_score(home_rating + advantage - away_rating)
+        if home_goals > away_goals:
+            actual = 1.0
+        elif home_goals == away_goals:
+            actual = 0.5
+        else:
+            actual = 0.0
+
+        change = (competition_weight(competition) * goal_multiplier(home_goals - away_goals)
+                  * (actual - expected))
+        self.ratings[home] = home_rating + change
+        self.ratings[away] = away_rating - change
+        self._record(home, ordinal, home_rating + change)
+        self._record(away, ordinal, away_rating - change)
+        return change
+
+    def extend(self, matches):
+        """(nap, hazai, vendég, hazai gól, vendég gól, bajnokság, semleges) sorok"""
+        for match in matches:
+            self.add(*match)
+        return self
+
+    def rating(self, team, on=None):
+        """
+        Egy csapat értékelése egy nap végén (bináris keresés a történetben)
+
+        Args:
+            team: Csapat név
+            on: Nap (date vagy napszám; None = jelenlegi)
+
+        Returns:
+            float: Az értékelés (az első mérkőzés előtt a kezdő érték),
+                   ismeretlen csapatnál None
+        """
+        if team not in self.history:
+            return None
+        if on is None:
+            return self.ratings[team]
+        ordinal = on if isinstance(on, int) else on.toordinal()
+        days, ratings = self.history[team]
+        position = bisect_right(days, ordinal)
+        return ratings[position - 1] if position else self.initial
+
+    def ranking(self, on=None, top=None, min_matches=1):
+        """
+        Csapatok értékelés szerint csökkenő sorrendben
+
+        Returns:
+            list: (csapat, értékelés) párok
+        """
+        ordinal = None if on is None else (on if isinstance(on, int) else on.toordinal())
+        ranked = []
+        for team, (days, _) in self.history.items():
+            played = len(days) if ordinal is None else bisect_right(days, ordinal)
+            if played >= min_matches:
+                ranked.append((team, self.rating(team, ordinal)))
+        ranked.sort(key=lambda item: item[1], reverse=True)
+        return ranked[:top] if top else ranked
+
+    def predict(self, home, away, neutral=False, on=None):
+        """A hazai csapat várható pontszáma (győzelem 1, döntetlen 0.5)"""
+        home_rating = self.rating(home, on) or self.initial
+        away_rating = self.rating(away, on) or self.initial
+        return expected_score(home_rating + (0.0 if neutral else self.home_advantage) - away_rating)
+
+    def history_lengths(self):
+        """Csapatonkénti történet hosszak (a history_rows() kezdőpontjához)"""
+        return {team: len(days) for team, (days, _) in self.history.items()}
+
+    def history_rows(self, since=None):
+        """
+        Értékelés történet sorok, csapatonként nap szerint rendezve
+
+        Args:
+            since: history_lengths() kimenet; csak az azóta rögzített sorok
+
+        Yields:
+            tuple: (csapat, nap, értékelés)
+        """
+        since = since or {}
+        for team, (days, ratings) in self.history.items():
+            for index in range(since.get(team, 0), len(days)):
+                yield team, days[index], ratings[index]
+
+    def add_history_row(self, team, ordinal, rating):
+        """Egy mentett történet sor visszatöltése (a csapat sorai nap szerint rendezve)"""
+        self._record(team, ordinal, rating)
+        self.ratings[team] = rating
+
+    def to_dict(self, include_history=True):
+        data = {
+            'initial': self.initial,
+            'home_advantage': self.home_advantage,
+            'last_ordinal': self.last_ordinal,
+            'matches': self.matches,
+        }
+        if include_history:
+            data['history'] = {team: [days.tolist(), ratings.tolist()]
+                               for team, (days, ratings) in self.history.items()}
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        engine = cls(data['initial'], data['home_advantage'])
+        engine.last_ordinal = data['last_ordinal']
+        engine.matches = data['matches']
+        for team, (days, ratings) in data.get('history', {}).items():
+            engine.history[team] = (array('l', days), array('d', ratings))
+            engine.ratings[team] = ratings[-1]
+        return engine
+
+
+def international_rows(rows):
+    """
+    adatokfoci.csv sorok -> EloEngine.add argumentumok
+
+    Yields:
+        tuple: (nap, hazai, vendég, hazai gól, vendég gól, bajnokság, semleges)
+    """
+    for row in rows:
+        if len(row) < 5:
+            continue
+        ordinal = parse_international_date(row[0])
+        try:
+            home_goals, away_goals = int(row[3]), int(row[4])
+        except ValueError:
+            continue  # fejléc vagy hibás sor
+        home, away = row[1].strip(), row[2].strip()
+        if ordinal is None or not home or not away:
+            continue
+        competition = row[5].strip() if len(row) > 5 else ''
+        neutral = len(row) > 6 and row[6].strip().upper() == 'TRUE'
+        yield ordinal, home, away, home_goals, away_goals, competition, neutral
+
+
+def history_path(state_path):
+    """A történet fájl a checkpoint mellett: data/elo_ratings.history.jsonl"""
+    base, _ = os.path.splitext(state_path)
+    return f"{base}.history.jsonl"
+
+
+def _history_lines(rows):
+    return b''.join(json.dumps(row, ensure_ascii=False).encode('utf-8') + b'\n' for row in rows)
+
+
+def read_history(path, length, engine):
+    """
+    A történet fájl első length bájtjának visszatöltése a motorba
+
+    A length utáni rész egy félbeszakadt futás maradéka, nem olvasódik be.
+
+    Returns:
+        bool: False, ha a fájl hiányzik, rövidebb a vártnál vagy sérült
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read(length)
+    except OSError:
+        return False
+    if len(data) != length:
+        return False
+    try:
+        for line in data.splitlines():
+            engine.add_history_row(*json.loads(line))
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def write_history(path, engine):
+    """A teljes történet kiírása (ideiglenes fájlon keresztül); visszaadja a hosszát"""
+    data = _history_lines(engine.history_rows())
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return len(data)
+
+
+def append_history(path, rows, length):
+    """
+    Új történet sorok hozzáfűzése a checkpointban rögzített length után
+
+    Egy korábbi, checkpoint mentés előtt félbeszakadt hozzáfűzés maradékát
+    előbb levágja. Visszaadja az új hosszt.
+    """
+    data = _history_lines(rows)
+    with open(path, 'r+b') as f:
+        f.truncate(length)
+        f.seek(length)
+        f.write(data)
+    return length + len(data)
+
+
+def load_state(path):
+    """Elo checkpoint betöltése; hiba esetén None"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if state.get('version') != ELO_VERSION:
+        return None
+    return state
+
+
+def update_elo(csv_file='data/adatokfoci.csv', state_path=ELO_PATH, force_full=False):
+    """
+    Elo értékelések inkrementális frissítése
+
+    A checkpoint tárolja a feldolgozott bájt pozíciót, a feldolgozott rész
+    ujjlenyomatát (scraper.prefix_fingerprint) és a történet fájl hosszát.
+    Csak a hozzáfűzött sorok dolgozódnak fel, és csak az új értékelés sorok
+    fűződnek a történet fájlhoz; ha a korábbi rész megváltozott, vagy egy új
+    sor a már feldolgozottaknál korábbi napra esik, teljes újraszámolás
+    történik (és a történet fájl is újraíródik).
+
+    Returns:
+        EloEngine: A frissített motor, vagy None hiba esetén
+    """
+    try:
+        size = os.path.getsize(csv_file)
+    except OSError:
+        print(f"❌ HIBA: A fájl nem található: {csv_file}")
+        return None
+    complete_end = last_line_end(csv_file, size)
+
+    history_file = history_path(state_path)
+    state = None if force_full else load_state(state_path)
+    if state is not None and (state.get('csv_file') != os.path.abspath(csv_file)
+                              or state['offset'] > complete_end
+                              or not prefix_matches(csv_file, state['fingerprint'])):
+        print("⚠️  A korábban feldolgozott rész megváltozott, teljes újraszámolás")
+        state = None
+
+    if state is not None:
+        engine = EloEngine.from_dict(state['engine'])
+        if not read_history(history_file, state['history_bytes'], engine):
+            print("⚠️  Az értékelés történet hiányos, teljes újraszámolás")
+            state = None
+
+    if state is not None:
+        encoding, offset = state['encoding'], state['offset']
+    else:
+        encoding = detect_encoding(csv_file)
+        if encoding is None:
+            print(f"❌ Nem sikerült dekódolni a fájlt")
+            return None
+        engine, offset = EloEngine(), 0
+
+    start = engine.matches
+    lengths = engine.history_lengths()
+    try:
+        engine.extend(international_rows(iter_csv_rows(csv_file, encoding, offset, end_offset=complete_end)))
+    except ValueError:
+        if state is None:
+            # Rendezetlen fájl: a sorok egyszeri rendezése után egy menet
+            rows = sorted(international_rows(iter_csv_rows(csv_file, encoding, end_offset=complete_end)),
+                          key=lambda row: row[0])
+            engine, start = EloEngine().extend(rows), 0
+        else:
+            print("⚠️  Az új sorok korábbi napra esnek, teljes újraszámolás")
+            return update_elo(csv_file, state_path, force_full=True)
+
+    print(f"✅ {engine.matches - start} új mérkőzés feldolgozva ({engine.matches} összesen)")
+    os.makedirs(os.path.dirname(state_path) or '.', exist_ok=True)
+    # Előbb a történet, utána a checkpoint: a checkpoint csak teljes
+    # történetre hivatkozik
+    if state is not None:
+        history_bytes = append_history(history_file, engine.history_rows(lengths),
+                                       state['history_bytes'])
+    else:
+        history_bytes = write_history(history_file, engine)
+    save_checkpoint(state_path, {
+        'version': ELO_VERSION,
+        'csv_file': os.path.abspath(csv_file),
+        'encoding': encoding,
+        'offset': complete_end,
+        'fingerprint': prefix_fingerprint(csv_file, complete_end,
+                                          previous=state['fingerprint'] if state else None),
+        'engine': engine.to_dict(include_history=False),
+        'history_bytes': history_bytes,
+    })
+    return engine
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Válogatott Elo értékelések")
+    parser.add_argument('--input', default='data/adatokfoci.csv')
+    parser.add_argument('--full', action='store_true', help="teljes újraszámolás")
+    parser.add_argument('--date', metavar='ÉÉÉÉ-HH-NN', help="értékelések egy adott napon")
+    parser.add_argument('--team', action='append', default=[], help="csapat értékelése (többször is)")
+    parser.add_argument('--top', type=int, default=20)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    print("⚽ VÁLOGATOTT ELO ÉRTÉKELÉSEK")
+    print("=" * 60)
+    engine = update_elo(args.input, force_full=args.full)
+    if engine is None or not engine.matches:
+        print("❌ Nincs feldolgozható adat!")
+        return
+
+    on = datetime.strptime(args.date, '%Y-%m-%d').date() if args.date else None
+    label = on.isoformat() if on else date.fromordinal(engine.last_ordinal).isoformat()
+    print(f"\n🏆 TOP {args.top} ({label}):")
+    for i, (team, rating) in enumerate(engine.ranking(on, top=args.top, min_matches=5), 1):
+        print(f"   {i:<4} {team:<30} {rating:7.1f}")
+
+    for team in args.team:
+        rating = engine.rating(team, on)
+        print(f"\n📈 {team}: {rating:.1f}" if rating is not None else f"\n❓ Ismeretlen csapat: {team}")
+
+    print(f"\n💾 Checkpoint: {ELO_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,12 +8,181 @@ Margin elemzéshez
 
 import requests
 import json
-import os
-from datetime import datetime, timedelta
+from datetime import datetime
 
-def fetch_live_matches(api_key):
+import instrumentation
+from margin_engine import annotate_live_matches
+from odds_history import OddsHistoryStore
+from shards import atomic_write, write_shards
+from team_registry import TeamRegistry
+
+# Ligák
+SPORTS = {
+    'soccer_epl': 'Premier League',
+    'soccer_spain_la_liga': 'La Liga',
+    'soccer_germany_bundesliga': 'Bundesliga',
+    'soccer_italy_serie_a': 'Serie A',
+    'soccer_france_ligue_one': 'Ligue 1',
+    'soccer_uefa_champs_league': 'Champions League',
+    'soccer_uefa_europa_league': 'Europa League'
+}
+
+
+def parse_commence_time(commence_time):
+    """ISO kezdési idő -> datetime (None, ha nem értelmezhető)"""
+    try:
+        return datetime.fromisoformat(commence_time.replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        return None
+
+
+def parse_live_match(match, league_name, horizon_hours=48, annotate=True):
+    """
+    Egy API mérkőzés átalakítása margin elemzéshez
+    
+    Args:
+        match: A The Odds API egy mérkőzés objektuma
+        league_name: A bajnokság megjelenített neve
+        horizon_hours: Csak az ennyi órán belül kezdődő mérkőzések
+        annotate: Margin mezők kiszámítása; False esetén a hívó egyben
+            számolja őket (margin_engine.annotate_live_matches)
+        
+    Returns:
+        dict: A mérkőzés adatai, vagy None ha kívül esik / nincs odds
+    """
+    home_team = match.get('home_team', '')
+    away_team = match.get('away_team', '')
+    commence_time = match.get('commence_time', '')
+    
+    # Csak 48 órán belüli mérkőzések
+    match_time = parse_commence_time(commence_time)
+    if match_time is not None:
+        hours_until = (match_time - datetime.now(match_time.tzinfo)).total_seconds() / 3600
+        
+        if hours_until > horizon_hours:
+            return None
+            
+        time_status = "🔴 ÉLŐ" if hours_until < 0 else f"⏰ {int(hours_until)}h"
+    else:
+        time_status = "⏰ Hamarosan"
+    
+    # Több bookmaker odds-ainak összegyűjtése
+    bookmakers_data = []
+    
+    if match.get('bookmakers'):
+        for bookmaker in match['bookmakers']:
+            bookie_name = bookmaker.get('title', 'Unknown')
+            market = bookmaker.get('markets', [{}])[0]
+            outcomes = market.get('outcomes', [])
+            
+            odds_home = None
+            odds_draw = None
+            odds_away = None
+            
+            for outcome in outcomes:
+                name = outcome.get('name', '')
+                price = outcome.get('price', 0)
+                
+                if name == home_team:
+                    odds_home = price
+                elif name == 'Draw':
+                    odds_draw = price
+                elif name == away_team:
+                    odds_away = price
+            
+            if odds_home and odds_draw and odds_away:
+                # Nyers árak: a margin ezekből számolódik, a kerekítés
+                # az annotate_live_matches-ban történik
+                bookmakers_data.append({
+                    'bookmaker': bookie_name,
+                    'odds_home': odds_home,
+                    'odds_draw': odds_draw,
+                    'odds_away': odds_away,
+                })
+    
+    if not bookmakers_data:
+        return None
+    
+    # Dátum formázás
+    if match_time is not None:
+        date_str = match_time.strftime('%Y-%m-%d %H:%M')
+    else:
+        date_str = commence_time[:16]
+    
+    parsed = {
+        'date': date_str,
+        'status': time_status,
+        'league': league_name,
+        'home_team': home_team,
+        'away_team': away_team,
+        'bookmakers': bookmakers_data,
+        'avg_margin': None,
+        'num_bookmakers': len(bookmakers_data)
+    }
+    
+    # Margin és fair valószínűségek (vektorizált motor)
+    if annotate:
+        annotate_live_matches([parsed])
+    
+    return parsed
+
+
+def request_league_odds(api_key, sport_key, session=None):
+    """
+    Egy bajnokság odds-ainak lekérdezése
+    
+    Args:
+        api_key: The Odds API kulcs
+        sport_key: Pl. 'soccer_epl'
+        session: Opcionális requests.Session (keep-alive kapcsolatokhoz)
+        
+    Returns:
+        requests.Response
+    """
+    url = f'https://api.the-odds-api.com/v4/sports/{sport_key}/odds/'
+    params = {
+        'apiKey': api_key,
+        'regions': 'eu',
+        'markets': 'h2h',
+        'oddsFormat': 'decimal',
+        'bookmakers': 'bet365,williamhill,betfair'  # Top bookmakers
+    }
+    with instrumentation.phase('fetch'):
+        response = (session or requests).get(url, params=params, timeout=15)
+    if session is None:
+        # A make_session() sessionök response hook-ja már számol
+        instrumentation.record_response(response)
+    return response
+
+
+def save_live_matches(all_matches, json_path='data/live_matches.json'):
+    """
+    Élő mérkőzések mentése a margins.html számára
+    
+    A teljes fájl mellett bajnokságonkénti shardok is készülnek
+    (data/live_matches/, lásd shards.py); csak a változottak íródnak újra.
+    
+    Returns:
+        dict: A shard írás statisztikája ({'written', 'unchanged', 'removed'})
+    """
+    updated = datetime.now().isoformat()
+    atomic_write(json_path, json.dumps({
+        'updated': updated,
+        'total_matches': len(all_matches),
+        'matches': all_matches
+    }, indent=2, ensure_ascii=False).encode('utf-8'))
+    return write_shards(all_matches, json_path, meta={'updated': updated})
+
+
+@instrumentation.instrumented('fetch_live_matches')
+def fetch_live_matches(api_key, fair_method='proportional'):
     """
     Lekérdezi az élő és közelgő mérkőzéseket az API-ról
+    
+    Args:
+        api_key: The Odds API kulcs
+        fair_method: Fair valószínűség módszere ('proportional', 'power',
+            'odds_ratio', 'shin')
     """
     
     print("🔴 ÉLŐ MÉRKŐZÉSEK LETÖLTÉSE")
@@ -24,16 +193,7 @@ def fetch_live_matches(api_key):
         print("📝 Regisztrálj: https://the-odds-api.com/")
         return False
     
-    # Ligák
-    sports = {
-        'soccer_epl': 'Premier League',
-        'soccer_spain_la_liga': 'La Liga',
-        'soccer_germany_bundesliga': 'Bundesliga',
-        'soccer_italy_serie_a': 'Serie A',
-        'soccer_france_ligue_one': 'Ligue 1',
-        'soccer_uefa_champs_league': 'Champions League',
-        'soccer_uefa_europa_league': 'Europa League'
-    }
+    sports = SPORTS
     
     all_matches = []
     total_requests = 0
@@ -43,100 +203,21 @@ def fetch_live_matches(api_key):
     
     for sport_key, league_name in sports.items():
         try:
-            url = f'https://api.the-odds-api.com/v4/sports/{sport_key}/odds/'
-            params = {
-                'apiKey': api_key,
-                'regions': 'eu',
-                'markets': 'h2h',
-                'oddsFormat': 'decimal',
-                'bookmakers': 'bet365,williamhill,betfair'  # Top bookmakers
-            }
-            
             print(f"⚽ {league_name}...", end=' ', flush=True)
-            response = requests.get(url, params=params, timeout=15)
+            response = request_league_odds(api_key, sport_key)
             total_requests += 1
             
             if response.status_code == 200:
-                matches = response.json()
                 count = 0
-                
-                for match in matches:
-                    home_team = match.get('home_team', '')
-                    away_team = match.get('away_team', '')
-                    commence_time = match.get('commence_time', '')
-                    
-                    # Csak 48 órán belüli mérkőzések
-                    try:
-                        match_time = datetime.fromisoformat(commence_time.replace('Z', '+00:00'))
-                        hours_until = (match_time - datetime.now(match_time.tzinfo)).total_seconds() / 3600
-                        
-                        if hours_until > 48:
-                            continue
-                            
-                        time_status = "🔴 ÉLŐ" if hours_until < 0 else f"⏰ {int(hours_until)}h"
-                    except:
-                        time_status = "⏰ Hamarosan"
-                    
-                    # Több bookmaker odds-ainak összegyűjtése
-                    bookmakers_data = []
-                    
-                    if match.get('bookmakers'):
-                        for bookmaker in match['bookmakers']:
-                            bookie_name = bookmaker.get('title', 'Unknown')
-                            market = bookmaker.get('markets', [{}])[0]
-                            outcomes = market.get('outcomes', [])
-                            
-                            odds_home = None
-                            odds_draw = None
-                            odds_away = None
-                            
-                            for outcome in outcomes:
-                                name = outcome.get('name', '')
-                                price = outcome.get('price', 0)
-                                
-                                if name == home_team:
-                                    odds_home = price
-                                elif name == 'Draw':
-                                    odds_draw = price
-                                elif name == away_team:
-                                    odds_away = price
-                            
-                            if odds_home and odds_draw and odds_away:
-                                # Margin számítás
-                                implied_home = 1 / odds_home
-                                implied_draw = 1 / odds_draw
-                                implied_away = 1 / odds_away
-                                margin = (implied_home + implied_draw + implied_away - 1) * 100
-                                
-                                bookmakers_data.append({
-                                    'bookmaker': bookie_name,
-                                    'odds_home': round(odds_home, 2),
-                                    'odds_draw': round(odds_draw, 2),
-                                    'odds_away': round(odds_away, 2),
-                                    'margin': round(margin, 2)
-                                })
-                    
-                    if bookmakers_data:
-                        # Átlag margin számítás
-                        avg_margin = sum(b['margin'] for b in bookmakers_data) / len(bookmakers_data)
-                        
-                        # Dátum formázás
-                        try:
-                            date_str = match_time.strftime('%Y-%m-%d %H:%M')
-                        except:
-                            date_str = commence_time[:16]
-                        
-                        all_matches.append({
-                            'date': date_str,
-                            'status': time_status,
-                            'league': league_name,
-                            'home_team': home_team,
-                            'away_team': away_team,
-                            'bookmakers': bookmakers_data,
-                            'avg_margin': round(avg_margin, 2),
-                            'num_bookmakers': len(bookmakers_data)
-                        })
-                        count += 1
+                with instrumentation.phase('parse'):
+                    matches = response.json()
+                    for match in matches:
+                        parsed = parse_live_match(match, league_name, annotate=False)
+                        if parsed:
+                            all_matches.append(parsed)
+                            count += 1
+                instrumentation.count('rows_parsed', len(matches))
+                instrumentation.count('rows_rejected', len(matches) - count)
                 
                 if count > 0:
                     print(f"✅ {count} mérkőzés")
@@ -162,6 +243,16 @@ def fetch_live_matches(api_key):
         print("💡 Próbáld újra később, amikor közelebb vannak a meccsek.")
         return False
     
+    # Margin és fair valószínűségek minden árazott sorra egyszerre
+    with instrumentation.phase('annotate'):
+        annotate_live_matches(all_matches, fair_method)
+    
+    # Kanonikus csapat nevek (a Football-Data adatokkal összekapcsolhatók)
+    with instrumentation.phase('canonicalize'):
+        teams = TeamRegistry.load()
+        teams.canonicalize_all(all_matches)
+        teams.save()
+    
     print(f"\n📊 ÖSSZESÍTÉS:")
     print(f"   ✅ Összes mérkőzés: {len(all_matches)}")
     print(f"   🌐 API kérések: {total_requests}")
@@ -172,7 +263,7 @@ def fetch_live_matches(api_key):
         print(f"   🔢 Fennmaradó kérések: {remaining}")
     
     # Margin statisztikák
-    margins = [m['avg_margin'] for m in all_matches]
+    margins = [m['avg_margin'] for m in all_matches if m['avg_margin'] is not None]
     if margins:
         print(f"\n💰 MARGIN STATISZTIKÁK:")
         print(f"   Átlag: {sum(margins)/len(margins):.2f}%")
@@ -181,17 +272,19 @@ def fetch_live_matches(api_key):
     
     # Mentés
     print("\n💾 Mentés...")
-    os.makedirs('data', exist_ok=True)
     
     json_path = 'data/live_matches.json'
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump({
-            'updated': datetime.now().isoformat(),
-            'total_matches': len(all_matches),
-            'matches': all_matches
-        }, f, indent=2, ensure_ascii=False)
+    with instrumentation.phase('write'):
+        shard_stats = save_live_matches(all_matches, json_path)
     
     print(f"   ✅ JSON: {json_path}")
+    print(f"   🗂️  Shardok: {shard_stats['written']} frissítve, "
+          f"{shard_stats['unchanged']} változatlan, {shard_stats['removed']} törölve")
+    
+    # Árváltozások rögzítése az idősor tárolóba
+    with instrumentation.phase('history'):
+        changes = OddsHistoryStore().record_live_matches(all_matches)
+    print(f"   📈 Idősor: {changes} árváltozás rögzítve")
     
     # Ligánként
     print(f"\n🏆 Bajnokságonként:")
@@ -234,6 +327,7 @@ def main():
         print("\n" + "="*70)
         print("✨ Sikeres letöltés! Frissítsd a böngészőt (Ctrl+Shift+R)")
         print("💡 Futtasd újra 15-30 percenként a friss odds-okért!")
+        print("🤖 Vagy indítsd a kvóta-kímélő daemont: python live_daemon.py")
     else:
         print("\n" + "="*70)
         print("❌ Nem sikerült adatot letölteni")
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Football-Data.co.uk CSV-k teljes szélességű, típusos oszlopos betöltése
+- Mind a ~120 oszlop (Bet365, Pinnacle, William Hill, Betfair Exchange,
+  Max/Avg, záró árak, over/under 2.5, ázsiai hendikep, statisztikák)
+- Oszlop projekció: csak a kért oszlopok dekódolódnak
+- Oszlopos fájlformátum (.fdc), amelyből a kért oszlopok külön olvashatók
+"""
+
+import csv
+import json
+import math
+import os
+import struct
+from array import array
+
+from odds_formats import (MISSING_INT, MISSING_STRING, TYPECODES, _decode_strings, _encode_strings,
+                          _to_little_endian)
+
+# Szöveges és egész oszlopok; minden más float64 (odds, hendikep)
+STRING_COLUMNS = {
+    'Div', 'Date', 'Time', 'HomeTeam', 'AwayTeam', 'HT', 'AT',
+    'FTR', 'HTR', 'Res', 'Referee', 'Country', 'League', 'Season',
+}
+INT_COLUMNS = {
+    'FTHG', 'FTAG', 'HTHG', 'HTAG', 'HG', 'AG',
+    'HS', 'AS', 'HST', 'AST', 'HHW', 'AHW', 'HF', 'AF', 'HFKC', 'AFKC',
+    'HC', 'AC', 'HO', 'AO', 'HY', 'AY', 'HR', 'AR', 'HBP', 'ABP', 'Attendance',
+}
+
+MAGIC = b'FDCT'
+VERSION = 2
+# 1: '\0'-val elválasztott string tábla (csak olvasás)
+# 2: hossz-prefixes (uint32) string tábla, mint az .odc fájlban
+SUPPORTED_VERSIONS = (1, 2)
+
+
+def column_kind(name):
+    """Az oszlop típusa: 's' (string tábla index), 'i' (int32) vagy 'd' (float64)"""
+    if name in STRING_COLUMNS:
+        return 's'
+    if name in INT_COLUMNS:
+        return 'i'
+    return 'd'
+
+
+class FootballDataTable:
+    """
+    Football-Data mérkőzések oszlopos táblája
+
+    Minden oszlop egy típusos tömb; a string oszlopok saját string táblába
+    mutató indexek. Hiányzó érték: NaN / MISSING_INT / MISSING_STRING.
+    """
+
+    def __init__(self):
+        self.names = []
+        self.kinds = {}
+        self.columns = {}
+        self.strings = {}
+        self._string_ids = {}
+        self.count = 0
+
+    # --- Építés ---
+
+    def _add_column(self, name, kind=None):
+        kind = kind or column_kind(name)
+        self.names.append(name)
+        self.kinds[name] = kind
+        column = array(TYPECODES[kind])
+        missing = self._missing(kind)
+        if self.count:
+            column.extend(array(TYPECODES[kind], [missing]) * self.count)
+        self.columns[name] = column
+        if kind == 's':
+            self.strings[name] = []
+            self._string_ids[name] = {}
+        return column
+
+    @staticmethod
+    def _missing(kind):
+        if kind == 's':
+            return MISSING_STRING
+        if kind == 'i':
+            return MISSING_INT
+        return float('nan')
+
+    def _intern(self, name, value):
+        ids = self._string_ids[name]
+        index = ids.get(value)
+        if index is None:
+            index = ids[value] = len(self.strings[name])
+            self.strings[name].append(value)
+        return index
+
+    def append_raw(self, name, values):
+        """
+        Nyers (CSV) string értékek dekódolása egy oszlop végére
+
+        Üres vagy nem értelmezhető érték: hiányzó.
+        """
+        column = self.columns.get(name)
+        if column is None:
+            column = self._add_column(name)
+        kind = self.kinds[name]
+
+        if kind == 's':
+            intern = self._intern
+            column.extend(array('I', [intern(name, v) if v else MISSING_STRING for v in values]))
+        elif kind == 'i':
+            decoded = array('i')
+            for v in values:
+                try:
+                    decoded.append(int(v))
+                except ValueError:
+                    try:
+                        decoded.append(int(float(v)))
+                    except ValueError:
+                        decoded.append(MISSING_INT)
+            column.extend(decoded)
+        else:
+            decoded = array('d')
+            nan = float('nan')
+            for v in values:
+                try:
+                    decoded.append(float(v))
+                except ValueError:
+                    decoded.append(nan)
+            column.extend(decoded)
+
+    def _pad(self):
+        """A rövidebb oszlopok feltöltése hiányzó értékkel a sorok számáig"""
+        for name in self.names:
+            column = self.columns[name]
+            if len(column) < self.count:
+                missing = self._missing(self.kinds[name])
+                column.extend(array(column.typecode, [missing]) * (self.count - len(column)))
+
+    def extend(self, other):
+        """
+        Egy másik tábla sorainak hozzáfűzése (oszlopok uniója)
+
+        A csak az egyik táblában szereplő oszlopok a másik sorainál hiányzók.
+        """
+        for name in other.names:
+            if name not in self.columns:
+                self._add_column(name, other.kinds[name])
+            column = self.columns[name]
+            if other.kinds[name] == 's':
+                strings = other.strings[name]
+                column.extend(array('I', [
+                    MISSING_STRING if i == MISSING_STRING else self._intern(name, strings[i])
+                    for i in other.columns[name]
+                ]))
+            else:
+                column.extend(other.columns[name])
+        self.count += other.count
+        self._pad()
+
+    # --- Olvasás ---
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def column(self, name):
+        """Az oszlop nyers tömbje memoryview-ként (másolás nélkül)"""
+        return memoryview(self.columns[name])
+
+    def value(self, name, index):
+        """Egy mező értéke (hiányzó érték: None)"""
+        raw = self.columns[name][index]
+        kind = self.kinds[name]
+        if kind == 's':
+            return None if raw == MISSING_STRING else self.strings[name][raw]
+        if kind == 'd':
+            return None if math.isnan(raw) else raw
+        return None if raw == MISSING_INT else raw
+
+    def values(self, name):
+        """Az oszlop értékei listaként (hiányzó érték: None)"""
+        return [self.value(name, index) for index in range(self.count)]
+
+    def select(self, names):
+        """Új tábla csak a megadott (létező) oszlopokkal; a tömbök közösek"""
+        table = FootballDataTable()
+        table.count = self.count
+        for name in names:
+            if name in self.columns:
+                table.names.append(name)
+                table.kinds[name] = self.kinds[name]
+                table.columns[name] = self.columns[name]
+                if self.kinds[name] == 's':
+                    table.strings[name] = self.strings[name]
+                    table._string_ids[name] = self._string_ids[name]
+        return table
+
+    def rows(self, names=None):
+        """Sorok dict-ként (alapért.: minden oszlop)"""
+        names = [name for name in (names or self.names) if name in self.columns]
+        for index in range(self.count):
+            yield {name: self.value(name, index) for name in names}
+
+    # --- Fájl ---
+
+    def write(self, filename):
+        """
+        Mentés oszlopos fájlba (.fdc)
+
+        Felépítés: MAGIC, verzió, fejléc hossz, JSON fejléc (oszloponként
+        név, típus, pozíció, méret), majd oszloponként a string tábla
+        (stringenként uint32 bájthossz + UTF-8 bájtok, így bármilyen érték,
+        '\\0' is tárolható) és a nyers tömb (little-endian).
+        """
+        header_columns = []
+        blocks = []
+        offset = 0
+        for name in self.names:
+            entry = {'name': name, 'kind': self.kinds[name], 'offset': offset}
+            if self.kinds[name] == 's':
+                blob = _encode_strings(self.strings[name])
+                entry['strings'] = len(self.strings[name])
+                entry['strings_size'] = len(blob)
+                blocks.append(blob)
+                offset += len(blob)
+            data = _to_little_endian(self.columns[name]).tobytes()
+            blocks.append(data)
+            offset += len(data)
+            entry['size'] = offset - entry['offset']
+            header_columns.append(entry)
+
+        header = json.dumps({'count': self.count, 'columns': header_columns},
+                            separators=(',', ':')).encode('utf-8')
+
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Ideiglenes fájl és atomikus csere: olvasó sosem lát félig írt fájlt
+        tmp_path = filename + '.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(MAGIC)
+                f.write(struct.pack('<HI', VERSION, len(header)))
+                f.write(header)
+                for block in blocks:
+                    f.write(block)
+            os.replace(tmp_path, filename)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def read(cls, filename, columns=None):
+        """
+        Tábla betöltése oszlopos fájlból
+
+        Args:
+            filename: .fdc fájl
+            columns: Csak ezek az oszlopok (a többi be sem olvasódik)
+        """
+        with open(filename, 'rb') as f:
+            if f.read(4) != MAGIC:
+                raise ValueError(f"Nem Football-Data oszlopos fájl: {filename}")
+            version, header_size = struct.unpack('<HI', f.read(struct.calcsize('<HI')))
+            if version not in SUPPORTED_VERSIONS:
+                raise ValueError(f"Nem támogatott verzió: {version}")
+            header = json.loads(f.read(header_size))
+            data_start = f.tell()
+
+            wanted = None if columns is None else set(columns)
+            table = cls()
+            table.count = header['count']
+            for entry in header['columns']:
+                name, kind = entry['name'], entry['kind']
+                if wanted is not None and name not in wanted:
+                    continue
+                f.seek(data_start + entry['offset'])
+                data = f.read(entry['size'])
+
+                table.names.append(name)
+                table.kinds[name] = kind
+                if kind == 's':
+                    blob_size = entry['strings_size']
+                    strings = _decode_strings(data[:blob_size], entry['strings'], version)
+                    table.strings[name] = strings
+                    table._string_ids[name] = {value: i for i, value in enumerate(strings)}
+                    data = data[blob_size:]
+                column = array(TYPECODES[kind])
+                column.frombytes(data)
+                table.columns[name] = _to_little_endian(column)
+
+        return table
+
+
+def parse_football_data(text, columns=None, constants=None):
+    """
+    Football-Data CSV szöveg feldolgozása oszlopos táblává
+
+    Args:
+        text: A CSV tartalma
+        columns: Csak ezek az oszlopok dekódolódnak (alapért.: mind)
+        constants: Minden sorhoz hozzáadott állandó oszlopok, pl.
+                   {'League': 'Premier League', 'Season': '2425'}
+
+    Returns:
+        FootballDataTable
+    """
+    reader = csv.reader(text.lstrip('\ufeff').splitlines())
+    header = next(reader, None)
+    table = FootballDataTable()
+    if not header:
+        return table
+
+    header = [name.strip() for name in header]
+    wanted = None if columns is None else set(columns)
+    selected = []
+    seen = set()
+    for i, name in enumerate(header):
+        # Üres és ismétlődő fejlécek kihagyása (az első előfordulás marad)
+        if name and name not in seen and (wanted is None or name in wanted):
+            selected.append((i, name))
+            seen.add(name)
+
+    # Sorok -> oszloponkénti nyers értékek (csak a kiválasztott indexek)
+    raw = [[] for _ in selected]
+    width = len(header)
+    count = 0
+    for row in reader:
+        if not any(row):
+            continue
+        if len(row) < width:
+            row = row + [''] * (width - len(row))
+        for values, (i, _) in zip(raw, selected):
+            values.append(row[i])
+        count += 1
+
+    for values, (_, name) in zip(raw, selected):
+        table.append_raw(name, values)
+    for name, value in (constants or {}).items():
+        if columns is None or name in columns:
+            table.append_raw(name, [value] * count)
+    table.count = count
+    table._pad()
+    return table
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Közös HTTP segédeszközök a letöltő szkriptekhez
+- Újrahasznosított (keep-alive) kapcsolatok connection poollal
+- Token-bucket alapú kérés korlátozó a fix sleep hívások helyett
+- Lemezes válasz cache feltételes (ETag / Last-Modified) kérésekkel
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import instrumentation
+
+
+class TokenBucket:
+    """
+    Szálbiztos token-bucket kérés korlátozó
+
+    Másodpercenként `rate` token keletkezik, legfeljebb `capacity` gyűlhet
+    össze, így rövid ideig `capacity` kérés mehet ki egyszerre.
+    """
+
+    def __init__(self, rate=5.0, capacity=10):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens=1):
+        """Vár, amíg `tokens` token elérhető, majd elfogyasztja"""
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def make_session(headers=None, pool_size=10):
+    """
+    requests.Session connection poollal
+
+    Args:
+        headers: Alapértelmezett fejlécek
+        pool_size: Hostonként megtartott kapcsolatok száma
+                   (legalább akkora legyen, mint a párhuzamos szálak száma)
+
+    Returns:
+        requests.Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    if headers:
+        session.headers.update(headers)
+    # Kérés / bájt / kvóta számlálás (kikapcsolt mérésnél no-op)
+    session.hooks['response'].append(instrumentation.record_response)
+    return session
+
+
+class CachedResponse:
+    """Lemezről kiszolgált válasz (a requests.Response használt részével)"""
+
+    def __init__(self, url, content, encoding, headers):
+        self.url = url
+        self.status_code = 200
+        self.content = content
+        self.encoding = encoding
+        self.headers = headers
+        self.from_cache = True
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class HttpCache:
+    """
+    Lemezes HTTP válasz cache feltételes kérésekkel
+
+    URL-enként tárolja a választ, az ETag és Last-Modified értékeket, és
+    If-None-Match / If-Modified-Since fejlécekkel kérdez újra; 304 esetén a
+    lemezről szolgál ki. A változatlan (immutable) erőforrásokat kérés
+    nélkül adja vissza. A méretkorlát felett a legrégebben használt
+    bejegyzéseket törli.
+    """
+
+    def __init__(self, directory='data/.http_cache', max_bytes=200 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+        # Index: kulcs -> meta adatok
+        self._index = {}
+        for name in os.listdir(directory):
+            if name.endswith('.json'):
+                try:
+                    with open(os.path.join(directory, name), 'r', encoding='utf-8') as f:
+                        self._index[name[:-5]] = json.load(f)
+                except (OSError, ValueError):
+                    continue
+
+    @staticmethod
+    def _key(url):
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _path(self, key, suffix):
+        return os.path.join(self.directory, f"{key}{suffix}")
+
+    def _write(self, path, data, mode='wb'):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, mode) as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _write_meta(self, key, meta):
+        self._write(self._path(key, '.json'), json.dumps(meta).encode('utf-8'))
+
+    def _load(self, key, meta):
+        try:
+            with open(self._path(key, '.body'), 'rb') as f:
+                content = f.read()
+        except OSError:
+            return None
+        return CachedResponse(meta['url'], content, meta.get('encoding'), meta.get('headers', {}))
+
+    def lookup(self, url):
+        """
+        Változatlannak tekintett erőforrás kiszolgálása kérés nélkül
+
+        Returns:
+            CachedResponse vagy None, ha nincs a cache-ben
+        """
+        key = self._key(url)
+        with self._lock:
+            meta = self._index.get(key)
+            if meta is None:
+                return None
+            meta['last_used'] = time.time()
+        self._write_meta(key, meta)
+        return self._load(key, meta)
+
+    def fetch(self, session, url, immutable=False, **kwargs):
+        """
+        Feltételes GET kérés a cache alapján
+
+        Args:
+            session: requests.Session
+            url: A kért URL
+            immutable: Ha True és van tárolt válasz, nem küld kérést
+            **kwargs: A session.get további argumentumai
+
+        Returns:
+            requests.Response vagy CachedResponse
+        """
+        if immutable:
+            cached = self.lookup(url)
+            if cached is not None:
+                return cached
+
+        key = self._key(url)
+        with self._lock:
+            meta = self._index.get(key)
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        if meta is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        response = session.get(url, headers=headers, **kwargs)
+
+        if response.status_code == 304 and meta is not None:
+            meta['last_used'] = time.time()
+            self._write_meta(key, meta)
+            cached = self._load(key, meta)
+            if cached is not None:
+                return cached
+            # A törzs elveszett: feltétel nélkül újrakérjük
+            for header in ('If-None-Match', 'If-Modified-Since'):
+                headers.pop(header, None)
+            response = session.get(url, headers=headers, **kwargs)
+
+        if response.status_code == 200:
+            self.store(url, response)
+
+        return response
+
+    def store(self, url, response):
+        """Sikeres válasz mentése és a méretkorlát betartása"""
+        key = self._key(url)
+        content = response.content
+        meta = {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'encoding': response.encoding or response.apparent_encoding,
+            'headers': {'Content-Type': response.headers.get('Content-Type', '')},
+            'size': len(content),
+            'stored': time.time(),
+            'last_used': time.time()
+        }
+        self._write(self._path(key, '.body'), content)
+        self._write_meta(key, meta)
+
+        with self._lock:
+            self._index[key] = meta
+            self._evict()
+
+    def _evict(self):
+        """Legrégebben használt bejegyzések törlése a méretkorlát felett"""
+        total = sum(meta.get('size', 0) for meta in self._index.values())
+        if total <= self.max_bytes:
+            return
+
+        for key, meta in sorted(self._index.items(), key=lambda item: item[1].get('last_used', 0)):
+            if total <= self.max_bytes:
+                break
+            for suffix in ('.body', '.json'):
+                try:
+                    os.remove(self._path(key, suffix))
+                except OSError:
+                    pass
+            total -= meta.get('size', 0)
+            del self._index[key]
+
+    def size(self):
+        """A cache teljes mérete bájtban"""
+        with self._lock:
+            return sum(meta.get('size', 0) for meta in self._index.values())
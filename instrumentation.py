@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Futásonkénti mérés: fázisidők (fal és CPU) és számlálók
+- Fázisok: with phase('fetch'): ...  (fal idő, CPU idő, hívások száma)
+- Számlálók: HTTP kérések, átvitt bájtok, feldolgozott / elutasított sorok
+- Mérők (gauge): pl. a fennmaradó API kvóta
+Futás végén JSON vagy Prometheus szöveg fájlba íródik.
+
+Bekapcsolás: ODDS_METRICS környezeti változó (fájl útvonal, a '{run}' a
+futás nevére cserélődik; '.prom' kiterjesztés: Prometheus formátum, '1':
+data/metrics/{run}.json), vagy a run() path paramétere.
+Kikapcsolva minden hívás egyetlen None ellenőrzés (a phase() egy közös,
+üres context managert ad vissza).
+"""
+
+import contextlib
+import functools
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+
+ENV_VARIABLE = 'ODDS_METRICS'
+DEFAULT_PATH = 'data/metrics/{run}.json'
+PROMETHEUS_PREFIX = 'odds'
+
+# Az aktív futás (None = kikapcsolva)
+_current = None
+_NULL_PHASE = contextlib.nullcontext()
+
+
+class RunMetrics:
+    """Egy futás fázisai, számlálói és mérői"""
+
+    def __init__(self, name):
+        self.name = name
+        self.started = datetime.now().isoformat(timespec='seconds')
+        self.phases = {}        # név -> [fal idő, CPU idő, hívások]
+        self.counters = {}
+        self.gauges = {}
+        self._lock = threading.Lock()
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        self.wall_seconds = None
+        self.cpu_seconds = None
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            elapsed_wall = time.perf_counter() - wall
+            elapsed_cpu = time.process_time() - cpu
+            with self._lock:
+                totals = self.phases.setdefault(name, [0.0, 0.0, 0])
+                totals[0] += elapsed_wall
+                totals[1] += elapsed_cpu
+                totals[2] += 1
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def gauge(self, name, value):
+        with self._lock:
+            self.gauges[name] = value
+
+    def finish(self):
+        self.wall_seconds = time.perf_counter() - self._wall
+        self.cpu_seconds = time.process_time() - self._cpu
+
+    def to_dict(self):
+        return {
+            'run': self.name,
+            'started': self.started,
+            'wall_seconds': round(self.wall_seconds or 0.0, 6),
+            'cpu_seconds': round(self.cpu_seconds or 0.0, 6),
+            'phases': {name: {'wall_seconds': round(wall, 6), 'cpu_seconds': round(cpu, 6), 'calls': calls}
+                       for name, (wall, cpu, calls) in self.phases.items()},
+            'counters': dict(self.counters),
+            'gauges': dict(self.gauges),
+        }
+
+    def to_prometheus(self):
+        """Prometheus szöveges formátum (node_exporter textfile collectorhoz)"""
+        run = _label(self.name)
+        lines = [
+            f'# TYPE {PROMETHEUS_PREFIX}_run_wall_seconds gauge',
+            f'{PROMETHEUS_PREFIX}_run_wall_seconds{{run="{run}"}} {self.wall_seconds or 0.0:.6f}',
+            f'# TYPE {PROMETHEUS_PREFIX}_run_cpu_seconds gauge',
+            f'{PROMETHEUS_PREFIX}_run_cpu_seconds{{run="{run}"}} {self.cpu_seconds or 0.0:.6f}',
+        ]
+        for metric, position in (('phase_wall_seconds', 0), ('phase_cpu_seconds', 1), ('phase_calls', 2)):
+            lines.append(f'# TYPE {PROMETHEUS_PREFIX}_{metric} gauge')
+            for name, totals in self.phases.items():
+                lines.append(f'{PROMETHEUS_PREFIX}_{metric}{{run="{run}",phase="{_label(name)}"}} {totals[position]:g}')
+        for name, value in sorted(self.counters.items()):
+            metric = f'{PROMETHEUS_PREFIX}_{_metric_name(name)}_total'
+            lines += [f'# TYPE {metric} counter', f'{metric}{{run="{run}"}} {value}']
+        for name, value in sorted(self.gauges.items()):
+            metric = f'{PROMETHEUS_PREFIX}_{_metric_name(name)}'
+            lines += [f'# TYPE {metric} gauge', f'{metric}{{run="{run}"}} {value}']
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path):
+        """Mentés (.prom: Prometheus, egyébként JSON), ideiglenes fájlon keresztül"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            if path.endswith('.prom'):
+                f.write(self.to_prometheus())
+            else:
+                json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"')
+
+
+def _metric_name(name):
+    return re.sub(r'[^a-zA-Z0-9_]', '_', name)
+
+
+# --- Modul szintű API (kikapcsolva: no-op) ---
+
+def enabled():
+    return _current is not None
+
+
+def phase(name):
+    """Fázis mérése: with phase('parse'): ..."""
+    if _current is None:
+        return _NULL_PHASE
+    return _current.phase(name)
+
+
+def count(name, value=1):
+    """Számláló növelése (pl. 'rows_parsed', 'rows_rejected')"""
+    if _current is not None:
+        _current.count(name, value)
+
+
+def add_counters(counters):
+    """Máshol (pl. worker folyamatban, lásd collect()) gyűjtött számlálók hozzáadása"""
+    if _current is not None:
+        for name, value in counters.items():
+            _current.count(name, value)
+
+
+def gauge(name, value):
+    """Mérő beállítása (pl. 'api_quota_remaining')"""
+    if _current is not None:
+        _current.gauge(name, value)
+
+
+def record_response(response, *args, **kwargs):
+    """
+    HTTP válasz számlálása: kérések, átvitt bájtok, fennmaradó API kvóta
+
+    requests response hook-ként is használható (lásd http_client.make_session).
+    Az átvitt bájtok a Content-Length fejlécből jönnek (tömörített méret);
+    ha hiányzik, a válasz törzsének hosszából (stream kérésnél kimarad).
+    """
+    if _current is None:
+        return response
+    _current.count('http_requests')
+    length = response.headers.get('Content-Length')
+    if length is None and not kwargs.get('stream', False):
+        length = len(response.content or b'')
+    if length:
+        _current.count('http_bytes', int(length))
+    remaining = response.headers.get('x-requests-remaining')
+    if remaining is not None:
+        try:
+            _current.gauge('api_quota_remaining', float(remaining))
+        except ValueError:
+            pass
+    return response
+
+
+def metrics_path(name, path=None):
+    """A kimeneti fájl útvonala (None = kikapcsolva)"""
+    path = path or os.environ.get(ENV_VARIABLE)
+    if not path or path == '0':
+        return None
+    if path == '1':
+        path = DEFAULT_PATH
+    return path.replace('{run}', name)
+
+
+def instrumented(name):
+    """Dekorátor: a függvény minden hívása egy mért futás (lásd run())"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with run(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+@contextlib.contextmanager
+def collect():
+    """
+    Számlálók helyi gyűjtése, fájlba írás nélkül
+
+    Folyamat-pool workerben a szülő futása nem látszik (ott _current None);
+    a worker ezzel gyűjt, és a számlálókat visszaadja a szülőnek, amely
+    add_counters()-szel veszi fel őket. A korábbi aktív mérés közben
+    félreteszi, így semmi sem számolódik kétszer.
+
+    Yields:
+        dict: A gyűjtött számlálók (a blokk végéig töltődik)
+    """
+    global _current
+    previous, _current = _current, RunMetrics('collect')
+    try:
+        yield _current.counters
+    finally:
+        _current = previous
+
+
+@contextlib.contextmanager
+def run(name, path=None):
+    """
+    Egy belépési pont futásának mérése
+
+    Args:
+        name: A futás neve (pl. 'update_odds_from_api')
+        path: Kimeneti fájl (None = ODDS_METRICS környezeti változó)
+
+    Yields:
+        RunMetrics vagy None (kikapcsolva / már futó mérésen belül)
+    """
+    global _current
+    output = metrics_path(name, path)
+    if output is None or _current is not None:
+        yield _current
+        return
+
+    _current = RunMetrics(name)
+    try:
+        yield _current
+    finally:
+        metrics, _current = _current, None
+        metrics.finish()
+        try:
+            metrics.write(output)
+            print(f"📈 Mérés mentve: {output}")
+        except OSError as e:
+            print(f"⚠️  Mérés mentési hiba: {e}")
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Kvóta-kímélő élő odds daemon (The Odds API)
+Folyamatosan frissíti a data/live_matches.json fájlt úgy, hogy a havi
+kérés keretet oda költi, ahol számít: a hamarosan kezdődő mérkőzésekkel
+rendelkező bajnokságokat gyakran, a többit ritkán kérdezi le
+"""
+
+import argparse
+import calendar
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+from fetch_live_matches import (SPORTS, parse_commence_time, parse_live_match,
+                                request_league_odds, save_live_matches)
+from http_client import make_session
+from margin_engine import annotate_live_matches
+from odds_history import OddsHistoryStore
+from team_registry import TeamRegistry
+
+# Alap lekérdezési időközök (másodperc) a következő kezdésig hátralévő idő szerint
+BASE_INTERVALS = [
+    (0, 5 * 60),         # élő mérkőzés
+    (3, 10 * 60),        # 3 órán belül kezdődik
+    (12, 30 * 60),       # 12 órán belül
+    (48, 2 * 3600),      # 48 órán belül
+]
+IDLE_INTERVAL = 12 * 3600  # nincs mérkőzés 48 órán belül
+
+# Ennyi órával a kezdés után még élőnek tekintjük a mérkőzést
+LIVE_WINDOW_HOURS = 2
+
+
+# Kvóta nullázódás fejlécek (ha az API küldi): epoch, hátralévő mp vagy ISO időpont
+RESET_HEADERS = ('x-requests-reset', 'x-ratelimit-reset')
+
+
+def next_reset(now=None, reset_day=1):
+    """
+    A havi kvóta következő nullázódása (a megadott hónapnap 00:00 UTC)
+
+    Args:
+        now: Aktuális időpont (alapért.: most, UTC)
+        reset_day: A hónap napja, amikor az előfizetés megújul (1-31; rövidebb
+                   hónapban a hónap utolsó napja)
+    """
+    now = now or datetime.now(timezone.utc)
+    year, month = now.year, now.month
+    for _ in range(2):
+        day = min(reset_day, calendar.monthrange(year, month)[1])
+        reset = datetime(year, month, day, tzinfo=timezone.utc)
+        if reset > now:
+            return reset
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return reset
+
+
+def seconds_until_reset(now=None, reset_day=1):
+    """Hátralévő idő a havi kvóta nullázódásáig (lásd next_reset)"""
+    now = now or datetime.now(timezone.utc)
+    return max(1.0, (next_reset(now, reset_day) - now).total_seconds())
+
+
+def parse_reset_header(value, now=None):
+    """
+    Kvóta nullázódás fejléc értelmezése
+
+    Returns:
+        datetime: A nullázódás időpontja (UTC), vagy None ha nem értelmezhető
+    """
+    if not value:
+        return None
+    now = now or datetime.now(timezone.utc)
+    try:
+        number = float(value)
+    except ValueError:
+        try:
+            reset = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+        except ValueError:
+            return None
+        return reset if reset.tzinfo else reset.replace(tzinfo=timezone.utc)
+    # Nagy szám: epoch időbélyeg, egyébként hátralévő másodpercek
+    if number > 10 ** 9:
+        return datetime.fromtimestamp(number, timezone.utc)
+    return now + timedelta(seconds=number)
+
+
+class QuotaTracker:
+    """A havi kérés keret követése a válasz fejlécekből"""
+
+    def __init__(self, reset_day=1):
+        """
+        Args:
+            reset_day: A kvóta megújulásának napja a hónapban, ha a válasz
+                       fejlécek nem adják meg a nullázódás idejét
+        """
+        self.remaining = None
+        self.used = None
+        self.last_cost = 1
+        self.reset_day = reset_day
+        self.reset_at = None
+
+    def update(self, headers):
+        """x-requests-remaining / -used / -last fejlécek feldolgozása"""
+        def header_int(name):
+            try:
+                return int(float(headers.get(name)))
+            except (TypeError, ValueError):
+                return None
+
+        remaining = header_int('x-requests-remaining')
+        if remaining is not None:
+            self.remaining = remaining
+        used = header_int('x-requests-used')
+        if used is not None:
+            self.used = used
+        last = header_int('x-requests-last')
+        if last is not None:
+            self.last_cost = max(1, last)
+        for name in RESET_HEADERS:
+            reset = parse_reset_header(headers.get(name))
+            if reset is not None:
+                self.reset_at = reset
+                break
+
+    def seconds_left(self, now=None):
+        """Másodpercek a kvóta nullázódásáig (fejlécből, különben a reset_day szerint)"""
+        now = now or datetime.now(timezone.utc)
+        if self.reset_at is not None and self.reset_at > now:
+            return max(1.0, (self.reset_at - now).total_seconds())
+        return seconds_until_reset(now, self.reset_day)
+
+
+class PollPlanner:
+    """
+    Lekérdezési ütemterv a kvóta és a kezdési időpontok alapján
+
+    Minden bajnokság alap időközt kap a következő kezdésig hátralévő idő
+    szerint; ha ezek együtt többet költenének, mint amennyi a hónapból
+    hátralévő keretbe belefér, minden időközt arányosan megnyújt.
+    """
+
+    def __init__(self, reserve=20, min_interval=60):
+        """
+        Args:
+            reserve: Ennyi kérést tartalékol a kvóta nullázódásáig
+            min_interval: Legrövidebb időköz bajnokságonként (mp)
+        """
+        self.reserve = reserve
+        self.min_interval = min_interval
+
+    @staticmethod
+    def base_interval(hours_to_kickoff):
+        """Alap időköz a következő kezdésig hátralévő órák szerint"""
+        if hours_to_kickoff is None:
+            return IDLE_INTERVAL
+        for limit, interval in BASE_INTERVALS:
+            if hours_to_kickoff <= limit:
+                return interval
+        return IDLE_INTERVAL
+
+    def plan(self, kickoffs, remaining, seconds_left, cost=1):
+        """
+        Időközök kiszámítása
+
+        Args:
+            kickoffs: Bajnokság -> órák a következő (vagy folyó) mérkőzésig, vagy None
+            remaining: Hátralévő kérések (None = ismeretlen)
+            seconds_left: Másodpercek a kvóta nullázódásáig
+            cost: Egy lekérdezés kvóta költsége
+
+        Returns:
+            dict: Bajnokság -> időköz másodpercben
+        """
+        intervals = {league: self.base_interval(hours) for league, hours in kickoffs.items()}
+        if remaining is None or not intervals:
+            return intervals
+
+        # Tervezett költés / mp vs. megengedett költés / mp
+        planned_rate = sum(cost / interval for interval in intervals.values())
+        budget = max(0, remaining - self.reserve)
+        allowed_rate = budget / seconds_left
+
+        if allowed_rate <= 0:
+            return {league: seconds_left for league in intervals}
+
+        stretch = max(1.0, planned_rate / allowed_rate)
+        return {
+            league: max(self.min_interval, interval * stretch)
+            for league, interval in intervals.items()
+        }
+
+
+def hours_to_next_kickoff(matches, now=None):
+    """
+    Órák a bajnokság következő (vagy még folyó) mérkőzéséig
+
+    Returns:
+        float: Negatív érték = élő mérkőzés, None = nincs ismert mérkőzés
+    """
+    now = now or datetime.now(timezone.utc)
+    best = None
+    for match in matches:
+        match_time = parse_commence_time(match.get('commence_time', ''))
+        if match_time is None:
+            continue
+        if match_time.tzinfo is None:
+            match_time = match_time.replace(tzinfo=timezone.utc)
+        hours = (match_time - now).total_seconds() / 3600
+        if hours < -LIVE_WINDOW_HOURS:
+            continue
+        # Élő mérkőzés esetén 0-nak vesszük (a leggyakoribb frissítés)
+        hours = max(0.0, hours)
+        if best is None or hours < best:
+            best = hours
+    return best
+
+
+def run_daemon(api_key, sports=None, json_path='data/live_matches.json',
+               reserve=20, min_interval=60, max_backoff=3600, max_polls=None,
+               reset_day=1):
+    """
+    Folyamatos, kvóta-kímélő lekérdezés
+
+    Args:
+        api_key: The Odds API kulcs
+        sports: Sport kulcs -> bajnokság név (alapért.: SPORTS)
+        json_path: Kimeneti fájl
+        reserve: Tartalék kérések a kvóta nullázódásáig
+        min_interval: Legrövidebb időköz bajnokságonként (mp)
+        max_backoff: Leghosszabb várakozás 429 után (mp)
+        max_polls: Ennyi lekérdezés után leáll, a sikertelenekkel együtt
+                   (None = végtelen)
+        reset_day: A havi kvóta megújulásának napja, ha az API nem küldi
+    
+    Returns:
+        bool: False, ha az API kulcs érvénytelen
+    """
+    sports = sports or SPORTS
+    session = make_session()
+    quota = QuotaTracker(reset_day)
+    planner = PollPlanner(reserve, min_interval)
+    history = OddsHistoryStore()
+    teams = TeamRegistry.load()
+
+    kickoffs = {sport_key: None for sport_key in sports}
+    latest = {sport_key: [] for sport_key in sports}
+    # Induláskor minden bajnokságot egyszer lekérdezünk
+    next_due = {sport_key: 0.0 for sport_key in sports}
+    backoff = 0
+    polls = 0
+
+    print("🤖 ÉLŐ ODDS DAEMON")
+    print("=" * 70)
+
+    while max_polls is None or polls < max_polls:
+        sport_key = min(next_due, key=next_due.get)
+        wait = next_due[sport_key] - time.time()
+        if wait > 0:
+            time.sleep(wait)
+
+        league_name = sports[sport_key]
+        polls += 1
+        try:
+            response = request_league_odds(api_key, sport_key, session)
+        except Exception as e:
+            print(f"❌ {league_name}: {e}")
+            next_due[sport_key] = time.time() + min_interval
+            continue
+        quota.update(response.headers)
+
+        if response.status_code == 401:
+            print("❌ API kulcs érvénytelen! A daemon leáll.")
+            return False
+
+        if response.status_code == 429:
+            # Exponenciális visszalépés (a Retry-After fejléc elsőbbséget élvez)
+            try:
+                retry_after = float(response.headers.get('Retry-After'))
+            except (TypeError, ValueError):
+                retry_after = None
+            backoff = min(max_backoff, backoff * 2 if backoff else min_interval)
+            delay = retry_after if retry_after is not None else backoff
+            print(f"⚠️ Rate limit - várakozás {int(delay)} mp")
+            resume = time.time() + delay
+            for key in next_due:
+                next_due[key] = max(next_due[key], resume)
+            continue
+
+        backoff = 0
+        if response.status_code == 200:
+            # Hibás válasz vagy mentési hiba nem állítja le a daemont
+            try:
+                matches = response.json()
+                kickoffs[sport_key] = hours_to_next_kickoff(matches)
+                latest[sport_key] = annotate_live_matches([
+                    parsed for parsed in (parse_live_match(m, league_name, annotate=False) for m in matches)
+                    if parsed
+                ])
+                teams.canonicalize_all(latest[sport_key])
+                teams.save()
+                save_live_matches([m for key in sports for m in latest[key]], json_path)
+                history.record_live_matches(latest[sport_key])
+            except Exception as e:
+                print(f"❌ {league_name}: feldolgozási hiba: {e}")
+                next_due[sport_key] = time.time() + min_interval
+                continue
+        else:
+            print(f"❌ {league_name}: Hiba {response.status_code}")
+
+        # Ütemterv újraszámolása a friss kvóta adatokkal
+        intervals = planner.plan(kickoffs, quota.remaining, quota.seconds_left(), quota.last_cost)
+        next_due[sport_key] = time.time() + intervals[sport_key]
+
+        remaining = quota.remaining if quota.remaining is not None else '?'
+        print(f"⚽ {league_name}: {len(latest[sport_key])} mérkőzés | "
+              f"következő: {int(intervals[sport_key] // 60)} perc múlva | "
+              f"🔢 fennmaradó kérések: {remaining}")
+
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kvóta-kímélő élő odds daemon")
+    parser.add_argument('--api-key', default=os.environ.get('ODDS_API_KEY'),
+                        help="The Odds API kulcs (vagy ODDS_API_KEY környezeti változó)")
+    parser.add_argument('--reserve', type=int, default=20,
+                        help="tartalék kérések a kvóta nullázódásáig")
+    parser.add_argument('--min-interval', type=int, default=60,
+                        help="legrövidebb időköz bajnokságonként (mp)")
+    parser.add_argument('--reset-day', type=int, default=1, choices=range(1, 32), metavar='NAP',
+                        help="a havi kvóta megújulásának napja (ha az API fejléc nem adja meg)")
+    args = parser.parse_args()
+
+    api_key = args.api_key or input("🔑 Add meg az API kulcsodat: ").strip()
+    if not api_key:
+        print("\n❌ Nincs API kulcs!")
+        print("📝 Regisztrálj: https://the-odds-api.com/")
+        return
+
+    try:
+        run_daemon(api_key, reserve=args.reserve, min_interval=args.min_interval,
+                   reset_day=args.reset_day)
+    except KeyboardInterrupt:
+        print("\n👋 Daemon leállítva")
+
+
+if __name__ == "__main__":
+    main()
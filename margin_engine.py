@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Vektorizált bookmaker margin és "fair" valószínűség motor
+Egy teljes odds tömbön (mérkőzések × bookmakerek × kimenetek) számolja
+a margint és a margin nélküli valószínűségeket, négyféle módszerrel:
+- proportional: arányos normalizálás (1/odds / összeg)
+- power:        p_i = (1/odds_i)^k, k úgy, hogy az összeg 1 legyen
+- odds_ratio:   p_i = q_i / (c + q_i - c*q_i), c úgy, hogy az összeg 1 legyen
+- shin:         Shin (1993) modell a bennfentes kereskedés z arányával
+"""
+
+import numpy as np
+
+METHODS = ('proportional', 'power', 'odds_ratio', 'shin')
+
+
+def as_odds_array(odds):
+    """
+    Odds tömb előkészítése: float64, az érvénytelen (<= 0 vagy hiányzó)
+    értékek NaN-ná alakítva. Az utolsó tengely a kimeneteké.
+
+    Az 1.0-s odds érvényes (biztos kimenet, q = 1): a mérkőzés margint kap,
+    nem esik ki az átlagból.
+    """
+    odds = np.array(odds, dtype=np.float64)
+    odds[~(odds > 0.0)] = np.nan
+    return odds
+
+
+def implied_probabilities(odds):
+    """Nyers implikált valószínűségek (1/odds)"""
+    return 1.0 / as_odds_array(odds)
+
+
+def margins(odds):
+    """
+    Margin (overround) százalékban: (Σ 1/odds - 1) * 100
+
+    Args:
+        odds: Tömb (..., kimenetek)
+
+    Returns:
+        np.ndarray: A kimenet tengely nélküli alakú tömb (NaN, ha hiányos)
+    """
+    return (implied_probabilities(odds).sum(axis=-1) - 1.0) * 100.0
+
+
+def _solve(func, low, high, iterations=60):
+    """
+    Vektorizált felezéses gyökkeresés: func(x) monoton csökkenő x-ben,
+    func(low) >= 0 >= func(high) elemenként
+    """
+    low = np.array(low, dtype=np.float64)
+    high = np.array(high, dtype=np.float64)
+    for _ in range(iterations):
+        mid = 0.5 * (low + high)
+        positive = func(mid) > 0
+        low = np.where(positive, mid, low)
+        high = np.where(positive, high, mid)
+    return 0.5 * (low + high)
+
+
+def _proportional(q, total):
+    return q / total[..., None]
+
+
+def _power(q, total):
+    # Σ q_i^k = 1; k >= 1, mert q_i < 1 és Σ q_i > 1 (k-ban csökkenő)
+    log_q = np.log(q)
+
+    def excess(k):
+        return np.exp(log_q * k[..., None]).sum(axis=-1) - 1.0
+
+    k = _solve(excess, np.ones(total.shape), np.full(total.shape, 100.0))
+    return np.exp(log_q * k[..., None])
+
+
+def _odds_ratio(q, total):
+    # p_i = q_i / (c + q_i - c*q_i); c >= 1 (c-ben csökkenő összeg)
+    def excess(c):
+        c = c[..., None]
+        return (q / (c + q - c * q)).sum(axis=-1) - 1.0
+
+    c = _solve(excess, np.ones(total.shape), np.full(total.shape, 1000.0))
+    c = c[..., None]
+    return q / (c + q - c * q)
+
+
+def _shin(q, total):
+    # p_i = (sqrt(z^2 + 4(1-z) q_i^2 / Σq) - z) / (2(1-z)); z a [0, 1) tartományban
+    def probabilities(z):
+        z = z[..., None]
+        return (np.sqrt(z * z + 4.0 * (1.0 - z) * q * q / total[..., None]) - z) / (2.0 * (1.0 - z))
+
+    def excess(z):
+        return probabilities(z).sum(axis=-1) - 1.0
+
+    z = _solve(excess, np.zeros(total.shape), np.full(total.shape, 0.999))
+    return probabilities(z)
+
+
+_SOLVERS = {
+    'proportional': _proportional,
+    'power': _power,
+    'odds_ratio': _odds_ratio,
+    'shin': _shin,
+}
+
+
+def fair_probabilities(odds, method='proportional'):
+    """
+    Margin nélküli ("fair") valószínűségek
+
+    Args:
+        odds: Tömb (..., kimenetek), pl. (mérkőzés, bookmaker, 3)
+        method: 'proportional', 'power', 'odds_ratio' vagy 'shin'
+
+    Returns:
+        np.ndarray: Azonos alakú tömb; a hiányos sorok NaN-ok
+    """
+    if method not in _SOLVERS:
+        raise ValueError(f"Ismeretlen módszer: {method} (választható: {', '.join(METHODS)})")
+
+    q = implied_probabilities(odds)
+    total = q.sum(axis=-1)
+    # A megoldók q_i < 1-et feltételeznek (1.0 alatti / egyenlő odds nélkül)
+    valid = np.isfinite(total) & (total > 1.0) & (q < 1.0).all(axis=-1)
+
+    result = np.full(q.shape, np.nan)
+    if not valid.any():
+        return result
+
+    # Csak a margint tartalmazó, teljes sorokat oldjuk meg
+    q_valid = q[valid]
+    result[valid] = _SOLVERS[method](q_valid, total[valid])
+
+    # Margin nélküli, alulárazott vagy 1.0-s oddsot tartalmazó sorok: egyszerű normalizálás
+    underround = np.isfinite(total) & ~valid & (total > 0)
+    if underround.any():
+        result[underround] = q[underround] / total[underround][..., None]
+
+    return result
+
+
+def odds_matrix(matches, bookmakers=None):
+    """
+    live_matches.json formátumú mérkőzésekből odds tömb
+
+    Args:
+        matches: Mérkőzések 'bookmakers' listával (bookmaker, odds_home/draw/away)
+        bookmakers: Bookmaker nevek sorrendje (alapért.: előfordulási sorrend)
+
+    Returns:
+        tuple: (tömb (mérkőzés, bookmaker, 3), bookmaker nevek listája)
+    """
+    if bookmakers is None:
+        bookmakers = []
+        for match in matches:
+            for bookmaker in match.get('bookmakers', []):
+                if bookmaker['bookmaker'] not in bookmakers:
+                    bookmakers.append(bookmaker['bookmaker'])
+    index = {name: i for i, name in enumerate(bookmakers)}
+
+    odds = np.full((len(matches), len(bookmakers), 3), np.nan)
+    for m, match in enumerate(matches):
+        for bookmaker in match.get('bookmakers', []):
+            b = index.get(bookmaker['bookmaker'])
+            if b is not None:
+                odds[m, b] = (bookmaker.get('odds_home') or np.nan,
+                              bookmaker.get('odds_draw') or np.nan,
+                              bookmaker.get('odds_away') or np.nan)
+
+    return as_odds_array(odds), bookmakers
+
+
+def annotate_live_matches(matches, method='proportional'):
+    """
+    Élő mérkőzések (parse_live_match kimenete) margin és fair
+    valószínűség mezőinek kitöltése egyetlen vektorizált lépésben
+
+    Bookmakerenként: 'margin', 'fair_home', 'fair_draw', 'fair_away';
+    mérkőzésenként: 'avg_margin' és 'fair_method'. A számítás a nyers
+    árakból történik; az odds mezők csak utána kerekülnek 2 tizedesre.
+
+    Args:
+        matches: Mérkőzések 'bookmakers' listával (helyben módosulnak)
+        method: A fair valószínűség módszere
+
+    Returns:
+        list: Ugyanazok a mérkőzések
+    """
+    if not matches:
+        return matches
+
+    odds, bookmakers = odds_matrix(matches)
+    index = {name: i for i, name in enumerate(bookmakers)}
+    margin = margins(odds)
+    fair = fair_probabilities(odds, method)
+    priced = np.isfinite(margin)
+    count = priced.sum(axis=-1)
+    avg_margin = np.where(priced, margin, 0.0).sum(axis=-1) / np.maximum(count, 1)
+    avg_margin[count == 0] = np.nan
+
+    for m, match in enumerate(matches):
+        for bookmaker in match.get('bookmakers', []):
+            b = index[bookmaker['bookmaker']]
+            for field in ('odds_home', 'odds_draw', 'odds_away'):
+                if bookmaker.get(field) is not None:
+                    bookmaker[field] = round(bookmaker[field], 2)
+            if priced[m, b]:
+                bookmaker['margin'] = round(float(margin[m, b]), 2)
+                bookmaker['fair_home'] = round(float(fair[m, b, 0]), 4)
+                bookmaker['fair_draw'] = round(float(fair[m, b, 1]), 4)
+                bookmaker['fair_away'] = round(float(fair[m, b, 2]), 4)
+        if np.isfinite(avg_margin[m]):
+            match['avg_margin'] = round(float(avg_margin[m]), 2)
+        match['fair_method'] = method
+
+    return matches
+
+
+def match_columns(matches):
+    """
+    OddsScraper formátumú mérkőzésekből (odds_home/draw/away) odds tömb
+
+    Returns:
+        np.ndarray: (mérkőzés, 3) alakú tömb
+    """
+    if hasattr(matches, 'column'):
+        # MatchTable: az oszlopok másolás nélkül olvashatók
+        return as_odds_array(np.column_stack([
+            np.frombuffer(matches.column(name), dtype=np.float64)
+            for name in ('odds_home', 'odds_draw', 'odds_away')
+        ]).reshape(-1, 3))
+    return as_odds_array([
+        [m.get('odds_home') or np.nan, m.get('odds_draw') or np.nan, m.get('odds_away') or np.nan]
+        for m in matches
+    ]).reshape(-1, 3)
+
+
+def analyze_matches(matches, method='proportional'):
+    """
+    Történelmi (OddsScraper) mérkőzések margin elemzése egy menetben
+
+    Args:
+        matches: Mérkőzés dict-ek vagy MatchTable
+        method: A fair valószínűség módszere
+
+    Returns:
+        dict: 'margin' (%), 'fair_home', 'fair_draw', 'fair_away' tömbök
+    """
+    odds = match_columns(matches)
+    fair = fair_probabilities(odds, method)
+    return {
+        'margin': margins(odds),
+        'fair_home': fair[:, 0],
+        'fair_draw': fair[:, 1],
+        'fair_away': fair[:, 2],
+    }
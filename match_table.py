@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tömör mérkőzés reprezentációk dict-ek helyett
+- MatchRecord: __slots__ alapú rekord egy mérkőzéshez
+- MatchTable: oszlopos tároló típusos tömbökkel és közös (internált)
+  string táblával; iterálás másolás nélküli nézeteken keresztül
+Mindkettő exportálható a meglévő CSV/JSON sémára
+"""
+
+import math
+from array import array
+from collections.abc import Mapping
+
+from odds_formats import (FIELDNAMES, FIELDS, MISSING_INT, MISSING_STRING, TYPECODES,
+                          read_columnar_columns, write_columnar_arrays)
+
+
+class MatchRecord:
+    """Egy mérkőzés __slots__ alapú rekordként (a dict-nél jóval kisebb)"""
+
+    __slots__ = tuple(FIELDNAMES)
+
+    def __init__(self, **values):
+        for name in FIELDNAMES:
+            setattr(self, name, values.get(name))
+
+    @classmethod
+    def from_dict(cls, match):
+        return cls(**match)
+
+    def get(self, name, default=None):
+        value = getattr(self, name, None)
+        return default if value is None else value
+
+    def to_dict(self):
+        """Dict a CSV/JSON sémával"""
+        return {name: getattr(self, name) for name in FIELDNAMES}
+
+    def __repr__(self):
+        return f"MatchRecord({self.date!r}, {self.home_team!r} - {self.away_team!r})"
+
+
+class MatchView(Mapping):
+    """
+    Másolás nélküli nézet a MatchTable egy sorára
+
+    Dict-ként olvasható (get, kulcsok, csv.DictWriter), de az értékeket
+    közvetlenül a tábla oszlopaiból adja vissza.
+    """
+
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table, index):
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, name):
+        return self._table.value(name, self._index)
+
+    def __iter__(self):
+        return iter(FIELDNAMES)
+
+    def __len__(self):
+        return len(FIELDNAMES)
+
+    def to_dict(self):
+        return {name: self._table.value(name, self._index) for name in FIELDNAMES}
+
+    def __repr__(self):
+        return f"MatchView({self.to_dict()!r})"
+
+
+class MatchTable:
+    """
+    Oszlopos mérkőzés tároló
+
+    Minden mező egy típusos tömb (string mezők: index a közös string
+    táblába, odds: float64, gólok: int32). Hiányzó érték: NaN / sentinel.
+    """
+
+    def __init__(self):
+        self.strings = []
+        self._string_ids = {}
+        self.columns = {name: array(TYPECODES[kind]) for name, kind in FIELDS}
+        self._kinds = dict(FIELDS)
+
+    # --- Építés ---
+
+    def _intern(self, value):
+        if value is None:
+            return MISSING_STRING
+        value = str(value)
+        index = self._string_ids.get(value)
+        if index is None:
+            index = self._string_ids[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+    def append(self, match):
+        """Egy mérkőzés hozzáadása (dict, MatchRecord vagy MatchView)"""
+        for name, kind in FIELDS:
+            value = match.get(name)
+            if kind == 's':
+                self.columns[name].append(self._intern(value))
+            elif kind == 'd':
+                self.columns[name].append(float('nan') if value is None else float(value))
+            else:
+                self.columns[name].append(MISSING_INT if value is None else int(value))
+
+    def extend(self, matches):
+        """Több mérkőzés hozzáadása"""
+        for match in matches:
+            self.append(match)
+
+    # --- Olvasás ---
+
+    def __len__(self):
+        return len(self.columns['date'])
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return MatchView(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield MatchView(self, index)
+
+    def value(self, name, index):
+        """Egy mező értéke (hiányzó érték: None)"""
+        raw = self.columns[name][index]
+        kind = self._kinds[name]
+        if kind == 's':
+            return None if raw == MISSING_STRING else self.strings[raw]
+        if kind == 'd':
+            return None if math.isnan(raw) else raw
+        return None if raw == MISSING_INT else raw
+
+    def column(self, name):
+        """Az oszlop nyers tömbje memoryview-ként (másolás nélkül)"""
+        return memoryview(self.columns[name])
+
+    def record(self, index):
+        """Egy sor MatchRecord-ként"""
+        return MatchRecord(**self[index].to_dict())
+
+    # --- Export ---
+
+    def to_dicts(self):
+        """Dict-ek generátora a CSV/JSON sémával"""
+        for index in range(len(self)):
+            yield {name: self.value(name, index) for name in FIELDNAMES}
+
+    def write_columnar(self, filename):
+        """
+        Mentés az odds_formats oszlopos formátumába
+
+        A tömbök és a string tábla újra-internálás nélkül kerülnek a fájlba.
+        """
+        write_columnar_arrays(filename, self.strings, self.columns, len(self))
+
+    @classmethod
+    def read_columnar(cls, filename):
+        """Tábla betöltése oszlopos fájlból (soronkénti feldolgozás nélkül)"""
+        strings, columns = read_columnar_columns(filename)
+        table = cls()
+        table.strings = strings
+        table._string_ids = {value: index for index, value in enumerate(strings)}
+        table.columns = columns
+        return table
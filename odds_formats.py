@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tömör kimeneti formátumok az odds adatokhoz
+- Típusos, oszlopos bináris formátum (.odc) közös string táblával
+- Előre tömörített JSON (gzip / brotli)
+Mindkettőhöz tartozik gyors olvasó
+"""
+
+import contextlib
+import gzip
+import json
+import math
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+
+try:
+    import brotli
+except ImportError:  # A brotli tömörítés opcionális
+    brotli = None
+
+# Mezők és típusaik (a CSV/JSON séma sorrendjében)
+# 's' = string tábla index, 'd' = float64, 'i' = int32
+FIELDS = [
+    ('date', 's'),
+    ('league', 's'),
+    ('home_team', 's'),
+    ('away_team', 's'),
+    ('odds_home', 'd'),
+    ('odds_draw', 'd'),
+    ('odds_away', 'd'),
+    ('home_goals', 'i'),
+    ('away_goals', 'i'),
+    ('result', 's'),
+    ('bookmaker', 's'),
+]
+FIELDNAMES = [name for name, _ in FIELDS]
+
+MAGIC = b'ODDC'
+VERSION = 2
+# 1: '\0'-val elválasztott string tábla (csak olvasás)
+# 2: hossz-prefixes (uint32) string tábla
+SUPPORTED_VERSIONS = (1, 2)
+
+# Hiányzó érték jelölése típusonként
+MISSING_STRING = 0xFFFFFFFF
+MISSING_INT = -2 ** 31
+
+TYPECODES = {'s': 'I', 'd': 'd', 'i': 'i'}
+
+
+def _ensure_dir(filename):
+    directory = os.path.dirname(filename)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+
+@contextlib.contextmanager
+def _replace_on_success(filename):
+    """Írás ideiglenes fájlba, siker esetén atomikus csere (os.replace)"""
+    _ensure_dir(filename)
+    tmp_path = filename + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            yield f
+        os.replace(tmp_path, filename)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+
+
+def _encode_strings(strings):
+    """String tábla: stringenként uint32 bájthossz + UTF-8 bájtok"""
+    parts = []
+    for value in strings:
+        encoded = value.encode('utf-8')
+        parts.append(struct.pack('<I', len(encoded)))
+        parts.append(encoded)
+    return b''.join(parts)
+
+
+def _decode_strings(blob, count, version):
+    if version == 1:
+        return blob.decode('utf-8').split('\0') if count else []
+    strings = []
+    offset = 0
+    for _ in range(count):
+        (length,) = struct.unpack_from('<I', blob, offset)
+        offset += 4
+        strings.append(blob[offset:offset + length].decode('utf-8'))
+        offset += length
+    return strings
+
+
+def _write_header(f, count, strings):
+    string_blob = _encode_strings(strings)
+    f.write(MAGIC)
+    f.write(struct.pack('<HII', VERSION, count, len(strings)))
+    f.write(struct.pack('<I', len(string_blob)))
+    f.write(string_blob)
+
+
+def _to_little_endian(column):
+    if sys.byteorder == 'big':
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column
+
+
+def write_columnar(rows, filename):
+    """
+    Mérkőzések mentése oszlopos bináris formátumba
+
+    Felépítés: MAGIC, verzió, sorok száma, string tábla (stringenként
+    uint32 hossz + UTF-8 bájtok, így bármilyen karaktert tartalmazhat),
+    majd oszloponként a nyers tömb (little-endian). Ideiglenes fájlba ír,
+    és atomikusan cseréli a célfájlt.
+
+    Args:
+        rows: Mérkőzés dict-ek (a CSV/JSON sémával)
+        filename: Kimeneti fájl
+    """
+    strings = {}
+    columns = {name: array(TYPECODES[kind]) for name, kind in FIELDS}
+
+    def intern(value):
+        if value is None:
+            return MISSING_STRING
+        value = str(value)
+        index = strings.get(value)
+        if index is None:
+            index = strings[value] = len(strings)
+        return index
+
+    count = 0
+    for row in rows:
+        count += 1
+        for name, kind in FIELDS:
+            value = row.get(name)
+            if kind == 's':
+                columns[name].append(intern(value))
+            elif kind == 'd':
+                columns[name].append(float('nan') if value is None else float(value))
+            else:
+                columns[name].append(MISSING_INT if value is None else int(value))
+
+    write_columnar_arrays(filename, list(strings), columns, count)
+
+
+def write_columnar_arrays(filename, strings, columns, count):
+    """
+    Már oszlopokba rendezett adatok mentése az oszlopos formátumba
+
+    Args:
+        filename: Kimeneti fájl
+        strings: String tábla (lista, az indexek erre mutatnak)
+        columns: Mező név -> array (a FIELDS típusaival)
+        count: Sorok száma
+    """
+    with _replace_on_success(filename) as f:
+        _write_header(f, count, strings)
+        for name, _ in FIELDS:
+            f.write(_to_little_endian(columns[name]).tobytes())
+
+
+class ColumnarWriter:
+    """
+    Oszlopos fájl írása darabonként, a teljes adat memóriában tartása nélkül
+
+    Az oszlopok ideiglenes fájlokba gyűlnek, a lezáráskor (close) kerülnek
+    a string táblával együtt a végleges fájlba.
+
+    Használat:
+        with ColumnarWriter('data/odds_data.odc') as writer:
+            writer.append({'date': [...], ...}, count)
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.strings = []
+        self._string_ids = {}
+        self.count = 0
+        _ensure_dir(filename)
+        self._tmp = tempfile.TemporaryDirectory(dir=os.path.dirname(filename) or '.')
+        self._parts = {name: open(os.path.join(self._tmp.name, name), 'wb') for name in FIELDNAMES}
+
+    def intern(self, value):
+        """String tábla index (None -> MISSING_STRING)"""
+        if value is None:
+            return MISSING_STRING
+        index = self._string_ids.get(value)
+        if index is None:
+            index = self._string_ids[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+    def append(self, columns, count):
+        """
+        Egy darab hozzáfűzése
+
+        Args:
+            columns: Mező név -> array vagy numpy tömb (string mezőknél már
+                     internált indexek; a FIELDS típusaival, little-endian)
+            count: Sorok száma a darabban
+        """
+        for name, _ in FIELDS:
+            column = columns[name]
+            if isinstance(column, array):
+                column = _to_little_endian(column)
+            self._parts[name].write(column.tobytes())
+        self.count += count
+
+    def close(self):
+        """A végleges fájl összeállítása (ideiglenes fájlon és os.replace-en át)"""
+        if self._parts is None:
+            return
+        for part in self._parts.values():
+            part.close()
+
+        try:
+            with _replace_on_success(self.filename) as f:
+                _write_header(f, self.count, self.strings)
+                for name in FIELDNAMES:
+                    with open(self._parts[name].name, 'rb') as part:
+                        shutil.copyfileobj(part, f)
+        finally:
+            self._parts = None
+            self._tmp.cleanup()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            for part in self._parts.values():
+                part.close()
+            self._parts = None
+            self._tmp.cleanup()
+
+
+def read_columnar_columns(filename):
+    """
+    Oszlopos fájl beolvasása oszloponként (dict-ek építése nélkül)
+
+    Returns:
+        tuple: (string tábla lista, oszlop név -> array dict)
+    """
+    with open(filename, 'rb') as f:
+        data = f.read()
+
+    if data[:4] != MAGIC:
+        raise ValueError(f"Nem oszlopos odds fájl: {filename}")
+    version, count, string_count, blob_size = struct.unpack_from('<HIII', data, 4)
+    if version not in SUPPORTED_VERSIONS:
+        raise ValueError(f"Nem támogatott verzió: {version}")
+
+    offset = 4 + struct.calcsize('<HIII')
+    strings = _decode_strings(data[offset:offset + blob_size], string_count, version)
+    offset += blob_size
+
+    columns = {}
+    for name, kind in FIELDS:
+        column = array(TYPECODES[kind])
+        size = column.itemsize * count
+        column.frombytes(data[offset:offset + size])
+        columns[name] = _to_little_endian(column)
+        offset += size
+
+    return strings, columns
+
+
+def read_columnar(filename):
+    """
+    Oszlopos fájl beolvasása mérkőzés dict-ek listájaként
+
+    Returns:
+        list: Mérkőzések a CSV/JSON sémával (hiányzó érték: None)
+    """
+    strings, columns = read_columnar_columns(filename)
+
+    decoded = []
+    for name, kind in FIELDS:
+        column = columns[name]
+        if kind == 's':
+            decoded.append([None if i == MISSING_STRING else strings[i] for i in column])
+        elif kind == 'd':
+            decoded.append([None if math.isnan(v) else v for v in column])
+        else:
+            decoded.append([None if v == MISSING_INT else v for v in column])
+
+    return [dict(zip(FIELDNAMES, values)) for values in zip(*decoded)]
+
+
+def write_json_compressed(rows, filename, codec='gzip'):
+    """
+    Tömör (szóközök nélküli) JSON mentése előre tömörítve
+
+    Args:
+        rows: Mérkőzés dict-ek
+        filename: Kimeneti fájl (pl. data/odds_data.json.gz)
+        codec: 'gzip' vagy 'brotli'
+    """
+    payload = json.dumps(list(rows), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    if codec == 'gzip':
+        compressed = gzip.compress(payload, compresslevel=6)
+    elif codec == 'brotli':
+        if brotli is None:
+            raise RuntimeError("A brotli csomag nincs telepítve (pip install brotli)")
+        compressed = brotli.compress(payload, quality=9)
+    else:
+        raise ValueError(f"Ismeretlen tömörítés: {codec}")
+
+    _ensure_dir(filename)
+    tmp_path = filename + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(compressed)
+    os.replace(tmp_path, filename)
+
+
+def read_json_compressed(filename):
+    """Tömörített JSON beolvasása (a kiterjesztés alapján: .gz / .br)"""
+    with open(filename, 'rb') as f:
+        data = f.read()
+
+    if filename.endswith('.br'):
+        if brotli is None:
+            raise RuntimeError("A brotli csomag nincs telepítve (pip install brotli)")
+        data = brotli.decompress(data)
+    else:
+        data = gzip.decompress(data)
+
+    return json.loads(data)
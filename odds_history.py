@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Odds idősor tároló (csak hozzáfűzés)
+A live_matches.json minden frissítéséből csak a megváltozott árakat menti
+(mérkőzés, bookmaker, kimenet) kulcsonként, szegmens fájlokba görgetve
+
+Felépítés (data/odds_history/):
+- keys.jsonl      - kulcs tábla: [kulcs id, mérkőzés id, bookmaker, kimenet]
+- manifest.json   - szegmensek: fájl, időtartam, érintett mérkőzések
+- seg-NNNNNN.jsonl(.gz) - első sor: teljes állapot a szegmens elején,
+                          utána [időbélyeg, kulcs id, ár] változás rekordok
+"""
+
+import bisect
+import gzip
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+OUTCOMES = (('home', 'odds_home'), ('draw', 'odds_draw'), ('away', 'odds_away'))
+
+
+def match_id(match):
+    """Mérkőzés azonosító a live_matches.json rekordjából"""
+    return f"{match['date']}|{match['home_team']}|{match['away_team']}"
+
+
+def to_timestamp(value):
+    """datetime vagy epoch másodperc -> epoch másodperc"""
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+
+class OddsHistoryStore:
+    """Csak hozzáfűző odds idősor tároló változás alapú rekordokkal"""
+
+    def __init__(self, directory='data/odds_history', segment_records=50000, retain_days=2):
+        """
+        Args:
+            directory: A tároló mappája
+            segment_records: Ennyi változás után új szegmens kezdődik
+            retain_days: Ennyi nappal a kezdés után a mérkőzés kikerül az
+                         élő állapotból (az új szegmensek alap állapotából)
+        """
+        self.directory = directory
+        self.segment_records = segment_records
+        self.retain_days = retain_days
+        os.makedirs(directory, exist_ok=True)
+
+        self._keys = []        # kulcs id -> (mérkőzés, bookmaker, kimenet)
+        self._key_ids = {}
+        self._load_keys()
+
+        self._manifest = self._load_manifest()
+        # Élő állapot: kulcs id -> utolsó ár (az aktív szegmens visszajátszásából)
+        self._last = {}
+        if self._manifest['segments']:
+            active = self._manifest['segments'][-1]
+            self._last = self._replay(active, until=None)
+            if active['file'].endswith('.gz'):
+                # A görgetés az új szegmens megnyitása előtt szakadt meg
+                self._start_segment(max(time.time(), active['end_ts']),
+                                    {str(k): v for k, v in self._last.items()})
+        else:
+            self._start_segment(time.time(), {})
+
+    # --- Belső segédfüggvények ---
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _load_keys(self):
+        try:
+            with open(self._path('keys.jsonl'), 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    key_id, match, bookmaker, outcome = json.loads(line)
+                    if key_id == len(self._keys):
+                        self._keys.append((match, bookmaker, outcome))
+                        self._key_ids[(match, bookmaker, outcome)] = key_id
+        except FileNotFoundError:
+            pass
+
+    def _load_manifest(self):
+        try:
+            with open(self._path('manifest.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'version': 1, 'segments': []}
+
+    def _save_manifest(self):
+        tmp_path = self._path('manifest.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._manifest, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self._path('manifest.json'))
+
+    def _key_id(self, key, new_keys):
+        key_id = self._key_ids.get(key)
+        if key_id is None:
+            key_id = self._key_ids[key] = len(self._keys)
+            self._keys.append(key)
+            new_keys.append([key_id, *key])
+        return key_id
+
+    def _open_segment(self, segment):
+        path = self._path(segment['file'])
+        if segment['file'].endswith('.gz'):
+            return gzip.open(path, 'rt', encoding='utf-8')
+        return open(path, 'r', encoding='utf-8')
+
+    def _replay(self, segment, until=None):
+        """Szegmens alap állapota + változások (until időbélyegig)"""
+        with self._open_segment(segment) as f:
+            header = json.loads(f.readline())
+            state = {int(k): v for k, v in header['base'].items()}
+            for line in f:
+                if not line.strip():
+                    continue
+                ts, key_id, price = json.loads(line)
+                if until is not None and ts > until:
+                    break
+                state[key_id] = price
+        return state
+
+    def _start_segment(self, ts, base):
+        number = len(self._manifest['segments']) + 1
+        name = f"seg-{number:06d}.jsonl"
+        with open(self._path(name), 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'ts': ts, 'base': base}, separators=(',', ':')) + '\n')
+        self._manifest['segments'].append({
+            'file': name,
+            'start_ts': ts,
+            'end_ts': ts,
+            'records': 0,
+            'matches': sorted({self._keys[int(k)][0] for k in base})
+        })
+        self._save_manifest()
+
+    def _roll_segment(self, ts):
+        """Aktív szegmens lezárása (tömörítve) és új szegmens nyitása"""
+        active = self._manifest['segments'][-1]
+        path = self._path(active['file'])
+        # Sorrend: kész .gz, a manifest már arra mutat, csak utána törlődik a
+        # .jsonl (bármelyik lépésnél megszakadva is olvasható marad a szegmens)
+        with open(path, 'rb') as src, gzip.open(f"{path}.gz.tmp", 'wb') as dst:
+            dst.writelines(src)
+        os.replace(f"{path}.gz.tmp", f"{path}.gz")
+        active['file'] += '.gz'
+        self._save_manifest()
+        os.remove(path)
+
+        # Régen lejátszott mérkőzések kihagyása az új alap állapotból
+        cutoff = datetime.fromtimestamp(ts) - timedelta(days=self.retain_days)
+        base = {}
+        for key_id, price in self._last.items():
+            kickoff = self._keys[key_id][0].split('|', 1)[0]
+            try:
+                if datetime.strptime(kickoff, '%Y-%m-%d %H:%M') < cutoff:
+                    continue
+            except ValueError:
+                pass
+            base[str(key_id)] = price
+        self._last = {int(k): v for k, v in base.items()}
+        self._start_segment(ts, base)
+
+    # --- Nyilvános API ---
+
+    def record_live_matches(self, matches, ts=None):
+        """
+        Egy lekérdezés eredményének rögzítése (csak a változások)
+
+        Args:
+            matches: A live_matches.json 'matches' listájának elemei
+            ts: Időbélyeg (alapért.: most)
+
+        Returns:
+            int: A rögzített változások száma
+        """
+        ts = to_timestamp(ts) if ts is not None else time.time()
+        new_keys = []
+        changes = []
+
+        for match in matches:
+            mid = match_id(match)
+            for bookmaker in match.get('bookmakers', []):
+                for outcome, field in OUTCOMES:
+                    price = bookmaker.get(field)
+                    if price is None:
+                        continue
+                    key_id = self._key_id((mid, bookmaker.get('bookmaker', 'Unknown'), outcome), new_keys)
+                    if self._last.get(key_id) != price:
+                        self._last[key_id] = price
+                        changes.append([ts, key_id, price])
+
+        if new_keys:
+            with open(self._path('keys.jsonl'), 'a', encoding='utf-8') as f:
+                for row in new_keys:
+                    f.write(json.dumps(row, ensure_ascii=False) + '\n')
+
+        if changes:
+            active = self._manifest['segments'][-1]
+            if active['records'] == 0 and not active['matches']:
+                # Az első szegmens az első rögzített változással indul
+                active['start_ts'] = ts
+            with open(self._path(active['file']), 'a', encoding='utf-8') as f:
+                for change in changes:
+                    f.write(json.dumps(change, separators=(',', ':')) + '\n')
+            active['records'] += len(changes)
+            active['end_ts'] = ts
+            touched = {self._keys[key_id][0] for _, key_id, _ in changes}
+            active['matches'] = sorted(touched.union(active['matches']))
+            self._save_manifest()
+
+            if active['records'] >= self.segment_records:
+                self._roll_segment(ts)
+
+        return len(changes)
+
+    def state_as_of(self, when):
+        """
+        Az összes ár állapota egy adott időpontban
+
+        Csak egy szegmenst olvas: a szegmens alap állapotát és a
+        változásokat az időpontig.
+
+        Args:
+            when: datetime vagy epoch másodperc
+
+        Returns:
+            dict: (mérkőzés, bookmaker, kimenet) -> ár
+        """
+        ts = to_timestamp(when)
+        segments = self._manifest['segments']
+        starts = [segment['start_ts'] for segment in segments]
+        index = bisect.bisect_right(starts, ts) - 1
+        if index < 0:
+            return {}
+        state = self._replay(segments[index], until=ts)
+        return {self._keys[key_id]: price for key_id, price in state.items()}
+
+    def price_history(self, match):
+        """
+        Egy mérkőzés árváltozásai
+
+        Csak azokat a szegmenseket olvassa, amelyekben a mérkőzés szerepel.
+
+        Args:
+            match: Mérkőzés azonosító (lásd match_id) vagy live_matches rekord
+
+        Returns:
+            list: (időbélyeg, bookmaker, kimenet, ár) sorok időrendben
+        """
+        mid = match if isinstance(match, str) else match_id(match)
+        keys = {key_id for key_id, key in enumerate(self._keys) if key[0] == mid}
+        history = []
+        last = {}
+
+        for segment in self._manifest['segments']:
+            if mid not in segment['matches']:
+                continue
+            with self._open_segment(segment) as f:
+                header = json.loads(f.readline())
+                records = [(header['ts'], int(k), v) for k, v in header['base'].items() if int(k) in keys]
+                for line in f:
+                    if line.strip():
+                        ts, key_id, price = json.loads(line)
+                        if key_id in keys:
+                            records.append((ts, key_id, price))
+            for ts, key_id, price in records:
+                if last.get(key_id) != price:
+                    last[key_id] = price
+                    _, bookmaker, outcome = self._keys[key_id]
+                    history.append((ts, bookmaker, outcome, price))
+
+        return history
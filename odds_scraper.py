@@ -6,27 +6,146 @@ Gyűjt fogadási szorzó (odds) adatokat különböző forrásokból
 a Stratégia Szimulátor oldalhoz
 """
 
-import requests
 import json
 import csv
-from datetime import datetime, timedelta
+from datetime import datetime
 from bs4 import BeautifulSoup
-import time
-import random
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import instrumentation
+from football_data import FootballDataTable, parse_football_data
+from http_client import HttpCache, TokenBucket, make_session
+from margin_engine import analyze_matches
+from match_table import MatchTable
+from odds_formats import write_columnar, write_json_compressed
+from results_index import season_code
+from rolling_form import FormEngine, scraper_matches
+from shards import write_shards
+from synthetic import generate_matches
+from team_registry import ALIASES_PATH, TeamRegistry
+
+COMPRESSED_EXTENSIONS = {'gzip': '.gz', 'brotli': '.br'}
+
+# A mérkőzés rekordokhoz szükséges Football-Data oszlopok
+MATCH_COLUMNS = ('Date', 'HomeTeam', 'AwayTeam', 'B365H', 'B365D', 'B365A', 'FTHG', 'FTAG', 'FTR')
+
+def current_season_code(today=None):
+    """
+    Az aktuális szezon Football-Data kódja (pl. 2025. március -> '2425',
+    2025. október -> '2526'; július 1-től új szezon, lásd season_code)
+    
+    Két számjegy mindkét évből: a régi f"{év-1}{év[2:]}" alak '202425'-öt
+    adott, ami nem létező URL.
+    """
+    return season_code((today or datetime.now()).toordinal())
+
+
+def season_closed(season, current_season):
+    """
+    Lezárt-e a szezon (pl. '2324' lezárt, ha az aktuális '2425')
+    
+    A lezárt szezonok Football-Data CSV-i már nem változnak.
+    """
+    def start_year(code):
+        # A Football-Data kódok 1993-tól indulnak ('9394')
+        year = int(code[:2])
+        return 1900 + year if year >= 90 else 2000 + year
+    
+    try:
+        return start_year(season) < start_year(current_season)
+    except ValueError:
+        return False
+
 
 class OddsScraper:
     """Odds adat gyűjtő osztály több forrásból"""
     
-    def __init__(self):
-        self.data = []
+    # Football-Data.co.uk alap URL (teszteléshez helyi szerverre cserélhető)
+    football_data_url = "https://www.football-data.co.uk/mmz4281"
+    
+    def __init__(self, max_workers=16, rate_limit=5.0, burst=20,
+                 cache_dir='data/.http_cache', cache_max_bytes=200 * 1024 * 1024,
+                 compact=False, aliases_path=ALIASES_PATH, canonical_names=False):
+        """
+        Args:
+            max_workers: Egyszerre futó letöltések maximális száma
+            rate_limit: Megengedett kérések másodpercenként (token-bucket)
+            burst: Egyszerre elküldhető kérések száma a korlát előtt
+            cache_dir: A Football-Data CSV-k lemezes cache mappája (None = nincs cache)
+            cache_max_bytes: A cache maximális mérete
+            compact: Ha True, a mérkőzések oszlopos MatchTable-ben tárolódnak
+                     dict-ek helyett (sokmilliós adatmennyiséghez)
+            aliases_path: A csapat név alias tábla fájlja (None = csak memóriában)
+            canonical_names: Ha True, a letöltött mérkőzések csapat nevei a
+                     kanonikus névre cserélődnek (team_registry.py); alapból
+                     a forrás nevei maradnak a mentett kimenetekben
+        """
+        self.data = MatchTable() if compact else []
+        # A Football-Data CSV-k összes oszlopa (lásd football_data.py)
+        self.football_data = FootballDataTable()
+        # Források közötti egységes csapat nevek (lásd team_registry.py)
+        self.teams = TeamRegistry.load(aliases_path) if aliases_path else TeamRegistry(None)
+        self.canonical_names = canonical_names
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
+        self.max_workers = max_workers
+        self.session = make_session(self.headers, pool_size=max_workers)
+        self.rate_limiter = TokenBucket(rate_limit, burst)
+        self.http_cache = HttpCache(cache_dir, cache_max_bytes) if cache_dir else None
+    
+    def _get(self, url, cached=False, immutable=False, **kwargs):
+        """
+        GET kérés a közös sessionnel, a kérés korlát betartásával
+        
+        Args:
+            url: A kért URL
+            cached: A lemezes cache használata (feltételes kérés)
+            immutable: Változatlan erőforrás - cache találat esetén nincs kérés
+        """
+        kwargs.setdefault('timeout', 10)
+        
+        if cached and self.http_cache is not None:
+            if immutable:
+                response = self.http_cache.lookup(url)
+                if response is not None:
+                    instrumentation.count('http_cache_hits')
+                    return response
+            self.rate_limiter.acquire()
+            return self.http_cache.fetch(self.session, url, **kwargs)
+        
+        self.rate_limiter.acquire()
+        return self.session.get(url, **kwargs)
     
-    def scrape_odds_api(self, api_key=None):
+    def _fetch_all(self, requests_to_send):
+        """
+        Több GET kérés párhuzamosan (legfeljebb max_workers szálon)
+        
+        Args:
+            requests_to_send: (url, kwargs) párok listája
+            
+        Returns:
+            list: Válaszok vagy kivételek, a bemenet sorrendjében
+        """
+        def fetch(item):
+            url, kwargs = item
+            try:
+                return self._get(url, **kwargs)
+            except Exception as e:
+                return e
+        
+        workers = max(1, min(self.max_workers, len(requests_to_send)))
+        with instrumentation.phase('fetch'), ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(fetch, requests_to_send))
+    
+    def scrape_odds_api(self, api_key=None, sports=None):
         """
         The Odds API használata (Ingyenes tier: 500 request/hó)
         Regisztráció: https://the-odds-api.com/
+        
+        A ligákat párhuzamosan kérdezi le.
         """
         if not api_key:
             print("⚠️ API kulcs szükséges. Regisztrálj: https://the-odds-api.com/")
@@ -36,202 +155,224 @@ class OddsScraper:
         print("📡 The Odds API lekérdezés...")
         
         # Elérhető sportok: soccer_epl, soccer_spain_la_liga, soccer_germany_bundesliga, stb.
-        sports = ['soccer_epl', 'soccer_spain_la_liga', 'soccer_germany_bundesliga', 
-                  'soccer_italy_serie_a', 'soccer_france_ligue_one']
+        if sports is None:
+            sports = ['soccer_epl', 'soccer_spain_la_liga', 'soccer_germany_bundesliga', 
+                      'soccer_italy_serie_a', 'soccer_france_ligue_one']
+        
+        params = {
+            'apiKey': api_key,
+            'regions': 'eu',  # Európai odds
+            'markets': 'h2h',  # Head to head (1X2)
+            'oddsFormat': 'decimal'
+        }
+        responses = self._fetch_all([
+            (f'https://api.the-odds-api.com/v4/sports/{sport}/odds/', {'params': params})
+            for sport in sports
+        ])
         
         all_matches = []
         
-        for sport in sports:
+        for sport, response in zip(sports, responses):
             try:
-                url = f'https://api.the-odds-api.com/v4/sports/{sport}/odds/'
-                params = {
-                    'apiKey': api_key,
-                    'regions': 'eu',  # Európai odds
-                    'markets': 'h2h',  # Head to head (1X2)
-                    'oddsFormat': 'decimal'
-                }
-                
-                response = requests.get(url, params=params, timeout=10)
+                if isinstance(response, Exception):
+                    raise response
                 
                 if response.status_code == 200:
-                    matches = response.json()
+                    with instrumentation.phase('parse'):
+                        matches = response.json()
+                        all_matches.extend(self._parse_odds_api_matches(matches, sport))
                     print(f"✅ {sport}: {len(matches)} mérkőzés")
-                    
-                    for match in matches:
-                        home_team = match['home_team']
-                        away_team = match['away_team']
-                        commence_time = match['commence_time']
-                        
-                        # Odds kinyerése (első bookmaker)
-                        if match['bookmakers']:
-                            bookmaker = match['bookmakers'][0]
-                            outcomes = bookmaker['markets'][0]['outcomes']
-                            
-                            odds_home = next((o['price'] for o in outcomes if o['name'] == home_team), None)
-                            odds_draw = next((o['price'] for o in outcomes if o['name'] == 'Draw'), None)
-                            odds_away = next((o['price'] for o in outcomes if o['name'] == away_team), None)
-                            
-                            all_matches.append({
-                                'date': commence_time,
-                                'league': sport.replace('soccer_', '').upper(),
-                                'home_team': home_team,
-                                'away_team': away_team,
-                                'odds_home': odds_home,
-                                'odds_draw': odds_draw,
-                                'odds_away': odds_away,
-                                'bookmaker': bookmaker['title']
-                            })
-                    
-                    time.sleep(1)  # Rate limiting
                 else:
                     print(f"❌ {sport}: Hiba {response.status_code}")
                     
             except Exception as e:
                 print(f"❌ {sport} hiba: {e}")
         
+        self._canonicalize(all_matches)
         self.data.extend(all_matches)
         return all_matches
     
-    def scrape_football_data(self):
+    def _canonicalize(self, matches):
+        """Kanonikus csapat nevek (csak canonical_names=True esetén)"""
+        if not self.canonical_names:
+            return
+        self.teams.canonicalize_all(matches)
+        self.teams.save()
+    
+    def _parse_odds_api_matches(self, matches, sport):
+        """The Odds API válasz átalakítása mérkőzés rekordokká"""
+        parsed = []
+        
+        for match in matches:
+            home_team = match['home_team']
+            away_team = match['away_team']
+            commence_time = match['commence_time']
+            
+            # Odds kinyerése (első bookmaker)
+            if match['bookmakers']:
+                bookmaker = match['bookmakers'][0]
+                outcomes = bookmaker['markets'][0]['outcomes']
+                
+                odds_home = next((o['price'] for o in outcomes if o['name'] == home_team), None)
+                odds_draw = next((o['price'] for o in outcomes if o['name'] == 'Draw'), None)
+                odds_away = next((o['price'] for o in outcomes if o['name'] == away_team), None)
+                
+                parsed.append({
+                    'date': commence_time,
+                    'league': sport.replace('soccer_', '').upper(),
+                    'home_team': home_team,
+                    'away_team': away_team,
+                    'odds_home': odds_home,
+                    'odds_draw': odds_draw,
+                    'odds_away': odds_away,
+                    'bookmaker': bookmaker['title']
+                })
+        
+        instrumentation.count('rows_parsed', len(matches))
+        instrumentation.count('rows_rejected', len(matches) - len(parsed))
+        return parsed
+    
+    def scrape_football_data(self, leagues=None, seasons=None, full_width=False):
         """
         Football-Data.co.uk - Ingyenes történelmi adatok
         Nem szükséges API kulcs!
+        
+        A liga CSV-ket párhuzamosan tölti le. A letöltött fájlok a lemezes
+        cache-be kerülnek: a lezárt szezonokat nem kéri le újra, az aktuálisat
+        feltételes kéréssel (304 esetén a lemezről).
+        
+        Args:
+            leagues: Liga kód -> név dict (alapért.: az 5 top liga)
+            seasons: Szezon kódok listája, pl. ['2324', '2425'] (alapért.: aktuális)
+            full_width: Ha True, az összes oszlop (Pinnacle, záró árak, O/U,
+                        AH, ...) dekódolódik és a self.football_data táblába
+                        kerül; alapból csak a mérkőzés rekordokhoz szükséges
+                        oszlopok (MATCH_COLUMNS)
         """
         print("📊 Football-Data.co.uk scraping...")
         
-        base_url = "https://www.football-data.co.uk/mmz4281"
+        base_url = self.football_data_url
         
         # Legfrissebb szezon
-        current_year = datetime.now().year
-        season = f"{current_year-1}{str(current_year)[2:]}"
+        current_season = current_season_code()
+        if seasons is None:
+            seasons = [current_season]
         
         # Különböző ligák
-        leagues = {
-            'E0': 'Premier League',
-            'SP1': 'La Liga',
-            'D1': 'Bundesliga',
-            'I1': 'Serie A',
-            'F1': 'Ligue 1'
-        }
+        if leagues is None:
+            leagues = {
+                'E0': 'Premier League',
+                'SP1': 'La Liga',
+                'D1': 'Bundesliga',
+                'I1': 'Serie A',
+                'F1': 'Ligue 1'
+            }
+        
+        print(f"🔍 Letöltés: {', '.join(leagues.values())} ({', '.join(seasons)})...")
+        targets = [(season, league_name) for season in seasons for league_name in leagues.values()]
+        responses = self._fetch_all([
+            # A lezárt szezonok fájljai már nem változnak
+            (f"{base_url}/{season}/{code}.csv",
+             {'cached': True, 'immutable': season_closed(season, current_season)})
+            for season in seasons for code in leagues
+        ])
         
         all_matches = []
+        from_cache = 0
         
-        for code, league_name in leagues.items():
+        for (season, league_name), response in zip(targets, responses):
             try:
-                url = f"{base_url}/{season}/{code}.csv"
-                print(f"🔍 Letöltés: {league_name}...")
-                
-                response = requests.get(url, headers=self.headers, timeout=10)
+                if isinstance(response, Exception):
+                    raise response
                 
                 if response.status_code == 200:
-                    # CSV feldolgozás
-                    lines = response.text.strip().split('\n')
-                    reader = csv.DictReader(lines)
-                    
-                    count = 0
-                    for row in reader:
-                        try:
-                            # Csak ha van odds adat
-                            if 'B365H' in row and row['B365H']:
-                                match_data = {
-                                    'date': row.get('Date', ''),
-                                    'league': league_name,
-                                    'home_team': row.get('HomeTeam', ''),
-                                    'away_team': row.get('AwayTeam', ''),
-                                    'odds_home': float(row.get('B365H', 0)),
-                                    'odds_draw': float(row.get('B365D', 0)),
-                                    'odds_away': float(row.get('B365A', 0)),
-                                    'home_goals': int(row.get('FTHG', 0)),
-                                    'away_goals': int(row.get('FTAG', 0)),
-                                    'result': row.get('FTR', ''),
-                                    'bookmaker': 'Bet365'
-                                }
-                                all_matches.append(match_data)
-                                count += 1
-                        except (ValueError, KeyError) as e:
-                            continue
-                    
-                    print(f"✅ {league_name}: {count} mérkőzés")
-                    time.sleep(0.5)  # Udvarias delay
-                    
+                    with instrumentation.phase('parse'):
+                        table = parse_football_data(
+                            response.text,
+                            columns=None if full_width else MATCH_COLUMNS,
+                            constants={'League': league_name, 'Season': season},
+                        )
+                        matches = self._matches_from_table(table, league_name)
+                    if full_width:
+                        self.football_data.extend(table)
+                    all_matches.extend(matches)
+                    if getattr(response, 'from_cache', False):
+                        from_cache += 1
+                    print(f"✅ {league_name} ({season}): {len(matches)} mérkőzés")
                 else:
                     print(f"❌ {league_name}: Nem érhető el (HTTP {response.status_code})")
                     
             except Exception as e:
                 print(f"❌ {league_name} hiba: {e}")
         
+        if from_cache:
+            print(f"💾 {from_cache}/{len(targets)} fájl a cache-ből")
+        
+        self._canonicalize(all_matches)
         self.data.extend(all_matches)
         return all_matches
     
-    def generate_sample_data(self, num_matches=100):
-        """
-        Minta adatok generálása teszteléshez
-        Használd ezt, ha nincs API kulcsod vagy netes hozzáférésed
-        """
-        print(f"🎲 {num_matches} minta mérkőzés generálása...")
-        
-        teams = [
-            'Manchester City', 'Liverpool', 'Chelsea', 'Arsenal', 'Tottenham',
-            'Barcelona', 'Real Madrid', 'Atletico Madrid', 'Sevilla',
-            'Bayern Munich', 'Dortmund', 'RB Leipzig',
-            'Juventus', 'AC Milan', 'Inter Milan',
-            'PSG', 'Monaco', 'Lyon'
-        ]
+    def _matches_from_table(self, table, league_name):
+        """Mérkőzés rekordok a Football-Data tábla Bet365 1X2 oszlopaiból"""
+        if 'B365H' not in table:
+            return []
         
-        leagues = ['Premier League', 'La Liga', 'Bundesliga', 'Serie A', 'Ligue 1']
+        def column(name, default):
+            return table.values(name) if name in table else [default] * len(table)
         
         matches = []
-        start_date = datetime.now() - timedelta(days=365)
-        
-        for i in range(num_matches):
-            # Random csapatok
-            home, away = random.sample(teams, 2)
-            league = random.choice(leagues)
-            
-            # Reális odds generálás
-            # Hazai előny figyelembevételével
-            base_odds_home = random.uniform(1.5, 3.5)
-            odds_draw = random.uniform(2.8, 4.0)
-            
-            # Away odds inverze a valószínűségeknek
-            total_prob = (1/base_odds_home) + (1/odds_draw)
-            odds_away = 1 / (1 - total_prob)
-            
-            # Eredmény szimuláció az odds alapján
-            rand = random.random()
-            if rand < 1/base_odds_home:
-                result = 'H'
-                home_goals = random.randint(1, 4)
-                away_goals = random.randint(0, home_goals-1)
-            elif rand < (1/base_odds_home + 1/odds_draw):
-                result = 'D'
-                goals = random.randint(0, 3)
-                home_goals = away_goals = goals
-            else:
-                result = 'A'
-                away_goals = random.randint(1, 4)
-                home_goals = random.randint(0, away_goals-1)
-            
-            match_date = start_date + timedelta(days=i*3)
-            
+        for date, home, away, odds_home, odds_draw, odds_away, home_goals, away_goals, result in zip(
+                column('Date', ''), column('HomeTeam', ''), column('AwayTeam', ''),
+                column('B365H', 0.0), column('B365D', 0.0), column('B365A', 0.0),
+                column('FTHG', 0), column('FTAG', 0), column('FTR', '')):
+            # Csak ha van odds adat és értelmezhető eredmény
+            if None in (odds_home, odds_draw, odds_away, home_goals, away_goals):
+                continue
             matches.append({
-                'date': match_date.strftime('%d/%m/%Y'),
-                'league': league,
-                'home_team': home,
-                'away_team': away,
-                'odds_home': round(base_odds_home, 2),
-                'odds_draw': round(odds_draw, 2),
-                'odds_away': round(odds_away, 2),
+                'date': date or '',
+                'league': league_name,
+                'home_team': home or '',
+                'away_team': away or '',
+                'odds_home': odds_home,
+                'odds_draw': odds_draw,
+                'odds_away': odds_away,
                 'home_goals': home_goals,
                 'away_goals': away_goals,
-                'result': result,
-                'bookmaker': 'Simulated'
+                'result': result or '',
+                'bookmaker': 'Bet365'
             })
         
+        instrumentation.count('rows_parsed', len(table))
+        instrumentation.count('rows_rejected', len(table) - len(matches))
+        return matches
+    
+    def generate_sample_data(self, num_matches=100, seed=None):
+        """
+        Minta adatok generálása teszteléshez
+        Használd ezt, ha nincs API kulcsod vagy netes hozzáférésed
+        
+        Az odds-ok egy Poisson gól modell valószínűségeiből készülnek, az
+        eredmények ugyanebből a modellből (lásd synthetic.py). Sokmilliós
+        terheléses teszthez: synthetic.generate_to_file()
+        
+        Args:
+            num_matches: Mérkőzések száma
+            seed: Véletlen seed (reprodukálható minta adatokhoz)
+        """
+        print(f"🎲 {num_matches} minta mérkőzés generálása...")
+        
+        matches = list(generate_matches(num_matches, seed=seed))
+        
         print(f"✅ {len(matches)} minta mérkőzés kész")
         self.data.extend(matches)
         return matches
     
+    def _export_rows(self):
+        """A mérkőzések dict-ként (MatchTable esetén menet közben előállítva)"""
+        if isinstance(self.data, MatchTable):
+            return self.data.to_dicts()
+        return self.data
+    
     def save_to_csv(self, filename='data/odds_data.csv'):
         """Adatok mentése CSV fájlba"""
         if not self.data:
@@ -252,33 +393,135 @@ class OddsScraper:
                 
                 writer = csv.DictWriter(f, fieldnames=fieldnames)
                 writer.writeheader()
-                writer.writerows(self.data)
+                writer.writerows(self._export_rows())
             
             print(f"✅ {len(self.data)} mérkőzés elmentve!")
             
         except Exception as e:
             print(f"❌ Mentési hiba: {e}")
     
-    def save_to_json(self, filename='data/odds_data.json'):
-        """Adatok mentése JSON fájlba (frontend használatra)"""
+    def save_to_json(self, filename='data/odds_data.json', compress=None, shards=True):
+        """
+        Adatok mentése JSON fájlba (frontend használatra)
+        
+        A fájl ideiglenes fájlba íródik és atomikusan kerül a helyére.
+        
+        Args:
+            filename: Kimeneti fájl
+            compress: None (olvasható JSON), 'gzip' vagy 'brotli' (tömör,
+                      előre tömörített JSON; a kiterjesztés .gz / .br lesz)
+            shards: Bajnokság × szezon shardok a fájl melletti mappába
+                    (pl. data/odds_data/, lásd shards.py)
+        """
         if not self.data:
             print("❌ Nincs adat a mentéshez!")
             return
         
+        if compress:
+            extension = COMPRESSED_EXTENSIONS[compress]
+            if not filename.endswith(extension):
+                filename += extension
+        
         print(f"💾 JSON mentés: {filename}")
         
         try:
-            import os
-            os.makedirs(os.path.dirname(filename), exist_ok=True)
-            
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(self.data, f, indent=2, ensure_ascii=False)
+            if compress:
+                write_json_compressed(self._export_rows(), filename, codec=compress)
+            else:
+                import os
+                os.makedirs(os.path.dirname(filename), exist_ok=True)
+                
+                with open(filename + '.tmp', 'w', encoding='utf-8') as f:
+                    json.dump(list(self._export_rows()), f, indent=2, ensure_ascii=False)
+                os.replace(filename + '.tmp', filename)
             
             print(f"✅ {len(self.data)} mérkőzés JSON-ba mentve!")
             
+            if shards:
+                stats = write_shards(self._export_rows(), filename)
+                print(f"🗂️  Shardok: {stats['written']} frissítve, "
+                      f"{stats['unchanged']} változatlan, {stats['removed']} törölve")
+            
         except Exception as e:
             print(f"❌ JSON mentési hiba: {e}")
     
+    def save_to_columnar(self, filename='data/odds_data.odc'):
+        """Adatok mentése típusos, oszlopos bináris fájlba (lásd odds_formats)"""
+        if not self.data:
+            print("❌ Nincs adat a mentéshez!")
+            return
+        
+        print(f"💾 Oszlopos mentés: {filename}")
+        
+        try:
+            if isinstance(self.data, MatchTable):
+                self.data.write_columnar(filename)
+            else:
+                write_columnar(self.data, filename)
+            print(f"✅ {len(self.data)} mérkőzés oszlopos fájlba mentve!")
+            
+        except Exception as e:
+            print(f"❌ Oszlopos mentési hiba: {e}")
+    
+    def save_football_data(self, filename='data/football_data.fdc'):
+        """
+        A Football-Data CSV-k összes oszlopának mentése oszlopos fájlba
+        
+        Visszaolvasás csak a szükséges oszlopokkal:
+        FootballDataTable.read(filename, columns=['PSCH', 'PSCD', 'PSCA'])
+        """
+        if not self.football_data:
+            print("❌ Nincs Football-Data adat a mentéshez!")
+            return
+        
+        print(f"💾 Football-Data mentés: {filename}")
+        
+        try:
+            self.football_data.write(filename)
+            print(f"✅ {len(self.football_data)} mérkőzés, "
+                  f"{len(self.football_data.names)} oszlop elmentve!")
+            
+        except Exception as e:
+            print(f"❌ Football-Data mentési hiba: {e}")
+    
+    def save(self, formats=('csv', 'json')):
+        """
+        Mentés a kiválasztott formátumokba az alapértelmezett fájlnevekkel
+        
+        Args:
+            formats: 'csv', 'json', 'json.gz', 'json.br', 'columnar', 'football_data'
+                     tetszőleges részhalmaza
+        """
+        for fmt in formats:
+            if fmt == 'csv':
+                self.save_to_csv()
+            elif fmt == 'json':
+                self.save_to_json()
+            elif fmt == 'json.gz':
+                self.save_to_json(compress='gzip')
+            elif fmt == 'json.br':
+                self.save_to_json(compress='brotli')
+            elif fmt == 'columnar':
+                self.save_to_columnar()
+            elif fmt == 'football_data':
+                self.save_football_data()
+            else:
+                print(f"❌ Ismeretlen formátum: {fmt}")
+    
+    def team_form(self, last_n=5, days=365, as_of=None):
+        """
+        Csapatonkénti gördülő forma a lejátszott mérkőzésekből
+
+        Args:
+            last_n: Az utolsó N mérkőzés ablak mérete
+            days: Az időablak hossza napokban
+            as_of: Pillanatkép napja (date; alapért.: az utolsó mérkőzés napja)
+
+        Returns:
+            dict: FormEngine.snapshot() kimenet (lásd rolling_form.py)
+        """
+        return FormEngine(last_n, days).extend(scraper_matches(self.data)).snapshot(as_of)
+    
     def get_summary(self):
         """Statisztikák az összegyűjtött adatokról"""
         if not self.data:
@@ -309,10 +552,22 @@ class OddsScraper:
             print(f"  Hazai: {avg_home:.2f}")
             print(f"  Döntetlen: {avg_draw:.2f}")
             print(f"  Vendég: {avg_away:.2f}")
+            
+            # Margin és fair valószínűségek (vektorizált, az összes sorra egyszerre)
+            analysis = analyze_matches(self.data)
+            margin = analysis['margin'][np.isfinite(analysis['margin'])]
+            if margin.size:
+                print(f"\n📐 Bookmaker margin ({margin.size} árazott sor):")
+                print(f"  Átlag: {margin.mean():.2f}%  Min: {margin.min():.2f}%  Max: {margin.max():.2f}%")
+                print(f"  Fair valószínűség (átlag): "
+                      f"H {np.nanmean(analysis['fair_home']):.1%} | "
+                      f"D {np.nanmean(analysis['fair_draw']):.1%} | "
+                      f"V {np.nanmean(analysis['fair_away']):.1%}")
         
         print("="*50 + "\n")
 
 
+@instrumentation.instrumented('odds_scraper')
 def main():
     """Fő program"""
     print("⚽ LABDARÚGÁS ODDS SCRAPER")
@@ -364,8 +619,9 @@ def main():
     
     # Mentés
     if scraper.data:
-        scraper.save_to_csv()
-        scraper.save_to_json()
+        with instrumentation.phase('write'):
+            scraper.save_to_csv()
+            scraper.save_to_json()
         print("\n✅ Kész! Használd az adatokat a Stratégia Szimulátor oldalon!")
     else:
         print("\n❌ Nem sikerült adatot gyűjteni!")
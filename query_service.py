@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lekérdezés szolgáltatás az előszámolt adatokhoz (asyncio HTTP)
+A scraper.py és az OddsScraper kimeneteit memóriában indexeli, és csak a
+kért szeletet küldi vissza (egy csapat, egy bajnokság, dátum tartomány):
+- Indexek: csapat / bajnokság / bookmaker -> dátum szerint rendezett pozíciók
+- LRU eredmény cache, gzip, ETag / 304
+- Automatikus újratöltés, ha a fájlok újragenerálódnak
+
+Végpontok:
+    GET /api/matches?team=&league=&bookmaker=&from=ÉÉÉÉ-HH-NN&to=&result=&limit=&offset=
+    GET /api/live?team=&league=&from=&to=&limit=&offset=
+    GET /api/teams?team=&search=&min_matches=&sort=&limit=&offset=
+    GET /api/status
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import datetime
+from email.utils import formatdate
+from urllib.parse import parse_qs, urlsplit
+
+from results_index import date_ordinal
+from team_registry import ALIASES_PATH, TeamRegistry
+
+DATASETS = {
+    'matches': 'data/odds_data.json',
+    'live': 'data/live_matches.json',
+    'teams': 'data/team_stats.json',
+}
+
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 5000
+GZIP_MIN_SIZE = 1024
+REQUEST_TIMEOUT = 30
+
+
+def load_json_file(path):
+    """JSON (vagy .json.gz) fájl betöltése"""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def file_version(path):
+    """Változás észleléshez: (mtime_ns, méret), hiányzó fájlnál None"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def query_ordinal(value):
+    """Lekérdezés dátum paraméter (ÉÉÉÉ-HH-NN vagy NN/HH/ÉÉÉÉ) -> napszám"""
+    if not value:
+        return None
+    ordinal = date_ordinal(value)
+    if ordinal is None:
+        raise ValueError(f"Érvénytelen dátum: {value}")
+    return ordinal
+
+
+def team_key(name, known, registry=None):
+    """
+    Lekérdezett csapat név -> index kulcs
+
+    Pontos név, különben pontos alias egyezés a regiszterben
+    (TeamRegistry.lookup); fuzzy egyezés nincs, így minden végpont
+    ugyanazt a csapatot érti egy név alatt.
+    """
+    if name in known or registry is None:
+        return name
+    return registry.lookup(name) or name
+
+
+class MatchIndex:
+    """
+    Mérkőzés lista indexelve
+
+    A sorok dátum szerint rendezve állnak; a csapat / bajnokság / bookmaker
+    indexek növekvő pozíció listák, így a dátum tartomány mindegyiken
+    bináris kereséssel szűkíthető.
+    """
+
+    FIELDS = ('team', 'league', 'bookmaker')
+
+    def __init__(self, matches, teams=None):
+        keyed = [(date_ordinal(match.get('date')) or 0, position, match)
+                 for position, match in enumerate(matches)]
+        keyed.sort(key=lambda item: (item[0], item[1]))
+        self.rows = [match for _, _, match in keyed]
+        self.ordinals = [ordinal for ordinal, _, _ in keyed]
+        self.teams = teams
+        self.indexes = {field: {} for field in self.FIELDS}
+
+        for position, match in enumerate(self.rows):
+            for team in {match.get('home_team'), match.get('away_team')}:
+                if team:
+                    self.indexes['team'].setdefault(team, []).append(position)
+            for field in ('league', 'bookmaker'):
+                value = match.get(field)
+                if value:
+                    self.indexes[field].setdefault(value, []).append(position)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def query(self, team=None, league=None, bookmaker=None, date_from=None, date_to=None, result=None):
+        """
+        Szűrt mérkőzések (dátum szerint növekvő sorrendben)
+
+        Returns:
+            list: A feltételeknek megfelelő mérkőzés dict-ek
+        """
+        low = bisect_left(self.ordinals, date_from) if date_from is not None else 0
+        high = bisect_right(self.ordinals, date_to) if date_to is not None else len(self.rows)
+
+        filters = {'team': team_key(team, self.indexes['team'], self.teams) if team else None,
+                   'league': league, 'bookmaker': bookmaker}
+        postings = [self.indexes[field].get(value, []) for field, value in filters.items() if value]
+        if postings:
+            # A legrövidebb lista a kiinduló halmaz, a többi metszet
+            postings.sort(key=len)
+            first = postings[0]
+            positions = first[bisect_left(first, low):bisect_left(first, high)]
+            for other in postings[1:]:
+                allowed = set(other[bisect_left(other, low):bisect_left(other, high)])
+                positions = [position for position in positions if position in allowed]
+        else:
+            positions = range(low, high)
+
+        rows = [self.rows[position] for position in positions]
+        if result:
+            rows = [match for match in rows if match.get('result') == result]
+        return rows
+
+
+class TeamStatsIndex:
+    """scraper.py team_stats.json: név szerint rendezett csapat statisztikák"""
+
+    SORT_KEYS = ('team_name', 'total_matches', 'total_goals', 'average_goals_per_match')
+
+    def __init__(self, stats, teams=None):
+        self.stats = stats
+        self.teams = teams
+        self.names = sorted(stats)
+        self._lowered = [name.lower() for name in self.names]
+
+    def __len__(self):
+        return len(self.names)
+
+    def query(self, team=None, search=None, min_matches=0, sort='team_name'):
+        if team:
+            team = team_key(team, self.stats, self.teams)
+            return [self.stats[team]] if team in self.stats else []
+        if search:
+            needle = search.lower()
+            names = [name for name, lowered in zip(self.names, self._lowered) if needle in lowered]
+        else:
+            names = self.names
+        rows = [self.stats[name] for name in names if self.stats[name].get('total_matches', 0) >= min_matches]
+        if sort != 'team_name':
+            rows.sort(key=lambda row: row.get(sort, 0), reverse=True)
+        return rows
+
+
+class DataStore:
+    """A betöltött adathalmazok és fájl verzióik"""
+
+    def __init__(self, paths=None, aliases_path=ALIASES_PATH):
+        self.paths = dict(paths or DATASETS)
+        self.aliases_path = aliases_path
+        self.versions = {name: None for name in self.paths}
+        self.matches = MatchIndex([])
+        self.live = MatchIndex([])
+        self.live_updated = None
+        self.teams = TeamStatsIndex({})
+        self.generation = 0
+        self.loaded_at = None
+
+    def changed(self):
+        """Az adathalmazok, amelyek fájlja a legutóbbi betöltés óta változott"""
+        return [name for name, path in self.paths.items() if file_version(path) != self.versions[name]]
+
+    def reload(self, names=None):
+        """
+        Adathalmazok (újra)betöltése; hibás / félig írt fájlnál a régi marad
+
+        Returns:
+            list: A ténylegesen újratöltött adathalmazok
+        """
+        names = self.changed() if names is None else names
+        registry = TeamRegistry.load(self.aliases_path)
+        reloaded = []
+        for name in names:
+            path = self.paths[name]
+            version = file_version(path)
+            try:
+                data = load_json_file(path) if version is not None else None
+            except (OSError, ValueError):
+                continue  # a következő ellenőrzéskor újrapróbálja
+            if name == 'matches':
+                self.matches = MatchIndex(data or [], registry)
+            elif name == 'live':
+                data = data or {}
+                self.live = MatchIndex(data.get('matches', []), registry)
+                self.live_updated = data.get('updated')
+            elif name == 'teams':
+                self.teams = TeamStatsIndex(data or {}, registry)
+            self.versions[name] = version
+            reloaded.append(name)
+        if reloaded:
+            self.generation += 1
+            self.loaded_at = datetime.now().isoformat(timespec='seconds')
+        return reloaded
+
+
+class LRUCache:
+    """Legutóbb használt eredmények (kulcs -> válasz) korlátos cache-e"""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+
+class Response:
+    """Kész (cache-elhető) válasz: nyers és gzip törzs, ETag"""
+
+    def __init__(self, status, payload):
+        self.status = status
+        self.body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        self.etag = '"' + hashlib.blake2b(self.body, digest_size=16).hexdigest() + '"'
+        self._gzipped = None
+
+    def gzipped(self):
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, compresslevel=6)
+        return self._gzipped
+
+
+def page(rows, params):
+    """limit / offset lapozás"""
+    limit = min(max(int(params.get('limit', DEFAULT_LIMIT)), 0), MAX_LIMIT)
+    offset = max(int(params.get('offset', 0)), 0)
+    return {'total': len(rows), 'offset': offset, 'limit': limit, 'items': rows[offset:offset + limit]}
+
+
+class QueryService:
+    """Útvonalak, cache és HTTP kiszolgálás"""
+
+    def __init__(self, store, cache_size=256, reload_interval=2.0):
+        self.store = store
+        self.cache = LRUCache(cache_size)
+        self.reload_interval = reload_interval
+        self.routes = {
+            '/api/matches': self.matches,
+            '/api/live': self.live,
+            '/api/teams': self.teams,
+            '/api/status': self.status,
+        }
+
+    # --- Végpontok ---
+
+    def matches(self, params):
+        rows = self.store.matches.query(
+            team=params.get('team'), league=params.get('league'), bookmaker=params.get('bookmaker'),
+            date_from=query_ordinal(params.get('from')), date_to=query_ordinal(params.get('to')),
+            result=params.get('result'))
+        return page(rows, params)
+
+    def live(self, params):
+        rows = self.store.live.query(
+            team=params.get('team'), league=params.get('league'),
+            date_from=query_ordinal(params.get('from')), date_to=query_ordinal(params.get('to')))
+        result = page(rows, params)
+        result['updated'] = self.store.live_updated
+        return result
+
+    def teams(self, params):
+        sort = params.get('sort', 'team_name')
+        if sort not in TeamStatsIndex.SORT_KEYS:
+            raise ValueError(f"Ismeretlen rendezés: {sort}")
+        rows = self.store.teams.query(
+            team=params.get('team'), search=params.get('search'),
+            min_matches=int(params.get('min_matches', 0)), sort=sort)
+        return page(rows, params)
+
+    def status(self, params):
+        return {
+            'loaded_at': self.store.loaded_at,
+            'generation': self.store.generation,
+            'datasets': {'matches': len(self.store.matches), 'live': len(self.store.live),
+                         'teams': len(self.store.teams)},
+            'cache': {'entries': len(self.cache.entries), 'hits': self.cache.hits,
+                      'misses': self.cache.misses},
+        }
+
+    # --- Kiszolgálás ---
+
+    def respond(self, target):
+        """
+        Válasz egy kérés célra (útvonal + query string)
+
+        Returns:
+            Response
+        """
+        parts = urlsplit(target)
+        handler = self.routes.get(parts.path.rstrip('/') or '/')
+        if handler is None:
+            return Response(404, {'error': 'Ismeretlen végpont', 'endpoints': sorted(self.routes)})
+
+        params = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        cacheable = handler != self.status
+        key = (self.store.generation, parts.path, tuple(sorted(params.items())))
+        if cacheable:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        try:
+            response = Response(200, handler(params))
+        except ValueError as e:
+            return Response(400, {'error': str(e)})
+        if cacheable:
+            self.cache.put(key, response)
+        return response
+
+    async def handle(self, reader, writer):
+        """Egy kapcsolat kiszolgálása (HTTP/1.1 keep-alive)"""
+        try:
+            while True:
+                request_line = await asyncio.wait_for(reader.readline(), REQUEST_TIMEOUT)
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await asyncio.wait_for(reader.readline(), REQUEST_TIMEOUT)
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = (version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                              or headers.get('connection', '').lower() == 'keep-alive')
+                writer.write(self._render(method, target, headers, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def _render(self, method, target, headers, keep_alive):
+        base = [
+            ('Date', formatdate(usegmt=True)),
+            ('Access-Control-Allow-Origin', '*'),
+            ('Connection', 'keep-alive' if keep_alive else 'close'),
+        ]
+        if method == 'OPTIONS':
+            return self._message(204, base + [('Access-Control-Allow-Methods', 'GET, HEAD, OPTIONS'),
+                                              ('Content-Length', '0')], b'')
+        if method not in ('GET', 'HEAD'):
+            return self._message(405, base + [('Allow', 'GET, HEAD, OPTIONS'), ('Content-Length', '0')], b'')
+
+        response = self.respond(target)
+        base += [('ETag', response.etag), ('Cache-Control', 'no-cache'), ('Vary', 'Accept-Encoding')]
+        if response.status == 200 and response.etag in headers.get('if-none-match', ''):
+            return self._message(304, base + [('Content-Length', '0')], b'')
+
+        body = response.body
+        if len(body) >= GZIP_MIN_SIZE and 'gzip' in headers.get('accept-encoding', ''):
+            body = response.gzipped()
+            base.append(('Content-Encoding', 'gzip'))
+        base += [('Content-Type', 'application/json; charset=utf-8'), ('Content-Length', str(len(body)))]
+        return self._message(response.status, base, b'' if method == 'HEAD' else body)
+
+    @staticmethod
+    def _message(status, headers, body):
+        reasons = {200: 'OK', 204: 'No Content', 304: 'Not Modified', 400: 'Bad Request',
+                   404: 'Not Found', 405: 'Method Not Allowed'}
+        head = f"HTTP/1.1 {status} {reasons.get(status, '')}\r\n"
+        head += ''.join(f"{name}: {value}\r\n" for name, value in headers)
+        return head.encode('latin-1') + b'\r\n' + body
+
+    async def watch(self):
+        """Fájl változások figyelése; újratöltés külön szálon (a kiszolgálás nem áll meg)"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            changed = self.store.changed()
+            if not changed:
+                continue
+            reloaded = await loop.run_in_executor(None, self.store.reload, changed)
+            if reloaded:
+                self.cache.clear()
+                print(f"♻️  Újratöltve: {', '.join(reloaded)} (generáció {self.store.generation})")
+
+    async def serve(self, host='127.0.0.1', port=8001):
+        server = await asyncio.start_server(self.handle, host, port)
+        watcher = asyncio.create_task(self.watch())
+        print(f"🌐 Lekérdezés szolgáltatás: http://{host}:{port}/api/status")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            watcher.cancel()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Lekérdezés szolgáltatás az előszámolt adatokhoz")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--matches', default=DATASETS['matches'], help="OddsScraper JSON kimenet")
+    parser.add_argument('--live', default=DATASETS['live'], help="élő mérkőzések JSON")
+    parser.add_argument('--teams', default=DATASETS['teams'], help="scraper.py team_stats.json")
+    parser.add_argument('--cache-size', type=int, default=256, help="LRU cache bejegyzések száma")
+    parser.add_argument('--reload-interval', type=float, default=2.0, help="fájl figyelés (mp)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    print("⚡ LEKÉRDEZÉS SZOLGÁLTATÁS")
+    print("=" * 60)
+    store = DataStore({'matches': args.matches, 'live': args.live, 'teams': args.teams})
+    store.reload()
+    print(f"📊 Mérkőzések: {len(store.matches)} | Élő: {len(store.live)} | Csapatok: {len(store.teams)}")
+
+    service = QueryService(store, args.cache_size, args.reload_interval)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n👋 Leállítva")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Valódi eredmények feloldása a Football-Data CSV-kből
+Hash index (dátum, kanonikus hazai, kanonikus vendég) kulccsal: a
+függőben lévő (még eredmény nélküli) mérkőzések egyetlen O(n) menetben
+kapják meg az eredményt; amit még nem lehet feloldani, függőben marad
+a következő futásig (külön fájlban, lásd pending_path; a frontend
+kimenetekbe csak a lezárt mérkőzések kerülnek).
+"""
+
+import json
+import os
+from datetime import date, datetime
+
+from football_data import parse_football_data
+from scraper import detect_encoding
+
+RESULT_COLUMNS = ('Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG', 'FTR')
+RESULT_CODES = ('H', 'D', 'A')
+DATE_FORMATS = ('%d/%m/%Y', '%d/%m/%y', '%Y-%m-%d', '%Y-%m-%d %H:%M')
+
+# A generált minta adatok bookmaker mezője (lásd synthetic.py)
+SAMPLE_BOOKMAKER = 'Simulated'
+
+# A ResultIndex-ből feloldott eredmény forrása (result_source mező); a
+# forrás nélküli régi lezárt API sorok eredménye nem ellenőrzött
+RESULT_SOURCE = 'football-data'
+
+# Ennyi nappal a kezdés után a még függőben lévő mérkőzés elhagyódik
+PENDING_MAX_DAYS = 14
+
+# The Odds API sport kulcs -> Football-Data liga kód
+FOOTBALL_DATA_CODES = {
+    'soccer_epl': 'E0',
+    'soccer_spain_la_liga': 'SP1',
+    'soccer_germany_bundesliga': 'D1',
+    'soccer_italy_serie_a': 'I1',
+    'soccer_france_ligue_one': 'F1',
+}
+
+# The Odds API sport kulcs -> megjelenített bajnokság név
+LEAGUE_NAMES = {
+    'soccer_epl': 'Premier League',
+    'soccer_spain_la_liga': 'La Liga',
+    'soccer_germany_bundesliga': 'Bundesliga',
+    'soccer_italy_serie_a': 'Serie A',
+    'soccer_france_ligue_one': 'Ligue 1',
+}
+
+
+def date_ordinal(value):
+    """Dátum szöveg -> napok száma (None, ha nem értelmezhető)"""
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).toordinal()
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def season_code(ordinal):
+    """Football-Data szezon kód egy naphoz (július 1-től új szezon), pl. '2425'"""
+    day = date.fromordinal(ordinal)
+    start = day.year if day.month >= 7 else day.year - 1
+    return f"{start % 100:02d}{(start + 1) % 100:02d}"
+
+
+def is_pending(match):
+    """Eredmény nélküli (függőben lévő) mérkőzés-e"""
+    return match.get('result') not in RESULT_CODES
+
+
+class ResultIndex:
+    """
+    Lejátszott mérkőzések eredményei hash indexben
+
+    Kulcs: (dátum napszáma, hazai csapat kulcs, vendég csapat kulcs), ahol a
+    kulcs a TeamRegistry.key() (futás közben nem változik, a kanonikus név igen)
+    Érték: (hazai gólok, vendég gólok, eredmény)
+    """
+
+    def __init__(self, teams, tolerance_days=1):
+        """
+        Args:
+            teams: TeamRegistry a kanonikus nevekhez
+            tolerance_days: A kezdési idő (UTC) és a helyi dátum eltérése
+                            miatt ennyi nappal korábbi/későbbi dátum is egyezik
+        """
+        self.teams = teams
+        self.tolerance_days = tolerance_days
+        self.results = {}
+
+    def __len__(self):
+        return len(self.results)
+
+    def add_table(self, table):
+        """Eredmények felvétele egy FootballDataTable-ből (lásd football_data.py)"""
+        if not all(name in table for name in ('Date', 'HomeTeam', 'AwayTeam', 'FTR')):
+            return 0
+        added = 0
+        resolve = self.teams.key
+        home_goals = table.values('FTHG') if 'FTHG' in table else [None] * len(table)
+        away_goals = table.values('FTAG') if 'FTAG' in table else [None] * len(table)
+        for day, home, away, hg, ag, result in zip(
+                table.values('Date'), table.values('HomeTeam'), table.values('AwayTeam'),
+                home_goals, away_goals, table.values('FTR')):
+            ordinal = date_ordinal(day)
+            if ordinal is None or result not in RESULT_CODES or not home or not away:
+                continue
+            self.results[(ordinal, resolve(home), resolve(away))] = (hg, ag, result)
+            added += 1
+        return added
+
+    def add_csv(self, csv_file):
+        """Eredmények felvétele egy helyi Football-Data CSV-ből"""
+        encoding = detect_encoding(csv_file) or 'latin-1'
+        with open(csv_file, 'r', encoding=encoding) as f:
+            text = f.read()
+        return self.add_table(parse_football_data(text, columns=RESULT_COLUMNS))
+
+    def lookup(self, day, home, away):
+        """
+        Eredmény keresése
+
+        Args:
+            day: Dátum (szöveg vagy napszám)
+            home, away: Csapat nevek (bármely ismert alakban)
+
+        Returns:
+            tuple: (hazai gólok, vendég gólok, eredmény) vagy None
+        """
+        ordinal = day if isinstance(day, int) else date_ordinal(day)
+        if ordinal is None:
+            return None
+        home = self.teams.key(home)
+        away = self.teams.key(away)
+        for offset in (0, *(d for k in range(1, self.tolerance_days + 1) for d in (-k, k))):
+            found = self.results.get((ordinal + offset, home, away))
+            if found is not None:
+                return found
+        return None
+
+    def resolve(self, matches):
+        """
+        Függőben lévő mérkőzések eredményének kitöltése (helyben)
+
+        Returns:
+            int: A most feloldott mérkőzések száma
+        """
+        resolved = 0
+        for match in matches:
+            if not is_pending(match):
+                continue
+            found = self.lookup(match.get('date'), match.get('home_team'), match.get('away_team'))
+            if found is None:
+                continue
+            match['home_goals'], match['away_goals'], match['result'] = found
+            match['result_source'] = RESULT_SOURCE
+            resolved += 1
+        return resolved
+
+
+def league_codes(sport_keys=None):
+    """Bajnokság név -> Football-Data liga kód (csak a feloldható ligák)"""
+    sport_keys = sport_keys or LEAGUE_NAMES
+    return {name: FOOTBALL_DATA_CODES[key] for key, name in sport_keys.items() if key in FOOTBALL_DATA_CODES}
+
+
+def pending_targets(matches, sport_keys=None, today=None):
+    """
+    A már lejátszott, függőben lévő mérkőzések (liga kód, szezon) párjai
+
+    Csak ezek CSV-i kellenek a feloldáshoz; a Football-Data kód nélküli
+    ligák (pl. Bajnokok Ligája) kimaradnak.
+    """
+    codes = league_codes(sport_keys)
+    today = (today or date.today()).toordinal()
+    targets = set()
+    for match in matches:
+        if not is_pending(match):
+            continue
+        code = codes.get(match.get('league'))
+        ordinal = date_ordinal(match.get('date'))
+        if code is not None and ordinal is not None and ordinal <= today:
+            targets.add((code, season_code(ordinal)))
+    return sorted(targets)
+
+
+def local_result_files(targets, directory='data'):
+    """
+    A célokhoz tartozó helyi Football-Data CSV-k
+
+    Keresett helyek: <mappa>/<szezon>/<kód>.csv, majd <mappa>/<kód>.csv
+    (pl. data/2425/E0.csv, data/E0.csv); a többi CSV nem olvasódik be.
+    """
+    files = []
+    for code, season in targets:
+        for path in (os.path.join(directory, season, f"{code}.csv"), os.path.join(directory, f"{code}.csv")):
+            if path not in files and os.path.exists(path):
+                files.append(path)
+    return files
+
+
+def build_result_index(teams, files=()):
+    """
+    Eredmény index a megadott helyi Football-Data CSV-kből
+
+    Args:
+        teams: TeamRegistry
+        files: CSV fájlok (lásd local_result_files)
+
+    Returns:
+        ResultIndex
+    """
+    index = ResultIndex(teams)
+    for csv_file in files:
+        try:
+            index.add_csv(csv_file)
+        except (OSError, ValueError):
+            continue
+    return index
+
+
+def resolve_pending(matches, teams, sport_keys=None, data_dir='data', scraper_factory=None, today=None):
+    """
+    Függőben lévő mérkőzések eredményének feloldása (helyben)
+
+    Csak a függőben lévő mérkőzések liga / szezon párjainak CSV-i kellenek:
+    először a helyiek (data_dir), majd ha marad feloldatlan, ugyanezek
+    letöltve (OddsScraper cache: a lezárt szezonok kérés nélkül jönnek).
+
+    Args:
+        matches: Mérkőzés dict-ek
+        teams: TeamRegistry
+        sport_keys: The Odds API sport kulcs -> bajnokság név (alapért.: LEAGUE_NAMES)
+        data_dir: A helyi CSV-k mappája (None = csak letöltés)
+        scraper_factory: OddsScraper-t adó függvény (None = nincs letöltés)
+
+    Returns:
+        int: A feloldott mérkőzések száma
+    """
+    targets = pending_targets(matches, sport_keys, today)
+    if not targets:
+        return 0
+    index = build_result_index(teams, local_result_files(targets, data_dir) if data_dir else ())
+    resolved = index.resolve(matches)
+
+    # A letöltés után is csak a még függőben lévők célpontjai
+    targets = pending_targets(matches, sport_keys, today)
+    if scraper_factory is None or not targets:
+        return resolved
+
+    names = {code: name for name, code in league_codes(sport_keys).items()}
+    by_season = {}
+    for code, season in targets:
+        by_season.setdefault(season, {})[code] = names[code]
+    scraper = scraper_factory()
+    for season, leagues in sorted(by_season.items()):
+        scraper.scrape_football_data(leagues=leagues, seasons=[season], full_width=True)
+    index.add_table(scraper.football_data)
+    resolved += index.resolve(matches)
+    return resolved
+
+
+def expire_pending(matches, sport_keys=None, today=None, max_days=PENDING_MAX_DAYS):
+    """
+    Feloldhatatlan függőben lévő mérkőzések elhagyása
+
+    Elhagyódik a Football-Data kód nélküli liga (sosem kap eredményt) és a
+    max_days napnál régebben kezdődött mérkőzés (elhalasztott / elmaradt,
+    vagy a CSV-ben eltérő névvel szerepel).
+
+    Returns:
+        tuple: (megmaradt mérkőzések, elhagyottak száma)
+    """
+    codes = league_codes(sport_keys)
+    limit = (today or date.today()).toordinal() - max_days
+    kept = []
+    for match in matches:
+        if is_pending(match):
+            ordinal = date_ordinal(match.get('date'))
+            if match.get('league') not in codes or (ordinal is not None and ordinal < limit):
+                continue
+        kept.append(match)
+    return kept, len(matches) - len(kept)
+
+
+def split_pending(matches):
+    """(lezárt, függőben lévő) mérkőzések"""
+    settled, pending = [], []
+    for match in matches:
+        (pending if is_pending(match) else settled).append(match)
+    return settled, pending
+
+
+def pending_path(json_path):
+    """A függőben lévő mérkőzések fájlja: data/odds_data.json -> data/odds_data.pending.json"""
+    return os.path.splitext(json_path)[0] + '.pending.json'
+
+
+def is_api_row(match):
+    """API-ból származó sor-e (a generált minta adatok nem)"""
+    return match.get('bookmaker') != SAMPLE_BOOKMAKER
+
+
+def reset_unverified(match):
+    """
+    Forrás nélküli lezárt sor visszaállítása függőbe (helyben)
+
+    A régi formátumú JSON eredményei nem a ResultIndex-ből származnak
+    (véletlenszerűen generáltak voltak); ezek a következő feloldáskor a
+    Football-Data CSV-ből kapnak valódi eredményt, vagy lejárnak.
+
+    Returns:
+        bool: Visszaállított-e
+    """
+    if is_pending(match) or match.get('result_source') == RESULT_SOURCE:
+        return False
+    match['home_goals'] = match['away_goals'] = match['result'] = None
+    return True
+
+
+def load_matches(json_path):
+    """
+    Korábban mentett API mérkőzések (hiányzó vagy hibás fájl: üres lista)
+
+    A generált minta sorok ('Simulated' bookmaker) kimaradnak, így nem
+    keverednek a valódi mérkőzések közé; a nem ellenőrzött eredményű
+    lezárt sorok függőbe kerülnek (lásd reset_unverified).
+    """
+    if not os.path.exists(json_path):
+        return []
+    try:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            matches = json.load(f)
+    except (OSError, ValueError):
+        return []
+    if not isinstance(matches, list):
+        return []
+    matches = [match for match in matches if is_api_row(match)]
+    for match in matches:
+        reset_unverified(match)
+    return matches
+
+
+def merge_fixtures(existing, fetched):
+    """
+    Friss API mérkőzések összefésülése a korábban mentettekkel
+
+    Kulcs: (dátum, hazai, vendég, bookmaker). A már feloldott mérkőzések
+    változatlanok maradnak; a függőben lévők a friss odds-okat kapják.
+
+    Returns:
+        list: Az összefésült mérkőzések (a korábbi sorrend megmarad)
+    """
+    def key(match):
+        return (match.get('date'), match.get('home_team'), match.get('away_team'), match.get('bookmaker'))
+
+    merged = list(existing)
+    positions = {key(match): i for i, match in enumerate(merged)}
+    for match in fetched:
+        position = positions.get(key(match))
+        if position is None:
+            positions[key(match)] = len(merged)
+            merged.append(match)
+        elif is_pending(merged[position]):
+            merged[position] = match
+    return merged
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gördülő forma és időablakos statisztikák
+Dátum szerint rendezett mérkőzés folyamon csapatonként két ablakot tart
+karban: az utolsó N mérkőzést és az utolsó D napot (lőtt / kapott gól,
+pont, győzelmi arány). Mérkőzésenként O(1) frissítés gyűrű pufferekkel,
+a történet újraolvasása nélkül; pillanatkép bármely dátumra kérhető.
+"""
+
+import argparse
+import json
+import os
+from array import array
+from collections import deque
+from datetime import date, datetime
+
+from results_index import date_ordinal, is_pending
+from scraper import detect_encoding, iter_csv_rows
+
+FORM_PATH = 'data/team_form.json'
+
+# Pont: győzelem / döntetlen / vereség
+WIN_POINTS = 3
+DRAW_POINTS = 1
+
+# Az adatokfoci.csv amerikai dátum formátumot használ (6/14/2019)
+INTERNATIONAL_DATE_FORMATS = ('%m/%d/%Y', '%Y-%m-%d')
+
+WINDOW_FIELDS = ('matches', 'goals_for', 'goals_against', 'points', 'wins')
+
+
+def points(goals_for, goals_against):
+    if goals_for > goals_against:
+        return WIN_POINTS
+    if goals_for == goals_against:
+        return DRAW_POINTS
+    return 0
+
+
+def window_stats(sums):
+    """Ablak összesítő a futó összegekből (matches, gf, ga, pont, győzelem)"""
+    matches, goals_for, goals_against, pts, wins = sums
+    return {
+        'matches': matches,
+        'goals_for': goals_for,
+        'goals_against': goals_against,
+        'points': pts,
+        'wins': wins,
+        'win_rate': round(wins / matches, 4) if matches else None,
+        'points_per_match': round(pts / matches, 4) if matches else None,
+    }
+
+
+class MatchWindow:
+    """Utolsó N mérkőzés: fix méretű gyűrű puffer futó összegekkel"""
+
+    def __init__(self, size):
+        self.size = size
+        self.goals_for = array('i', bytes(4 * size))
+        self.goals_against = array('i', bytes(4 * size))
+        self.points = array('b', bytes(size))
+        self.head = 0       # a következő írás helye (a legrégebbi elem, ha tele van)
+        self.count = 0
+        self.sums = [0, 0, 0, 0, 0]
+
+    def push(self, goals_for, goals_against, pts):
+        sums = self.sums
+        slot = self.head
+        if self.count == self.size:
+            # A legrégebbi elem kiesik az ablakból
+            sums[1] -= self.goals_for[slot]
+            sums[2] -= self.goals_against[slot]
+            sums[3] -= self.points[slot]
+            sums[4] -= self.points[slot] == WIN_POINTS
+        else:
+            self.count += 1
+            sums[0] += 1
+        self.goals_for[slot] = goals_for
+        self.goals_against[slot] = goals_against
+        self.points[slot] = pts
+        sums[1] += goals_for
+        sums[2] += goals_against
+        sums[3] += pts
+        sums[4] += pts == WIN_POINTS
+        self.head = (slot + 1) % self.size
+
+    def form(self):
+        """Forma karakterlánc a legrégebbitől a legfrissebbig, pl. 'WWDLW'"""
+        start = (self.head - self.count) % self.size
+        symbols = {WIN_POINTS: 'W', DRAW_POINTS: 'D', 0: 'L'}
+        return ''.join(symbols[self.points[(start + i) % self.size]] for i in range(self.count))
+
+    def stats(self):
+        return window_stats(self.sums)
+
+
+class DayWindow:
+    """
+    Utolsó D nap: dátum szerint rendezett gyűrű puffer (deque)
+
+    Minden mérkőzés egyszer kerül be és egyszer esik ki, így a frissítés
+    amortizáltan O(1).
+    """
+
+    def __init__(self, days):
+        self.days = days
+        self.entries = deque()
+        self.sums = [0, 0, 0, 0, 0]
+
+    def evict(self, as_of):
+        """Az as_of napon már D napnál régebbi mérkőzések eltávolítása"""
+        entries = self.entries
+        sums = self.sums
+        limit = as_of - self.days
+        while entries and entries[0][0] <= limit:
+            _, goals_for, goals_against, pts = entries.popleft()
+            sums[0] -= 1
+            sums[1] -= goals_for
+            sums[2] -= goals_against
+            sums[3] -= pts
+            sums[4] -= pts == WIN_POINTS
+
+    def push(self, ordinal, goals_for, goals_against, pts):
+        self.evict(ordinal)
+        self.entries.append((ordinal, goals_for, goals_against, pts))
+        sums = self.sums
+        sums[0] += 1
+        sums[1] += goals_for
+        sums[2] += goals_against
+        sums[3] += pts
+        sums[4] += pts == WIN_POINTS
+
+    def stats(self, as_of=None):
+        """
+        Ablak összesítő; as_of napon a már kiesett mérkőzések nélkül
+
+        Csak olvas: a kiesőket a futó összegek másolatából vonja le, az
+        ablakot a következő push() igazítja.
+        """
+        if as_of is None:
+            return window_stats(self.sums)
+        sums = list(self.sums)
+        limit = as_of - self.days
+        for ordinal, goals_for, goals_against, pts in self.entries:
+            if ordinal > limit:
+                break
+            sums[0] -= 1
+            sums[1] -= goals_for
+            sums[2] -= goals_against
+            sums[3] -= pts
+            sums[4] -= pts == WIN_POINTS
+        return window_stats(sums)
+
+
+class FormEngine:
+    """
+    Csapatonkénti gördülő ablakok dátum szerint rendezett mérkőzés folyamon
+
+    Használat:
+        engine = FormEngine(last_n=5, days=365)
+        for match in international_matches():
+            engine.add(*match)
+        engine.snapshot()
+    """
+
+    def __init__(self, last_n=5, days=365):
+        """
+        Args:
+            last_n: Az utolsó N mérkőzés ablak mérete
+            days: Az időablak hossza napokban
+        """
+        if last_n < 1 or days < 1:
+            raise ValueError("Az ablak mérete legalább 1")
+        self.last_n = last_n
+        self.days = days
+        self.teams = {}         # csapat -> (MatchWindow, DayWindow)
+        self.last_ordinal = None
+        self.processed = 0
+
+    def _team(self, team):
+        windows = self.teams.get(team)
+        if windows is None:
+            windows = self.teams[team] = (MatchWindow(self.last_n), DayWindow(self.days))
+        return windows
+
+    def add(self, ordinal, home, away, home_goals, away_goals):
+        """
+        Egy lejátszott mérkőzés hozzáadása
+
+        Args:
+            ordinal: A mérkőzés napja (date.toordinal); nem lehet korábbi
+                     az eddig feldolgozottaknál
+        """
+        if self.last_ordinal is not None and ordinal < self.last_ordinal:
+            raise ValueError(f"A mérkőzések nincsenek dátum szerint rendezve: "
+                             f"{date.fromordinal(ordinal)} < {date.fromordinal(self.last_ordinal)}")
+        self.last_ordinal = ordinal
+        self.processed += 1
+
+        home_points = points(home_goals, away_goals)
+        away_points = points(away_goals, home_goals)
+        match_window, day_window = self._team(home)
+        match_window.push(home_goals, away_goals, home_points)
+        day_window.push(ordinal, home_goals, away_goals, home_points)
+        match_window, day_window = self._team(away)
+        match_window.push(away_goals, home_goals, away_points)
+        day_window.push(ordinal, away_goals, home_goals, away_points)
+
+    def extend(self, matches):
+        """(nap, hazai, vendég, hazai gól, vendég gól) sorok hozzáadása"""
+        for match in matches:
+            self.add(*match)
+        return self
+
+    def team_snapshot(self, team, as_of=None):
+        """
+        Egy csapat ablakai as_of napon (alapért.: az utolsó mérkőzés napja)
+
+        Az állapotot nem módosítja; ablakból kiesés csak add()-ban történik.
+        """
+        windows = self.teams.get(team)
+        if windows is None:
+            return None
+        as_of = self._as_of(as_of)
+        match_window, day_window = windows
+        return {
+            'last_n': match_window.stats(),
+            'form': match_window.form(),
+            'last_days': day_window.stats(as_of),
+        }
+
+    def _as_of(self, as_of):
+        if as_of is None:
+            return self.last_ordinal or date.today().toordinal()
+        if not isinstance(as_of, int):
+            as_of = as_of.toordinal()
+        if self.last_ordinal is not None and as_of < self.last_ordinal:
+            raise ValueError("Pillanatkép csak az utolsó feldolgozott mérkőzés napjára vagy későbbre kérhető")
+        return as_of
+
+    def snapshot(self, as_of=None, teams=None):
+        """
+        Pillanatkép az összes (vagy a megadott) csapatra
+
+        Args:
+            as_of: Nap (date vagy napszám); a napi ablak ehhez a naphoz igazodik
+            teams: Csapat nevek (None = mindegyik)
+
+        Returns:
+            dict: {'date', 'last_n', 'days', 'teams': {csapat: ablakok}}
+        """
+        as_of = self._as_of(as_of)
+        names = sorted(self.teams) if teams is None else [t for t in teams if t in self.teams]
+        return {
+            'date': date.fromordinal(as_of).isoformat(),
+            'last_n': self.last_n,
+            'days': self.days,
+            'teams': {team: self.team_snapshot(team, as_of) for team in names},
+        }
+
+    def replay(self, matches, snapshot_dates):
+        """
+        Mérkőzések feldolgozása, közben pillanatképek a megadott napokon
+
+        A pillanatkép az adott nap előtti mérkőzéseket tartalmazza.
+
+        Yields:
+            dict: snapshot() kimenet dátum szerint növekvő sorrendben
+        """
+        pending = sorted(d if isinstance(d, int) else d.toordinal() for d in snapshot_dates)
+        position = 0
+        for match in matches:
+            while position < len(pending) and pending[position] <= match[0]:
+                yield self.snapshot(pending[position])
+                position += 1
+            self.add(*match)
+        for ordinal in pending[position:]:
+            yield self.snapshot(ordinal)
+
+
+def parse_international_date(value):
+    """adatokfoci.csv dátum -> napszám (None, ha nem értelmezhető)"""
+    for fmt in INTERNATIONAL_DATE_FORMATS:
+        try:
+            return datetime.strptime(value.strip(), fmt).toordinal()
+        except ValueError:
+            continue
+    return None
+
+
+def international_matches(csv_file='data/adatokfoci.csv'):
+    """
+    Mérkőzések az adatokfoci.csv-ből dátum szerint rendezve
+
+    Returns:
+        list: (nap, hazai, vendég, hazai gól, vendég gól) sorok
+    """
+    encoding = detect_encoding(csv_file) or 'utf-8'
+    rows = iter_csv_rows(csv_file, encoding)
+    next(rows, None)  # fejléc
+    matches = []
+    for row in rows:
+        if len(row) < 5:
+            continue
+        ordinal = parse_international_date(row[0])
+        try:
+            home_goals, away_goals = int(row[3]), int(row[4])
+        except ValueError:
+            continue
+        if ordinal is not None and row[1].strip() and row[2].strip():
+            matches.append((ordinal, row[1].strip(), row[2].strip(), home_goals, away_goals))
+    matches.sort(key=lambda match: match[0])
+    return matches
+
+
+def scraper_matches(matches):
+    """
+    OddsScraper formátumú lejátszott mérkőzések dátum szerint rendezve
+
+    Returns:
+        list: (nap, hazai, vendég, hazai gól, vendég gól) sorok
+    """
+    rows = []
+    for match in matches:
+        if is_pending(match) or match.get('home_goals') is None or match.get('away_goals') is None:
+            continue
+        ordinal = date_ordinal(match.get('date'))
+        if ordinal is None:
+            continue
+        rows.append((ordinal, match['home_team'], match['away_team'],
+                     int(match['home_goals']), int(match['away_goals'])))
+    rows.sort(key=lambda match: match[0])
+    return rows
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Gördülő forma és időablakos statisztikák")
+    parser.add_argument('--input', default='data/adatokfoci.csv',
+                        help="adatokfoci.csv vagy OddsScraper JSON (.json)")
+    parser.add_argument('--last-n', type=int, default=5, help="utolsó N mérkőzés ablak")
+    parser.add_argument('--days', type=int, default=365, help="időablak napokban")
+    parser.add_argument('--at', action='append', default=[], metavar='ÉÉÉÉ-HH-NN',
+                        help="pillanatkép dátuma (többször is megadható; alapért.: utolsó mérkőzés)")
+    parser.add_argument('--output', default=FORM_PATH)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    print("📈 GÖRDÜLŐ FORMA")
+    print("=" * 60)
+    if args.input.endswith('.json'):
+        with open(args.input, 'r', encoding='utf-8') as f:
+            matches = scraper_matches(json.load(f))
+    else:
+        matches = international_matches(args.input)
+
+    engine = FormEngine(args.last_n, args.days)
+    if args.at:
+        dates = [datetime.strptime(value, '%Y-%m-%d').toordinal() for value in args.at]
+        snapshots = list(engine.replay(matches, dates))
+    else:
+        snapshots = [engine.extend(matches).snapshot()]
+
+    print(f"📊 Mérkőzések: {len(matches)} | Csapatok: {len(engine.teams)}")
+    latest = snapshots[-1]
+    ranked = sorted(
+        ((team, windows) for team, windows in latest['teams'].items()
+         if windows['last_days']['matches'] >= args.last_n),
+        key=lambda item: item[1]['last_days']['points_per_match'], reverse=True)
+    print(f"\n🏆 Legjobb forma ({latest['date']}, utolsó {args.days} nap):")
+    for team, windows in ranked[:10]:
+        last_days = windows['last_days']
+        print(f"   {team:<25} {windows['form']:<{args.last_n}}  "
+              f"{last_days['points_per_match']:.2f} pont/meccs  "
+              f"({last_days['matches']} meccs, {last_days['goals_for']}-{last_days['goals_against']})")
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(snapshots if args.at else latest, f, ensure_ascii=False)
+    print(f"\n💾 Mentve: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,32 +8,411 @@ Kiszámítja minden válogatott számára:
 - Átlagos gólszám mérkőzésenként
 """
 
+import argparse
+import codecs
 import csv
+import glob
+import hashlib
 import json
+import os
+from array import array
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
-def analyze_team_stats(csv_file='data/adatokfoci.csv'):
+import instrumentation
+from team_cube import TeamCube, parse_year
+
+try:
+    import numpy as np
+except ImportError:  # A numpy motor opcionális
+    np = None
+
+# Kódolások próbálási sorrendben
+ENCODINGS = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
+
+
+def detect_encoding(csv_file, sample_size=64 * 1024):
+    """
+    Kódolás felismerése a fájl elejéből (nem olvassa be az egész fájlt)
+    
+    Args:
+        csv_file: CSV fájl elérési útja
+        sample_size: Hány bájtot vizsgáljon meg
+        
+    Returns:
+        str: Az első kódolás, amellyel a minta hibátlanul dekódolható, vagy None
+    """
+    with open(csv_file, 'rb') as file:
+        sample = file.read(sample_size)
+    
+    for encoding in ENCODINGS:
+        try:
+            # Inkrementális dekóder: a minta végén félbevágott
+            # többbájtos karakter nem számít hibának
+            decoder = codecs.getincrementaldecoder(encoding)()
+            decoder.decode(sample, final=len(sample) < sample_size)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    
+    return None
+
+
+def iter_csv_rows(csv_file, encoding, start_offset=0, position=None, end_offset=None):
+    """
+    CSV sorok lusta beolvasása generátorral
+    
+    Soronként olvas a fájlból, így a memóriahasználat nem függ a fájl méretétől.
+    
+    Args:
+        csv_file: CSV fájl elérési útja
+        encoding: A fájl kódolása
+        start_offset: Bájt pozíció, ahonnan az olvasás indul
+        position: Opcionális dict; a 'offset' kulcsban mindig az utolsó
+                  teljesen beolvasott sor utáni bájt pozíció található
+        end_offset: Opcionális bájt pozíció, ahol az olvasás megáll
+        
+    Yields:
+        list: A CSV sor mezői
+    """
+    if position is None:
+        position = {}
+    position['offset'] = start_offset
+    
+    def lines(file):
+        offset = start_offset
+        for raw_line in file:
+            if end_offset is not None and offset >= end_offset:
+                break
+            offset += len(raw_line)
+            position['offset'] = offset
+            yield raw_line.decode(encoding)
+    
+    with open(csv_file, 'rb') as file:
+        file.seek(start_offset)
+        yield from csv.reader(lines(file))
+
+
+def is_header_row(row):
+    """Fejléc sor-e: van elég oszlop, de a gól oszlopok nem számok"""
+    if len(row) < 5:
+        return False
+    try:
+        int(row[3])
+        int(row[4])
+    except ValueError:
+        return True
+    return False
+
+
+def accumulate_team_stats(team_stats, rows, line_count=0):
+    """
+    Sorok hozzáadása a futó csapat statisztikákhoz
+    
+    Args:
+        team_stats: A futó statisztikák (csapat -> {'matches', 'goals'})
+        rows: CSV sorok iterálható forrása
+        line_count: Az eddig feldolgozott sorok száma
+        
+    Returns:
+        int: A feldolgozott sorok száma összesen
+    """
+    start_count = line_count
+    rejected = header = 0
+    for row in rows:
+        line_count += 1
+        
+        # A fájl első sora lehet fejléc (nem adat sor, nem is hibás)
+        if line_count == 1 and is_header_row(row):
+            header = 1
+            continue
+        
+        # Ellenőrizzük, hogy van-e elég oszlop
+        if len(row) < 5:
+            print(f"⚠️  Sor {line_count}: Hiányos adat, kihagyva")
+            rejected += 1
+            continue
+        
+        try:
+            # B oszlop: Hazai csapat (index 1)
+            home_team = row[1].strip()
+            # C oszlop: Vendég csapat (index 2)
+            away_team = row[2].strip()
+            # D oszlop: Hazai gólok (index 3)
+            home_goals = int(row[3])
+            # E oszlop: Vendég gólok (index 4)
+            away_goals = int(row[4])
+            
+            # Hazai csapat statisztikái
+            team_stats[home_team]['matches'] += 1
+            team_stats[home_team]['goals'] += home_goals
+            
+            # Vendég csapat statisztikái
+            team_stats[away_team]['matches'] += 1
+            team_stats[away_team]['goals'] += away_goals
+            
+        except (ValueError, IndexError) as e:
+            print(f"⚠️  Sor {line_count}: Hibás formátum - {e}")
+            rejected += 1
+            continue
+    
+    instrumentation.count('rows_parsed', line_count - start_count - header)
+    instrumentation.count('rows_rejected', rejected)
+    return line_count
+
+
+def accumulate_cube(cube, rows, line_count=0):
+    """
+    Sorok hozzáadása a csapat × bajnokság × év kockához
+    
+    Ugyanazokat a sorokat fogadja el, mint az accumulate_team_stats.
+    
+    Args:
+        cube: TeamCube példány
+        rows: CSV sorok iterálható forrása
+        line_count: Az eddig feldolgozott sorok száma
+        
+    Returns:
+        int: A feldolgozott sorok száma összesen
+    """
+    start_count = line_count
+    rejected = header = 0
+    for row in rows:
+        line_count += 1
+        
+        if line_count == 1 and is_header_row(row):
+            header = 1
+            continue
+        
+        if len(row) < 5:
+            print(f"⚠️  Sor {line_count}: Hiányos adat, kihagyva")
+            rejected += 1
+            continue
+        
+        try:
+            home_goals = int(row[3])
+            away_goals = int(row[4])
+        except ValueError as e:
+            print(f"⚠️  Sor {line_count}: Hibás formátum - {e}")
+            rejected += 1
+            continue
+        
+        # A oszlop: Dátum, F oszlop: Bajnokság (ha van)
+        competition = row[5].strip() if len(row) > 5 else ''
+        cube.add_match(row[1].strip(), row[2].strip(), home_goals, away_goals,
+                       competition, parse_year(row[0]))
+    
+    instrumentation.count('rows_parsed', line_count - start_count - header)
+    instrumentation.count('rows_rejected', rejected)
+    return line_count
+
+
+def build_team_cube(csv_file='data/adatokfoci.csv'):
+    """
+    Aggregátum kocka építése a CSV fájlból (streamelt olvasással)
+    
+    Args:
+        csv_file: Az adatokfoci.csv fájl elérési útja
+        
+    Returns:
+        TeamCube: A kocka, vagy None hiba esetén
+    """
+    built = build_team_cube_with_encoding(csv_file)
+    return built[0] if built is not None else None
+
+
+def build_team_cube_with_encoding(csv_file, end_offset=None):
+    """
+    Kocka építése a működő kódolás keresésével
+    
+    Args:
+        csv_file: Az adatokfoci.csv fájl elérési útja
+        end_offset: Csak eddig a bájt pozícióig (None: a fájl végéig)
+        
+    Returns:
+        tuple: (TeamCube, kódolás, sorok száma), vagy None hiba esetén
+    """
+    print(f"📦 Kocka építése: {csv_file}")
+    
+    try:
+        encoding = detect_encoding(csv_file)
+        if encoding is None:
+            print(f"❌ Nem sikerült dekódolni a fájlt")
+            return None
+        
+        candidates = ENCODINGS[ENCODINGS.index(encoding):]
+        for encoding in candidates:
+            cube = TeamCube()
+            try:
+                line_count = accumulate_cube(
+                    cube, iter_csv_rows(csv_file, encoding, end_offset=end_offset))
+                break
+            except UnicodeDecodeError:
+                print(f"⚠️  Dekódolási hiba ({encoding}), újrapróbálás...")
+                continue
+        else:
+            print(f"❌ Nem sikerült dekódolni a fájlt")
+            return None
+        
+        print(f"✅ {line_count} sor feldolgozva, {len(cube.cells)} cella")
+        
+    except FileNotFoundError:
+        print(f"❌ HIBA: A fájl nem található: {csv_file}")
+        return None
+    except Exception as e:
+        print(f"❌ HIBA az olvasás során: {e}")
+        return None
+    
+    return cube, encoding, line_count
+
+
+def expand_inputs(source):
+    """
+    Bemeneti CSV fájlok listája könyvtárból, glob mintából vagy fájlból
+    
+    Args:
+        source: Könyvtár, glob minta (pl. 'data/history/*.csv') vagy fájl
+        
+    Returns:
+        list: A fájlok rendezett listája (ez a soros feldolgozás sorrendje is)
+    """
+    if os.path.isdir(source):
+        return sorted(glob.glob(os.path.join(source, '*.csv')))
+    if any(char in source for char in '*?['):
+        return sorted(glob.glob(source))
+    return [source]
+
+
+def build_partial_cube(csv_file):
+    """
+    Egy fájl kockája a folyamat-pool számára
+    
+    A worker folyamatban nincs aktív mérés, ezért a sor számlálókat helyben
+    gyűjti; ezeket a szülő adja hozzá a saját futásához.
+    
+    Returns:
+        tuple: (TeamCube vagy None, számlálók)
+    """
+    with instrumentation.collect() as counters:
+        cube = build_team_cube(csv_file)
+    return cube, counters
+
+
+def build_team_cube_parallel(source, workers=None):
+    """
+    Több CSV fájl párhuzamos feldolgozása folyamat-poolban
+    
+    Minden fájlból részleges kocka készül, ezeket fájl sorrendben
+    (asszociatívan) vonjuk össze, így az eredmény megegyezik a fájlok
+    soros feldolgozásával.
+    
+    Args:
+        source: Könyvtár, glob minta vagy fájl (lásd expand_inputs)
+        workers: Folyamatok száma (alapértelmezés: CPU magok száma)
+        
+    Returns:
+        TeamCube: Az összevont kocka (None, ha nincs bemeneti fájl)
+    """
+    files = expand_inputs(source)
+    if not files:
+        print(f"❌ Nem található CSV fájl: {source}")
+        return None
+    
+    workers = min(workers or os.cpu_count() or 1, len(files))
+    print(f"🚀 {len(files)} fájl feldolgozása {workers} folyamattal")
+    
+    if workers == 1:
+        partials = map(build_partial_cube, files)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        partials = executor.map(build_partial_cube, files)
+    
+    cube = TeamCube()
+    try:
+        for csv_file, (partial, counters) in zip(files, partials):
+            instrumentation.add_counters(counters)
+            if partial is None:
+                print(f"⚠️  Kihagyva: {csv_file}")
+                continue
+            cube.merge(partial)
+    finally:
+        if workers > 1:
+            executor.shutdown()
+    
+    print(f"✅ Összevonva: {len(cube.teams)} csapat, {len(cube.cells)} cella")
+    return cube
+
+
+def analyze_team_stats_parallel(source, workers=None):
+    """
+    Csapat statisztikák több CSV fájlból (lásd build_team_cube_parallel)
+    
+    Returns:
+        dict: Csapat statisztikák (meccsek, gólok, átlag)
+    """
+    cube = build_team_cube_parallel(source, workers)
+    if cube is None:
+        return {}
+    return cube.team_stats()
+
+
+def build_results(team_stats):
+    """
+    Átlagok számítása a nyers számlálókból
+    
+    Args:
+        team_stats: Csapat -> {'matches', 'goals'} számlálók
+        
+    Returns:
+        dict: Csapat statisztikák (meccsek, gólok, átlag)
+    """
+    results = {}
+    for team, stats in team_stats.items():
+        if stats['matches'] > 0:
+            average = stats['goals'] / stats['matches']
+            results[team] = {
+                'team_name': team,
+                'total_matches': stats['matches'],
+                'total_goals': stats['goals'],
+                'average_goals_per_match': round(average, 2)
+            }
+    
+    return results
+
+
+def new_team_stats():
+    """Üres futó statisztika tároló"""
+    return defaultdict(lambda: {'matches': 0, 'goals': 0})
+
+
+def analyze_team_stats(csv_file='data/adatokfoci.csv', streaming=False, engine='python'):
     """
     Elemzi a válogatottak statisztikáit a CSV fájlból
     
     Args:
         csv_file: Az adatokfoci.csv fájl elérési útja
+        streaming: Ha True, egyetlen menetben, soronként olvas
+                   (állandó memóriahasználat nagy fájloknál is)
+        engine: 'python' (soronkénti) vagy 'numpy' (oszlopos, vektorizált)
         
     Returns:
         dict: Csapat statisztikák (meccsek, gólok, átlag)
     """
+    if engine == 'numpy':
+        return analyze_team_stats_numpy(csv_file)
+    if streaming:
+        return analyze_team_stats_streaming(csv_file)
     
     # Statisztikák tárolása minden csapat számára
-    team_stats = defaultdict(lambda: {'matches': 0, 'goals': 0})
+    team_stats = new_team_stats()
     
     print(f"📊 Adatok beolvasása: {csv_file}")
     
     try:
         # Próbáljuk több kódolással is
-        encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
         file_content = None
         
-        for encoding in encodings:
+        for encoding in ENCODINGS:
             try:
                 with open(csv_file, 'r', encoding=encoding) as file:
                     file_content = file.read()
@@ -48,40 +427,189 @@ def analyze_team_stats(csv_file='data/adatokfoci.csv'):
         
         # Most dolgozzuk fel a tartalmat
         csv_reader = csv.reader(file_content.splitlines())
+        line_count = accumulate_team_stats(team_stats, csv_reader)
         
-        line_count = 0
-        for row in csv_reader:
-            line_count += 1
+        print(f"✅ {line_count} sor feldolgozva")
             
-            # Ellenőrizzük, hogy van-e elég oszlop
-            if len(row) < 5:
-                print(f"⚠️  Sor {line_count}: Hiányos adat, kihagyva")
+    except FileNotFoundError:
+        print(f"❌ HIBA: A fájl nem található: {csv_file}")
+        return {}
+    except Exception as e:
+        print(f"❌ HIBA az olvasás során: {e}")
+        return {}
+    
+    # Átlagok számítása
+    return build_results(team_stats)
+
+
+def analyze_team_stats_streaming(csv_file='data/adatokfoci.csv'):
+    """
+    Egymenetes, streamelt elemzés
+    
+    A kódolást a fájl elejéből ismeri fel, a sorokat generátorral olvassa,
+    és csak a csapatonkénti futó összegeket tartja memóriában.
+    
+    Args:
+        csv_file: Az adatokfoci.csv fájl elérési útja
+        
+    Returns:
+        dict: Csapat statisztikák (meccsek, gólok, átlag)
+    """
+    print(f"📊 Adatok beolvasása (stream): {csv_file}")
+    
+    try:
+        encoding = detect_encoding(csv_file)
+        if encoding is None:
+            print(f"❌ Nem sikerült dekódolni a fájlt")
+            return {}
+        
+        # Ha a minta után mégis dekódolási hiba jön, a következő
+        # kódolással kezdjük újra
+        candidates = ENCODINGS[ENCODINGS.index(encoding):]
+        for encoding in candidates:
+            team_stats = new_team_stats()
+            try:
+                line_count = accumulate_team_stats(
+                    team_stats, iter_csv_rows(csv_file, encoding)
+                )
+                break
+            except UnicodeDecodeError:
+                print(f"⚠️  Dekódolási hiba ({encoding}), újrapróbálás...")
                 continue
-            
+        else:
+            print(f"❌ Nem sikerült dekódolni a fájlt")
+            return {}
+        
+        print(f"✅ Sikeres kódolás: {encoding}")
+        print(f"✅ {line_count} sor feldolgozva")
+        
+    except FileNotFoundError:
+        print(f"❌ HIBA: A fájl nem található: {csv_file}")
+        return {}
+    except Exception as e:
+        print(f"❌ HIBA az olvasás során: {e}")
+        return {}
+    
+    return build_results(team_stats)
+
+def parse_goal_column(values):
+    """
+    Gól oszlop konvertálása int64 tömbbé
+    
+    A decimális számjegyekből álló értékeket vektorizáltan alakítja át,
+    a többit egyenként int()-tel, pontosan úgy, mint a soronkénti motor.
+    
+    Args:
+        values: Szöveges értékek listája
+        
+    Returns:
+        tuple: (értékek int64 tömbje, érvényes sorok bool maszkja)
+    """
+    raw = np.array(values, dtype=str)
+    goals = np.zeros(len(raw), dtype=np.int64)
+    valid = np.char.isdecimal(raw) if len(raw) else np.zeros(0, dtype=bool)
+    goals[valid] = raw[valid].astype(np.int64)
+    
+    for index in np.flatnonzero(~valid):
+        try:
+            goals[index] = int(raw[index])
+            valid[index] = True
+        except ValueError:
+            pass
+    
+    return goals, valid
+
+
+def aggregate_team_arrays(home_ids, away_ids, home_goals, away_goals, n_teams):
+    """
+    Csapatonkénti összesítés néhány bincount menetben
+    
+    Args:
+        home_ids, away_ids: Hazai / vendég csapat azonosítók (int tömbök)
+        home_goals, away_goals: Hazai / vendég gólok (int tömbök)
+        n_teams: Csapatok száma
+        
+    Returns:
+        dict: Tömbök csapat azonosító szerint indexelve
+              (matches, goals_for, goals_against, wins, draws, losses)
+    """
+    def count(ids, weights=None):
+        return np.bincount(ids, weights=weights, minlength=n_teams).astype(np.int64)
+    
+    home_win = home_goals > away_goals
+    away_win = home_goals < away_goals
+    draw = ~(home_win | away_win)
+    
+    return {
+        'matches': count(home_ids) + count(away_ids),
+        'goals_for': count(home_ids, home_goals) + count(away_ids, away_goals),
+        'goals_against': count(home_ids, away_goals) + count(away_ids, home_goals),
+        'wins': count(home_ids[home_win]) + count(away_ids[away_win]),
+        'draws': count(home_ids[draw]) + count(away_ids[draw]),
+        'losses': count(home_ids[away_win]) + count(away_ids[home_win])
+    }
+
+
+def analyze_team_stats_numpy(csv_file='data/adatokfoci.csv'):
+    """
+    Oszlopos, NumPy alapú elemzés
+    
+    A csapatneveket egész azonosítókra cseréli, a gól oszlopokat tömbökbe
+    tölti, és az összesítést bincount menetekkel végzi. Az eredmény
+    formátuma megegyezik az analyze_team_stats kimenetével.
+    
+    Args:
+        csv_file: Az adatokfoci.csv fájl elérési útja
+        
+    Returns:
+        dict: Csapat statisztikák (meccsek, gólok, átlag)
+    """
+    if np is None:
+        print("⚠️  A numpy nincs telepítve, soronkénti feldolgozás")
+        return analyze_team_stats_streaming(csv_file)
+    
+    print(f"📊 Adatok beolvasása (numpy): {csv_file}")
+    
+    try:
+        encoding = detect_encoding(csv_file)
+        if encoding is None:
+            print(f"❌ Nem sikerült dekódolni a fájlt")
+            return {}
+        
+        # Ha a minta után mégis dekódolási hiba jön, a következő
+        # kódolással kezdjük újra (mint a streamelt motornál)
+        candidates = ENCODINGS[ENCODINGS.index(encoding):]
+        for encoding in candidates:
+            team_ids = {}
+            home_ids = array('l')
+            away_ids = array('l')
+            home_goal_values = []
+            away_goal_values = []
+            line_count = header = 0
             try:
-                # B oszlop: Hazai csapat (index 1)
-                home_team = row[1].strip()
-                # C oszlop: Vendég csapat (index 2)
-                away_team = row[2].strip()
-                # D oszlop: Hazai gólok (index 3)
-                home_goals = int(row[3])
-                # E oszlop: Vendég gólok (index 4)
-                away_goals = int(row[4])
-                
-                # Hazai csapat statisztikái
-                team_stats[home_team]['matches'] += 1
-                team_stats[home_team]['goals'] += home_goals
-                
-                # Vendég csapat statisztikái
-                team_stats[away_team]['matches'] += 1
-                team_stats[away_team]['goals'] += away_goals
-                
-            except (ValueError, IndexError) as e:
-                print(f"⚠️  Sor {line_count}: Hibás formátum - {e}")
+                for row in iter_csv_rows(csv_file, encoding):
+                    line_count += 1
+                    if line_count == 1 and is_header_row(row):
+                        header = 1
+                        continue
+                    if len(row) < 5:
+                        print(f"⚠️  Sor {line_count}: Hiányos adat, kihagyva")
+                        continue
+                    home_ids.append(team_ids.setdefault(row[1].strip(), len(team_ids)))
+                    away_ids.append(team_ids.setdefault(row[2].strip(), len(team_ids)))
+                    home_goal_values.append(row[3])
+                    away_goal_values.append(row[4])
+                break
+            except UnicodeDecodeError:
+                print(f"⚠️  Dekódolási hiba ({encoding}), újrapróbálás...")
                 continue
+        else:
+            print(f"❌ Nem sikerült dekódolni a fájlt")
+            return {}
         
+        print(f"✅ Sikeres kódolás: {encoding}")
         print(f"✅ {line_count} sor feldolgozva")
-            
+        
     except FileNotFoundError:
         print(f"❌ HIBA: A fájl nem található: {csv_file}")
         return {}
@@ -89,20 +617,318 @@ def analyze_team_stats(csv_file='data/adatokfoci.csv'):
         print(f"❌ HIBA az olvasás során: {e}")
         return {}
     
-    # Átlagok számítása
+    home_goals, home_valid = parse_goal_column(home_goal_values)
+    away_goals, away_valid = parse_goal_column(away_goal_values)
+    valid = home_valid & away_valid
+    
+    skipped = int(np.count_nonzero(~valid))
+    if skipped:
+        print(f"⚠️  {skipped} hibás formátumú sor kihagyva")
+    instrumentation.count('rows_parsed', line_count - header)
+    instrumentation.count('rows_rejected', line_count - header - len(valid) + skipped)
+    
+    home = np.frombuffer(home_ids, dtype=np.dtype(home_ids.typecode))[valid].astype(np.intp)
+    away = np.frombuffer(away_ids, dtype=np.dtype(away_ids.typecode))[valid].astype(np.intp)
+    totals = aggregate_team_arrays(
+        home, away, home_goals[valid], away_goals[valid], len(team_ids)
+    )
+    
+    # Első (érvényes) előfordulás szerinti sorrend, mint a soronkénti motornál
+    sequence = np.column_stack((home, away)).ravel()
+    order, first_seen = np.unique(sequence, return_index=True)
+    order = order[np.argsort(first_seen, kind='stable')]
+    
+    names = list(team_ids)
+    matches = totals['matches']
+    goals = totals['goals_for']
+    
     results = {}
-    for team, stats in team_stats.items():
-        if stats['matches'] > 0:
-            average = stats['goals'] / stats['matches']
-            results[team] = {
-                'team_name': team,
-                'total_matches': stats['matches'],
-                'total_goals': stats['goals'],
-                'average_goals_per_match': round(average, 2)
-            }
+    for team_id in order.tolist():
+        team = names[team_id]
+        results[team] = {
+            'team_name': team,
+            'total_matches': int(matches[team_id]),
+            'total_goals': int(goals[team_id]),
+            'average_goals_per_match': round(int(goals[team_id]) / int(matches[team_id]), 2)
+        }
     
     return results
 
+CHECKPOINT_VERSION = 3
+
+
+def checkpoint_path(output_file):
+    """A checkpoint fájl helye (a kimeneti JSON mellett)"""
+    base, _ = os.path.splitext(output_file)
+    return f"{base}.checkpoint.json"
+
+
+def fingerprint_prefix(csv_file, offset, block_size=64 * 1024):
+    """
+    Mintavételezett ujjlenyomat a fájl már feldolgozott részéről
+    
+    Csak a rész elejét és végét hasheli (ha a rész legfeljebb két blokk,
+    akkor az egészet), így a középső módosításokat nem veszi észre. Csak
+    kifejezett kérésre használt gyors ellenőrzés (lásd
+    prefix_fingerprint(sample=True)).
+    
+    Args:
+        csv_file: CSV fájl elérési útja
+        offset: A feldolgozott rész hossza bájtban
+        block_size: Blokk méret
+        
+    Returns:
+        str: SHA-256 hex ujjlenyomat
+    """
+    digest = hashlib.sha256(str(offset).encode('ascii'))
+    
+    with open(csv_file, 'rb') as file:
+        if offset <= 2 * block_size:
+            remaining = offset
+            while remaining > 0:
+                chunk = file.read(min(block_size, remaining))
+                if not chunk:
+                    break
+                digest.update(chunk)
+                remaining -= len(chunk)
+        else:
+            digest.update(file.read(block_size))
+            file.seek(offset - block_size)
+            digest.update(file.read(block_size))
+    
+    return digest.hexdigest()
+
+
+PREFIX_BLOCK_SIZE = 1024 * 1024
+
+
+def _hash_blocks(csv_file, start, end, block_size):
+    """SHA-256 blokk hash-ek a [start, end) tartományra (start blokkhatáron van)"""
+    digests = []
+    with open(csv_file, 'rb') as file:
+        file.seek(start)
+        position = start
+        while position < end:
+            chunk = file.read(min(block_size, end - position))
+            if not chunk:
+                break
+            digests.append(hashlib.sha256(chunk).hexdigest())
+            position += len(chunk)
+    return digests
+
+
+def prefix_fingerprint(csv_file, offset, previous=None, sample=False,
+                       block_size=PREFIX_BLOCK_SIZE):
+    """
+    Ujjlenyomat a feldolgozott részről (az első offset bájt)
+    
+    Alapból a teljes részt blokkonként hasheli; a már ellenőrzött előző
+    ujjlenyomat (previous) teljes blokkjai újrahasznosulnak, így
+    hozzáfűzéskor csak az utolsó részleges blokk és az új bájtok
+    hashelődnek. sample=True: csak eleje/vége mintavétel (gyorsabb, de a
+    középső módosításokat nem veszi észre).
+    
+    Args:
+        csv_file: CSV fájl elérési útja
+        offset: A feldolgozott rész hossza bájtban
+        previous: Az előző, prefix_matches()-sel ellenőrzött ujjlenyomat
+        sample: Mintavételezett ujjlenyomat
+        block_size: Blokk méret
+        
+    Returns:
+        dict: {'offset', 'block_size', 'blocks'} vagy {'offset', 'sample'}
+    """
+    if sample:
+        return {'offset': offset, 'sample': fingerprint_prefix(csv_file, offset)}
+    
+    blocks = []
+    if (previous is not None and 'blocks' in previous
+            and previous.get('block_size') == block_size and previous['offset'] <= offset):
+        blocks = previous['blocks'][:previous['offset'] // block_size]
+    start = len(blocks) * block_size
+    blocks = blocks + _hash_blocks(csv_file, start, offset, block_size)
+    return {'offset': offset, 'block_size': block_size, 'blocks': blocks}
+
+
+def prefix_matches(csv_file, fingerprint):
+    """
+    Változatlan-e a fájl ujjlenyomattal lefedett része
+    
+    A teljes ujjlenyomatot blokkonként ellenőrzi, az első eltérésnél megáll.
+    """
+    offset = fingerprint.get('offset')
+    if not isinstance(offset, int) or os.path.getsize(csv_file) < offset:
+        return False
+    if 'sample' in fingerprint:
+        return fingerprint['sample'] == fingerprint_prefix(csv_file, offset)
+    
+    block_size = fingerprint['block_size']
+    expected = fingerprint['blocks']
+    with open(csv_file, 'rb') as file:
+        for index, digest in enumerate(expected):
+            chunk = file.read(min(block_size, offset - index * block_size))
+            if hashlib.sha256(chunk).hexdigest() != digest:
+                return False
+    return len(expected) == -(-offset // block_size)
+
+
+def load_checkpoint(path):
+    """Checkpoint betöltése; hiba esetén None"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    if checkpoint.get('version') != CHECKPOINT_VERSION:
+        return None
+    return checkpoint
+
+
+def save_checkpoint(path, checkpoint):
+    """Checkpoint mentése (ideiglenes fájlon keresztül, atomikusan)"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def last_line_end(csv_file, size, block_size=64 * 1024):
+    """Az utolsó teljes (sortöréssel lezárt) sor utáni bájt pozíció"""
+    with open(csv_file, 'rb') as file:
+        position = size
+        while position > 0:
+            start = max(0, position - block_size)
+            file.seek(start)
+            chunk = file.read(position - start)
+            index = chunk.rfind(b'\n')
+            if index != -1:
+                return start + index + 1
+            position = start
+    return 0
+
+
+def update_team_cube_incremental(csv_file='data/adatokfoci.csv',
+                                 output_file='data/team_stats.json',
+                                 sample_verify=False, force_full=False):
+    """
+    Aggregátum kocka inkrementális frissítése checkpoint alapján
+    
+    A checkpoint (a kimeneti fájl mellett) tárolja a feldolgozott bájt
+    pozíciót, a feldolgozott rész blokkonkénti ujjlenyomatát és a nyers
+    számlálókat (a kockát). Csak a hozzáfűzött sorokat dolgozza fel; ha a
+    korábbi rész bárhol megváltozott, teljes újraszámolás történik.
+    
+    Args:
+        csv_file: Az adatokfoci.csv fájl elérési útja
+        output_file: A team_stats.json helye (a checkpoint mellé kerül)
+        sample_verify: Csak a feldolgozott rész elejét/végét ellenőrzi
+                       (gyorsabb, de a középső módosításokat nem veszi észre)
+        force_full: Checkpoint figyelmen kívül hagyása
+        
+    Returns:
+        TeamCube: A frissített kocka, vagy None hiba esetén
+    """
+    cp_path = checkpoint_path(output_file)
+    print(f"📊 Adatok beolvasása (inkrementális): {csv_file}")
+    
+    try:
+        size = os.path.getsize(csv_file)
+        complete_end = last_line_end(csv_file, size)
+        
+        checkpoint = None if force_full else load_checkpoint(cp_path)
+        if checkpoint is not None:
+            offset = checkpoint['offset']
+            fingerprint = checkpoint['fingerprint']
+            if (checkpoint.get('csv_file') != os.path.abspath(csv_file)
+                    or offset > complete_end
+                    or fingerprint.get('offset') != offset
+                    or ('sample' in fingerprint) != sample_verify
+                    or not prefix_matches(csv_file, fingerprint)):
+                print("⚠️  A korábban feldolgozott rész megváltozott, teljes újraszámolás")
+                checkpoint = None
+        
+        if checkpoint is not None:
+            encoding = checkpoint['encoding']
+            offset = checkpoint['offset']
+            line_count = checkpoint['line_count']
+            cube = TeamCube.from_dict(checkpoint['cube'])
+            previous = checkpoint['fingerprint']
+            print(f"♻️  Checkpoint: {line_count} sor már feldolgozva, "
+                  f"{complete_end - offset} új bájt")
+        else:
+            encoding = detect_encoding(csv_file)
+            if encoding is None:
+                print(f"❌ Nem sikerült dekódolni a fájlt")
+                return None
+            offset = 0
+            line_count = 0
+            cube = TeamCube()
+            previous = None
+        
+        # Teljes sorok feldolgozása - ezekig menthető a checkpoint
+        start_count = line_count
+        try:
+            line_count = accumulate_cube(
+                cube,
+                iter_csv_rows(csv_file, encoding, offset, end_offset=complete_end),
+                line_count
+            )
+        except UnicodeDecodeError:
+            # Teljes újraszámolás működő kódolással; a checkpoint ebből is
+            # mentődik, így a következő futás már inkrementális
+            print(f"⚠️  Dekódolási hiba ({encoding}), teljes újraszámolás")
+            built = build_team_cube_with_encoding(csv_file, end_offset=complete_end)
+            if built is None:
+                return None
+            cube, encoding, line_count = built
+            start_count = 0
+        
+        save_checkpoint(cp_path, {
+            'version': CHECKPOINT_VERSION,
+            'csv_file': os.path.abspath(csv_file),
+            'encoding': encoding,
+            'offset': complete_end,
+            'fingerprint': prefix_fingerprint(csv_file, complete_end, previous, sample=sample_verify),
+            'line_count': line_count,
+            'cube': cube.to_dict()
+        })
+        
+        # Lezáratlan utolsó sor (pl. éppen írják): beszámítjuk,
+        # de a checkpointba nem kerül bele
+        if complete_end < size:
+            cube = TeamCube().merge(cube)
+            line_count = accumulate_cube(
+                cube, iter_csv_rows(csv_file, encoding, complete_end), line_count
+            )
+        
+        print(f"✅ {line_count - start_count} új sor feldolgozva ({line_count} összesen)")
+        
+    except FileNotFoundError:
+        print(f"❌ HIBA: A fájl nem található: {csv_file}")
+        return None
+    except Exception as e:
+        print(f"❌ HIBA az olvasás során: {e}")
+        return None
+    
+    return cube
+
+
+def analyze_team_stats_incremental(csv_file='data/adatokfoci.csv',
+                                   output_file='data/team_stats.json',
+                                   sample_verify=False, force_full=False):
+    """
+    Inkrementális elemzés checkpoint alapján (lásd update_team_cube_incremental)
+    
+    Returns:
+        dict: Csapat statisztikák (meccsek, gólok, átlag)
+    """
+    cube = update_team_cube_incremental(csv_file, output_file, sample_verify, force_full)
+    if cube is None:
+        return {}
+    return cube.team_stats()
+
+
 def save_results(results, output_file='data/team_stats.json'):
     """
     Elmenti az eredményeket JSON fájlba
@@ -164,26 +990,78 @@ def print_statistics(results):
     print(f"Átlagos gól/meccs (global):  {avg_goals_per_match:.2f}")
     print("=" * 80)
 
-def main():
+def parse_args(argv=None):
+    """
+    Parancssori kapcsolók feldolgozása
+    
+    Args:
+        argv: Argumentumok listája (alapértelmezés: sys.argv)
+    """
+    parser = argparse.ArgumentParser(description="Válogatottak gólstatisztika elemző")
+    parser.add_argument('--full', action='store_true',
+                        help="teljes újraszámolás a checkpoint figyelmen kívül hagyásával")
+    parser.add_argument('--sample-verify', action='store_true',
+                        help="csak a feldolgozott rész elejének/végének ellenőrzése "
+                             "(gyorsabb, de a középső módosításokat nem veszi észre)")
+    parser.add_argument('--engine', choices=['python', 'numpy'], default='python',
+                        help="'numpy': teljes, vektorizált újraszámolás (checkpoint nélkül)")
+    parser.add_argument('--input', metavar='FORRÁS',
+                        help="több CSV párhuzamos feldolgozása (könyvtár vagy glob minta)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="folyamatok száma --input esetén (alapért.: CPU magok)")
+    parser.add_argument('--metrics', metavar='FÁJL', default=None,
+                        help="fázisidők és számlálók mentése (.json vagy .prom; "
+                             f"alapért.: {instrumentation.ENV_VARIABLE} környezeti változó)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """
     Főprogram
     """
+    args = parse_args(argv)
+    with instrumentation.run('scraper', args.metrics):
+        run_analysis(args)
+
+def run_analysis(args):
+    """
+    Elemzés, mentés és kiírás a parancssori kapcsolók szerint
+    
+    Args:
+        args: A parse_args() eredménye
+    """
     print("⚽ VÁLOGATOTTAK GÓLSTATISZTIKA ELEMZŐ")
     print("=" * 80)
     
-    # Statisztikák elemzése
-    results = analyze_team_stats()
+    # Statisztikák elemzése (csak az új sorok, ha van checkpoint)
+    cube = None
+    with instrumentation.phase('parse'):
+        if args.input:
+            cube = build_team_cube_parallel(args.input, args.workers)
+            results = cube.team_stats() if cube is not None else {}
+        elif args.engine == 'numpy':
+            results = analyze_team_stats(engine='numpy')
+        else:
+            # A team_stats.json a csapat × bajnokság × év kocka csapatonkénti összesítése
+            cube = update_team_cube_incremental(
+                sample_verify=args.sample_verify, force_full=args.full
+            )
+            results = cube.team_stats() if cube is not None else {}
     
     if not results:
         print("❌ Nincs feldolgozható adat!")
         return
     
     # Eredmények mentése
-    save_results(results)
+    with instrumentation.phase('write'):
+        if cube is not None and not args.input:
+            cube.save('data/team_cube.json')
+            print(f"📦 Kocka mentve: data/team_cube.json")
+        save_results(results)
     
     # Statisztikák kiírása
-    print_statistics(results)
-    print_top_teams(results, top_n=15)
+    with instrumentation.phase('report'):
+        print_statistics(results)
+        print_top_teams(results, top_n=15)
     
     # Néhány példa csapat kiírása
     print(f"\n📋 PÉLDA CSAPATOK:")
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Bajnokság és szezon szerint particionált kimenet (shardok)
+Az odds_data.json / live_matches.json mellé bajnokságonként és szezononként
+külön fájl kerül, így egy oldal csak a megjelenített ligát tölti le
+
+Felépítés (pl. data/odds_data/):
+- manifest.json              - shardok: bajnokság, szezon, fájl, sorok, bájtok, hash
+- <bajnokság>/<szezon>.json  - a shard mérkőzései (tömör JSON lista)
+
+Minden fájl ideiglenes fájlba íródik, majd atomikus átnevezéssel kerül a
+helyére (olvasó sosem lát félig írt fájlt). Csak a megváltozott tartalmú
+shardok íródnak újra; a manifest utoljára frissül, így mindig teljes
+shardokra hivatkozik.
+"""
+
+import hashlib
+import json
+import os
+import unicodedata
+from datetime import datetime
+
+from results_index import date_ordinal, season_code
+
+MANIFEST_NAME = 'manifest.json'
+UNKNOWN = 'unknown'
+
+
+def atomic_write(path, data):
+    """Bájtok írása ideiglenes fájlon és os.replace-en keresztül"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def league_slug(league):
+    """Bajnokság név -> fájlnév rész, pl. 'Premier League' -> 'premier-league'"""
+    text = unicodedata.normalize('NFKD', str(league or '')).encode('ascii', 'ignore').decode('ascii')
+    slug = '-'.join(''.join(c if c.isalnum() else ' ' for c in text.lower()).split())
+    return slug or UNKNOWN
+
+
+def match_season(date_value):
+    """Szezon kód a mérkőzés dátumából (pl. '2425'), 'unknown' ha nem értelmezhető"""
+    value = str(date_value or '')
+    # The Odds API ISO időbélyeg (2024-08-17T14:00:00Z): csak a dátum rész
+    ordinal = date_ordinal(value) or date_ordinal(value[:10])
+    return season_code(ordinal) if ordinal is not None else UNKNOWN
+
+
+def shard_directory(filename):
+    """A shard mappa a monolitikus fájl mellett: data/odds_data.json -> data/odds_data"""
+    base = filename
+    for extension in ('.gz', '.br', '.json'):
+        if base.endswith(extension):
+            base = base[:-len(extension)]
+    return base
+
+
+def shard_key(row, cache=None):
+    """
+    (shard kulcs, bajnokság, szezon) egy mérkőzéshez, pl. 'premier-league/2425'
+
+    Args:
+        cache: Opcionális dict (bajnokság, dátum) -> eredmény; a dátumok
+               sokszor ismétlődnek, így a dátum értelmezés ritka
+    """
+    league = row.get('league') or ''
+    date_value = row.get('date')
+    if cache is not None:
+        found = cache.get((league, date_value))
+        if found is not None:
+            return found
+    season = match_season(date_value)
+    found = (f"{league_slug(league)}/{season}", league, season)
+    if cache is not None:
+        cache[(league, date_value)] = found
+    return found
+
+
+class PendingShard:
+    """
+    Soronként épülő shard: hash és méret menet közben
+
+    A sorok BATCH_ROWS-os kötegekben kódolódnak (egy encoder hívás
+    kötegenként), a kódolt bájtok pufferben gyűlnek, és FLUSH_BYTES felett
+    az ideiglenes fájlba kerülnek; így a memória shardonként korlátos, és a
+    változatlan kis shardok a lemezt sem érintik.
+    """
+
+    BATCH_ROWS = 1024
+    FLUSH_BYTES = 256 * 1024
+
+    def __init__(self, league, season, tmp_path, encode):
+        self.league = league
+        self.season = season
+        self.tmp_path = tmp_path
+        self.rows = 0
+        self.bytes = 0
+        self._encode = encode
+        self._batch = []
+        self._hasher = hashlib.blake2b(digest_size=16)
+        self._buffer = []
+        self._buffered = 0
+        self._flushed = False
+        self._append(b'[')
+
+    def _append(self, data):
+        self._hasher.update(data)
+        self._buffer.append(data)
+        self._buffered += len(data)
+        self.bytes += len(data)
+        if self._buffered > self.FLUSH_BYTES:
+            self.flush()
+
+    def add(self, row):
+        self._batch.append(row)
+        if len(self._batch) >= self.BATCH_ROWS:
+            self._encode_batch()
+
+    def _encode_batch(self):
+        # '[a,b]' -> 'a,b'; a kötegek közé vessző kerül
+        data = self._encode(self._batch)[1:-1].encode('utf-8')
+        self._append(data if not self.rows else b',' + data)
+        self.rows += len(self._batch)
+        self._batch = []
+
+    def finish(self):
+        """A lista lezárása; visszaadja a tartalom hash-ét"""
+        if self._batch:
+            self._encode_batch()
+        self._append(b']')
+        return self._hasher.hexdigest()
+
+    def flush(self):
+        if not self._flushed:
+            os.makedirs(os.path.dirname(self.tmp_path) or '.', exist_ok=True)
+        with open(self.tmp_path, 'ab' if self._flushed else 'wb') as f:
+            f.writelines(self._buffer)
+        self._flushed = True
+        self._buffer = []
+        self._buffered = 0
+
+    def publish(self, path):
+        """Az ideiglenes fájl atomikus átnevezése a végleges helyére"""
+        self.flush()
+        os.replace(self.tmp_path, path)
+
+    def discard(self):
+        self._buffer = []
+        if self._flushed:
+            os.remove(self.tmp_path)
+
+
+class ShardStore:
+    """Bajnokság × szezon shardok manifesttel"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.manifest = self._load_manifest()
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _load_manifest(self):
+        try:
+            with open(self._path(MANIFEST_NAME), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {'version': 1, 'updated': None, 'total_rows': 0, 'shards': {}}
+
+    def write(self, rows, meta=None):
+        """
+        Shardok frissítése: csak a megváltozott tartalmúak íródnak újra
+
+        A bemenetből hiányzó (korábbi) shardok törlődnek, így a mappa mindig
+        a teljes, aktuális adathalmazt tükrözi.
+
+        Args:
+            rows: Mérkőzés dict-ek (a teljes adathalmaz)
+            meta: A manifestbe kerülő további mezők (pl. {'updated': ...})
+
+        Returns:
+            dict: {'written', 'unchanged', 'removed'} shard darabszámok
+        """
+        previous = self.manifest.get('shards', {})
+        stats = {'written': 0, 'unchanged': 0, 'removed': 0}
+        now = datetime.now().isoformat(timespec='seconds')
+
+        # Egy menet: minden sor a saját shardjába (a bemenet lehet generátor)
+        encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+        pending = {}
+        cache = {}
+        for row in rows:
+            key, league, season = shard_key(row, cache)
+            shard = pending.get(key)
+            if shard is None:
+                shard = pending[key] = PendingShard(league, season, self._path(f"{key}.json.tmp"), encode)
+            shard.add(row)
+
+        shards = {}
+        total_rows = 0
+        for key, shard in pending.items():
+            digest = shard.finish()
+            path = f"{key}.json"
+            old = previous.get(key)
+            if old is not None and old['hash'] == digest and os.path.exists(self._path(path)):
+                shard.discard()
+                shards[key] = dict(old, league=shard.league)
+                stats['unchanged'] += 1
+            else:
+                shard.publish(self._path(path))
+                shards[key] = {
+                    'league': shard.league,
+                    'season': shard.season,
+                    'path': path,
+                    'rows': shard.rows,
+                    'bytes': shard.bytes,
+                    'hash': digest,
+                    'updated': now,
+                }
+                stats['written'] += 1
+            total_rows += shard.rows
+
+        removed = [entry['path'] for key, entry in previous.items() if key not in shards]
+        stats['removed'] = len(removed)
+
+        if stats['written'] or removed or meta or not os.path.exists(self._path(MANIFEST_NAME)):
+            self.manifest = {
+                'version': 1,
+                'updated': now,
+                'total_rows': total_rows,
+                **(meta or {}),
+                'shards': dict(sorted(shards.items())),
+            }
+            data = json.dumps(self.manifest, ensure_ascii=False, indent=2).encode('utf-8')
+            atomic_write(self._path(MANIFEST_NAME), data)
+
+        # A manifest már nem hivatkozik rájuk
+        for path in removed:
+            try:
+                os.remove(self._path(path))
+                os.rmdir(os.path.dirname(self._path(path)))
+            except OSError:
+                # Hiányzó fájl, vagy a bajnokság mappájában más szezon is van
+                pass
+
+        return stats
+
+    def keys(self, league=None, season=None):
+        """Shard kulcsok bajnokság (név vagy slug) és/vagy szezon szerint szűrve"""
+        slug = league_slug(league) if league is not None else None
+        return [key for key, entry in self.manifest.get('shards', {}).items()
+                if (slug is None or key.split('/')[0] == slug)
+                and (season is None or entry['season'] == season)]
+
+    def read(self, league=None, season=None):
+        """A kiválasztott shardok mérkőzései egy listában"""
+        rows = []
+        for key in self.keys(league, season):
+            with open(self._path(self.manifest['shards'][key]['path']), 'r', encoding='utf-8') as f:
+                rows.extend(json.load(f))
+        return rows
+
+
+def write_shards(rows, filename, meta=None):
+    """
+    A monolitikus fájl melletti shard mappa frissítése
+
+    Args:
+        rows: Mérkőzés dict-ek
+        filename: A monolitikus JSON fájl (pl. data/odds_data.json)
+        meta: A manifestbe kerülő további mezők
+
+    Returns:
+        dict: ShardStore.write() statisztika
+    """
+    return ShardStore(shard_directory(filename)).write(rows, meta)
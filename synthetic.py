@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Nagy tömegű, vektorizált szintetikus mérkőzés generátor terheléses teszthez
+- Seedelhető (azonos seed és darabméret -> azonos adatok)
+- Poisson gól modell: az odds-ok a modell H/D/A valószínűségeiből
+  készülnek (plusz margin), így az eredmények konzisztensek az odds-okkal
+- Darabonként (chunk) generál, a kimeneti formátumokba közvetlenül ír,
+  streaming módban a teljes adathalmaz soha nincs a memóriában
+
+Használat: python synthetic.py 10000000 --format columnar --seed 42
+"""
+
+import argparse
+import csv
+import gzip
+import json
+import os
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from odds_formats import FIELDNAMES, ColumnarWriter
+
+TEAMS = [
+    'Manchester City', 'Liverpool', 'Chelsea', 'Arsenal', 'Tottenham',
+    'Barcelona', 'Real Madrid', 'Atletico Madrid', 'Sevilla',
+    'Bayern Munich', 'Dortmund', 'RB Leipzig',
+    'Juventus', 'AC Milan', 'Inter Milan',
+    'PSG', 'Monaco', 'Lyon'
+]
+LEAGUES = ['Premier League', 'La Liga', 'Bundesliga', 'Serie A', 'Ligue 1']
+RESULTS = np.array(['H', 'D', 'A'], dtype=object)
+
+# Poisson modell: log(várható gól) = alap + hazai előny + erő különbség + zaj
+BASE_GOALS = np.log(1.3)
+HOME_ADVANTAGE = 0.2
+STRENGTH_SD = 0.3
+MATCH_NOISE_SD = 0.15
+
+# A valószínűségek számításánál figyelembe vett legnagyobb gólszám
+MAX_GOALS = 10
+
+# Az első mérkőzés alapértelmezett napja (rögzített: azonos seed -> azonos dátumok)
+DEFAULT_START_DATE = date(2024, 8, 1)
+
+
+def poisson_pmf(rates, max_goals=MAX_GOALS):
+    """(n, max_goals+1) tömb: P(gól = k) soronként, vektorizáltan"""
+    k = np.arange(max_goals + 1)
+    log_factorial = np.concatenate(([0.0], np.cumsum(np.log(k[1:]))))
+    return np.exp(k * np.log(rates)[:, None] - rates[:, None] - log_factorial)
+
+
+def outcome_probabilities(home_rates, away_rates, max_goals=MAX_GOALS):
+    """
+    Hazai győzelem / döntetlen / vendég győzelem valószínűségei két
+    független Poisson eloszlásból (teljes eredmény rács nélkül)
+
+    Returns:
+        np.ndarray: (n, 3) tömb, soronként 1-re normálva
+    """
+    home = poisson_pmf(home_rates, max_goals)
+    away = poisson_pmf(away_rates, max_goals)
+    away_below = np.cumsum(away, axis=1) - away   # P(vendég gól < k)
+    home_below = np.cumsum(home, axis=1) - home
+    probabilities = np.column_stack([
+        (home * away_below).sum(axis=1),
+        (home * away).sum(axis=1),
+        (away * home_below).sum(axis=1),
+    ])
+    return probabilities / probabilities.sum(axis=1, keepdims=True)
+
+
+class MatchGenerator:
+    """
+    Darabonkénti szintetikus mérkőzés generátor
+
+    A csapat erősségek a seedből származnak; minden mérkőzés várható
+    góljai az erősségekből és egy mérkőzés szintű zajból adódnak.
+    """
+
+    def __init__(self, seed=None, teams=TEAMS, leagues=LEAGUES, margin=0.05,
+                 start_date=None, days=365, bookmaker='Simulated'):
+        """
+        Args:
+            seed: Véletlen seed (None = nem reprodukálható)
+            teams: Csapat nevek
+            leagues: Bajnokság nevek
+            margin: Bookmaker margin (0.05 = 5%), arányosan elosztva
+            start_date: Az első mérkőzés napja (alapért.: DEFAULT_START_DATE)
+            days: Ennyi napra oszlanak el a mérkőzések
+            bookmaker: A bookmaker mező értéke
+        """
+        self.rng = np.random.default_rng(seed)
+        self.teams = np.array(teams, dtype=object)
+        self.leagues = np.array(leagues, dtype=object)
+        self.margin = margin
+        self.start_date = start_date or DEFAULT_START_DATE
+        self.days = days
+        self.bookmaker = bookmaker
+        self.strength = self.rng.normal(0.0, STRENGTH_SD, len(teams))
+
+    def chunk(self, offset, size, total):
+        """
+        Egy darab generálása
+
+        Args:
+            offset: Az első mérkőzés sorszáma (a dátum ebből adódik)
+            size: Mérkőzések száma
+            total: Az összes generálandó mérkőzés (a dátum eloszláshoz)
+
+        Returns:
+            dict: Mező név -> numpy tömb (string mezők: object tömbök)
+        """
+        rng = self.rng
+        n_teams = len(self.teams)
+
+        # Két különböző csapat: a vendég a hazai utáni 1..n-1 eltolással
+        home = rng.integers(0, n_teams, size)
+        away = (home + rng.integers(1, n_teams, size)) % n_teams
+        league = rng.integers(0, len(self.leagues), size)
+
+        diff = self.strength[home] - self.strength[away]
+        home_rates = np.exp(BASE_GOALS + HOME_ADVANTAGE + diff + rng.normal(0.0, MATCH_NOISE_SD, size))
+        away_rates = np.exp(BASE_GOALS - diff + rng.normal(0.0, MATCH_NOISE_SD, size))
+
+        # Odds a modell valószínűségeiből + margin
+        probabilities = outcome_probabilities(home_rates, away_rates)
+        odds = np.maximum(1.01, np.round(1.0 / (probabilities * (1.0 + self.margin)), 2))
+
+        home_goals = rng.poisson(home_rates).astype(np.int32)
+        away_goals = rng.poisson(away_rates).astype(np.int32)
+        result = np.where(home_goals > away_goals, 0, np.where(home_goals == away_goals, 1, 2))
+
+        # Dátumok: a napok egyenletesen oszlanak el az összes mérkőzés között
+        day = (np.arange(offset, offset + size, dtype=np.int64) * self.days) // max(1, total)
+        unique_days, day_index = np.unique(day, return_inverse=True)
+        day_strings = np.array([(self.start_date + timedelta(days=int(d))).strftime('%d/%m/%Y')
+                                for d in unique_days], dtype=object)
+
+        return {
+            'date': day_strings[day_index],
+            'league': self.leagues[league],
+            'home_team': self.teams[home],
+            'away_team': self.teams[away],
+            'odds_home': odds[:, 0],
+            'odds_draw': odds[:, 1],
+            'odds_away': odds[:, 2],
+            'home_goals': home_goals,
+            'away_goals': away_goals,
+            'result': RESULTS[result],
+            'bookmaker': np.full(size, self.bookmaker, dtype=object),
+        }
+
+    def chunks(self, num_matches, chunk_size=100000):
+        """Darabok generátora (összesen num_matches mérkőzés)"""
+        for offset in range(0, num_matches, chunk_size):
+            yield self.chunk(offset, min(chunk_size, num_matches - offset), num_matches)
+
+
+def chunk_rows(chunk):
+    """Egy darab sorai dict-ként (a CSV/JSON sémával)"""
+    columns = [chunk[name].tolist() for name in FIELDNAMES]
+    for values in zip(*columns):
+        yield dict(zip(FIELDNAMES, values))
+
+
+def generate_matches(num_matches, seed=None, chunk_size=100000, **options):
+    """Mérkőzés dict-ek generátora (lásd MatchGenerator)"""
+    generator = MatchGenerator(seed, **options)
+    for chunk in generator.chunks(num_matches, chunk_size):
+        yield from chunk_rows(chunk)
+
+
+# --- Streaming írók ---
+
+def write_csv(chunks, filename):
+    """Darabok írása CSV-be (fejléc + soronként)"""
+    count = 0
+    with open(filename, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDNAMES)
+        for chunk in chunks:
+            writer.writerows(zip(*(chunk[name].tolist() for name in FIELDNAMES)))
+            count += len(chunk['date'])
+    return count
+
+
+def write_json(chunks, filename, compress=False):
+    """
+    Darabok írása egyetlen JSON tömbbe (tömör formátum)
+
+    A tömb elemei darabonként kerülnek a fájlba; compress=True esetén gzip.
+    """
+    opener = gzip.open if compress else open
+    count = 0
+    with opener(filename, 'wt', encoding='utf-8') as f:
+        f.write('[')
+        for chunk in chunks:
+            rows = list(chunk_rows(chunk))
+            if not rows:
+                continue
+            body = json.dumps(rows, ensure_ascii=False, separators=(',', ':'))[1:-1]
+            f.write((',' if count else '') + body)
+            count += len(rows)
+        f.write(']')
+    return count
+
+
+def write_columnar_stream(chunks, filename):
+    """Darabok írása az odds_formats oszlopos formátumába (ColumnarWriter)"""
+    with ColumnarWriter(filename) as writer:
+        for chunk in chunks:
+            columns = {}
+            for name in FIELDNAMES:
+                values = chunk[name]
+                if values.dtype == object:
+                    # Kevés egyedi érték: internálás egyedi értékenként
+                    unique, inverse = np.unique(values.astype(str), return_inverse=True)
+                    ids = np.array([writer.intern(value) for value in unique.tolist()], dtype='<u4')
+                    columns[name] = ids[inverse.reshape(-1)]
+                elif values.dtype.kind == 'f':
+                    columns[name] = values.astype('<f8')
+                else:
+                    columns[name] = values.astype('<i4')
+            writer.append(columns, len(chunk['date']))
+        return writer.count
+
+
+WRITERS = {
+    'csv': ('.csv', write_csv),
+    'json': ('.json', write_json),
+    'json.gz': ('.json.gz', lambda chunks, filename: write_json(chunks, filename, compress=True)),
+    'columnar': ('.odc', write_columnar_stream),
+}
+
+
+def generate_to_file(num_matches, filename=None, fmt='columnar', seed=None,
+                     chunk_size=100000, **options):
+    """
+    Mérkőzések generálása közvetlenül fájlba, darabonként
+
+    Args:
+        num_matches: Mérkőzések száma
+        filename: Kimeneti fájl (alapért.: data/synthetic_odds + kiterjesztés)
+        fmt: 'csv', 'json', 'json.gz' vagy 'columnar'
+        seed: Véletlen seed
+        chunk_size: Mérkőzések száma darabonként (ez határozza meg a memóriát)
+
+    Returns:
+        int: A kiírt mérkőzések száma
+    """
+    if fmt not in WRITERS:
+        raise ValueError(f"Ismeretlen formátum: {fmt} (választható: {', '.join(WRITERS)})")
+    extension, writer = WRITERS[fmt]
+    filename = filename or f'data/synthetic_odds{extension}'
+    os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+
+    generator = MatchGenerator(seed, **options)
+    return writer(generator.chunks(num_matches, chunk_size), filename)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Szintetikus mérkőzés adatok generálása")
+    parser.add_argument('count', type=int, nargs='?', default=1000000, help="mérkőzések száma")
+    parser.add_argument('--format', choices=list(WRITERS), default='columnar')
+    parser.add_argument('--output', default=None, help="kimeneti fájl")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=100000)
+    parser.add_argument('--days', type=int, default=365, help="ennyi napra oszlanak el a mérkőzések")
+    parser.add_argument('--start-date', type=date.fromisoformat, default=DEFAULT_START_DATE,
+                        help="az első mérkőzés napja (ÉÉÉÉ-HH-NN)")
+    args = parser.parse_args()
+
+    print(f"🎲 {args.count} szintetikus mérkőzés generálása ({args.format})...")
+    start = time.perf_counter()
+    count = generate_to_file(args.count, args.output, args.format, args.seed,
+                             args.chunk_size, days=args.days, start_date=args.start_date)
+    elapsed = time.perf_counter() - start
+    print(f"✅ {count} mérkőzés kész {elapsed:.1f} mp alatt ({count / max(elapsed, 1e-9):,.0f} / mp)")
+
+
+if __name__ == "__main__":
+    main()
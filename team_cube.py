@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Csapat × Bajnokság × Év aggregátum kocka
+Előre összesített számlálók az adatokfoci.csv alapján, amelyekből
+bármely dimenzió-részhalmazra összesítés kérhető a nyers sorok nélkül
+"""
+
+import json
+import os
+
+# Dimenziók és mértékek sorrendje (a tárolt formátum is ezt követi)
+DIMENSIONS = ('team', 'competition', 'year')
+MEASURES = ('matches', 'goals_for', 'goals_against', 'wins', 'draws', 'losses')
+
+CUBE_VERSION = 1
+
+
+def parse_year(date_str):
+    """
+    Év kinyerése a Datum mezőből (pl. '6/8/2019' vagy '2019-06-08')
+
+    Returns:
+        int: Az év, vagy 0 ha nem értelmezhető
+    """
+    date_str = date_str.strip()
+    for part in (date_str.split('/')[-1], date_str.split('-')[0]):
+        if len(part) == 4 and part.isdigit():
+            return int(part)
+    return 0
+
+
+class TeamCube:
+    """Csapat × bajnokság × év aggregátum kocka"""
+
+    def __init__(self):
+        self.teams = []
+        self.competitions = []
+        self._team_ids = {}
+        self._competition_ids = {}
+        # (csapat id, bajnokság id, év) -> mértékek listája
+        self.cells = {}
+
+    def _team_id(self, team):
+        team_id = self._team_ids.get(team)
+        if team_id is None:
+            team_id = self._team_ids[team] = len(self.teams)
+            self.teams.append(team)
+        return team_id
+
+    def _competition_id(self, competition):
+        competition_id = self._competition_ids.get(competition)
+        if competition_id is None:
+            competition_id = self._competition_ids[competition] = len(self.competitions)
+            self.competitions.append(competition)
+        return competition_id
+
+    def _add(self, team, competition_id, year, goals_for, goals_against):
+        key = (self._team_id(team), competition_id, year)
+        cell = self.cells.get(key)
+        if cell is None:
+            cell = self.cells[key] = [0] * len(MEASURES)
+
+        cell[0] += 1
+        cell[1] += goals_for
+        cell[2] += goals_against
+        if goals_for > goals_against:
+            cell[3] += 1
+        elif goals_for == goals_against:
+            cell[4] += 1
+        else:
+            cell[5] += 1
+
+    def add_match(self, home_team, away_team, home_goals, away_goals, competition='', year=0):
+        """Egy mérkőzés hozzáadása mindkét csapat celláihoz"""
+        competition_id = self._competition_id(competition)
+        self._add(home_team, competition_id, year, home_goals, away_goals)
+        self._add(away_team, competition_id, year, away_goals, home_goals)
+
+    def merge(self, other):
+        """Egy másik kocka számlálóinak hozzáadása (asszociatív)"""
+        for (team_id, competition_id, year), values in other.cells.items():
+            key = (
+                self._team_id(other.teams[team_id]),
+                self._competition_id(other.competitions[competition_id]),
+                year
+            )
+            cell = self.cells.get(key)
+            if cell is None:
+                self.cells[key] = list(values)
+            else:
+                for i, value in enumerate(values):
+                    cell[i] += value
+        return self
+
+    def years(self):
+        """A kockában szereplő évek növekvő sorrendben"""
+        return sorted({year for _, _, year in self.cells})
+
+    @staticmethod
+    def _allowed(values, selection):
+        """Szűrő -> megengedett indexek halmaza (None = mind)"""
+        if selection is None:
+            return None
+        if callable(selection):
+            return {i for i, value in enumerate(values) if selection(value)}
+        selection = set(selection)
+        return {i for i, value in enumerate(values) if value in selection}
+
+    def rollup(self, by=('team',), teams=None, competitions=None, years=None):
+        """
+        Összesítés tetszőleges dimenziókra
+
+        Példa - gól/meccs selejtezőkön 2021 óta:
+            cube.rollup(by=(), competitions=lambda c: 'qualification' in c,
+                        years=lambda y: y >= 2021)[()]
+
+        Args:
+            by: Csoportosító dimenziók ('team', 'competition', 'year' részhalmaza)
+            teams: Csapatok szűrője (gyűjtemény vagy függvény)
+            competitions: Bajnokságok szűrője (gyűjtemény vagy függvény)
+            years: Évek szűrője (gyűjtemény, pl. range, vagy függvény)
+
+        Returns:
+            dict: Kulcs tuple (a `by` sorrendjében) -> mértékek dict
+        """
+        for dimension in by:
+            if dimension not in DIMENSIONS:
+                raise ValueError(f"Ismeretlen dimenzió: {dimension}")
+
+        team_filter = self._allowed(self.teams, teams)
+        competition_filter = self._allowed(self.competitions, competitions)
+        if years is None:
+            year_filter = None
+        elif callable(years):
+            year_filter = {year for year in self.years() if years(year)}
+        else:
+            year_filter = set(years)
+
+        positions = [DIMENSIONS.index(dimension) for dimension in by]
+        labels = (self.teams, self.competitions, None)
+
+        # A cellák beszúrási sorrendje a csapatok első előfordulását követi
+        totals = {}
+        for key, values in self.cells.items():
+            team_id, competition_id, year = key
+            if team_filter is not None and team_id not in team_filter:
+                continue
+            if competition_filter is not None and competition_id not in competition_filter:
+                continue
+            if year_filter is not None and year not in year_filter:
+                continue
+
+            group = tuple(
+                key[p] if labels[p] is None else labels[p][key[p]] for p in positions
+            )
+            total = totals.get(group)
+            if total is None:
+                totals[group] = list(values)
+            else:
+                for i, value in enumerate(values):
+                    total[i] += value
+
+        return {group: dict(zip(MEASURES, values)) for group, values in totals.items()}
+
+    def team_stats(self, **filters):
+        """
+        Csapatonkénti összesítés a team_stats.json formátumában
+
+        Args:
+            **filters: A rollup szűrői (competitions, years, teams)
+
+        Returns:
+            dict: Csapat statisztikák (meccsek, gólok, átlag)
+        """
+        grouped = self.rollup(by=('team',), **filters)
+
+        results = {}
+        for team in self.teams:
+            stats = grouped.get((team,))
+            if stats and stats['matches'] > 0:
+                results[team] = {
+                    'team_name': team,
+                    'total_matches': stats['matches'],
+                    'total_goals': stats['goals_for'],
+                    'average_goals_per_match': round(stats['goals_for'] / stats['matches'], 2)
+                }
+
+        return results
+
+    def to_dict(self):
+        """Tömör, JSON-kompatibilis forma: szótárak + lapos cella lista"""
+        cells = []
+        for (team_id, competition_id, year), values in self.cells.items():
+            cells.append([team_id, competition_id, year] + values)
+        return {
+            'version': CUBE_VERSION,
+            'dimensions': list(DIMENSIONS),
+            'measures': list(MEASURES),
+            'teams': self.teams,
+            'competitions': self.competitions,
+            'cells': cells
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Kocka visszaállítása a to_dict() formából"""
+        if data.get('version') != CUBE_VERSION:
+            raise ValueError(f"Nem támogatott kocka verzió: {data.get('version')}")
+
+        cube = cls()
+        for team in data['teams']:
+            cube._team_id(team)
+        for competition in data['competitions']:
+            cube._competition_id(competition)
+        for cell in data['cells']:
+            cube.cells[tuple(cell[:3])] = list(cell[3:])
+        return cube
+
+    def save(self, path='data/team_cube.json'):
+        """Kocka mentése tömör JSON-ba"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path='data/team_cube.json'):
+        """Kocka betöltése"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Kanonikus csapat név regiszter a források összekapcsolásához
+A Football-Data ("Man United"), a The Odds API ("Manchester United",
+"Atlético Madrid") és a helyi CSV-k eltérő neveit egy kanonikus névre
+vezeti vissza:
+1. Feloldott nevek cache-e (futások között megmarad)
+2. Normalizált alias tábla (ékezetek, rövidítések, FC/CF/... nélkül),
+   majd egyértelmű mag alak ('Leeds' / 'Leeds United')
+3. Karakter trigram index: a jelöltek az invertált indexből jönnek,
+   nem páronkénti összehasonlításból (csak egyértelmű, erős egyezés,
+   azonos megkülönböztető szavakkal). A fuzzy egyezés nem kerül
+   automatikusan az alias táblába: ellenőrzési sorba kerül (review),
+   amíg accept() / reject() el nem dönti.
+
+A kanonikus név a csoport neveiből determinisztikusan választódik
+(canonical_rank), nem az elsőként látott alak. Egy már kiadott kanonikus
+név (resolve / canonicalize visszatérési értéke) többé nem változik, így
+egy csapat egy fájlon belül és futások között is ugyanazon a néven
+szerepel; egy köteg neveit canonicalize_all() egyszerre rendezi el, mielőtt
+bármelyiket kiadná.
+"""
+
+import json
+import os
+import re
+import unicodedata
+from collections import defaultdict
+
+ALIASES_PATH = 'data/team_aliases.json'
+REGISTRY_VERSION = 1
+
+# Elhagyott szavak (klub forma jelölések)
+STOP_WORDS = {
+    'fc', 'cf', 'afc', 'sc', 'fk', 'sk', 'ac', 'as', 'ss', 'ssc', 'us', 'cd', 'ud',
+    'sd', 'rc', 'rcd', 'ca', 'club', 'calcio', 'de', 'the', '1', 'bk', 'if', 'sv', 'vfl', 'vfb',
+}
+
+# Testvércsapatokat / más csapatot jelölő szavak ('Brentford B', 'Paris FC',
+# 'DR Congo'); fuzzy egyezés csak azonos halmaz esetén. Az 'fc' a
+# normalizálásban elhagyott szó, itt a nyers névből számít.
+DISTINGUISHING_WORDS = {
+    'fc', 'afc', 'sc', 'sg', 'b', 'c', 'ii', 'iii', 'dr', 'w', 'women', 'ladies',
+    'reserves', 'res', 'youth', 'am',
+}
+AGE_GROUP = re.compile(r'^u\d{2}$')
+
+# Rövidítések kifejtése (normalizált szavak)
+ABBREVIATIONS = {
+    'man': 'manchester',
+    'utd': 'united',
+    'nottm': 'nottingham',
+    'sheff': 'sheffield',
+    'wed': 'wednesday',
+    'atl': 'atletico',
+    'st': 'saint',
+    'psg': 'paris saint germain',
+    'qpr': 'queens park rangers',
+}
+
+# A "mag" alakból elhagyott szavak ('Leeds United' -> 'leeds'); a mag csak
+# akkor old fel, ha egyetlen kanonikus névhez tartozik ('Manchester' nem)
+CORE_DROP_WORDS = {
+    'city', 'town', 'united', 'county', 'hotspur', 'wanderers', 'albion',
+    'real', 'olympique', 'hellas', 'borussia', 'vigo',
+}
+
+# Ismert eltérések, amelyeket a normalizálás és a hasonlóság nem talál meg
+SEED_TEAMS = {
+    'Wolverhampton Wanderers': ['Wolves'],
+    'Brighton and Hove Albion': ['Brighton', 'Brighton & Hove Albion'],
+    'Tottenham Hotspur': ['Tottenham', 'Spurs'],
+    'West Ham United': ['West Ham'],
+    'Newcastle United': ['Newcastle'],
+    'Leicester City': ['Leicester'],
+    'Ipswich Town': ['Ipswich'],
+    'Inter Milan': ['Inter', 'Internazionale'],
+    'Bayern Munich': ['Bayern Munchen', 'Bayern München', 'FC Bayern'],
+    'Borussia Monchengladbach': ["M'gladbach", 'Borussia Mönchengladbach', 'Gladbach'],
+    'Eintracht Frankfurt': ['Ein Frankfurt'],
+    'Athletic Bilbao': ['Ath Bilbao', 'Athletic Club'],
+    'Atletico Madrid': ['Ath Madrid', 'Atlético Madrid'],
+    'Borussia Dortmund': ['Dortmund'],
+    'Bayer Leverkusen': ['Leverkusen'],
+    'AC Milan': ['Milan'],
+    'Real Sociedad': ['Sociedad'],
+    'Paris Saint Germain': ['Paris SG', 'PSG'],
+    'Olympique Lyonnais': ['Lyon'],
+    'West Bromwich Albion': ['West Brom'],
+}
+
+
+def _raw_words(name):
+    """Kisbetűs, ékezet és írásjel nélküli szavak (rövidítések kifejtése nélkül)"""
+    text = unicodedata.normalize('NFKD', name or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    text = text.replace('&', ' and ').replace('ı', 'i').replace('ø', 'o').replace('ß', 'ss')
+    return re.sub(r"[^a-z0-9]+", ' ', text.lower().replace("'", '')).split()
+
+
+def normalize_name(name):
+    """
+    Összehasonlítható alak: kisbetűs, ékezet és írásjel nélküli,
+    rövidítések kifejtve, klub forma jelölések (FC, CF, ...) elhagyva
+    """
+    words = ' '.join(ABBREVIATIONS.get(word, word) for word in _raw_words(name)).split()
+    kept = [word for word in words if word not in STOP_WORDS]
+    return ' '.join(kept or words)
+
+
+def distinguishing_words(name):
+    """A nyers név megkülönböztető szavai ('Brentford B' -> {'b'})"""
+    return frozenset(word for word in _raw_words(name)
+                     if word in DISTINGUISHING_WORDS or AGE_GROUP.match(word))
+
+
+def canonical_rank(name):
+    """
+    Rendezési kulcs a kanonikus név választásához (a legkisebb nyer)
+
+    Rövidítés nélküli ('Nottingham Forest', nem "Nott'm Forest"), majd a
+    több szavas ('Leeds United', nem 'Leeds'), kevesebb klub forma jelölést
+    tartalmazó, hosszabb alak; végül ábécé sorrend, így az eredmény nem
+    függ attól, melyik forrás látta elsőként a csapatot.
+    """
+    words = _raw_words(name)
+    abbreviated = "'" in name or any(word in ABBREVIATIONS for word in words)
+    club_forms = sum(1 for word in words if word in STOP_WORDS)
+    return (abbreviated, -len(normalize_name(name).split()), club_forms, -len(name), name)
+
+
+def core_name(normalized):
+    """Normalizált név mag alakja (CORE_DROP_WORDS nélkül)"""
+    words = [word for word in normalized.split() if word not in CORE_DROP_WORDS]
+    return ' '.join(words) or normalized
+
+
+def trigrams(normalized):
+    """Szavanként határolt karakter trigramok halmaza"""
+    grams = set()
+    for word in normalized.split():
+        padded = f' {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TeamRegistry:
+    """
+    Kanonikus csapat nevek, alias táblával és trigram indexszel
+
+    Használat:
+        registry = TeamRegistry.load()
+        registry.resolve('Bayern München')   # -> 'Bayern Munich'
+        registry.canonicalize_all(matches)   # 'Man City' és 'Manchester City'
+                                             # -> 'Manchester City' mindkét sorban
+        registry.pending_review()            # fuzzy javaslatok ellenőrzésre
+        registry.save()
+    """
+
+    def __init__(self, path=ALIASES_PATH, threshold=0.75, ambiguity=0.1):
+        """
+        Args:
+            path: Az alias tábla fájlja (None = nincs mentés)
+            threshold: Minimális hasonlóság a fuzzy javaslathoz (0-1)
+            ambiguity: Ha a második legjobb jelölt ennyire megközelíti az
+                       elsőt, nincs javaslat
+        """
+        self.path = path
+        self.threshold = threshold
+        self.ambiguity = ambiguity
+        self.teams = {}                 # kanonikus név -> alias nevek halmaza
+        self.review = {}                # nyers név -> {'candidate', 'score'} (ellenőrzésre vár)
+        self._aliases = {}              # normalizált alias -> kanonikus név
+        self._resolved = {}             # nyers név -> kanonikus név (cache)
+        self._cores = defaultdict(set)  # mag alak -> kanonikus nevek (hosszú aliasokból)
+        self._grams = {}                # normalizált alias -> trigramok
+        self._marks = {}                # normalizált alias -> megkülönböztető szavak
+        self._index = defaultdict(set)  # trigram -> normalizált aliasok
+        self._keys = {}                 # kanonikus név -> futás közben állandó kulcs
+        self._issued = set()            # már kiadott (többé át nem nevezett) kanonikus nevek
+        self._dirty = False
+        # A beépített kanonikus nevek rögzítettek
+        self._fixed = set(SEED_TEAMS)
+        for canonical, aliases in SEED_TEAMS.items():
+            self.add(canonical, aliases)
+        self._dirty = False
+
+    # --- Építés ---
+
+    def _index_alias(self, normalized, canonical, name):
+        if normalized in self._aliases:
+            return
+        self._aliases[normalized] = canonical
+        self._marks[normalized] = distinguishing_words(name)
+        core = core_name(normalized)
+        if core != normalized:
+            self._cores[core].add(canonical)
+        grams = trigrams(normalized)
+        self._grams[normalized] = grams
+        for gram in grams:
+            self._index[gram].add(normalized)
+
+    def add(self, canonical, aliases=()):
+        """
+        Kanonikus név (és aliasai) felvétele
+
+        Returns:
+            str: A csoport kanonikus neve (a legjobb canonical_rank alak)
+        """
+        names = self.teams.setdefault(canonical, set())
+        self._keys.setdefault(canonical, canonical)
+        for name in (canonical, *aliases):
+            if name not in names:
+                names.add(name)
+                self._dirty = True
+            normalized = normalize_name(name)
+            if normalized:
+                self._index_alias(normalized, canonical, name)
+            self._resolved[name] = canonical
+        return self._choose_canonical(canonical)
+
+    def _choose_canonical(self, canonical):
+        """A csoport átnevezése, ha van jobb kanonikus alak (kiadott névnél nem)"""
+        if canonical in self._fixed or canonical in self._issued:
+            return canonical
+        best = min(self.teams[canonical], key=canonical_rank)
+        if best == canonical:
+            return canonical
+
+        names = self.teams.pop(canonical)
+        self.teams[best] = names
+        self._keys[best] = self._keys.pop(canonical)
+        for name in names:
+            self._resolved[name] = best
+            normalized = normalize_name(name)
+            if self._aliases.get(normalized) == canonical:
+                self._aliases[normalized] = best
+            owners = self._cores.get(core_name(normalized))
+            if owners and canonical in owners:
+                owners.discard(canonical)
+                owners.add(best)
+        self._dirty = True
+        return best
+
+    # --- Keresés ---
+
+    def candidates(self, name, limit=5):
+        """
+        Fuzzy jelöltek a trigram indexből
+
+        Pontszám: Dice együttható a trigramokon. A részleges nevek
+        ('Dortmund' / 'Borussia Dortmund') a beépített aliasokban vannak,
+        mert a szó-részhalmaz egyezés félrevezető ('Milan' / 'Inter Milan').
+        Csak az azonos megkülönböztető szavú aliasok jelöltek: 'Brentford B'
+        nem 'Brentford', 'Paris FC' nem 'Paris SG'.
+
+        Returns:
+            list: (kanonikus név, pontszám) párok csökkenő sorrendben
+        """
+        normalized = normalize_name(name)
+        grams = trigrams(normalized)
+        if not grams:
+            return []
+        marks = distinguishing_words(name)
+
+        # Közös trigramok száma csak az indexben talált aliasokra
+        shared = defaultdict(int)
+        for gram in grams:
+            for alias in self._index.get(gram, ()):
+                shared[alias] += 1
+
+        best = {}
+        for alias, count in shared.items():
+            if self._marks[alias] != marks:
+                continue
+            score = 2.0 * count / (len(grams) + len(self._grams[alias]))
+            canonical = self._aliases[alias]
+            if score > best.get(canonical, 0.0):
+                best[canonical] = score
+
+        return sorted(best.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+    def lookup(self, name):
+        """Kanonikus név fuzzy egyezés nélkül (None, ha ismeretlen)"""
+        canonical = self._resolved.get(name)
+        if canonical is None:
+            canonical = self._aliases.get(normalize_name(name))
+        return canonical
+
+    def resolve(self, name, create=True):
+        """
+        Kanonikus név feloldása
+
+        A fuzzy egyezés csak javaslat: a név ellenőrzési sorba kerül
+        (self.review), és feloldatlan marad, amíg accept() nem hagyja jóvá.
+        A visszaadott kanonikus név kiadottnak számít: a csoport később
+        érkező, jobb alakja sem nevezi át (több név egyszerre:
+        resolve_all / canonicalize_all).
+
+        Args:
+            name: A forrásban szereplő név
+            create: Ismeretlen név esetén új kanonikus névként felvenni
+
+        Returns:
+            str: A kanonikus név; ellenőrzésre váró névnél maga a név
+                 (create=False esetén None, ha nincs pontos egyezés)
+        """
+        canonical = self._resolve(name, create)
+        if canonical in self.teams and canonical not in self._issued:
+            self._issued.add(canonical)
+            self._dirty = True
+        return canonical
+
+    def _resolve(self, name, create=True):
+        """resolve() a név kiadása nélkül (a csoport még átnevezhető)"""
+        if not name:
+            return name
+        canonical = self._resolved.get(name)
+        if canonical is not None:
+            return canonical
+        if name in self.review:
+            return name if create else None
+
+        normalized = normalize_name(name)
+        canonical = self._aliases.get(normalized)
+        if canonical is None:
+            # Rövid alak egy ismert hosszú névhez ('Leeds' -> 'Leeds United'),
+            # vagy hosszú alak egy ismert rövid névhez; mag-mag egyezés nincs
+            # ('Man City' és 'Man United' magja egyaránt 'manchester')
+            owners = self._cores.get(normalized, ())
+            if len(owners) == 1:
+                canonical = next(iter(owners))
+            else:
+                canonical = self._aliases.get(core_name(normalized))
+        if canonical is None:
+            ranked = self.candidates(name, limit=2)
+            if ranked and ranked[0][1] >= self.threshold and (
+                    len(ranked) == 1 or ranked[0][1] - ranked[1][1] > self.ambiguity):
+                self.review[name] = {'candidate': ranked[0][0], 'score': round(ranked[0][1], 3)}
+                self._dirty = True
+                return name if create else None
+
+        if canonical is None:
+            if not create:
+                return None
+            canonical = name
+
+        # Az eredmény aliasként és cache-ben is megmarad
+        return self.add(canonical, (name,))
+
+    def key(self, name):
+        """
+        Futás közben állandó csapat kulcs (indexekhez)
+
+        A kanonikus név új aliasok érkezésekor változhat ('Leeds' ->
+        'Leeds United'); a kulcs nem, így a korábban épített indexek
+        érvényesek maradnak.
+        """
+        canonical = self._resolve(name)
+        return self._keys.get(canonical, canonical)
+
+    def resolve_all(self, names):
+        """
+        Több név feloldása egy lépésben
+
+        Előbb minden név bekerül a regiszterbe, és csak utána adódnak ki a
+        kanonikus nevek, így a köteg minden alakja ugyanazt a (legjobb) nevet
+        kapja, függetlenül a sorrendtől.
+
+        Returns:
+            dict: név -> kanonikus név
+        """
+        names = [name for name in dict.fromkeys(names) if name]
+        for name in names:
+            self._resolve(name)
+        return {name: self.resolve(name) for name in names}
+
+    def canonicalize_all(self, matches, fields=('home_team', 'away_team')):
+        """Mérkőzés dict-ek csapat neveinek cseréje a kanonikusra (helyben, egy kötegben)"""
+        canonical = self.resolve_all(match[field] for match in matches for field in fields
+                                     if match.get(field))
+        for match in matches:
+            for field in fields:
+                if match.get(field):
+                    match[field] = canonical[match[field]]
+        return matches
+
+    def canonicalize(self, match, fields=('home_team', 'away_team')):
+        """Egy mérkőzés dict csapat neveinek cseréje a kanonikusra (helyben)"""
+        return self.canonicalize_all([match], fields)[0]
+
+    # --- Ellenőrzés ---
+
+    def pending_review(self):
+        """Ellenőrzésre váró fuzzy javaslatok: (név, jelölt, pontszám) lista"""
+        return [(name, entry['candidate'], entry['score'])
+                for name, entry in sorted(self.review.items())]
+
+    def accept(self, name, canonical=None):
+        """Fuzzy javaslat jóváhagyása (vagy a név kézi hozzárendelése)"""
+        entry = self.review.pop(name, None)
+        canonical = canonical or (entry and entry['candidate'])
+        if not canonical:
+            raise KeyError(name)
+        self._dirty = True
+        return self.add(self._resolved.get(canonical, canonical), (name,))
+
+    def reject(self, name):
+        """Fuzzy javaslat elutasítása: a név saját kanonikus névként marad"""
+        self.review.pop(name, None)
+        self._dirty = True
+        return self.add(name)
+
+    # --- Fájl ---
+
+    def to_dict(self):
+        return {
+            'version': REGISTRY_VERSION,
+            'teams': {canonical: sorted(aliases - {canonical})
+                      for canonical, aliases in sorted(self.teams.items())},
+            'review': dict(sorted(self.review.items())),
+            'issued': sorted(self._issued & set(self.teams)),
+        }
+
+    def save(self, path=None):
+        """Alias tábla mentése (csak ha változott)"""
+        path = path or self.path
+        if not path or not self._dirty:
+            return
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path=ALIASES_PATH, **options):
+        """Regiszter betöltése (hiányzó vagy hibás fájl: csak a beépített aliasok)"""
+        registry = cls(path, **options)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return registry
+
+        if data.get('version') == REGISTRY_VERSION:
+            # A korábban kiadott nevek betöltéskor sem nevezhetők át
+            registry._issued.update(data.get('issued', []))
+            for canonical, aliases in data.get('teams', {}).items():
+                registry.add(canonical, aliases)
+            registry.review.update(data.get('review', {}))
+        registry._dirty = False
+        return registry
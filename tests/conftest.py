@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""Közös pytest beállítások: a projekt gyökere importálható"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""Stratégia backtest: referencia árak, stratégiák, kiértékelés és rács futtatás"""
+
+import numpy as np
+import pytest
+
+from backtest import (BacktestData, DEFAULT_GRIDS, evaluate, load_matches, param_grid,
+                      reference_odds, run_strategy, sweep)
+
+# Négy mérkőzés ismert kimenettel; a fair valószínűségek kézzel megadva
+ODDS = [
+    [1.5, 4.0, 6.0],   # H nyer
+    [2.0, 3.4, 3.8],   # D
+    [3.0, 3.2, 2.2],   # A nyer
+    [1.8, 3.6, 4.5],   # A nyer
+]
+FAIR = [
+    [0.70, 0.20, 0.10],   # H várható érték: 1.5 * 0.7 - 1 = 0.05
+    [0.45, 0.25, 0.30],   # A: 3.8 * 0.3 - 1 = 0.14
+    [0.30, 0.25, 0.45],   # nincs előny (max: 3.0 * 0.3 - 1 = -0.1)
+    [0.50, 0.20, 0.30],   # A: 4.5 * 0.3 - 1 = 0.35
+]
+OUTCOME = [0, 1, 2, 2]
+
+
+@pytest.fixture
+def data():
+    return BacktestData(ODDS, FAIR, OUTCOME, ['EPL', 'EPL', 'Liga', 'Liga'], [4, 3, 2, 1])
+
+
+def unordered():
+    return BacktestData(ODDS, FAIR, OUTCOME)
+
+
+def test_rows_sorted_by_date_undated_first():
+    data = BacktestData(ODDS, FAIR, OUTCOME, dates=[5, np.nan, 1, np.nan])
+    assert data.outcome.tolist() == [1, 2, 2, 0]
+
+
+def test_favourite_fixed_stakes():
+    result = run_strategy(unordered(), 'favourite')
+    # H 1.5 nyer (+0.5), H 2.0 veszít, A 2.2 nyer (+1.2), H 1.8 veszít
+    assert result['bets'] == 4
+    assert result['profit'] == pytest.approx(-0.3)
+    assert result['roi'] == pytest.approx(-0.075)
+    assert result['hit_rate'] == 0.5
+    assert result['max_drawdown'] == pytest.approx(1.0)
+
+    capped = run_strategy(unordered(), 'favourite', max_odds=1.6)
+    assert (capped['bets'], capped['profit']) == (1, 0.5)
+
+
+def test_value_bets_only_with_edge():
+    result = run_strategy(unordered(), 'value', edge=0.1)
+    # A (3.8) veszít, A (4.5) nyer: -1 + 3.5
+    assert result['bets'] == 2
+    assert result['profit'] == pytest.approx(2.5)
+    assert result['roi'] == pytest.approx(1.25)
+    assert run_strategy(unordered(), 'value', edge=0.0)['bets'] == 3
+    assert run_strategy(unordered(), 'value', edge=0.0, max_odds=4.0)['bets'] == 2
+
+
+def test_kelly_compounds_bankroll():
+    result = run_strategy(unordered(), 'kelly', fraction=1.0, edge=0.0, cap=1.0)
+    # Tétek: 0.05 / 0.5 = 0.1, 0.14 / 2.8 = 0.05, 0.35 / 3.5 = 0.1
+    bankroll = (1 + 0.1 * 0.5) * (1 - 0.05) * (1 + 0.1 * 3.5)
+    assert result['bets'] == 3
+    assert result['final_bankroll'] == pytest.approx(bankroll, abs=1e-4)
+    assert result['profit'] == pytest.approx(bankroll - 1.0, abs=1e-4)
+
+
+def test_draw_and_band():
+    result = run_strategy(unordered(), 'draw', min_odds=3.3, max_odds=3.5)
+    assert (result['bets'], result['profit']) == (1, 2.4)
+    result = run_strategy(unordered(), 'band', low=1.9, high=2.5)
+    assert (result['bets'], result['profit']) == (2, 0.2)
+    result = run_strategy(unordered(), 'band', low=2.0, high=4.0, outcome='A')
+    assert (result['bets'], result['profit']) == (2, 0.2)
+
+
+def test_no_bets():
+    selection = np.full(4, -1)
+    assert evaluate(unordered(), selection, np.ones(4))['roi'] == 0.0
+
+
+def test_value_and_kelly_refused_without_reference():
+    matches = [{'date': '17/08/2024', 'home_team': 'A', 'away_team': 'B', 'odds_home': 2.0,
+                'odds_draw': 3.3, 'odds_away': 3.8, 'result': 'H', 'bookmaker': 'Pinnacle'}]
+    data = load_matches(matches, reference_odds(matches))
+    assert not data.has_reference().any()
+    assert run_strategy(data, 'favourite')['bets'] == 1
+    for name in ('value', 'kelly'):
+        with pytest.raises(ValueError):
+            run_strategy(data, name)
+
+
+def test_reference_from_other_rows_of_the_same_match():
+    base = {'date': '17/08/2024', 'home_team': 'A', 'away_team': 'B', 'result': 'H'}
+    matches = [
+        dict(base, bookmaker='Bet365', odds_home=2.3, odds_draw=3.3, odds_away=3.2),
+        dict(base, bookmaker='Pinnacle', odds_home=2.0, odds_draw=3.5, odds_away=4.0),
+        dict(base, bookmaker='Unibet', odds_home=2.1, odds_draw=3.4, odds_away=3.6),
+        dict(base, date='18/08/2024', bookmaker='Bet365', odds_home=2.0, odds_draw=3.4, odds_away=3.6),
+    ]
+    reference = reference_odds(matches)
+    assert reference[0].tolist() == [2.0, 3.5, 4.0]
+    assert reference[2].tolist() == [2.0, 3.5, 4.0]
+    # A Pinnacle sornak a többiek átlaga, az egyedüli sornak nincs referencia
+    assert reference[1] == pytest.approx([2.2, 3.35, 3.4])
+    assert np.isnan(reference[3]).all()
+
+    data = load_matches(matches, reference)
+    assert data.has_reference().tolist() == [True, True, True, False]
+    # A Bet365 hazai ára a Pinnacle fair ára fölött van: van értékfogadás
+    assert run_strategy(data, 'value', edge=0.0)['bets'] >= 1
+
+
+def test_param_grid_drops_impossible_cells():
+    grid = param_grid(low=[1.5, 2.0], high=[1.8, 2.5])
+    assert grid == [{'low': 1.5, 'high': 1.8}, {'low': 1.5, 'high': 2.5}, {'low': 2.0, 'high': 2.5}]
+    for name, axes in DEFAULT_GRIDS.items():
+        for params in param_grid(**axes):
+            assert params.get('min_odds', 0) <= params.get('max_odds', np.inf)
+            assert params.get('low', 0) <= params.get('high', np.inf)
+
+
+def test_sweep_ranks_by_roi_and_matches_parallel(data):
+    grid = param_grid(max_odds=[1.6, 1.9, np.inf])
+    ranked = sweep(data, 'favourite', grid, workers=1)
+    assert [params['max_odds'] for params, _ in ranked] == [1.6, np.inf, 1.9]
+    assert [result['roi'] for _, result in ranked] == [0.5, -0.075, -0.25]
+    assert sweep(data, 'favourite', grid, workers=2, chunk_size=1) == ranked
+
+
+def test_subset_by_league(data):
+    liga = data.subset(data.leagues == 'Liga')
+    assert len(liga) == 2
+    assert run_strategy(liga, 'favourite')['profit'] == pytest.approx(0.2)
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""Kalibráció előszámítás: inkrementális állapot és a csapat mérlegek"""
+
+import json
+import os
+
+import pytest
+
+from calibration import CalibrationStore, team_records, update_calibration
+
+
+def match(day, home, away, result, odds=(2.0, 3.4, 3.8), bookmaker='Bet365', league='Premier League'):
+    goals = {'H': (2, 0), 'D': (1, 1), 'A': (0, 1), None: (None, None)}[result]
+    return {'date': day, 'league': league, 'home_team': home, 'away_team': away,
+            'odds_home': odds[0], 'odds_draw': odds[1], 'odds_away': odds[2],
+            'home_goals': goals[0], 'away_goals': goals[1], 'result': result, 'bookmaker': bookmaker}
+
+
+MATCHES = [
+    match('10/08/2024', 'Arsenal', 'Chelsea', 'H'),
+    match('11/08/2024', 'Liverpool', 'Everton', 'D', odds=(1.5, 4.2, 6.5)),
+    match('12/08/2024', 'Chelsea', 'Liverpool', 'A', odds=(2.6, 3.3, 2.7), bookmaker='Pinnacle'),
+    match('13/08/2024', 'Everton', 'Arsenal', 'A', odds=(4.5, 3.7, 1.8), league='Other'),
+]
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return str(tmp_path / 'state.json'), str(tmp_path / 'summary.json')
+
+
+def summary_groups(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)['groups']
+
+
+def test_incremental_equals_full(paths, tmp_path):
+    state, summary = paths
+    update_calibration(MATCHES[:2], state_path=state, summary_path=summary)
+    touched = update_calibration(MATCHES, state_path=state, summary_path=summary)
+    assert 'league:Other' in touched and 'league:Premier League' in touched
+    assert 'bookmaker:Pinnacle' in touched and 'team:Everton' in touched
+
+    full = str(tmp_path / 'full.json')
+    update_calibration(MATCHES, full=True, state_path=str(tmp_path / 'full_state.json'), summary_path=full)
+    assert summary_groups(summary) == summary_groups(full)
+    assert summary_groups(summary)['all']['matches'] == 4
+
+
+def test_state_is_bounded_and_files_are_replaced_atomically(paths, tmp_path):
+    state, summary = paths
+    update_calibration(MATCHES, state_path=state, summary_path=summary)
+    with open(state, encoding='utf-8') as f:
+        saved = json.load(f)
+    assert saved['processed']['rows'] == 4 and 'seen' not in saved
+    assert sorted(os.listdir(tmp_path)) == ['state.json', 'summary.json']
+
+    # Ugyanaz a bemenet még egyszer: nincs új sor
+    assert update_calibration(MATCHES, state_path=state, summary_path=summary) == set()
+
+
+def test_rewritten_input_triggers_full_recompute(paths):
+    state, summary = paths
+    update_calibration(MATCHES, state_path=state, summary_path=summary)
+    changed = [match('10/08/2024', 'Arsenal', 'Chelsea', 'A')] + MATCHES[1:]
+    update_calibration(changed, state_path=state, summary_path=summary)
+    groups = summary_groups(summary)
+    assert groups['all']['matches'] == 4
+    assert groups['team:Arsenal']['home']['losses'] == 1
+
+
+def test_stops_at_pending_and_skips_sample_rows(paths):
+    state, summary = paths
+    rows = [MATCHES[0], match('14/08/2024', 'A', 'B', 'H', bookmaker='Simulated'),
+            match('15/08/2024', 'Wolves', 'Fulham', None), MATCHES[1]]
+    update_calibration(rows, state_path=state, summary_path=summary)
+    store = CalibrationStore(state, summary).load()
+    assert store.processed['rows'] == 1
+    assert 'team:A' not in store.summary
+
+    rows[2] = match('15/08/2024', 'Wolves', 'Fulham', 'D')
+    update_calibration(rows, state_path=state, summary_path=summary)
+    assert summary_groups(summary)['all']['matches'] == 3
+
+
+def test_team_records_match_page_statistics(tmp_path):
+    path = tmp_path / 'adatokfoci.csv'
+    path.write_text(
+        "Datum,Hazai csapat,Vendeg csapat,Haza csapat eredmeny,Vendeg csapat eredmeny,Bajnoksag,Semleges\n"
+        "1/6/2019,Hungary,Wales,2,0,Friendly,FALSE\n"
+        "5/6/2019,Wales,Hungary,1,1,Friendly,FALSE\n"
+        "9/6/2019,Hungary,Brazil,0,3,Friendly,TRUE\n"
+        "9/6/2019,Hungary,,0,3,Friendly,FALSE\n"
+        "9/6/2019,Hungary,Chile,x,3,Friendly,FALSE\n", encoding='utf-8')
+    records = team_records(str(path))
+    assert (records['matches'], records['non_neutral_matches']) == (3, 2)
+    assert records['teams']['Hungary'] == {'matches': 3, 'wins': 1, 'draws': 1, 'losses': 1,
+                                           'goals_for': 3, 'goals_against': 4}
+    # Semleges pályás mérkőzés nélkül: Brazil nem szerepel
+    assert set(records['home_away']) == {'Hungary', 'Wales'}
+    assert records['home_away']['Hungary']['home']['wins'] == 1
+    assert records['home_away']['Hungary']['away']['draws'] == 1
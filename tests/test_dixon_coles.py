@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""Dixon-Coles modell: illesztés, meleg indítás és eredmény rácsok"""
+
+import numpy as np
+import pytest
+
+from dixon_coles import DixonColesModel, decay_weights, fit_model, tau
+from synthetic import poisson_pmf
+
+TEAMS = ['Hungary', 'Austria', 'Germany', 'Brazil', 'Spain', 'Italy', 'Malta', 'Andorra']
+ATTACK = np.array([0.0, 0.1, 0.4, 0.5, 0.4, 0.3, -0.6, -0.8])
+DEFENCE = np.array([0.0, -0.1, -0.3, -0.4, -0.3, -0.4, 0.5, 0.6])
+HOME = 0.3
+
+
+def make_matches(count=1500, seed=3):
+    rng = np.random.default_rng(seed)
+    matches = []
+    for i in range(count):
+        home, away = rng.choice(len(TEAMS), size=2, replace=False)
+        home_rate = np.exp(ATTACK[home] + DEFENCE[away] + HOME)
+        away_rate = np.exp(ATTACK[away] + DEFENCE[home])
+        matches.append((730000 + i // 4, TEAMS[home], TEAMS[away],
+                        int(rng.poisson(home_rate)), int(rng.poisson(away_rate))))
+    return matches
+
+
+@pytest.fixture(scope='module')
+def matches():
+    return make_matches()
+
+
+@pytest.fixture(scope='module')
+def model(matches):
+    model = DixonColesModel(xi=0.0, ridge=0.01)
+    model.fit(matches, warm=False)
+    return model
+
+
+def test_decay_weights():
+    weights = decay_weights([10, 5, 20], reference=10, xi=0.1)
+    assert weights[0] == 1.0
+    assert weights[1] == pytest.approx(np.exp(-0.5))
+    assert weights[2] == 1.0  # a referencia utáni nap nem kap nagyobb súlyt
+
+
+def test_tau_is_one_without_correction():
+    goals = np.array([0, 0, 1, 1, 2])
+    rates = np.full(5, 1.3)
+    value, *_ = tau(goals, goals[::-1], rates, rates, 0.0)
+    assert np.allclose(value, 1.0)
+
+
+def test_fit_recovers_parameters(model):
+    assert model.iterations < 100
+    attack, defence = model.ratings()['Germany']
+    assert model.home == pytest.approx(HOME, abs=0.1)
+    ranked = sorted(model.teams, key=lambda team: model.ratings()[team][0], reverse=True)
+    assert set(ranked[:4]) == {'Germany', 'Brazil', 'Spain', 'Italy'}
+    assert set(ranked[-2:]) == {'Malta', 'Andorra'}
+    assert attack > 0 > defence
+
+
+def test_fit_is_a_likelihood_maximum(model, matches):
+    home_ids = model._team_ids([m[1] for m in matches])
+    away_ids = model._team_ids([m[2] for m in matches])
+    home_goals = np.array([m[3] for m in matches], dtype=np.float64)
+    away_goals = np.array([m[4] for m in matches], dtype=np.float64)
+    weights = np.ones(len(matches))
+    best = model.log_likelihood(home_ids, away_ids, home_goals, away_goals, weights)
+    assert best == pytest.approx(model.log_likelihood_value)
+
+    for name in ('home', 'level', 'rho'):
+        original = getattr(model, name)
+        for delta in (-0.01, 0.01):
+            setattr(model, name, original + delta)
+            assert model.log_likelihood(home_ids, away_ids, home_goals, away_goals, weights) < best
+        setattr(model, name, original)
+
+
+def test_warm_refit_converges_quickly(matches, tmp_path):
+    path = str(tmp_path / 'dixon_coles.json')
+    cold = fit_model(matches[:-40], path, xi=0.0, ridge=0.01)
+    warm = fit_model(matches, path, xi=0.0, ridge=0.01)
+    full = fit_model(matches, str(tmp_path / 'full.json'), full=True, xi=0.0, ridge=0.01)
+
+    assert warm.iterations < cold.iterations
+    assert warm.home == pytest.approx(full.home, abs=1e-5)
+    assert warm.rho == pytest.approx(full.rho, abs=1e-5)
+    for team, (attack, defence) in full.ratings().items():
+        assert warm.ratings()[team] == pytest.approx((attack, defence), abs=1e-5)
+
+
+def test_load_requires_matching_options(model, tmp_path):
+    path = str(tmp_path / 'dixon_coles.json')
+    model.save(path)
+    loaded = DixonColesModel.load(path, xi=0.0, ridge=0.01)
+    assert loaded.teams == model.teams
+    assert np.allclose(loaded.attack, model.attack)
+    assert DixonColesModel.load(path, xi=0.01, ridge=0.01).teams == []
+
+
+def test_score_grids_are_distributions(model):
+    fixtures = [('Germany', 'Malta'), ('Malta', 'Germany'), ('Hungary', 'Unknown FC')]
+    grids = model.score_grids(fixtures)
+    assert grids.shape == (3, model.max_goals + 1, model.max_goals + 1)
+    assert np.allclose(grids.sum(axis=(1, 2)), 1.0)
+    assert (grids >= 0).all()
+
+    outcomes = model.outcome_probabilities(fixtures)
+    assert np.allclose(outcomes.sum(axis=1), 1.0)
+    assert outcomes[0, 0] > outcomes[1, 0]
+
+
+def test_score_grid_without_correction_is_independent_poisson(model):
+    plain = DixonColesModel(max_goals=15)
+    plain.teams, plain.attack, plain.defence = list(model.teams), model.attack, model.defence
+    plain.level, plain.home, plain.rho = model.level, model.home, 0.0
+    grid = plain.score_grids([('Spain', 'Italy')])[0]
+    home_rates, away_rates = plain.fixture_rates([('Spain', 'Italy')])
+    expected = np.outer(poisson_pmf(home_rates, 15)[0], poisson_pmf(away_rates, 15)[0])
+    assert np.allclose(grid, expected / expected.sum())
+
+
+def test_fit_without_matches_rejected():
+    with pytest.raises(ValueError):
+        DixonColesModel().fit([])
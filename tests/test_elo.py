@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""Inkrementális Elo: checkpoint ujjlenyomat és hozzáfűzéses történet fájl"""
+
+import json
+from datetime import date
+
+import pytest
+
+from elo import EloEngine, expected_score, history_path, update_elo
+
+HEADER = "Datum,Hazai csapat,Vendeg csapat,Haza csapat eredmeny,Vendeg csapat eredmeny,Bajnoksag\n"
+TEAMS = ['Hungary', 'Austria', 'Germany', 'Brazil', 'Spain', 'Italy']
+START = date(2000, 1, 1).toordinal()
+
+
+def make_rows(count, start=0):
+    rows = []
+    for i in range(start, start + count):
+        day = date.fromordinal(START + i)
+        rows.append(f"{day.month}/{day.day}/{day.year},{TEAMS[i % 6]},{TEAMS[(i + 1) % 6]},"
+                    f"{i % 4},{(i * 3) % 5},Friendly\n")
+    return ''.join(rows)
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return str(tmp_path / 'adatok.csv'), str(tmp_path / 'elo.json')
+
+
+def write_csv(csv_file, text, mode='w'):
+    with open(csv_file, mode, encoding='utf-8') as f:
+        f.write(text)
+
+
+def history(engine):
+    return {team: (list(days), list(ratings)) for team, (days, ratings) in engine.history.items()}
+
+
+def full_engine(csv_file, tmp_path):
+    return update_elo(csv_file, str(tmp_path / 'full.json'), force_full=True)
+
+
+def test_expected_score_symmetric():
+    assert expected_score(0) == 0.5
+    assert expected_score(200) + expected_score(-200) == pytest.approx(1.0)
+
+
+def test_append_writes_only_new_history_rows(paths, tmp_path):
+    csv_file, state_path = paths
+    write_csv(csv_file, HEADER + make_rows(300))
+    update_elo(csv_file, state_path)
+    with open(history_path(state_path), 'rb') as f:
+        before = f.read()
+
+    write_csv(csv_file, make_rows(40, start=300), 'a')
+    engine = update_elo(csv_file, state_path)
+    with open(history_path(state_path), 'rb') as f:
+        after = f.read()
+
+    assert after.startswith(before)
+    assert len(after[len(before):].splitlines()) == 80
+    assert history(engine) == history(full_engine(csv_file, tmp_path))
+    with open(state_path, encoding='utf-8') as f:
+        state = json.load(f)
+    assert 'history' not in state['engine']
+    assert state['history_bytes'] == len(after)
+
+
+def test_reload_from_history_file(paths):
+    csv_file, state_path = paths
+    write_csv(csv_file, HEADER + make_rows(120))
+    first = update_elo(csv_file, state_path)
+    second = update_elo(csv_file, state_path)
+    assert history(second) == history(first)
+    assert second.ratings == first.ratings
+    assert second.matches == first.matches == 120
+
+
+def test_middle_edit_detected(paths, tmp_path):
+    # A fájl nagyobb a mintavételezett ujjlenyomat két 64 KiB-os blokkjánál
+    csv_file, state_path = paths
+    text = HEADER + make_rows(5000)
+    write_csv(csv_file, text)
+    update_elo(csv_file, state_path)
+
+    middle = text.index('\n', len(text) // 2) + 1
+    line_end = text.index('\n', middle)
+    parts = text[middle:line_end].split(',')
+    parts[3] = '9'  # hazai gól: azonos hosszú, eltérő sor
+    write_csv(csv_file, text[:middle] + ','.join(parts) + text[line_end:])
+
+    engine = update_elo(csv_file, state_path)
+    assert history(engine) == history(full_engine(csv_file, tmp_path))
+
+
+def test_interrupted_append_is_discarded(paths, tmp_path):
+    csv_file, state_path = paths
+    write_csv(csv_file, HEADER + make_rows(100))
+    update_elo(csv_file, state_path)
+    # Egy checkpoint mentés előtt félbeszakadt futás maradéka
+    with open(history_path(state_path), 'ab') as f:
+        f.write(b'["Hungary", 1, 9999.0]\n["Aus')
+
+    write_csv(csv_file, make_rows(10, start=100), 'a')
+    engine = update_elo(csv_file, state_path)
+    assert history(engine) == history(full_engine(csv_file, tmp_path))
+    assert history(update_elo(csv_file, state_path)) == history(engine)
+
+
+def test_missing_history_triggers_full_recompute(paths, tmp_path):
+    csv_file, state_path = paths
+    write_csv(csv_file, HEADER + make_rows(50))
+    update_elo(csv_file, state_path)
+    with open(history_path(state_path), 'wb'):
+        pass
+
+    engine = update_elo(csv_file, state_path)
+    assert engine.matches == 50
+    assert history(engine) == history(full_engine(csv_file, tmp_path))
+
+
+def test_rating_on_date_uses_history():
+    engine = EloEngine()
+    engine.add(START, 'Hungary', 'Austria', 2, 0, 'Friendly')
+    engine.add(START + 5, 'Austria', 'Hungary', 1, 0, 'Friendly')
+    assert engine.rating('Hungary', START - 1) == engine.initial
+    assert engine.rating('Hungary', START + 1) > engine.initial
+    assert engine.rating('Hungary', START + 5) == engine.ratings['Hungary']
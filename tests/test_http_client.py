@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""HttpCache feltételes kérések egy helyi http.server ellen"""
+
+import itertools
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import http_client
+from http_client import HttpCache, make_session
+
+RESOURCES = {
+    '/etag.csv': {'body': b'a,b\n1,2\n', 'etag': '"v1"'},
+    '/modified.csv': {'body': b'c,d\n3,4\n', 'last_modified': 'Wed, 01 May 2024 10:00:00 GMT'},
+    '/one.csv': {'body': b'x' * 600},
+    '/two.csv': {'body': b'y' * 600},
+    '/three.csv': {'body': b'z' * 600},
+}
+
+
+class Handler(BaseHTTPRequestHandler):
+    log = []
+
+    def do_GET(self):
+        resource = RESOURCES.get(self.path)
+        if resource is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        etag = resource.get('etag')
+        modified = resource.get('last_modified')
+        not_modified = ((etag and self.headers.get('If-None-Match') == etag)
+                        or (modified and self.headers.get('If-Modified-Since') == modified))
+        self.log.append((self.path, 304 if not_modified else 200, dict(self.headers)))
+        if not_modified:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/csv; charset=utf-8')
+        self.send_header('Content-Length', str(len(resource['body'])))
+        if etag:
+            self.send_header('ETag', etag)
+        if modified:
+            self.send_header('Last-Modified', modified)
+        self.end_headers()
+        self.wfile.write(resource['body'])
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    Handler.log = []
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def session():
+    with make_session() as session:
+        yield session
+
+
+def statuses(path):
+    return [status for logged_path, status, _ in Handler.log if logged_path == path]
+
+
+def test_etag_revalidation_serves_body_from_disk(server, session, tmp_path):
+    cache = HttpCache(str(tmp_path))
+    first = cache.fetch(session, server + '/etag.csv')
+    second = cache.fetch(session, server + '/etag.csv')
+
+    assert first.status_code == second.status_code == 200
+    assert second.content == RESOURCES['/etag.csv']['body']
+    assert getattr(second, 'from_cache', False)
+    assert statuses('/etag.csv') == [200, 304]
+    assert Handler.log[-1][2].get('If-None-Match') == '"v1"'
+
+
+def test_last_modified_revalidation(server, session, tmp_path):
+    cache = HttpCache(str(tmp_path))
+    cache.fetch(session, server + '/modified.csv')
+    # Új példány: az index a lemezről töltődik
+    second = HttpCache(str(tmp_path)).fetch(session, server + '/modified.csv')
+
+    assert second.text == RESOURCES['/modified.csv']['body'].decode()
+    assert statuses('/modified.csv') == [200, 304]
+    assert Handler.log[-1][2].get('If-Modified-Since') == RESOURCES['/modified.csv']['last_modified']
+
+
+def test_lost_body_is_refetched_unconditionally(server, session, tmp_path):
+    cache = HttpCache(str(tmp_path))
+    cache.fetch(session, server + '/etag.csv')
+    (tmp_path / (HttpCache._key(server + '/etag.csv') + '.body')).unlink()
+
+    response = cache.fetch(session, server + '/etag.csv')
+    assert response.content == RESOURCES['/etag.csv']['body']
+    assert statuses('/etag.csv') == [200, 304, 200]
+
+
+def test_immutable_short_circuits_without_request(server, session, tmp_path):
+    cache = HttpCache(str(tmp_path))
+    cache.fetch(session, server + '/one.csv', immutable=True)
+    response = cache.fetch(session, server + '/one.csv', immutable=True)
+
+    assert response.from_cache
+    assert statuses('/one.csv') == [200]
+
+
+def test_lru_eviction_keeps_recently_used_entries(server, session, tmp_path, monkeypatch):
+    clock = itertools.count(1000)
+    monkeypatch.setattr(http_client.time, 'time', lambda: float(next(clock)))
+    cache = HttpCache(str(tmp_path), max_bytes=1300)
+
+    cache.fetch(session, server + '/one.csv')
+    cache.fetch(session, server + '/two.csv')
+    assert cache.lookup(server + '/one.csv') is not None     # one: legutóbb használt
+    cache.fetch(session, server + '/three.csv')
+
+    assert cache.size() <= 1300
+    assert cache.lookup(server + '/two.csv') is None
+    assert cache.lookup(server + '/one.csv') is not None
+    assert cache.lookup(server + '/three.csv') is not None
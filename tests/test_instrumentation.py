@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""Futásonkénti mérés: kikapcsolt no-op, JSON / Prometheus kimenet, számlálók"""
+
+import json
+
+import pytest
+
+import instrumentation
+import scraper
+
+CSV = (
+    "Datum,Hazai csapat,Vendeg csapat,Haza csapat eredmeny,Vendeg csapat eredmeny,Bajnoksag\n"
+    "6/8/2019,Hungary,Austria,2,1,Friendly\n"
+    "7/8/2019,Austria,Slovakia,x,0,Friendly\n"
+    "8/8/2019,Slovakia,Hungary,1,1,Friendly\n"
+    "9/8/2019,Hungary\n"
+)
+
+
+class Response:
+    def __init__(self, headers, content=b''):
+        self.headers = headers
+        self.content = content
+
+
+@pytest.fixture(autouse=True)
+def disabled(monkeypatch):
+    monkeypatch.delenv(instrumentation.ENV_VARIABLE, raising=False)
+
+
+def test_disabled_is_noop(tmp_path):
+    assert instrumentation.metrics_path('scraper') is None
+    with instrumentation.run('scraper') as metrics:
+        assert metrics is None
+        assert not instrumentation.enabled()
+        assert instrumentation.phase('parse') is instrumentation.phase('write')
+        with instrumentation.phase('parse'):
+            instrumentation.count('rows_parsed', 5)
+        instrumentation.gauge('api_quota_remaining', 10)
+        response = Response({'Content-Length': '7'})
+        assert instrumentation.record_response(response) is response
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_metrics_path(monkeypatch):
+    monkeypatch.setenv(instrumentation.ENV_VARIABLE, '1')
+    assert instrumentation.metrics_path('scraper') == 'data/metrics/scraper.json'
+    monkeypatch.setenv(instrumentation.ENV_VARIABLE, '0')
+    assert instrumentation.metrics_path('scraper') is None
+    assert instrumentation.metrics_path('daemon', 'out/{run}.prom') == 'out/daemon.prom'
+
+
+def test_json_output(tmp_path):
+    path = tmp_path / 'metrics' / '{run}.json'
+    with instrumentation.run('update', str(path)) as metrics:
+        assert instrumentation.enabled()
+        # Beágyazott futás nem indít új mérést
+        with instrumentation.run('inner', str(path)) as inner:
+            assert inner is metrics
+        for _ in range(2):
+            with instrumentation.phase('fetch'):
+                instrumentation.count('rows_parsed', 3)
+        instrumentation.record_response(Response({'x-requests-remaining': '480'}, b'abcd'))
+        instrumentation.record_response(Response({'Content-Length': '10'}), stream=True)
+    assert not instrumentation.enabled()
+
+    with open(tmp_path / 'metrics' / 'update.json', encoding='utf-8') as f:
+        saved = json.load(f)
+    assert saved['run'] == 'update'
+    assert saved['phases']['fetch']['calls'] == 2
+    assert saved['counters'] == {'rows_parsed': 6, 'http_requests': 2, 'http_bytes': 14}
+    assert saved['gauges'] == {'api_quota_remaining': 480.0}
+    assert saved['wall_seconds'] >= saved['phases']['fetch']['wall_seconds']
+    assert not (tmp_path / 'metrics' / 'inner.json').exists()
+
+
+def test_prometheus_output(tmp_path):
+    path = tmp_path / 'scraper.prom'
+    with instrumentation.run('scraper "test"', str(path)):
+        with instrumentation.phase('parse'):
+            instrumentation.count('rows-parsed', 4)
+        instrumentation.gauge('api_quota_remaining', 12)
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert '# TYPE odds_rows_parsed_total counter' in lines
+    assert 'odds_rows_parsed_total{run="scraper \\"test\\""} 4' in lines
+    assert 'odds_api_quota_remaining{run="scraper \\"test\\""} 12' in lines
+    assert 'odds_phase_calls{run="scraper \\"test\\"",phase="parse"} 1' in lines
+    assert not (tmp_path / 'scraper.prom.tmp').exists()
+
+
+def test_collect_keeps_counters_apart(tmp_path):
+    with instrumentation.run('outer', str(tmp_path / 'outer.json')) as metrics:
+        with instrumentation.collect() as counters:
+            instrumentation.count('rows_parsed', 2)
+        assert counters == {'rows_parsed': 2}
+        assert metrics.counters == {}
+        instrumentation.add_counters(counters)
+        assert metrics.counters == {'rows_parsed': 2}
+    # Kikapcsolva is gyűjt, a hozzáadás no-op
+    with instrumentation.collect() as counters:
+        instrumentation.count('rows_rejected')
+    assert counters == {'rows_rejected': 1}
+    instrumentation.add_counters(counters)
+    assert not instrumentation.enabled()
+
+
+@pytest.mark.parametrize('engine', ['python', 'streaming', 'numpy'])
+def test_row_counters_skip_header(tmp_path, engine):
+    csv_file = tmp_path / 'adatokfoci.csv'
+    csv_file.write_text(CSV, encoding='utf-8')
+    with instrumentation.run('scraper', str(tmp_path / 'metrics.json')) as metrics:
+        scraper.analyze_team_stats(str(csv_file), streaming=engine == 'streaming',
+                                   engine='numpy' if engine == 'numpy' else 'python')
+    assert metrics.counters == {'rows_parsed': 4, 'rows_rejected': 2}
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_parallel_counters_summed_in_parent(tmp_path, workers):
+    for name in ('a.csv', 'b.csv'):
+        (tmp_path / name).write_text(CSV, encoding='utf-8')
+    with instrumentation.run('scraper', str(tmp_path / 'metrics.json')) as metrics:
+        cube = scraper.build_team_cube_parallel(str(tmp_path), workers=workers)
+    assert cube.team_stats()['Hungary']['total_matches'] == 4
+    assert metrics.counters == {'rows_parsed': 8, 'rows_rejected': 4}
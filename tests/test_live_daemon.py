@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""Élő odds daemon: kvóta nullázódás, ütemterv, visszalépés és hibatűrés"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import live_daemon
+from live_daemon import (IDLE_INTERVAL, PollPlanner, QuotaTracker, next_reset, parse_reset_header,
+                         run_daemon)
+
+NOW = datetime(2024, 2, 20, 12, 0, tzinfo=timezone.utc)
+
+
+def test_next_reset_uses_configured_day():
+    assert next_reset(NOW) == datetime(2024, 3, 1, tzinfo=timezone.utc)
+    assert next_reset(NOW, reset_day=25) == datetime(2024, 2, 25, tzinfo=timezone.utc)
+    assert next_reset(NOW, reset_day=15) == datetime(2024, 3, 15, tzinfo=timezone.utc)
+    # Rövidebb hónap: a hónap utolsó napja
+    assert next_reset(NOW, reset_day=31) == datetime(2024, 2, 29, tzinfo=timezone.utc)
+    december = datetime(2024, 12, 31, 23, 0, tzinfo=timezone.utc)
+    assert next_reset(december) == datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def test_reset_header_formats():
+    assert parse_reset_header('3600', NOW) == NOW + timedelta(hours=1)
+    assert parse_reset_header('1709251200', NOW) == datetime(2024, 3, 1, tzinfo=timezone.utc)
+    assert parse_reset_header('2024-03-05T00:00:00Z', NOW) == datetime(2024, 3, 5, tzinfo=timezone.utc)
+    assert parse_reset_header('soon', NOW) is None
+    assert parse_reset_header(None, NOW) is None
+
+
+def test_quota_tracker_prefers_header_reset():
+    quota = QuotaTracker(reset_day=1)
+    quota.update({'x-requests-remaining': '120', 'x-requests-reset': '2024-02-22T00:00:00Z'})
+    assert quota.remaining == 120
+    assert quota.seconds_left(NOW) == 36 * 3600
+
+    fallback = QuotaTracker(reset_day=25)
+    fallback.update({'x-requests-remaining': '120'})
+    assert fallback.seconds_left(NOW) == (datetime(2024, 2, 25, tzinfo=timezone.utc) - NOW).total_seconds()
+
+
+def test_failed_polls_count_towards_max_polls(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    calls = []
+
+    def failing_request(api_key, sport_key, session=None):
+        calls.append(sport_key)
+        raise ConnectionError('hálózati hiba')
+
+    monkeypatch.setattr(live_daemon, 'request_league_odds', failing_request)
+    monkeypatch.setattr(live_daemon.time, 'sleep', lambda seconds: None)
+
+    assert run_daemon('key', sports={'soccer_epl': 'Premier League'}, max_polls=3)
+    assert len(calls) == 3
+
+
+class Clock:
+    """Hamis óra: a sleep csak előre tekeri (és feljegyzi a várakozást)"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None, payload=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self._payload = payload
+
+    def json(self):
+        if self._payload is None:
+            raise ValueError('nem JSON')
+        return self._payload
+
+
+@pytest.fixture
+def clock(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    clock = Clock()
+    monkeypatch.setattr(live_daemon, 'time', clock)
+    return clock
+
+
+def serve(monkeypatch, responses):
+    responses = iter(responses)
+    monkeypatch.setattr(live_daemon, 'request_league_odds',
+                        lambda api_key, sport_key, session=None: next(responses))
+
+
+@pytest.mark.parametrize('hours, interval', [
+    (None, IDLE_INTERVAL), (0.0, 5 * 60), (2.5, 10 * 60), (3.0, 10 * 60),
+    (10, 30 * 60), (47, 2 * 3600), (49, IDLE_INTERVAL),
+])
+def test_base_interval_by_kickoff(hours, interval):
+    assert PollPlanner.base_interval(hours) == interval
+
+
+def test_plan_stretches_to_remaining_budget():
+    planner = PollPlanner(reserve=20, min_interval=60)
+    kickoffs = {'epl': 0.0, 'liga': None}
+    assert planner.plan(kickoffs, None, 3600) == {'epl': 300, 'liga': IDLE_INTERVAL}
+    # Bőven van keret: az alap időközök maradnak
+    assert planner.plan(kickoffs, 10000, 24 * 3600) == {'epl': 300, 'liga': IDLE_INTERVAL}
+
+    seconds_left = 30 * 24 * 3600
+    intervals = planner.plan(kickoffs, 1000, seconds_left, cost=2)
+    assert intervals['liga'] / intervals['epl'] == pytest.approx(IDLE_INTERVAL / 300)
+    spend = sum(2 * seconds_left / interval for interval in intervals.values())
+    assert spend == pytest.approx(1000 - 20)
+
+    # A tartalékon belül: a nullázódásig nincs lekérdezés
+    assert planner.plan(kickoffs, 15, 7200) == {'epl': 7200, 'liga': 7200}
+    assert PollPlanner(min_interval=600).plan({'epl': 0.0}, None, 3600) == {'epl': 300}
+    assert PollPlanner(min_interval=600).plan({'epl': 0.0}, 10000, 3600) == {'epl': 600}
+
+
+def test_rate_limit_backoff_and_retry_after(clock, monkeypatch):
+    serve(monkeypatch, [
+        FakeResponse(429),
+        FakeResponse(429),
+        FakeResponse(429, {'Retry-After': '45'}),
+        FakeResponse(429),
+        FakeResponse(200, payload=[]),
+        FakeResponse(429),
+        FakeResponse(429),
+    ])
+    assert run_daemon('key', sports={'soccer_epl': 'Premier League'}, min_interval=60,
+                      max_backoff=150, max_polls=7)
+    # Exponenciális (60, 120), a Retry-After elsőbbséget élvez, a plafon 150;
+    # sikeres válasz után újraindul, a következő lekérdezés az ütemterv szerint jön
+    assert clock.sleeps == [60, 120, 45, 150, IDLE_INTERVAL, 60]
+
+
+def test_processing_errors_reschedule(clock, monkeypatch):
+    serve(monkeypatch, [FakeResponse(200), FakeResponse(200, payload=[]), FakeResponse(200, payload=[])])
+    saved = []
+
+    def failing_save(matches, json_path):
+        saved.append(len(saved))
+        if len(saved) == 1:
+            raise OSError('tele a lemez')
+
+    monkeypatch.setattr(live_daemon, 'save_live_matches', failing_save)
+    assert run_daemon('key', sports={'soccer_epl': 'Premier League'}, min_interval=60, max_polls=3)
+    # Hibás JSON, majd mentési hiba: mindkettő után min_interval múlva újra
+    assert clock.sleeps == [60, 60]
+    assert saved == [0, 1]
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""Vektorizált margin motor és az élő mérkőzés összesítés"""
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+import fetch_live_matches
+from margin_engine import (METHODS, analyze_matches, annotate_live_matches, as_odds_array, fair_probabilities,
+                           margins)
+from match_table import MatchTable
+
+
+def test_invalid_odds_are_only_missing_or_non_positive():
+    odds = as_odds_array([[1.0, 0.0, -2.0], [np.nan, 1.5, 2.0]])
+    assert odds[0, 0] == 1.0
+    assert np.isnan(odds[0, 1]) and np.isnan(odds[0, 2]) and np.isnan(odds[1, 0])
+
+
+def test_proportional_margin():
+    assert margins([2.0, 4.0, 4.0]) == pytest.approx(0.0)
+    assert margins([1.9, 3.4, 4.0]) == pytest.approx((1 / 1.9 + 1 / 3.4 + 1 / 4.0 - 1) * 100)
+
+
+@pytest.mark.parametrize('method', METHODS)
+def test_fair_probabilities_sum_to_one(method):
+    fair = fair_probabilities([[1.9, 3.4, 4.0], [1.01, 15.0, 30.0], [1.0, 20.0, 40.0]], method)
+    assert fair.sum(axis=-1) == pytest.approx([1.0, 1.0, 1.0])
+    assert np.all((fair >= 0) & (fair <= 1))
+
+
+def _bookmaker(name, home, draw, away):
+    return {'bookmaker': name, 'odds_home': home, 'odds_draw': draw, 'odds_away': away}
+
+
+def test_even_odds_keep_match_margin():
+    matches = [{'bookmakers': [_bookmaker('A', 1.0, 15.0, 34.0)]}]
+    annotate_live_matches(matches)
+    assert matches[0]['avg_margin'] == pytest.approx((1 / 15 + 1 / 34) * 100, abs=0.01)
+
+
+@pytest.mark.parametrize('method', METHODS)
+def test_analyze_matches_empty_input(method):
+    for matches in ([], MatchTable()):
+        result = analyze_matches(matches, method)
+        assert {name: values.shape for name, values in result.items()} == {
+            'margin': (0,), 'fair_home': (0,), 'fair_draw': (0,), 'fair_away': (0,)}
+
+
+def test_margin_uses_raw_prices():
+    raw = (1.955, 3.405, 4.125)
+    matches = [{'bookmakers': [_bookmaker('A', *raw)]}]
+    annotate_live_matches(matches)
+    bookmaker = matches[0]['bookmakers'][0]
+    assert bookmaker['margin'] == round((sum(1 / price for price in raw) - 1) * 100, 2)
+    assert (bookmaker['odds_home'], bookmaker['odds_draw'], bookmaker['odds_away']) == (
+        round(1.955, 2), round(3.405, 2), round(4.125, 2))
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, payload):
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+def _api_match(home, away, prices):
+    kickoff = (datetime.now(timezone.utc) + timedelta(hours=2)).strftime('%Y-%m-%dT%H:%M:%SZ')
+    outcomes = [{'name': name, 'price': price} for name, price in zip((home, 'Draw', away), prices)]
+    return {'home_team': home, 'away_team': away, 'commence_time': kickoff,
+            'bookmakers': [{'title': 'Bet365', 'markets': [{'outcomes': outcomes}]}]}
+
+
+def test_summary_skips_matches_without_margin(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    payload = [
+        _api_match('Arsenal', 'Chelsea', (2.0, 3.5, 3.8)),
+        _api_match('Bayern', 'Bochum', (1.0, 15.0, 34.0)),
+        # Hibás (negatív) ár: a mérkőzés nem kap margint
+        _api_match('Lens', 'Lille', (-1.5, 3.2, 2.6)),
+    ]
+    monkeypatch.setattr(fetch_live_matches, 'SPORTS', {'soccer_epl': 'Premier League'})
+    monkeypatch.setattr(fetch_live_matches, 'request_league_odds', lambda *args, **kwargs: FakeResponse(payload))
+
+    assert fetch_live_matches.fetch_live_matches('key') is True
+    output = capsys.readouterr().out
+    assert 'MARGIN STATISZTIKÁK' in output
+    assert (tmp_path / 'data' / 'live_matches.json').exists()
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""Oszlopos (.odc) és előre tömörített JSON formátumok"""
+
+import os
+import struct
+from array import array
+
+import pytest
+
+from match_table import MatchTable
+from odds_formats import (FIELDNAMES, MAGIC, ColumnarWriter, read_columnar, read_json_compressed,
+                          write_columnar, write_json_compressed)
+
+ROWS = [
+    {'date': '01/08/2024', 'league': 'Premier League', 'home_team': 'Arsenal', 'away_team': 'Chelsea',
+     'odds_home': 2.1, 'odds_draw': 3.4, 'odds_away': 3.6, 'home_goals': 2, 'away_goals': 1,
+     'result': 'H', 'bookmaker': 'Bet365'},
+    # NUL karakter a stringben: nem tolhatja el a későbbi indexeket
+    {'date': '02/08/2024', 'league': 'La\0Liga', 'home_team': 'Sevilla', 'away_team': 'Atlético',
+     'odds_home': 1.9, 'odds_draw': 3.5, 'odds_away': 4.2, 'home_goals': None, 'away_goals': None,
+     'result': None, 'bookmaker': 'Pinnacle'},
+    {'date': '03/08/2024', 'league': '', 'home_team': 'Ipswich', 'away_team': 'Arsenal',
+     'odds_home': None, 'odds_draw': 3.0, 'odds_away': 2.0, 'home_goals': 0, 'away_goals': 0,
+     'result': 'D', 'bookmaker': 'Bet365'},
+]
+
+
+def test_round_trip_with_nul_and_missing_values(tmp_path):
+    path = str(tmp_path / 'odds.odc')
+    write_columnar(ROWS, path)
+    assert read_columnar(path) == ROWS
+
+
+def test_match_table_round_trip(tmp_path):
+    path = str(tmp_path / 'odds.odc')
+    table = MatchTable()
+    table.extend(ROWS)
+    table.write_columnar(path)
+    assert list(MatchTable.read_columnar(path).to_dicts()) == ROWS
+
+
+def test_streaming_writer_round_trip(tmp_path):
+    path = str(tmp_path / 'stream.odc')
+    with ColumnarWriter(path) as writer:
+        for row in ROWS:
+            columns = {}
+            for name in FIELDNAMES:
+                value = row[name]
+                if name in ('odds_home', 'odds_draw', 'odds_away'):
+                    columns[name] = array('d', [float('nan') if value is None else value])
+                elif name in ('home_goals', 'away_goals'):
+                    columns[name] = array('i', [-2 ** 31 if value is None else value])
+                else:
+                    columns[name] = array('I', [writer.intern(value)])
+            writer.append(columns, 1)
+    assert read_columnar(path) == ROWS
+    assert sorted(os.listdir(tmp_path)) == ['stream.odc']
+
+
+def test_failed_write_keeps_previous_file(tmp_path):
+    path = str(tmp_path / 'odds.odc')
+    write_columnar(ROWS, path)
+    with pytest.raises(ValueError):
+        write_columnar([{'odds_home': 'nem szám'}], path)
+    assert read_columnar(path) == ROWS
+    assert sorted(os.listdir(tmp_path)) == ['odds.odc']
+
+
+def test_reads_version_1_files(tmp_path):
+    path = str(tmp_path / 'v1.odc')
+    strings = ['01/08/2024', 'EPL', 'A', 'B', 'H', 'X']
+    blob = '\0'.join(strings).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(MAGIC + struct.pack('<HIII', 1, 1, len(strings), len(blob)) + blob)
+        for values, code in (([0], 'I'), ([1], 'I'), ([2], 'I'), ([3], 'I'), ([1.5], 'd'), ([3.0], 'd'),
+                             ([6.0], 'd'), ([1], 'i'), ([0], 'i'), ([4], 'I'), ([5], 'I')):
+            f.write(array(code, values).tobytes())
+    assert read_columnar(path)[0]['bookmaker'] == 'X'
+
+
+def test_compressed_json_round_trip(tmp_path):
+    path = str(tmp_path / 'odds.json.gz')
+    write_json_compressed(ROWS, path)
+    assert read_json_compressed(path) == ROWS
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""Odds idősor tároló: változás alapú rögzítés, szegmens görgetés, visszaolvasás"""
+
+import json
+import os
+
+import pytest
+
+from odds_history import OddsHistoryStore, match_id
+
+MATCH = {'date': '2024-09-01 15:00', 'home_team': 'Arsenal', 'away_team': 'Chelsea'}
+OTHER = {'date': '2024-09-01 17:30', 'home_team': 'Fulham', 'away_team': 'Everton'}
+
+
+def live(match, home, draw=3.4, away=3.6, bookmaker='Bet365'):
+    return dict(match, bookmakers=[{'bookmaker': bookmaker, 'odds_home': home,
+                                    'odds_draw': draw, 'odds_away': away}])
+
+
+def manifest(directory):
+    with open(os.path.join(directory, 'manifest.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def directory(tmp_path):
+    return str(tmp_path / 'odds_history')
+
+
+def rolled_store(directory):
+    """Két szegmens: a váltás a 300-as időbélyegnél (segment_records=5)"""
+    store = OddsHistoryStore(directory, segment_records=5)
+    store.record_live_matches([live(MATCH, 2.0)], ts=100)
+    store.record_live_matches([live(MATCH, 2.1, draw=3.3)], ts=300)
+    store.record_live_matches([live(MATCH, 2.2, draw=3.3), live(OTHER, 1.9)], ts=500)
+    return store
+
+
+def test_only_changes_are_recorded(directory):
+    store = OddsHistoryStore(directory)
+    assert store.record_live_matches([live(MATCH, 2.0), live(OTHER, 1.9)], ts=100) == 6
+    assert store.record_live_matches([live(MATCH, 2.0), live(OTHER, 1.9)], ts=200) == 0
+    assert store.record_live_matches([live(MATCH, 2.05), live(OTHER, 1.9)], ts=300) == 1
+    assert store.record_live_matches([live(MATCH, 2.05, bookmaker='Pinnacle')], ts=400) == 3
+    segment = manifest(directory)['segments'][0]
+    assert (segment['start_ts'], segment['end_ts'], segment['records']) == (100, 400, 10)
+
+
+def test_state_as_of_across_segments(directory):
+    store = rolled_store(directory)
+    segments = manifest(directory)['segments']
+    assert [segment['file'] for segment in segments] == ['seg-000001.jsonl.gz', 'seg-000002.jsonl']
+    assert segments[1]['start_ts'] == 300
+
+    key = (match_id(MATCH), 'Bet365', 'home')
+    assert store.state_as_of(50) == {}
+    assert store.state_as_of(100)[key] == 2.0
+    assert store.state_as_of(299)[(match_id(MATCH), 'Bet365', 'draw')] == 3.4
+    # A második szegmens alap állapota a váltáskori teljes állapot
+    state = store.state_as_of(300)
+    assert (state[key], state[(match_id(MATCH), 'Bet365', 'draw')]) == (2.1, 3.3)
+    assert (match_id(OTHER), 'Bet365', 'home') not in state
+    assert store.state_as_of(600)[key] == 2.2
+    assert store.state_as_of(600)[(match_id(OTHER), 'Bet365', 'home')] == 1.9
+
+
+def test_price_history(directory):
+    store = rolled_store(directory)
+    history = store.price_history(MATCH)
+    assert [(ts, price) for ts, _, outcome, price in history if outcome == 'home'] == [
+        (100, 2.0), (300, 2.1), (500, 2.2)]
+    assert ('draw', 3.3) in [(outcome, price) for _, _, outcome, price in history]
+    assert store.price_history(match_id(OTHER)) == [(500, 'Bet365', 'home', 1.9),
+                                                    (500, 'Bet365', 'draw', 3.4),
+                                                    (500, 'Bet365', 'away', 3.6)]
+    assert store.price_history('nincs|ilyen|meccs') == []
+
+
+def test_reopen_after_roll(directory):
+    rolled_store(directory)
+    assert not os.path.exists(os.path.join(directory, 'seg-000001.jsonl'))
+    store = OddsHistoryStore(directory, segment_records=5)
+    assert store.record_live_matches([live(MATCH, 2.2, draw=3.3), live(OTHER, 1.9)], ts=600) == 0
+    assert store.record_live_matches([live(MATCH, 2.3, draw=3.3)], ts=700) == 1
+    assert [ts for ts, _, outcome, _ in store.price_history(MATCH) if outcome == 'home'] == [100, 300, 500, 700]
+
+
+def test_interrupted_roll_keeps_segment_readable(directory, monkeypatch):
+    store = OddsHistoryStore(directory, segment_records=4)
+    store.record_live_matches([live(MATCH, 2.0)], ts=100)
+    original = OddsHistoryStore._save_manifest
+
+    def crash_after_compressing(self):
+        if self._manifest['segments'][0]['file'].endswith('.gz'):
+            raise OSError('megszakadt')
+        original(self)
+
+    monkeypatch.setattr(OddsHistoryStore, '_save_manifest', crash_after_compressing)
+    with pytest.raises(OSError):
+        store.record_live_matches([live(MATCH, 2.1)], ts=300)
+    monkeypatch.setattr(OddsHistoryStore, '_save_manifest', original)
+
+    # A manifest még a .jsonl-re mutat, ami megvan
+    reopened = OddsHistoryStore(directory, segment_records=4)
+    assert reopened.state_as_of(300)[(match_id(MATCH), 'Bet365', 'home')] == 2.1
+    assert reopened.record_live_matches([live(MATCH, 2.1)], ts=400) == 0
+
+
+def test_reopen_after_roll_before_new_segment(directory, monkeypatch):
+    store = OddsHistoryStore(directory, segment_records=4)
+    store.record_live_matches([live(MATCH, 2.0)], ts=100)
+    monkeypatch.setattr(OddsHistoryStore, '_start_segment', lambda self, ts, base: None)
+    store.record_live_matches([live(MATCH, 2.1)], ts=300)
+    monkeypatch.undo()
+
+    reopened = OddsHistoryStore(directory, segment_records=4)
+    assert [segment['file'] for segment in manifest(directory)['segments']] == [
+        'seg-000001.jsonl.gz', 'seg-000002.jsonl']
+    assert reopened.record_live_matches([live(MATCH, 2.2)], ts=400) == 1
+    assert [price for _, _, outcome, price in reopened.price_history(MATCH) if outcome == 'home'] == [2.0, 2.1, 2.2]
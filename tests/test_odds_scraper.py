@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""OddsScraper Football-Data feldolgozás: oszlop projekció és csapat nevek"""
+
+import json
+import os
+import struct
+from array import array
+from datetime import datetime
+
+import pytest
+
+import football_data
+from football_data import FootballDataTable, parse_football_data
+from odds_scraper import MATCH_COLUMNS, OddsScraper, current_season_code, season_closed
+
+CSV = (
+    "Div,Date,HomeTeam,AwayTeam,FTHG,FTAG,FTR,B365H,B365D,B365A,PSCH,PSCD,PSCA\n"
+    "E0,16/08/2024,Man United,Fulham,1,0,H,1.6,4.2,5.25,1.62,4.3,5.4\n"
+    "E0,17/08/2024,Ipswich,Liverpool,0,2,A,7.5,5.0,1.36,7.8,5.2,1.4\n"
+)
+
+
+class FakeResponse:
+    status_code = 200
+    text = CSV
+
+
+@pytest.fixture
+def scraper(monkeypatch):
+    def make(**options):
+        instance = OddsScraper(cache_dir=None, aliases_path=None, **options)
+        monkeypatch.setattr(instance, '_fetch_all', lambda requests_to_send: [FakeResponse()] * len(requests_to_send))
+        return instance
+    return make
+
+
+def test_current_season_code():
+    assert current_season_code(datetime(2026, 3, 1)) == '2526'
+    assert current_season_code(datetime(2026, 6, 30)) == '2526'
+    assert current_season_code(datetime(2026, 7, 1)) == '2627'
+    assert current_season_code(datetime(2026, 10, 18)) == '2627'
+    assert current_season_code(datetime(2000, 1, 1)) == '9900'
+    assert season_closed('2324', '2425') and not season_closed('2425', '2425')
+    assert season_closed('9900', '0001')
+
+
+def test_default_keeps_only_match_columns_and_source_names(scraper):
+    instance = scraper()
+    matches = instance.scrape_football_data(leagues={'E0': 'Premier League'}, seasons=['2425'])
+    assert [m['home_team'] for m in matches] == ['Man United', 'Ipswich']
+    assert matches[1]['odds_away'] == 1.36 and matches[1]['result'] == 'A'
+    assert len(instance.football_data) == 0
+
+
+def test_full_width_is_opt_in(scraper, tmp_path):
+    instance = scraper()
+    instance.scrape_football_data(leagues={'E0': 'Premier League'}, seasons=['2425'], full_width=True)
+    assert len(instance.football_data) == 2
+    assert 'PSCH' in instance.football_data and 'PSCH' not in MATCH_COLUMNS
+
+    path = str(tmp_path / 'football_data.fdc')
+    instance.save_football_data(path)
+    closing = FootballDataTable.read(path, columns=['HomeTeam', 'PSCH'])
+    assert list(closing.values('PSCH')) == [1.62, 7.8]
+    assert os.listdir(tmp_path) == ['football_data.fdc']
+
+
+def test_fdc_string_table_keeps_any_value(tmp_path):
+    table = parse_football_data("Date,HomeTeam,AwayTeam,FTHG,B365H\n17/08/2024,Ipswich,Liverpool,0,4.5\n"
+                                "24/08/2024,,Brighton,,2.1\n", constants={'League': 'Premier\0League'})
+    path = str(tmp_path / 'football_data.fdc')
+    table.write(path)
+    loaded = FootballDataTable.read(path)
+    assert list(loaded.rows()) == list(table.rows())
+    assert loaded.values('League') == ['Premier\0League'] * 2
+    assert loaded.values('HomeTeam') == ['Ipswich', None]
+
+
+def test_fdc_reads_version_1_files(tmp_path):
+    path = str(tmp_path / 'v1.fdc')
+    blob = '\0'.join(['Ipswich', 'Fulham']).encode('utf-8')
+    data = array('I', [0, 1]).tobytes()
+    header = json.dumps({'count': 2, 'columns': [{'name': 'HomeTeam', 'kind': 's', 'offset': 0, 'strings': 2,
+                                                  'strings_size': len(blob), 'size': len(blob) + len(data)}]})
+    with open(path, 'wb') as f:
+        f.write(football_data.MAGIC + struct.pack('<HI', 1, len(header)) + header.encode('utf-8') + blob + data)
+    assert FootballDataTable.read(path).values('HomeTeam') == ['Ipswich', 'Fulham']
+
+
+def test_canonical_names_are_opt_in(scraper):
+    instance = scraper(canonical_names=True)
+    matches = instance.scrape_football_data(leagues={'E0': 'Premier League'}, seasons=['2425'])
+    assert [m['home_team'] for m in matches][1] == 'Ipswich Town'
+    assert instance.teams.lookup('Ipswich') == 'Ipswich Town'
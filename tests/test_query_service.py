@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""Lekérdezés szolgáltatás: végpontok, névfeloldás, ETag / 304 és újratöltés"""
+
+import asyncio
+import gzip
+import json
+
+import pytest
+
+import query_service
+from query_service import DataStore, QueryService
+from team_registry import TeamRegistry
+
+MATCHES = [
+    {'date': '17/08/2024', 'league': 'Premier League', 'home_team': 'Manchester United',
+     'away_team': 'Tottenham Hotspur', 'result': 'H', 'bookmaker': 'Bet365'},
+    {'date': '10/08/2024', 'league': 'Premier League', 'home_team': 'Tottenham Hotspur',
+     'away_team': 'Leicester City', 'result': 'D', 'bookmaker': 'Pinnacle'},
+    {'date': '01/09/2024', 'league': 'La Liga', 'home_team': 'Athletic Bilbao',
+     'away_team': 'Atletico Madrid', 'result': 'A', 'bookmaker': 'Bet365'},
+]
+
+LIVE = {'updated': '2024-09-01T12:00:00', 'matches': [
+    {'date': '2024-09-02 15:00', 'league': 'Premier League', 'home_team': 'Manchester United',
+     'away_team': 'Leicester City'},
+]}
+
+TEAM_STATS = {
+    'Tottenham Hotspur': {'team_name': 'Tottenham Hotspur', 'total_matches': 40, 'total_goals': 70,
+                          'average_goals_per_match': 1.75},
+    'Manchester United': {'team_name': 'Manchester United', 'total_matches': 38, 'total_goals': 57,
+                          'average_goals_per_match': 1.5},
+}
+
+
+def write_json(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+
+@pytest.fixture
+def files(tmp_path):
+    paths = {name: str(tmp_path / f"{name}.json") for name in ('matches', 'live', 'teams')}
+    write_json(paths['matches'], MATCHES)
+    write_json(paths['live'], LIVE)
+    write_json(paths['teams'], TEAM_STATS)
+    aliases = str(tmp_path / 'team_aliases.json')
+    registry = TeamRegistry(aliases)
+    registry.add('Manchester United', ('Man United',))
+    registry.save()
+    return paths, aliases
+
+
+@pytest.fixture
+def service(files):
+    paths, aliases = files
+    store = DataStore(paths, aliases_path=aliases)
+    store.reload()
+    return QueryService(store)
+
+
+def get(service, target):
+    response = service.respond(target)
+    return response.status, json.loads(response.body)
+
+
+def test_matches_filters_and_date_order(service):
+    status, body = get(service, '/api/matches?league=Premier+League')
+    assert status == 200
+    assert body['total'] == 2
+    assert [m['date'] for m in body['items']] == ['10/08/2024', '17/08/2024']
+
+    _, body = get(service, '/api/matches?bookmaker=Bet365&from=2024-08-15&to=2024-08-31')
+    assert [m['home_team'] for m in body['items']] == ['Manchester United']
+    _, body = get(service, '/api/matches?result=A')
+    assert body['items'][0]['league'] == 'La Liga'
+
+
+def test_team_names_resolve_the_same_way_on_every_endpoint(service):
+    _, matches = get(service, '/api/matches?team=Man+United')
+    _, teams = get(service, '/api/teams?team=Man+United')
+    assert matches['total'] == 1
+    assert [row['team_name'] for row in teams['items']] == ['Manchester United']
+
+    _, matches = get(service, '/api/matches?team=Spurs')
+    _, teams = get(service, '/api/teams?team=Spurs')
+    assert matches['total'] == 2
+    assert [row['team_name'] for row in teams['items']] == ['Tottenham Hotspur']
+
+
+def test_no_fuzzy_team_match(service):
+    _, matches = get(service, '/api/matches?team=Manchester+Untied')
+    _, teams = get(service, '/api/teams?team=Manchester+Untied')
+    assert matches['total'] == teams['total'] == 0
+    # A lekérdezés nem tesz javaslatot a regiszter ellenőrzési sorába
+    assert service.store.matches.teams.pending_review() == []
+
+
+def test_paging_clamps_limit_and_offset(service):
+    _, body = get(service, '/api/matches?limit=-5&offset=-3')
+    assert (body['limit'], body['offset'], body['items']) == (0, 0, [])
+    _, body = get(service, '/api/matches?limit=1&offset=1')
+    assert body['total'] == 3
+    assert [m['date'] for m in body['items']] == ['17/08/2024']
+    _, body = get(service, '/api/matches?limit=999999')
+    assert body['limit'] == 5000
+
+
+def test_live_teams_and_status(service):
+    _, body = get(service, '/api/live?team=Leicester+City')
+    assert body['total'] == 1
+    assert body['updated'] == LIVE['updated']
+
+    _, body = get(service, '/api/teams?sort=total_goals&min_matches=39')
+    assert [row['team_name'] for row in body['items']] == ['Tottenham Hotspur']
+
+    _, body = get(service, '/api/status')
+    assert body['datasets'] == {'matches': 3, 'live': 1, 'teams': 2}
+
+
+def test_errors(service):
+    assert service.respond('/api/nope').status == 404
+    assert service.respond('/api/matches?from=tegnap').status == 400
+    assert service.respond('/api/teams?sort=colour').status == 400
+    assert service.respond('/api/matches?limit=sok').status == 400
+
+
+def test_etag_not_modified_and_gzip(service, monkeypatch):
+    first = service._render('GET', '/api/matches', {}, True).decode('latin-1')
+    assert first.startswith('HTTP/1.1 200 OK')
+    etag = next(line.split(': ', 1)[1] for line in first.split('\r\n') if line.startswith('ETag: '))
+
+    second = service._render('GET', '/api/matches', {'if-none-match': etag}, True)
+    assert second.startswith(b'HTTP/1.1 304 Not Modified')
+    assert second.endswith(b'\r\n\r\n')
+
+    other = service._render('GET', '/api/matches?league=La+Liga', {'if-none-match': etag}, True)
+    assert other.startswith(b'HTTP/1.1 200 OK')
+
+    monkeypatch.setattr(query_service, 'GZIP_MIN_SIZE', 64)
+    compressed = service._render('GET', '/api/matches', {'accept-encoding': 'gzip'}, False)
+    head, _, body = compressed.partition(b'\r\n\r\n')
+    assert b'Content-Encoding: gzip' in head
+    assert json.loads(gzip.decompress(body))['total'] == 3
+    assert b'Connection: close' in head
+
+    assert service._render('POST', '/api/matches', {}, True).startswith(b'HTTP/1.1 405')
+    assert service._render('HEAD', '/api/matches', {}, True).endswith(b'\r\n\r\n')
+
+
+def test_reload_after_regeneration(service, files):
+    paths, _ = files
+    _, before = get(service, '/api/matches')
+    generation = service.store.generation
+
+    write_json(paths['matches'], MATCHES + [dict(MATCHES[0], date='20/09/2024')])
+    assert service.store.changed() == ['matches']
+    assert service.store.reload() == ['matches']
+    assert service.store.generation == generation + 1
+    _, after = get(service, '/api/matches')
+    assert (before['total'], after['total']) == (3, 4)
+
+
+def test_half_written_file_keeps_previous_data(service, files):
+    paths, _ = files
+    with open(paths['matches'], 'w', encoding='utf-8') as f:
+        f.write('[{"date": "17/08')
+    assert service.store.reload() == []
+    assert len(service.store.matches) == 3
+    # A következő ellenőrzéskor újrapróbálja
+    assert service.store.changed() == ['matches']
+
+
+def test_http_keep_alive_roundtrip(service):
+    async def scenario():
+        server = await asyncio.start_server(service.handle, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        responses = []
+        for target in ('/api/status', '/api/teams?team=Spurs'):
+            writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode('latin-1'))
+            await writer.drain()
+            status = await reader.readline()
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line == b'\r\n':
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.lower()] = value.strip()
+            body = await reader.readexactly(int(headers['content-length']))
+            responses.append((status, json.loads(body)))
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return responses
+
+    (status, _), (_, teams) = asyncio.run(scenario())
+    assert status.startswith(b'HTTP/1.1 200')
+    assert teams['items'][0]['team_name'] == 'Tottenham Hotspur'
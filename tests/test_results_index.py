@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""Függőben lévő mérkőzések: célzott eredmény feloldás, lejárat, külön fájl"""
+
+import json
+import os
+from datetime import date, datetime, timedelta, timezone
+
+import update_odds_from_api
+from results_index import (RESULT_SOURCE, ResultIndex, expire_pending, load_matches, local_result_files,
+                           merge_fixtures, pending_path, pending_targets, resolve_pending)
+from team_registry import TeamRegistry
+
+TODAY = date(2024, 9, 1)
+E0_CSV = (
+    "Div,Date,HomeTeam,AwayTeam,FTHG,FTAG,FTR\n"
+    "E0,17/08/2024,Ipswich,Liverpool,0,2,A\n"
+    "E0,24/08/2024,Man United,Brighton,1,2,A\n"
+)
+
+
+def fixture(day, home, away, league='Premier League', result=None, bookmaker='Bet365'):
+    return {'date': day, 'league': league, 'home_team': home, 'away_team': away,
+            'odds_home': 2.0, 'odds_draw': 3.4, 'odds_away': 3.6,
+            'home_goals': None, 'away_goals': None, 'result': result, 'bookmaker': bookmaker}
+
+
+def test_pending_targets_only_played_resolvable_rows():
+    matches = [
+        fixture('17/08/2024', 'Ipswich Town', 'Liverpool'),
+        fixture('20/08/2024', 'Real Madrid', 'Mallorca', league='La Liga'),
+        fixture('18/09/2024', 'Juventus', 'PSV', league='Champions League'),
+        fixture('01/10/2024', 'Arsenal', 'Chelsea'),
+        fixture('10/05/2024', 'Arsenal', 'Everton', result='H'),
+    ]
+    assert pending_targets(matches, today=TODAY) == [('E0', '2425'), ('SP1', '2425')]
+
+
+def test_local_result_files_reads_only_needed(tmp_path):
+    for path in ('E0.csv', 'D1.csv', '2324/E0.csv', '2425/SP1.csv', 'adatokfoci.csv'):
+        (tmp_path / path).parent.mkdir(exist_ok=True)
+        (tmp_path / path).write_text(E0_CSV)
+    files = local_result_files([('E0', '2425'), ('SP1', '2425')], str(tmp_path))
+    assert files == [str(tmp_path / 'E0.csv'), str(tmp_path / '2425' / 'SP1.csv')]
+
+
+def test_resolve_pending_from_local_files(tmp_path, monkeypatch):
+    (tmp_path / 'E0.csv').write_text(E0_CSV)
+    (tmp_path / 'other.csv').write_text('not,a\nfootball,file\n')
+    read = []
+    original = ResultIndex.add_csv
+    monkeypatch.setattr(ResultIndex, 'add_csv', lambda self, path: read.append(path) or original(self, path))
+
+    matches = [fixture('17/08/2024', 'Ipswich Town', 'Liverpool'),
+               fixture('2024-08-24', 'Manchester United', 'Brighton')]
+    teams = TeamRegistry(None)
+    teams.resolve('Manchester United')
+    assert resolve_pending(matches, teams, data_dir=str(tmp_path), today=TODAY) == 2
+    assert [m['result'] for m in matches] == ['A', 'A']
+    assert (matches[1]['home_goals'], matches[1]['away_goals']) == (1, 2)
+    assert {m['result_source'] for m in matches} == {RESULT_SOURCE}
+    assert read == [str(tmp_path / 'E0.csv')]
+
+
+def test_resolve_pending_downloads_only_missing_targets(tmp_path):
+    class Scraper:
+        calls = []
+
+        def __init__(self):
+            from football_data import FootballDataTable
+            self.football_data = FootballDataTable()
+
+        def scrape_football_data(self, leagues, seasons, full_width):
+            from football_data import parse_football_data
+            self.calls.append((leagues, seasons, full_width))
+            self.football_data.extend(parse_football_data(E0_CSV))
+
+    matches = [fixture('17/08/2024', 'Ipswich', 'Liverpool'),
+               fixture('18/09/2024', 'Juventus', 'PSV', league='Champions League')]
+    assert resolve_pending(matches, TeamRegistry(None), data_dir=str(tmp_path),
+                           scraper_factory=Scraper, today=TODAY) == 1
+    assert Scraper.calls == [({'E0': 'Premier League'}, ['2425'], True)]
+
+
+def test_expire_pending():
+    matches = [
+        fixture('01/08/2024', 'Arsenal', 'Wolves'),
+        fixture('25/08/2024', 'Arsenal', 'Brighton'),
+        fixture('18/09/2024', 'Juventus', 'PSV', league='Champions League'),
+        fixture('01/05/2024', 'Arsenal', 'Everton', result='H'),
+    ]
+    kept, expired = expire_pending(matches, today=TODAY)
+    assert expired == 2
+    assert [m['away_team'] for m in kept] == ['Brighton', 'Everton']
+
+
+def test_load_and_merge_skip_sample_rows(tmp_path):
+    path = tmp_path / 'odds_data.json'
+    path.write_text(json.dumps([fixture('17/08/2024', 'A', 'B', result='H', bookmaker='Simulated'),
+                                fixture('17/08/2024', 'C', 'D')]))
+    existing = load_matches(str(path))
+    assert [m['home_team'] for m in existing] == ['C']
+    fresh = dict(fixture('17/08/2024', 'C', 'D'), odds_home=2.5)
+    assert merge_fixtures(existing, [fresh]) == [fresh]
+    assert pending_path('data/odds_data.json') == os.path.join('data', 'odds_data.pending.json')
+
+
+def test_unverified_results_reset_to_pending(tmp_path):
+    path = tmp_path / 'odds_data.json'
+    legacy = dict(fixture('17/08/2024', 'Ipswich', 'Liverpool', result='H'), home_goals=3, away_goals=1)
+    verified = dict(fixture('24/08/2024', 'Man United', 'Brighton', result='A'),
+                    home_goals=1, away_goals=2, result_source=RESULT_SOURCE)
+    path.write_text(json.dumps([legacy, verified]))
+    existing = load_matches(str(path))
+    assert [(m['home_goals'], m['away_goals'], m['result']) for m in existing] == [(None, None, None), (1, 2, 'A')]
+
+    # A visszaállított sor friss odds-okat kap, majd a valódi eredményt
+    fresh = dict(fixture('17/08/2024', 'Ipswich', 'Liverpool'), odds_home=4.5)
+    merged = merge_fixtures(existing, [fresh, dict(verified, odds_home=9.9)])
+    assert [m['odds_home'] for m in merged] == [4.5, 2.0]
+    (tmp_path / 'E0.csv').write_text(E0_CSV)
+    assert resolve_pending(merged, TeamRegistry(None), data_dir=str(tmp_path), today=TODAY) == 1
+    assert (merged[0]['result'], merged[0]['result_source']) == ('A', RESULT_SOURCE)
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, payload):
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+def api_match(home, away, kickoff):
+    outcomes = [{'name': home, 'price': 2.0}, {'name': 'Draw', 'price': 3.4}, {'name': away, 'price': 3.6}]
+    return {'home_team': home, 'away_team': away, 'commence_time': kickoff,
+            'bookmakers': [{'title': 'Bet365', 'markets': [{'outcomes': outcomes}]}]}
+
+
+def test_update_keeps_pending_out_of_frontend_outputs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs('data')
+    played = (datetime.now(timezone.utc) - timedelta(days=3)).replace(hour=14, minute=0, second=0)
+    upcoming = datetime.now(timezone.utc) + timedelta(days=3)
+    with open('data/E0.csv', 'w', encoding='utf-8') as f:
+        f.write("Div,Date,HomeTeam,AwayTeam,FTHG,FTAG,FTR\n"
+                f"E0,{played.strftime('%d/%m/%Y')},Arsenal,Chelsea,2,0,H\n")
+    with open('data/odds_data.json', 'w', encoding='utf-8') as f:
+        json.dump([fixture('17/08/2024', 'Sample', 'Row', result='H', bookmaker='Simulated')], f)
+
+    payload = [api_match('Arsenal', 'Chelsea', played.strftime('%Y-%m-%dT%H:%M:%SZ')),
+               api_match('Fulham', 'Everton', upcoming.strftime('%Y-%m-%dT%H:%M:%SZ'))]
+    monkeypatch.setattr(update_odds_from_api, 'LEAGUE_NAMES', {'soccer_epl': 'Premier League'})
+    monkeypatch.setattr(update_odds_from_api.requests, 'get', lambda *args, **kwargs: FakeResponse(payload))
+
+    assert update_odds_from_api.update_odds_from_api('key') is True
+    with open('data/odds_data.json', encoding='utf-8') as f:
+        settled = json.load(f)
+    with open('data/odds_data.pending.json', encoding='utf-8') as f:
+        pending = json.load(f)
+    with open('data/odds_data.csv', encoding='utf-8') as f:
+        csv_rows = f.read().splitlines()
+    assert [(m['home_team'], m['result']) for m in settled] == [('Arsenal', 'H')]
+    assert [m['home_team'] for m in pending] == ['Fulham']
+    assert len(csv_rows) == 2 and 'Fulham' not in csv_rows[1]
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""Gördülő forma: ablakok, pillanatképek és a csak olvasó lekérdezés"""
+
+from datetime import date
+
+import pytest
+
+from rolling_form import FormEngine
+
+DAY = date(2024, 8, 1).toordinal()
+
+MATCHES = [
+    (DAY, 'Arsenal', 'Chelsea', 2, 0),
+    (DAY + 10, 'Chelsea', 'Arsenal', 1, 1),
+    (DAY + 20, 'Arsenal', 'Everton', 0, 1),
+]
+
+
+def test_last_n_and_day_windows():
+    engine = FormEngine(last_n=2, days=15).extend(MATCHES)
+    arsenal = engine.team_snapshot('Arsenal')
+    assert arsenal['form'] == 'DL'
+    assert arsenal['last_n']['matches'] == 2
+    # DAY + 20-on a DAY napi mérkőzés már kiesett a 15 napos ablakból
+    assert arsenal['last_days']['matches'] == 2
+    assert arsenal['last_days']['goals_for'] == 1
+    assert arsenal['last_days']['points'] == 1
+
+
+def test_snapshot_does_not_evict():
+    engine = FormEngine(last_n=5, days=15).extend(MATCHES)
+    _, day_window = engine.teams['Arsenal']
+    entries, sums = list(day_window.entries), list(day_window.sums)
+
+    later = engine.team_snapshot('Arsenal', DAY + 100)
+    assert later['last_days']['matches'] == 0
+    assert list(day_window.entries) == entries
+    assert day_window.sums == sums
+
+    # Egy későbbi dátumú lekérdezés nem változtatja a korábbi napi képet
+    assert engine.team_snapshot('Arsenal')['last_days']['matches'] == 2
+
+
+def test_add_after_snapshot_keeps_windows_correct():
+    engine = FormEngine(last_n=5, days=15).extend(MATCHES[:2])
+    engine.snapshot(DAY + 16)
+    engine.add(DAY + 16, 'Arsenal', 'Everton', 3, 0)
+    last_days = engine.team_snapshot('Arsenal')['last_days']
+    assert last_days['matches'] == 2
+    assert last_days['goals_for'] == 4
+    assert last_days['wins'] == 1
+
+
+def test_replay_snapshots_before_match_day():
+    engine = FormEngine(last_n=5, days=365)
+    first, second = engine.replay(MATCHES, [DAY + 10, DAY + 30])
+    assert first['teams']['Arsenal']['last_days']['matches'] == 1
+    assert second['teams']['Arsenal']['last_days']['matches'] == 3
+
+
+def test_snapshot_before_last_match_rejected():
+    engine = FormEngine().extend(MATCHES)
+    with pytest.raises(ValueError):
+        engine.snapshot(DAY)
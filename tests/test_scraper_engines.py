@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""Elemző motorok egyezése: soronkénti, streamelt és numpy, kódolás váltással"""
+
+import pytest
+
+from scraper import analyze_team_stats, build_team_cube
+
+HEADER = "Datum,Hazai csapat,Vendeg csapat,Haza csapat eredmeny,Vendeg csapat eredmeny,Bajnoksag\n"
+TEAMS = ['Hungary', 'Austria', 'Germany', 'Brazil', 'Spain', 'Italy']
+
+
+def make_rows(count, start=0):
+    return ''.join(
+        f"6/{1 + i % 28}/2019,{TEAMS[i % 6]},{TEAMS[(i + 1) % 6]},{i % 4},{(i * 3) % 5},Friendly\n"
+        for i in range(start, start + count))
+
+
+def run_engines(csv_file):
+    return {
+        'python': analyze_team_stats(csv_file),
+        'streaming': analyze_team_stats(csv_file, streaming=True),
+        'numpy': analyze_team_stats(csv_file, engine='numpy'),
+    }
+
+
+def assert_same(results):
+    expected = results['python']
+    assert expected
+    for engine, stats in results.items():
+        assert stats == expected, engine
+        assert list(stats) == list(expected), engine
+
+
+def test_engines_agree_on_bad_rows(tmp_path):
+    csv_file = tmp_path / 'adatokfoci.csv'
+    csv_file.write_text(HEADER + make_rows(40) + "7/1/2019,Spain,Italy,x,1,Friendly\n"
+                        "7/2/2019,Spain\n" + "7/3/2019,Brazil,Spain,+2, 1 ,Friendly\n" + make_rows(20, 40),
+                        encoding='utf-8')
+    results = run_engines(str(csv_file))
+    assert_same(results)
+    assert results['python'] == build_team_cube(str(csv_file)).team_stats()
+
+
+@pytest.mark.parametrize('name', ['Mönchengladbach', 'Curaçao'])
+def test_engines_retry_encoding_after_sample(tmp_path, name):
+    # Az első 64 KiB tiszta ASCII (utf-8-nak ismeri fel), utána latin-1 bájt jön
+    rows = make_rows(3000)
+    assert len(rows) > 64 * 1024
+    csv_file = tmp_path / 'adatokfoci.csv'
+    csv_file.write_bytes((HEADER + rows + f"8/1/2020,{name},Hungary,2,2,Friendly\n").encode('latin-1'))
+    results = run_engines(str(csv_file))
+    assert_same(results)
+    assert results['numpy'][name]['total_matches'] == 1
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""Inkrementális team_stats frissítés: checkpoint és prefix ujjlenyomat"""
+
+import json
+
+import pytest
+
+from scraper import (analyze_team_stats_incremental, build_team_cube, checkpoint_path,
+                     prefix_fingerprint, prefix_matches)
+
+HEADER = "Datum,Hazai csapat,Vendeg csapat,Haza csapat eredmeny,Vendeg csapat eredmeny,Bajnoksag\n"
+
+
+def make_rows(count, start=0):
+    teams = ['Hungary', 'Austria', 'Germany', 'Brazil', 'Spain', 'Italy']
+    return ''.join(
+        f"6/{1 + i % 28}/2019,{teams[i % 6]},{teams[(i + 1) % 6]},{i % 4},{(i * 3) % 5},Friendly\n"
+        for i in range(start, start + count))
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return str(tmp_path / 'adatok.csv'), str(tmp_path / 'team_stats.json')
+
+
+def full_stats(csv_file):
+    return build_team_cube(csv_file).team_stats()
+
+
+def test_append_processes_only_new_rows(paths):
+    csv_file, output = paths
+    with open(csv_file, 'w', encoding='utf-8') as f:
+        f.write(HEADER + make_rows(200))
+    analyze_team_stats_incremental(csv_file, output)
+    with open(csv_file, 'a', encoding='utf-8') as f:
+        f.write(make_rows(50, start=200))
+
+    assert analyze_team_stats_incremental(csv_file, output) == full_stats(csv_file)
+    with open(checkpoint_path(output), encoding='utf-8') as f:
+        assert json.load(f)['line_count'] == 251
+
+
+def test_same_length_edit_in_the_middle_triggers_rebuild(paths):
+    csv_file, output = paths
+    # Nagyobb, mint a mintavételezett ujjlenyomat két 64 KiB-os blokkja
+    content = HEADER + make_rows(6000)
+    assert len(content) > 3 * 64 * 1024
+    with open(csv_file, 'w', encoding='utf-8') as f:
+        f.write(content)
+    analyze_team_stats_incremental(csv_file, output)
+
+    # Egy gól számjegy átírása a fájl közepén, a hossz változatlan
+    middle = content.index('\n', len(content) // 2) + 1
+    line_end = content.index('\n', middle)
+    line = content[middle:line_end].split(',')
+    line[3] = '9' if line[3] != '9' else '8'
+    edited = content[:middle] + ','.join(line) + content[line_end:]
+    assert len(edited) == len(content)
+    with open(csv_file, 'w', encoding='utf-8') as f:
+        f.write(edited)
+
+    assert analyze_team_stats_incremental(csv_file, output) == full_stats(csv_file)
+
+
+def test_sampled_fingerprint_is_opt_in(paths):
+    csv_file, _ = paths
+    with open(csv_file, 'w', encoding='utf-8') as f:
+        f.write(HEADER + make_rows(10))
+    assert 'blocks' in prefix_fingerprint(csv_file, 100)
+    assert 'sample' in prefix_fingerprint(csv_file, 100, sample=True)
+
+
+def test_extended_fingerprint_equals_fresh_one(paths):
+    csv_file, _ = paths
+    with open(csv_file, 'w', encoding='utf-8') as f:
+        f.write(HEADER + make_rows(300))
+    first = prefix_fingerprint(csv_file, 2500, block_size=1000)
+    extended = prefix_fingerprint(csv_file, 7300, previous=first, block_size=1000)
+    assert extended == prefix_fingerprint(csv_file, 7300, block_size=1000)
+    assert prefix_matches(csv_file, extended)
+
+    with open(csv_file, 'r+b') as f:
+        f.seek(5000)
+        byte = f.read(1)
+        f.seek(5000)
+        f.write(b'#' if byte != b'#' else b'$')
+    assert not prefix_matches(csv_file, extended)
+    assert prefix_matches(csv_file, first)
+
+
+def test_decode_error_fallback_saves_checkpoint(paths):
+    csv_file, output = paths
+    with open(csv_file, 'w', encoding='utf-8') as f:
+        f.write(HEADER + make_rows(20))
+    analyze_team_stats_incremental(csv_file, output)
+
+    # latin-1 sor a már utf-8-ként rögzített fájl végén
+    with open(csv_file, 'ab') as f:
+        f.write("6/9/2019,Sápmi,Hungary,1,1,Friendly\n".encode('latin-1'))
+    stats = analyze_team_stats_incremental(csv_file, output)
+    assert stats['Hungary']['total_matches'] == full_stats(csv_file)['Hungary']['total_matches']
+
+    with open(checkpoint_path(output), encoding='utf-8') as f:
+        checkpoint = json.load(f)
+    assert checkpoint['encoding'] != 'utf-8'
+    assert checkpoint['line_count'] == 22
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""Bajnokság × szezon shardok: particionálás, változás észlelés és törlés"""
+
+import json
+import os
+
+import pytest
+
+import shards
+from shards import (MANIFEST_NAME, ShardStore, league_slug, match_season, shard_directory,
+                    write_shards)
+
+
+def match(league, day, home='Arsenal', away='Chelsea', **extra):
+    return dict({'date': day, 'league': league, 'home_team': home, 'away_team': away}, **extra)
+
+
+ROWS = [
+    match('Premier League', '17/08/2024'),
+    match('Premier League', '20/05/2024', home='Everton'),
+    match('La Liga', '2024-08-18T19:00:00Z', home='Sevilla', away='Getafe'),
+    match('Ligue 1', None),
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ShardStore(str(tmp_path / 'odds_data'))
+
+
+def read_manifest(store):
+    with open(os.path.join(store.directory, MANIFEST_NAME), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_names():
+    assert league_slug('Premier League') == 'premier-league'
+    assert league_slug('Ligue 1 Uber Eats') == 'ligue-1-uber-eats'
+    assert league_slug('Süper Lig') == 'super-lig'
+    assert league_slug('') == 'unknown'
+    assert match_season('17/08/2024') == '2425'
+    assert match_season('2024-05-20T14:00:00Z') == '2324'
+    assert match_season('') == 'unknown'
+    assert shard_directory('data/odds_data.json.gz') == 'data/odds_data'
+
+
+def test_partition_and_read(store):
+    stats = store.write(ROWS)
+    assert stats == {'written': 4, 'unchanged': 0, 'removed': 0}
+    manifest = read_manifest(store)
+    assert sorted(manifest['shards']) == ['la-liga/2425', 'ligue-1/unknown',
+                                          'premier-league/2324', 'premier-league/2425']
+    assert manifest['total_rows'] == 4
+    entry = manifest['shards']['premier-league/2425']
+    assert entry['rows'] == 1
+    assert entry['bytes'] == os.path.getsize(os.path.join(store.directory, entry['path']))
+
+    assert len(store.read('Premier League')) == 2
+    assert store.read('premier-league', '2324')[0]['home_team'] == 'Everton'
+    assert store.keys(season='2425') == ['la-liga/2425', 'premier-league/2425']
+
+
+def test_only_changed_shards_rewritten(store):
+    store.write(ROWS)
+    path = os.path.join(store.directory, 'la-liga', '2425.json')
+    mtime = os.stat(path).st_mtime_ns
+
+    assert store.write(ROWS) == {'written': 0, 'unchanged': 4, 'removed': 0}
+    changed = ROWS + [match('Premier League', '24/08/2024', home='Fulham')]
+    assert store.write(changed) == {'written': 1, 'unchanged': 3, 'removed': 0}
+    assert os.stat(path).st_mtime_ns == mtime
+    assert len(ShardStore(store.directory).read('Premier League', '2425')) == 2
+
+
+def test_missing_shards_removed(store):
+    store.write(ROWS)
+    stats = store.write(ROWS[:2])
+    assert stats == {'written': 0, 'unchanged': 2, 'removed': 2}
+    assert not os.path.exists(os.path.join(store.directory, 'la-liga'))
+    assert sorted(read_manifest(store)['shards']) == ['premier-league/2324', 'premier-league/2425']
+
+
+def test_deleted_shard_file_is_rewritten(store):
+    store.write(ROWS)
+    os.remove(os.path.join(store.directory, 'la-liga', '2425.json'))
+    assert store.write(ROWS)['written'] == 1
+
+
+def test_large_shard_streams_in_batches(store, monkeypatch):
+    monkeypatch.setattr(shards.PendingShard, 'BATCH_ROWS', 7)
+    monkeypatch.setattr(shards.PendingShard, 'FLUSH_BYTES', 200)
+    rows = [match('Premier League', '17/08/2024', home=f"Team {i}", odds_home=1.5 + i / 100)
+            for i in range(100)]
+    store.write(rows)
+    assert store.read() == rows
+    entry = read_manifest(store)['shards']['premier-league/2425']
+    assert entry['rows'] == 100
+    assert not any(name.endswith('.tmp') for _, _, files in os.walk(store.directory) for name in files)
+
+
+def test_write_shards_meta_next_to_monolithic_file(tmp_path):
+    filename = str(tmp_path / 'live_matches.json')
+    write_shards(ROWS, filename, meta={'updated': '2024-09-01T12:00:00'})
+    manifest = ShardStore(shard_directory(filename)).manifest
+    assert manifest['updated'] == '2024-09-01T12:00:00'
+    assert manifest['total_rows'] == len(ROWS)
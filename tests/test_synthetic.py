@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""Szintetikus generátor: reprodukálhatóság és odds / eredmény konzisztencia"""
+
+from datetime import date
+
+import numpy as np
+import pytest
+
+import synthetic
+from odds_formats import read_columnar
+from synthetic import DEFAULT_START_DATE, MatchGenerator, generate_matches, generate_to_file
+
+
+class LaterDate(date):
+    @classmethod
+    def today(cls):
+        return cls(2031, 5, 17)
+
+
+def test_same_seed_same_matches_on_any_day(monkeypatch):
+    first = list(generate_matches(500, seed=7, chunk_size=128))
+    monkeypatch.setattr(synthetic, 'date', LaterDate)
+    assert list(generate_matches(500, seed=7, chunk_size=128)) == first
+    assert first[0]['date'] == DEFAULT_START_DATE.strftime('%d/%m/%Y')
+
+
+def test_explicit_start_date():
+    matches = list(generate_matches(10, seed=1, start_date=date(2020, 1, 1), days=1))
+    assert {m['date'] for m in matches} == {'01/01/2020'}
+
+
+def test_chunk_fields_are_consistent():
+    chunk = next(MatchGenerator(seed=3).chunks(2000, 2000))
+    assert np.all(chunk['home_team'] != chunk['away_team'])
+    assert np.all(chunk['odds_home'] >= 1.01)
+    home_win = chunk['home_goals'] > chunk['away_goals']
+    assert np.all((chunk['result'] == 'H') == home_win)
+    # A margin miatt az implikált valószínűségek összege 1 fölött van
+    overround = 1 / chunk['odds_home'] + 1 / chunk['odds_draw'] + 1 / chunk['odds_away']
+    assert np.median(overround) == pytest.approx(1.05, abs=0.01)
+
+
+def test_columnar_file_matches_generator(tmp_path):
+    path = str(tmp_path / 'synthetic.odc')
+    assert generate_to_file(300, path, 'columnar', seed=11, chunk_size=100) == 300
+    assert read_columnar(path) == list(generate_matches(300, seed=11, chunk_size=100))
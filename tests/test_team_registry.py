@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""Kanonikus csapat név regiszter: alias tábla, fuzzy javaslatok, mentés"""
+
+import itertools
+import json
+
+import pytest
+
+from results_index import ResultIndex
+from team_registry import TeamRegistry, canonical_rank, distinguishing_words, normalize_name
+
+
+@pytest.fixture
+def registry():
+    return TeamRegistry(None)
+
+
+def test_normalization_and_seed_aliases(registry):
+    assert normalize_name('Atlético Madrid FC') == 'atletico madrid'
+    assert normalize_name("Nott'm Forest") == 'nottingham forest'
+    assert registry.resolve('Man United') == 'Man United'
+    assert registry.resolve('Bayern München') == 'Bayern Munich'
+    assert registry.resolve('PSG') == 'Paris Saint Germain'
+    assert registry.resolve('Wolves') == 'Wolverhampton Wanderers'
+
+
+@pytest.mark.parametrize('name', ['Paris FC', 'Paris', 'Brentford B', 'DR Congo', 'Arsenal U21', 'Chelsea Women'])
+def test_distinguishing_words_block_merges(name):
+    registry = TeamRegistry(None)
+    for known in ('Paris SG', 'Brentford', 'Congo', 'Arsenal', 'Chelsea'):
+        registry.resolve(known)
+    assert registry.resolve(name) == name
+    assert registry.review == {}
+
+
+def test_distinguishing_words():
+    assert distinguishing_words('Brentford B') == {'b'}
+    assert distinguishing_words('Paris FC') == {'fc'}
+    assert distinguishing_words('Man United U21') == {'u21'}
+    assert distinguishing_words('Brentford') == set()
+
+
+def test_fuzzy_match_is_queued_not_persisted(tmp_path):
+    path = str(tmp_path / 'team_aliases.json')
+    registry = TeamRegistry(path)
+    assert registry.resolve('Tottenham Hotspurs') == 'Tottenham Hotspurs'
+    assert registry.resolve('Tottenham Hotspurs', create=False) is None
+    assert registry.pending_review() == [('Tottenham Hotspurs', 'Tottenham Hotspur', pytest.approx(0.909, abs=0.001))]
+    registry.save()
+
+    with open(path, encoding='utf-8') as f:
+        saved = json.load(f)
+    assert 'Tottenham Hotspurs' not in saved['teams'].get('Tottenham Hotspur', [])
+    assert 'Tottenham Hotspurs' in saved['review']
+
+    reloaded = TeamRegistry.load(path)
+    assert reloaded.resolve('Tottenham Hotspurs') == 'Tottenham Hotspurs'
+    assert reloaded.accept('Tottenham Hotspurs') == 'Tottenham Hotspur'
+    assert reloaded.resolve('Tottenham Hotspurs') == 'Tottenham Hotspur'
+    assert reloaded.pending_review() == []
+
+
+def test_reject_keeps_own_name(registry):
+    registry.resolve('Tottenham Hotspurs')
+    assert registry.reject('Tottenham Hotspurs') == 'Tottenham Hotspurs'
+    assert registry.resolve('Tottenham Hotspurs') == 'Tottenham Hotspurs'
+
+
+@pytest.mark.parametrize('names', [
+    ('Leeds', 'Leeds United'),
+    ("Nott'm Forest", 'Nottingham Forest'),
+    ('Man United', 'Manchester United'),
+])
+def test_canonical_name_does_not_depend_on_order(names):
+    results = set()
+    for order in itertools.permutations(names):
+        registry = TeamRegistry(None)
+        results.add(frozenset(registry.resolve_all(order).values()))
+    assert results == {frozenset({min(names, key=canonical_rank)})}
+    assert min(names, key=canonical_rank) == names[1]
+
+
+@pytest.mark.parametrize('names', [
+    ('Man City', 'Manchester City'),
+    ("Nott'm Forest", 'Nottingham Forest'),
+    ('St Etienne', 'Saint Etienne'),
+])
+def test_issued_name_is_never_renamed(names, tmp_path):
+    path = str(tmp_path / 'team_aliases.json')
+    registry = TeamRegistry(path)
+    rows = [registry.canonicalize({'home_team': name}) for name in names]
+    assert {row['home_team'] for row in rows} == {names[0]}
+    assert registry.resolve(names[0]) == registry.resolve(names[1]) == names[0]
+
+    # Futások között is megmarad
+    registry.save()
+    assert TeamRegistry.load(path).resolve(names[1]) == names[0]
+
+
+def test_batch_settles_before_rewriting(registry):
+    rows = registry.canonicalize_all([{'home_team': 'Man City', 'away_team': 'Everton'},
+                                      {'home_team': 'Manchester City', 'away_team': 'Man City'}])
+    assert {row['home_team'] for row in rows} | {rows[1]['away_team']} == {'Manchester City'}
+    assert registry.resolve('Man City') == 'Manchester City'
+
+
+def test_canonical_choice_survives_reload(tmp_path):
+    path = str(tmp_path / 'team_aliases.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'version': 1, 'teams': {'Leeds': ['Leeds United']}}, f)
+    assert TeamRegistry.load(path).resolve('Leeds') == 'Leeds United'
+
+
+def test_key_is_stable_across_renames(registry):
+    key = registry.key('Leeds')
+    registry.resolve('Leeds United')
+    assert registry.resolve('Leeds') == 'Leeds United'
+    assert registry.key('Leeds United') == key
+
+
+def test_result_index_after_rename(registry):
+    from football_data import parse_football_data
+    index = ResultIndex(registry)
+    index.add_table(parse_football_data("Date,HomeTeam,AwayTeam,FTHG,FTAG,FTR\n17/08/2024,Leeds,Portsmouth,3,3,D\n"))
+    registry.resolve('Leeds United')
+    assert index.lookup('2024-08-17', 'Leeds United', 'Portsmouth') == (3, 3, 'D')
@@ -10,12 +10,27 @@ import json
 import os
 from datetime import datetime
 
-def update_odds_from_api(api_key):
+import instrumentation
+from odds_scraper import OddsScraper
+from results_index import (LEAGUE_NAMES, expire_pending, load_matches, merge_fixtures, pending_path,
+                           resolve_pending, split_pending)
+from shards import atomic_write, write_shards
+from team_registry import TeamRegistry
+
+@instrumentation.instrumented('update_odds_from_api')
+def update_odds_from_api(api_key, json_path='data/odds_data.json'):
     """
     Frissíti az odds adatokat The Odds API-ról
     
+    Az új mérkőzések eredmény nélkül (függőben) érkeznek; a valódi eredményt
+    a Football-Data CSV-kből kapják meg, amint elérhető (lásd results_index.py).
+    A frontend kimenetekbe (JSON, CSV, shardok) csak a lezárt mérkőzések
+    kerülnek; a még fel nem oldhatók külön fájlban (pending_path) várnak a
+    következő futásig, a túl régiek elhagyódnak.
+    
     Args:
         api_key: A The Odds API kulcsod (https://the-odds-api.com/)
+        json_path: A lezárt mérkőzések JSON fájlja (a CSV mellé kerül)
     """
     
     print("🚀 ODDS FRISSÍTÉS - The Odds API")
@@ -26,18 +41,15 @@ def update_odds_from_api(api_key):
         print("📝 Regisztrálj: https://the-odds-api.com/")
         return False
     
-    # Ligák listája
-    sports = {
-        'soccer_epl': 'Premier League',
-        'soccer_spain_la_liga': 'La Liga',
-        'soccer_germany_bundesliga': 'Bundesliga',
-        'soccer_italy_serie_a': 'Serie A',
-        'soccer_france_ligue_one': 'Ligue 1'
-    }
+    # Ligák listája (mind feloldható a Football-Data CSV-kből)
+    sports = dict(LEAGUE_NAMES)
     
     all_matches = []
     total_requests = 0
     
+    # Kanonikus csapat nevek (a Football-Data adatokkal összekapcsolhatók)
+    teams = TeamRegistry.load()
+    
     print(f"\n📊 Lekérdezés {len(sports)} bajnokságból...")
     print("-"*60)
     
@@ -52,11 +64,14 @@ def update_odds_from_api(api_key):
             }
             
             print(f"🔍 {league_name}...", end=' ')
-            response = requests.get(url, params=params, timeout=15)
+            with instrumentation.phase('fetch'):
+                response = requests.get(url, params=params, timeout=15)
+            instrumentation.record_response(response)
             total_requests += 1
             
             if response.status_code == 200:
-                matches = response.json()
+                with instrumentation.phase('parse'):
+                    matches = response.json()
                 count = 0
                 
                 for match in matches:
@@ -94,27 +109,7 @@ def update_odds_from_api(api_key):
                             except:
                                 date_str = commence_time[:10]
                             
-                            # Szimuláljuk az eredményt valószínűségek alapján
-                            import random
-                            prob_h = 1/odds_home
-                            prob_d = 1/odds_draw
-                            prob_a = 1/odds_away
-                            total = prob_h + prob_d + prob_a
-                            
-                            rand = random.random()
-                            if rand < prob_h/total:
-                                result = 'H'
-                                home_goals = random.randint(1, 4)
-                                away_goals = random.randint(0, home_goals-1) if home_goals > 0 else 0
-                            elif rand < (prob_h + prob_d)/total:
-                                result = 'D'
-                                goals = random.randint(0, 3)
-                                home_goals = away_goals = goals
-                            else:
-                                result = 'A'
-                                away_goals = random.randint(1, 4)
-                                home_goals = random.randint(0, away_goals-1) if away_goals > 0 else 0
-                            
+                            # Az eredmény függőben, amíg a Football-Data CSV-ben meg nem jelenik
                             all_matches.append({
                                 'date': date_str,
                                 'league': league_name,
@@ -123,13 +118,15 @@ def update_odds_from_api(api_key):
                                 'odds_home': round(odds_home, 2),
                                 'odds_draw': round(odds_draw, 2),
                                 'odds_away': round(odds_away, 2),
-                                'home_goals': home_goals,
-                                'away_goals': away_goals,
-                                'result': result,
+                                'home_goals': None,
+                                'away_goals': None,
+                                'result': None,
                                 'bookmaker': bookmaker.get('title', 'Unknown')
                             })
                             count += 1
                 
+                instrumentation.count('rows_parsed', len(matches))
+                instrumentation.count('rows_rejected', len(matches) - count)
                 print(f"✅ {count} mérkőzés")
                 
             elif response.status_code == 401:
@@ -145,8 +142,38 @@ def update_odds_from_api(api_key):
             print(f"❌ Hiba: {e}")
     
     print("-"*60)
+    
+    # Kanonikus nevek az egész kötegre egyszerre (egy csapat egy néven)
+    teams.canonicalize_all(all_matches)
+    
+    # Összefésülés a korábbi futásokkal (csak API sorok; a régi formátumú
+    # JSON-ban maradt függőben lévők is), majd eredmény feloldás egy menetben
+    fetched_count = len(all_matches)
+    pending_file = pending_path(json_path)
+    with instrumentation.phase('merge'):
+        all_matches = merge_fixtures(load_matches(json_path) + load_matches(pending_file), all_matches)
+    settled, pending = split_pending(all_matches)
+    resolved = 0
+    if pending:
+        def make_scraper():
+            scraper = OddsScraper()
+            scraper.teams = teams
+            return scraper
+        with instrumentation.phase('resolve'):
+            resolved = resolve_pending(pending, teams, sport_keys=sports, scraper_factory=make_scraper)
+        newly_settled, pending = split_pending(pending)
+        settled += newly_settled
+        pending, expired = expire_pending(pending, sport_keys=sports)
+    else:
+        expired = 0
+    teams.save()
+    
     print(f"\n📊 ÖSSZESÍTÉS:")
-    print(f"   ✅ Összes mérkőzés: {len(all_matches)}")
+    print(f"   ✅ Letöltött mérkőzés: {fetched_count}")
+    print(f"   📁 Lezárt mérkőzés: {len(settled)}")
+    print(f"   🏁 Most feloldott eredmény: {resolved}")
+    print(f"   ⏳ Függőben: {len(pending)}")
+    print(f"   🗑️  Lejárt (feloldhatatlan): {expired}")
     print(f"   🌐 API kérések: {total_requests}")
     
     # Ellenőrizd a remaining requests-et
@@ -154,7 +181,7 @@ def update_odds_from_api(api_key):
         remaining = response.headers.get('x-requests-remaining')
         print(f"   🔢 Fennmaradó kérések: {remaining}")
     
-    if not all_matches:
+    if not settled and not pending:
         print("\n❌ Nem sikerült adatot letölteni!")
         return False
     
@@ -162,29 +189,39 @@ def update_odds_from_api(api_key):
     print("\n💾 Mentés...")
     
     # Mappa létrehozás
-    os.makedirs('data', exist_ok=True)
-    
-    # JSON mentés
-    json_path = 'data/odds_data.json'
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(all_matches, f, indent=2, ensure_ascii=False)
-    print(f"   ✅ JSON: {json_path}")
-    
-    # CSV mentés
-    csv_path = 'data/odds_data.csv'
-    import csv
-    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
-        fieldnames = ['date', 'league', 'home_team', 'away_team', 
-                      'odds_home', 'odds_draw', 'odds_away',
-                      'home_goals', 'away_goals', 'result', 'bookmaker']
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(all_matches)
-    print(f"   ✅ CSV: {csv_path}")
+    os.makedirs(os.path.dirname(json_path) or '.', exist_ok=True)
+    
+    # Minden fájl ideiglenes fájlba íródik, majd atomikusan kerül a helyére
+    with instrumentation.phase('write'):
+        # JSON mentés (csak lezárt mérkőzések)
+        atomic_write(json_path, json.dumps(settled, indent=2, ensure_ascii=False).encode('utf-8'))
+        print(f"   ✅ JSON: {json_path}")
+        
+        # Függőben lévők külön fájlban, a következő futás feloldásához
+        atomic_write(pending_file, json.dumps(pending, indent=2, ensure_ascii=False).encode('utf-8'))
+        print(f"   ⏳ Függőben: {pending_file}")
+    
+        # CSV mentés
+        csv_path = os.path.splitext(json_path)[0] + '.csv'
+        import csv
+        with open(csv_path + '.tmp', 'w', newline='', encoding='utf-8') as f:
+            fieldnames = ['date', 'league', 'home_team', 'away_team', 
+                          'odds_home', 'odds_draw', 'odds_away',
+                          'home_goals', 'away_goals', 'result', 'bookmaker', 'result_source']
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(settled)
+        os.replace(csv_path + '.tmp', csv_path)
+        print(f"   ✅ CSV: {csv_path}")
+        
+        # Bajnokság × szezon shardok (csak a változottak íródnak újra)
+        shard_stats = write_shards(settled, json_path)
+        print(f"   🗂️  Shardok: {shard_stats['written']} frissítve, "
+              f"{shard_stats['unchanged']} változatlan, {shard_stats['removed']} törölve")
     
     # Bajnokságonkénti összesítés
     league_counts = {}
-    for match in all_matches:
+    for match in settled:
         league = match['league']
         league_counts[league] = league_counts.get(league, 0) + 1
     